@@ -1,12 +1,11 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 import time
-import os
+import copy
+import io
 import json
+import hashlib
+import os
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # ==============================================================================
 # 版本：v3.98 (Alignment Fix)
@@ -29,112 +28,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ==================================================
-# 0. 初始化 Session State
-# ==================================================
-
-# 1. 全域參數預設值
-DEFAULT_GLOBALS = {
-    "T_amb": 45.0, "Margin": 1.0, 
-    "L_pcb": 350.0, "W_pcb": 250.0, "t_base": 7.0, "H_shield": 20.0, "H_filter": 42.0,
-    "Top": 11.0, "Btm": 13.0, "Left": 11.0, "Right": 11.0,
-    "Coin_L_Setting": 55.0, "Coin_W_Setting": 35.0,
-    "Gap": 13.2, "Fin_t": 1.2,
-    "K_Via": 30.0, "Via_Eff": 0.9,
-    "K_Putty": 9.1, "t_Putty": 0.5,
-    "K_Pad": 7.5, "t_Pad": 1.7,
-    "K_Grease": 3.0, "t_Grease": 0.05,
-    "K_Solder": 58.0, "t_Solder": 0.3, "Voiding": 0.75,
-    "fin_tech_selector_v2": "Embedded Fin (0.95)",
-    "al_density": 2.70, "filter_density": 1.00, 
-    "shielding_density": 0.76, "pcb_surface_density": 0.95
-}
-
-# 嘗試載入設定檔
-config_path = "default_config.json"
-config_loaded_msg = "🟡 使用內建預設值" 
-config_status_color = "#f1c40f" 
-
-if os.path.exists(config_path):
-    try:
-        with open(config_path, "r", encoding='utf-8') as f:
-            custom_config = json.load(f)
-            
-            loaded_globals = False
-            loaded_components = False
-            
-            if 'global_params' in custom_config:
-                DEFAULT_GLOBALS.update(custom_config['global_params'])
-                loaded_globals = True
-            
-            if 'components_data' in custom_config:
-                pass 
-                
-            if loaded_globals:
-                config_loaded_msg = "🟢 設定檔載入成功 (default_config.json)"
-                config_status_color = "#2ecc71" 
-            else:
-                config_loaded_msg = "🔴 預設檔格式異常"
-                config_status_color = "#e74c3c"
-    except Exception as e:
-        config_loaded_msg = f"🔴 讀取錯誤: {str(e)}"
-        config_status_color = "#e74c3c"
-else:
-    config_loaded_msg = "🟡 無預設檔 (Internal Defaults)"
-    config_status_color = "#f1c40f"
-
-# 寫入 Session State
-for k, v in DEFAULT_GLOBALS.items():
-    if k not in st.session_state:
-        st.session_state[k] = v
-
-# 2. 預設元件清單
-default_component_data = {
-    "Component": ["Final PA", "Driver PA", "Pre Driver", "Circulator", "Cavity Filter", "CPU (FPGA)", "Si5518", "16G DDR", "Power Mod", "SFP"],
-    "Qty": [4, 4, 4, 4, 1, 1, 1, 2, 1, 1],
-    "Power(W)": [52.13, 9.54, 0.37, 2.76, 31.07, 35.00, 2.00, 0.40, 29.00, 0.50],
-    "Height(mm)": [250, 200, 180, 250, 0, 50, 80, 60, 30, 0], 
-    "Pad_L": [20, 5, 2, 10, 0, 35, 8.6, 7.5, 58, 14], 
-    "Pad_W": [10, 5, 2, 10, 0, 35, 8.6, 11.5, 61, 50],
-    "Thick(mm)": [2.5, 2.0, 2.0, 2.0, 0, 0, 2.0, 0, 0, 0],
-    "Board_Type": ["Copper Coin", "Thermal Via", "Thermal Via", "Thermal Via", "None", "None", "Thermal Via", "None", "None", "None"],
-    "Limit(C)": [225, 200, 175, 125, 200, 100, 125, 95, 95, 200],
-    "R_jc": [1.50, 1.70, 50.0, 0.0, 0.0, 0.16, 0.50, 0.0, 0.0, 0.0],
-    "TIM_Type": ["Solder", "Grease", "Grease", "Grease", "None", "Putty", "Pad", "Grease", "Grease", "Grease"]
-}
-
-# 再次檢查 JSON 是否有元件資料並覆蓋
-if os.path.exists(config_path):
-    try:
-        with open(config_path, "r", encoding='utf-8') as f:
-            custom_config = json.load(f)
-            if 'components_data' in custom_config:
-                default_component_data = custom_config['components_data']
-    except:
-        pass
-
-if 'df_initial' not in st.session_state:
-    st.session_state['df_initial'] = pd.DataFrame(default_component_data)
-
-if 'df_current' not in st.session_state:
-    st.session_state['df_current'] = st.session_state['df_initial'].copy()
-
-if 'editor_key' not in st.session_state:
-    st.session_state['editor_key'] = 0
-
-if 'last_loaded_file' not in st.session_state:
-    st.session_state['last_loaded_file'] = None
-
-if 'json_ready_to_download' not in st.session_state:
-    st.session_state['json_ready_to_download'] = None
-if 'json_file_name' not in st.session_state:
-    st.session_state['json_file_name'] = ""
-if 'trigger_generation' not in st.session_state:
-    st.session_state['trigger_generation'] = False
-
-def reset_download_state():
-    st.session_state['json_ready_to_download'] = None
-
 # ==================================================
 # 🔐 密碼保護
 # ==================================================
@@ -164,9 +57,107 @@ def check_password():
     else:
         return True
 
+# [Perf] 冷啟動：登入頁只需要 streamlit，pandas / numpy / rru_engine 在通過密碼後才載入
 if not check_password():
     st.stop()
 
+# ==================================================
+# 📦 運算引擎與資料處理 (登入後才載入)
+# ==================================================
+import pandas as pd
+import numpy as np
+from rru_engine.archive import ARCHIVE_EXT, ProjectArchive, dump_project_archive, is_archive
+from rru_engine.assets import asset_cache_stats, load_config, load_default_components, load_reference_image
+from rru_engine.compare import COMPARE_METRICS, evaluate_projects, param_diff
+from rru_engine.defaults import FIN_TECH_OPTIONS
+from rru_engine.defaults import DEFAULT_GLOBALS as ENGINE_DEFAULT_GLOBALS
+from rru_engine.figures import build_budget_bar, build_power_pie
+from rru_engine.incremental import IncrementalEvaluator, editor_changed_rows
+from rru_engine.lazy import LazyModule
+from rru_engine.geometry import DEFAULT_FIN_EFF_MODE, FIN_EFF_MODES, calc_h_value
+from rru_engine.mesh3d import AUTO_LOD_MAX_FULL_FINS, box_mesh, build_fin_mesh, resolve_lod
+from rru_engine.optimizer import OPT_OBJECTIVES, optimize_fin_geometry
+from rru_engine.pareto import PARETO_DESIGN_KEYS, PARETO_RESULT_COLUMNS, run_pareto
+from rru_engine.parts import PART_LIBRARY_FILE, load_part_library
+from rru_engine.perf import PERF_PERCENTILES, PerfRecorder
+from rru_engine.project_io import parse_project, project_json_bytes
+from rru_engine.result_cache import DEFAULT_RESULT_CACHE_MB, ResultCache, cached_artifact, canonical_hash
+from rru_engine.spreading import PLACEMENT_COLUMNS, auto_layout, base_conductivity, solve_base_temperature
+from rru_engine.session_mem import DEFAULT_SESSION_BUDGET_MB, SessionRegistry, enforce_budget, session_footprint
+from rru_engine.sensitivity import SENSITIVITY_METRICS, rank_sensitivity, run_sensitivity
+from rru_engine.sweep import SWEEP_RESULT_COLUMNS, run_sweep
+from rru_engine.table_view import (LARGE_TABLE_ROWS, PAGE_SIZE_OPTIONS, TABLE_SORT_OPTIONS, gradient_css, gradient_index,
+                                   page_count, page_rows, select_rows)
+from rru_engine.transient import DEFAULT_TAU_PKG_S, TRANSIENT_INITIAL_MODES, diurnal_profile, profile_from_table, simulate_transient
+from rru_engine.tolerance import (DEFAULT_TOLERANCES, TOLERANCE_COMPONENT_COLUMNS, TOLERANCE_DISTS,
+                                  TOLERANCE_GLOBAL_KEYS, run_tolerance, tolerances_from_table)
+
+# [Perf] 繪圖模組在第一次畫圖 (進入對應分頁) 時才載入
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
+components = LazyModule("streamlit.components.v1")
+
+# [Mem] pandas 2.x 需手動開啟 copy-on-write (3.0 起為預設)；共用的預設元件表靠它避免被就地修改
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# [Perf] 各階段計時 (每個 session 一個紀錄器；關閉時 stage() 幾乎零成本)
+if 'perf_recorder' not in st.session_state:
+    st.session_state['perf_recorder'] = PerfRecorder()
+perf = st.session_state['perf_recorder']
+perf.configure(st.session_state.get('perf_enabled', False), st.session_state.get('perf_memory', False))
+perf.begin_run()
+
+# ==================================================
+# 0. 初始化 Session State
+# ==================================================
+
+# 1. 全域參數預設值
+DEFAULT_GLOBALS = dict(ENGINE_DEFAULT_GLOBALS)
+
+# 嘗試載入設定檔
+config_path = "default_config.json"
+config_loaded_msg = "🟡 使用內建預設值" 
+config_status_color = "#f1c40f" 
+
+# [Perf] 設定檔每個 process 只解析一次 (依 mtime/size 自動失效)
+with perf.stage("config_load"):
+    config_snapshot = load_config(config_path)
+    if not config_snapshot.exists:
+        config_loaded_msg = "🟡 無預設檔 (Internal Defaults)"
+        config_status_color = "#f1c40f"
+    elif config_snapshot.error:
+        config_loaded_msg = f"🔴 讀取錯誤: {config_snapshot.error}"
+        config_status_color = "#e74c3c"
+    elif config_snapshot.global_params is not None:
+        DEFAULT_GLOBALS.update(config_snapshot.global_params)
+        config_loaded_msg = "🟢 設定檔載入成功 (default_config.json)"
+        config_status_color = "#2ecc71" 
+    else:
+        config_loaded_msg = "🔴 預設檔格式異常"
+        config_status_color = "#e74c3c"
+
+    # 寫入 Session State
+    for k, v in DEFAULT_GLOBALS.items():
+        if k not in st.session_state:
+            st.session_state[k] = v
+
+    # 2. 預設元件清單 (JSON 有元件資料則覆蓋)；[Mem] 所有 session 共用同一個 DataFrame，編輯後才各自持有新表
+    default_components_df = load_default_components(config_path)
+    if 'df_initial' not in st.session_state:
+        st.session_state['df_initial'] = default_components_df
+
+    if 'df_current' not in st.session_state:
+        st.session_state['df_current'] = st.session_state['df_initial']
+
+if 'editor_key' not in st.session_state:
+    st.session_state['editor_key'] = 0
+
+# [Mem] 只記錄上次載入檔案的 file_id 與內容雜湊，不保留 UploadedFile 物件
+if 'last_loaded_digest' not in st.session_state:
+    st.session_state['last_loaded_digest'] = None
+    st.session_state['last_loaded_file_id'] = None
+
 if "welcome_shown" not in st.session_state:
     st.toast(f'🎉 登入成功！歡迎回到熱流運算引擎 ({APP_VERSION})', icon="✅")
     st.session_state["welcome_shown"] = True
@@ -265,27 +256,64 @@ with col_header_R:
             # [UI Fix] 調整比例以容納文字與按鈕，並移除靠右對齊，讓其自然靠左
             c_text, c_btn = st.columns([1.8, 1])
             with c_text:
-                # 靠左對齊，與下方的 "2. 下載專案" 開頭對齊
-                st.markdown(f"<div style='{header_style} padding-top: 6px; white-space: nowrap;'>📂 載入專案設定 (.json)</div>", unsafe_allow_html=True)
+                # 靠左對齊，與下方的 "💾 下載專案" 開頭對齊
+                st.markdown(f"<div style='{header_style} padding-top: 6px; white-space: nowrap;'>📂 載入專案設定 (.json / {ARCHIVE_EXT})</div>", unsafe_allow_html=True)
             with c_btn:
-                uploaded_proj = st.file_uploader(" ", type=["json"], key="project_loader", label_visibility="collapsed")
-            
-        if uploaded_proj is not None:
-            if uploaded_proj != st.session_state['last_loaded_file']:
+                uploaded_proj = st.file_uploader(" ", type=["json", ARCHIVE_EXT.lstrip(".")], key="project_loader", label_visibility="collapsed")
+
+        def apply_loaded_project(new_params, new_df):
+            for k, v in new_params.items():
+                st.session_state[k] = v
+            # 舊專案檔沒有 fin_eff_mode：回到固定 Eff，不沿用目前畫面的模式
+            mode = new_params.get('fin_eff_mode')
+            st.session_state['fin_eff_mode'] = mode if mode in FIN_EFF_MODES else DEFAULT_FIN_EFF_MODE
+            if new_df is not None:
+                st.session_state['df_initial'] = new_df
+                st.session_state['df_current'] = new_df
+                st.session_state['editor_key'] += 1
+            st.toast("✅ 專案載入成功！", icon="📂")
+            time.sleep(0.5)
+            st.rerun()
+
+        # 同一個上傳檔 (file_id 不變) 的 rerun 不重算雜湊；換檔時才以內容雜湊判斷是否與上次載入的相同
+        upload_digest = None
+        if uploaded_proj is not None and uploaded_proj.file_id != st.session_state.get('last_loaded_file_id'):
+            st.session_state['last_loaded_file_id'] = uploaded_proj.file_id
+            upload_digest = hashlib.sha256(uploaded_proj.getbuffer()).hexdigest()
+        if uploaded_proj is None:
+            st.session_state.pop('uploaded_archive', None)
+            st.session_state['last_loaded_digest'] = None
+            st.session_state['last_loaded_file_id'] = None
+        elif upload_digest is not None and upload_digest != st.session_state['last_loaded_digest']:
+            try:
+                raw = uploaded_proj.getvalue()
+                st.session_state['last_loaded_digest'] = upload_digest
+                if is_archive(raw):
+                    # [Archive] 多專案封存檔：單一專案直接載入，否則由下方選單挑選
+                    archive = ProjectArchive.from_bytes(raw)
+                    if len(archive) == 1:
+                        new_params, new_df, _ = archive.load(0)
+                        apply_loaded_project(new_params, new_df)
+                    st.session_state['uploaded_archive'] = archive
+                else:
+                    st.session_state.pop('uploaded_archive', None)
+                    data = json.loads(raw)
+                    new_params, new_df, _ = parse_project(data)
+                    apply_loaded_project(new_params, new_df if 'components_data' in data else None)
+            except Exception as e:
+                st.session_state['last_loaded_digest'] = None
+                st.session_state['last_loaded_file_id'] = None
+                st.error(f"Error: {e}")
+
+        uploaded_archive = st.session_state.get('uploaded_archive')
+        if uploaded_archive is not None and len(uploaded_archive) > 1:
+            c_pick, c_load = st.columns([3, 1])
+            archive_pick = c_pick.selectbox(f"封存檔內的專案 ({len(uploaded_archive):,})", uploaded_archive.names,
+                                            key="archive_pick", label_visibility="collapsed")
+            if c_load.button("載入", key="archive_load", use_container_width=True):
                 try:
-                    data = json.load(uploaded_proj)
-                    if 'global_params' in data:
-                        for k, v in data['global_params'].items():
-                            st.session_state[k] = v
-                    if 'components_data' in data:
-                        new_df = pd.DataFrame(data['components_data'])
-                        st.session_state['df_initial'] = new_df
-                        st.session_state['df_current'] = new_df.copy()
-                        st.session_state['editor_key'] += 1
-                    st.session_state['last_loaded_file'] = uploaded_proj
-                    st.toast("✅ 專案載入成功！", icon="📂")
-                    time.sleep(0.5)
-                    st.rerun()
+                    new_params, new_df, _ = uploaded_archive.load(archive_pick)
+                    apply_loaded_project(new_params, new_df)
                 except Exception as e:
                     st.error(f"Error: {e}")
         
@@ -302,68 +330,60 @@ st.markdown("<hr style='margin-top: 5px; margin-bottom: 20px;'>", unsafe_allow_h
 # ==================================================
 st.sidebar.header("🛠️ 參數控制台")
 
-# --- 參數設定區 (綁定 on_change=reset_download_state + 讀取 value) ---
+# --- 參數設定區 (綁定 key + 讀取 value) ---
 with st.sidebar.expander("1. 環境與係數", expanded=True):
-    T_amb = st.number_input("環境溫度 (°C)", step=1.0, key="T_amb", value=st.session_state['T_amb'], on_change=reset_download_state)
-    Margin = st.number_input("設計安全係數 (Margin)", step=0.1, key="Margin", value=st.session_state['Margin'], on_change=reset_download_state)
-    Slope = 0.03 
+    T_amb = st.number_input("環境溫度 (°C)", step=1.0, key="T_amb", value=st.session_state['T_amb'])
+    Margin = st.number_input("設計安全係數 (Margin)", step=0.1, key="Margin", value=st.session_state['Margin'])
     
     fin_tech = st.selectbox(
         "🔨 鰭片製程 (Fin Tech)", 
-        ["Embedded Fin (0.95)", "Die-casting Fin (0.90)"],
-        key="fin_tech_selector_v2",
-        on_change=reset_download_state
+        FIN_TECH_OPTIONS,
+        key="fin_tech_selector_v2"
     )
     
-    if "Embedded" in fin_tech:
-        Eff = 0.95
-    else:
-        Eff = 0.90
-    st.caption(f"目前設定效率 (Eff): **{Eff}**")
+    fin_eff_mode = st.radio(
+        "鰭片效率 (Eff) 模式", list(FIN_EFF_MODES), format_func=FIN_EFF_MODES.get, key="fin_eff_mode",
+        help="耦合求解：依 Fin_t、h 值與鋁材 k，與鰭片高度一起求解 tanh(mH)/mH (鰭片越高效率越低)。"
+    )
+    eff_caption = st.empty()  # 耦合模式的 Eff 於計算後填入
 
 with st.sidebar.expander("2. PCB 與 機構尺寸", expanded=True):
-    L_pcb = st.number_input("PCB 長度 (mm)", key="L_pcb", value=st.session_state['L_pcb'], on_change=reset_download_state)
-    W_pcb = st.number_input("PCB 寬度 (mm)", key="W_pcb", value=st.session_state['W_pcb'], on_change=reset_download_state)
-    t_base = st.number_input("散熱器基板厚 (mm)", key="t_base", value=st.session_state['t_base'], on_change=reset_download_state)
-    H_shield = st.number_input("HSK內腔深度 (mm)", key="H_shield", value=st.session_state['H_shield'], on_change=reset_download_state)
-    H_filter = st.number_input("Cavity Filter 厚度 (mm)", key="H_filter", value=st.session_state['H_filter'], on_change=reset_download_state)
+    L_pcb = st.number_input("PCB 長度 (mm)", key="L_pcb", value=st.session_state['L_pcb'])
+    W_pcb = st.number_input("PCB 寬度 (mm)", key="W_pcb", value=st.session_state['W_pcb'])
+    t_base = st.number_input("散熱器基板厚 (mm)", key="t_base", value=st.session_state['t_base'])
+    H_shield = st.number_input("HSK內腔深度 (mm)", key="H_shield", value=st.session_state['H_shield'])
+    H_filter = st.number_input("Cavity Filter 厚度 (mm)", key="H_filter", value=st.session_state['H_filter'])
     
     # 重量參數
     st.caption("⚖️ 重量估算參數")
-    al_density = st.number_input("鋁材密度 (g/cm³)", step=0.01, key="al_density", value=st.session_state['al_density'], on_change=reset_download_state, help="Heatsink + Shield 用；壓鑄略調低")
-    filter_density = st.number_input("Cavity Filter (g/cm³)", step=0.05, key="filter_density", value=st.session_state['filter_density'], on_change=reset_download_state, help="實測校正 ≈0.97–1.05")
-    shielding_density = st.number_input("Shielding (g/cm³)", step=0.05, key="shielding_density", value=st.session_state['shielding_density'], on_change=reset_download_state, help="實測 0.758；固定高度 12 mm")
-    pcb_surface_density = st.number_input("PCB 面密度 (g/cm²)", step=0.05, key="pcb_surface_density", value=st.session_state['pcb_surface_density'], on_change=reset_download_state, help="含 SMT；實測 0.965 保守調低")
+    al_density = st.number_input("鋁材密度 (g/cm³)", step=0.01, key="al_density", value=st.session_state['al_density'], help="Heatsink + Shield 用；壓鑄略調低")
+    filter_density = st.number_input("Cavity Filter (g/cm³)", step=0.05, key="filter_density", value=st.session_state['filter_density'], help="實測校正 ≈0.97–1.05")
+    shielding_density = st.number_input("Shielding (g/cm³)", step=0.05, key="shielding_density", value=st.session_state['shielding_density'], help="實測 0.758；固定高度 12 mm")
+    pcb_surface_density = st.number_input("PCB 面密度 (g/cm²)", step=0.05, key="pcb_surface_density", value=st.session_state['pcb_surface_density'], help="含 SMT；實測 0.965 保守調低")
 
     st.markdown("---")
     st.caption("📏 PCB板離外殼邊距(防水)")
     m1, m2 = st.columns(2)
-    Top = m1.number_input("Top (mm)", step=1.0, key="Top", value=st.session_state['Top'], on_change=reset_download_state)
-    Btm = m2.number_input("Bottom (mm)", step=1.0, key="Btm", value=st.session_state['Btm'], on_change=reset_download_state)
+    Top = m1.number_input("Top (mm)", step=1.0, key="Top", value=st.session_state['Top'])
+    Btm = m2.number_input("Bottom (mm)", step=1.0, key="Btm", value=st.session_state['Btm'])
     m3, m4 = st.columns(2)
-    Left = m3.number_input("Left (mm)", step=1.0, key="Left", value=st.session_state['Left'], on_change=reset_download_state)
-    Right = m4.number_input("Right (mm)", step=1.0, key="Right", value=st.session_state['Right'], on_change=reset_download_state)
+    Left = m3.number_input("Left (mm)", step=1.0, key="Left", value=st.session_state['Left'])
+    Right = m4.number_input("Right (mm)", step=1.0, key="Right", value=st.session_state['Right'])
     
     st.markdown("---")
     st.caption("🔶 Final PA 銅塊設定")
     c1, c2 = st.columns(2)
-    Coin_L_Setting = c1.number_input("銅塊長 (mm)", step=1.0, key="Coin_L_Setting", value=st.session_state['Coin_L_Setting'], on_change=reset_download_state)
-    Coin_W_Setting = c2.number_input("銅塊寬 (mm)", step=1.0, key="Coin_W_Setting", value=st.session_state['Coin_W_Setting'], on_change=reset_download_state)
+    Coin_L_Setting = c1.number_input("銅塊長 (mm)", step=1.0, key="Coin_L_Setting", value=st.session_state['Coin_L_Setting'])
+    Coin_W_Setting = c2.number_input("銅塊寬 (mm)", step=1.0, key="Coin_W_Setting", value=st.session_state['Coin_W_Setting'])
 
     st.markdown("---")
     st.caption("🌊 鰭片幾何")
     c_fin1, c_fin2 = st.columns(2)
-    Gap = c_fin1.number_input("鰭片air gap (mm)", step=0.1, key="Gap", value=st.session_state['Gap'], on_change=reset_download_state)
-    Fin_t = c_fin2.number_input("鰭片厚度 (mm)", step=0.1, key="Fin_t", value=st.session_state['Fin_t'], on_change=reset_download_state)
+    Gap = c_fin1.number_input("鰭片air gap (mm)", step=0.1, key="Gap", value=st.session_state['Gap'])
+    Fin_t = c_fin2.number_input("鰭片厚度 (mm)", step=0.1, key="Fin_t", value=st.session_state['Fin_t'])
 
     # [Core] h 值自動計算
-    h_conv = 6.4 * np.tanh(Gap / 7.0)
-    if Gap >= 10.0:
-        rad_factor = 1.0
-    else:
-        rad_factor = np.sqrt(Gap / 10.0)
-    h_rad = 2.4 * rad_factor
-    h_value = h_conv + h_rad
+    h_value, h_conv, h_rad = calc_h_value(Gap)
     
     if h_conv < 4.0:
         st.error(f"🔥 **h_conv 過低警告: {h_conv:.2f}** (對流受阻，建議 ≥ 4.0)")
@@ -375,234 +395,253 @@ with st.sidebar.expander("2. PCB 與 機構尺寸", expanded=True):
 
 with st.sidebar.expander("3. 材料參數 (含 Via K值)", expanded=False):
     c1, c2 = st.columns(2)
-    K_Via = c1.number_input("Via 等效 K值", key="K_Via", value=st.session_state['K_Via'], on_change=reset_download_state)
-    Via_Eff = c2.number_input("Via 製程係數", key="Via_Eff", value=st.session_state['Via_Eff'], on_change=reset_download_state)
+    K_Via = c1.number_input("Via 等效 K值", key="K_Via", value=st.session_state['K_Via'])
+    Via_Eff = c2.number_input("Via 製程係數", key="Via_Eff", value=st.session_state['Via_Eff'])
     st.markdown("---") 
     st.caption("🔷 熱介面材料 (TIM)")
     c3, c4 = st.columns(2)
-    K_Putty = c3.number_input("K (Putty)", key="K_Putty", value=st.session_state['K_Putty'], on_change=reset_download_state)
-    t_Putty = c4.number_input("t (Putty)", key="t_Putty", value=st.session_state['t_Putty'], on_change=reset_download_state)
+    K_Putty = c3.number_input("K (Putty)", key="K_Putty", value=st.session_state['K_Putty'])
+    t_Putty = c4.number_input("t (Putty)", key="t_Putty", value=st.session_state['t_Putty'])
     c5, c6 = st.columns(2)
-    K_Pad = c5.number_input("K (Pad)", key="K_Pad", value=st.session_state['K_Pad'], on_change=reset_download_state)
-    t_Pad = c6.number_input("t (Pad)", key="t_Pad", value=st.session_state['t_Pad'], on_change=reset_download_state)
+    K_Pad = c5.number_input("K (Pad)", key="K_Pad", value=st.session_state['K_Pad'])
+    t_Pad = c6.number_input("t (Pad)", key="t_Pad", value=st.session_state['t_Pad'])
     c7, c8 = st.columns(2)
-    K_Grease = c7.number_input("K (Grease)", key="K_Grease", value=st.session_state['K_Grease'], on_change=reset_download_state)
-    t_Grease = c8.number_input("t (Grease)", format="%.3f", key="t_Grease", value=st.session_state['t_Grease'], on_change=reset_download_state)
+    K_Grease = c7.number_input("K (Grease)", key="K_Grease", value=st.session_state['K_Grease'])
+    t_Grease = c8.number_input("t (Grease)", format="%.3f", key="t_Grease", value=st.session_state['t_Grease'])
     st.markdown("---") 
     st.markdown("**🔘 Solder (錫片)**") 
     c9, c10 = st.columns(2)
-    K_Solder = c9.number_input("K (錫片)", key="K_Solder", value=st.session_state['K_Solder'], on_change=reset_download_state)
-    t_Solder = c10.number_input("t (錫片)", key="t_Solder", value=st.session_state['t_Solder'], on_change=reset_download_state)
-    Voiding = st.number_input("錫片空洞率 (Voiding)", key="Voiding", value=st.session_state['Voiding'], on_change=reset_download_state)
+    K_Solder = c9.number_input("K (錫片)", key="K_Solder", value=st.session_state['K_Solder'])
+    t_Solder = c10.number_input("t (錫片)", key="t_Solder", value=st.session_state['t_Solder'])
+    Voiding = st.number_input("錫片空洞率 (Voiding)", key="Voiding", value=st.session_state['Voiding'])
 
 # ==================================================
 # 3. 分頁與邏輯
 # ==================================================
-tab_input, tab_data, tab_viz, tab_3d = st.tabs([
-    "📝 COMPONENT SETUP (元件設定)", 
-    "🔢 DETAILED ANALYSIS (詳細分析)", 
-    "📊 VISUAL REPORT (視覺化報告)", 
-    "🧊 3D SIMULATION (3D 模擬視圖)"
-])
+# [Perf] 延遲渲染：只執行目前分頁的內容 (切換分頁觸發 rerun)；關閉時所有分頁照舊全部渲染
+lazy_tabs = st.session_state.get('lazy_tabs', True)
+tab_input, tab_data, tab_viz, tab_3d, tab_sweep, tab_tol, tab_cmp, tab_pareto = st.tabs([
+    "📝 COMPONENT SETUP (元件設定)",
+    "🔢 DETAILED ANALYSIS (詳細分析)",
+    "📊 VISUAL REPORT (視覺化報告)",
+    "🧊 3D SIMULATION (3D 模擬視圖)",
+    "🧪 DESIGN SWEEP (參數掃描)",
+    "🎲 TOLERANCE (公差分析)",
+    "🆚 COMPARE (多專案比較)",
+    "🏔️ PARETO (多目標探索)"
+], key="main_tab", on_change="rerun" if lazy_tabs else "ignore")
+
+def tab_is_active(tab):
+    """延遲渲染時只有目前分頁為 True；未追蹤狀態時 .open 為 None，視為可見"""
+    return tab.open is not False
+
+def keep_widget_state(prefix):
+    """分頁隱藏時元件不會渲染，Streamlit 會清掉其狀態；回寫一次以保留使用者的選擇"""
+    for k in list(st.session_state.keys()):
+        if isinstance(k, str) and k.startswith(prefix):
+            st.session_state[k] = st.session_state[k]
 
 # --- Tab 1: 輸入介面 ---
+@st.fragment
+def render_part_picker():
+    """元件庫查詢；調整條件只重跑此區塊，加入元件時才整頁重跑"""
+    try:
+        library = load_part_library(PART_LIBRARY_FILE)
+    except Exception as e:
+        st.error(f"元件庫讀取失敗: {e}")
+        return
+    if library is None:
+        st.info(f"找不到元件庫檔案 {PART_LIBRARY_FILE}")
+        return
+
+    f1, f2, f3, f4 = st.columns([1.4, 1.6, 1.6, 1])
+    prefix = f1.text_input("名稱開頭", key="lib_prefix", placeholder="例如 Final PA、CPU")
+    power_max = float(np.ceil(library.power_max))
+    area_max = float(np.ceil(library.area_max))
+    power = f2.slider("單顆功耗 (W)", 0.0, power_max, (0.0, power_max), key="lib_power")
+    area = f3.slider("Pad 面積 (mm²)", 0.0, area_max, (0.0, area_max), key="lib_area")
+    board = f4.selectbox("導熱方式", ["全部"] + library.board_types, key="lib_board")
+
+    t0 = time.perf_counter()
+    hits, total = library.search(
+        prefix,
+        power=None if power == (0.0, power_max) else power,
+        area=None if area == (0.0, area_max) else area,
+        board_type=None if board == "全部" else board,
+    )
+    elapsed_ms = (time.perf_counter() - t0) * 1e3
+    st.caption(f"元件庫 {len(library):,} 筆｜符合 {total:,} 筆 (顯示前 {len(hits):,} 筆)｜查詢 {elapsed_ms:.2f} ms")
+
+    event = st.dataframe(hits, hide_index=True, use_container_width=True, height=240,
+                         on_select="rerun", selection_mode="multi-row", key="lib_table")
+    selected = event.selection.rows
+    q1, q2 = st.columns([1, 3])
+    qty = q1.number_input("數量", min_value=1, value=1, step=1, key="lib_qty")
+    q2.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
+    if q2.button(f"➕ 加入元件表 ({len(selected)})", disabled=not selected, key="lib_add"):
+        new_rows = library.to_components(hits.iloc[selected], qty)
+        base = st.session_state['df_current']
+        st.session_state['df_initial'] = pd.concat([base, new_rows], ignore_index=True) if len(base) else new_rows
+        st.session_state['df_current'] = st.session_state['df_initial']
+        st.session_state['editor_key'] += 1
+        st.rerun()
+
 with tab_input:
     st.subheader("🔥 元件熱源清單設定")
     st.caption("💡 **提示：將滑鼠游標停留在表格的「欄位標題」上，即可查看詳細的名詞解釋與定義。**")
 
+    # 元件庫在開啟時才讀檔建索引，不影響啟動時間
+    if st.toggle("📚 從元件庫加入", key="lib_open"):
+        with st.container(border=True):
+            render_part_picker()
+
     # [Fix] 使用 df_initial (穩定源)
-    edited_df = st.data_editor(
-        st.session_state['df_initial'],
-        column_config={
-            "Component": st.column_config.TextColumn("元件名稱", help="元件型號或代號 (如 PA, FPGA)", width="medium"),
-            "Qty": st.column_config.NumberColumn("數量", help="該元件的使用數量", min_value=0, step=1, width="small"),
-            "Power(W)": st.column_config.NumberColumn("單顆功耗 (W)", help="單一顆元件的發熱瓦數 (TDP)", format="%.2f", min_value=0.0, step=0.01),
-            "Height(mm)": st.column_config.NumberColumn("高度 (mm)", help="元件距離 PCB 底部的垂直高度。高度越高，局部環溫 (Local Amb) 越高。", format="%.2f"),
-            "Pad_L": st.column_config.NumberColumn("Pad 長 (mm)", help="元件底部散熱焊盤 (E-pad) 的長度", format="%.2f"),
-            "Pad_W": st.column_config.NumberColumn("Pad 寬 (mm)", help="元件底部散熱焊盤 (E-pad) 的寬度", format="%.2f"),
-            "Thick(mm)": st.column_config.NumberColumn("板厚 (mm)", help="熱需傳導穿過的 PCB 或銅塊 (Coin) 厚度", format="%.2f"),
-            "Board_Type": st.column_config.SelectboxColumn("元件導熱方式", help="元件導熱到HSK表面的方式(thermal via或銅塊)", options=["Thermal Via", "Copper Coin", "None"], width="medium"),
-            # [修正] 移除 Solder 選項
-            "TIM_Type": st.column_config.SelectboxColumn("介面材料", help="元件或銅塊底部與散熱器之間的TIM", options=["Grease", "Pad", "Putty", "None"], width="medium"),
-            "R_jc": st.column_config.NumberColumn("熱阻 Rjc", help="結點到殼的內部熱阻", format="%.2f"),
-            "Limit(C)": st.column_config.NumberColumn("限溫 (°C)", help="元件允許最高運作溫度", format="%.2f")
-        },
-        num_rows="dynamic",
-        use_container_width=True,
-        key=f"editor_{st.session_state['editor_key']}",
-        on_change=reset_download_state # [Fix] 表格變動也會觸發下載按鈕重置
-    )
+    with perf.stage("data_editor"):
+        edited_df = st.data_editor(
+            st.session_state['df_initial'],
+            column_config={
+                "Component": st.column_config.TextColumn("元件名稱", help="元件型號或代號 (如 PA, FPGA)", width="medium"),
+                "Qty": st.column_config.NumberColumn("數量", help="該元件的使用數量", min_value=0, step=1, width="small"),
+                "Power(W)": st.column_config.NumberColumn("單顆功耗 (W)", help="單一顆元件的發熱瓦數 (TDP)", format="%.2f", min_value=0.0, step=0.01),
+                "Height(mm)": st.column_config.NumberColumn("高度 (mm)", help="元件距離 PCB 底部的垂直高度。高度越高，局部環溫 (Local Amb) 越高。", format="%.2f"),
+                "Pad_L": st.column_config.NumberColumn("Pad 長 (mm)", help="元件底部散熱焊盤 (E-pad) 的長度", format="%.2f"),
+                "Pad_W": st.column_config.NumberColumn("Pad 寬 (mm)", help="元件底部散熱焊盤 (E-pad) 的寬度", format="%.2f"),
+                "Thick(mm)": st.column_config.NumberColumn("板厚 (mm)", help="熱需傳導穿過的 PCB 或銅塊 (Coin) 厚度", format="%.2f"),
+                "Board_Type": st.column_config.SelectboxColumn("元件導熱方式", help="元件導熱到HSK表面的方式(thermal via或銅塊)", options=["Thermal Via", "Copper Coin", "None"], width="medium"),
+                # [修正] 移除 Solder 選項
+                "TIM_Type": st.column_config.SelectboxColumn("介面材料", help="元件或銅塊底部與散熱器之間的TIM", options=["Grease", "Pad", "Putty", "None"], width="medium"),
+                "R_jc": st.column_config.NumberColumn("熱阻 Rjc", help="結點到殼的內部熱阻", format="%.2f"),
+                "Limit(C)": st.column_config.NumberColumn("限溫 (°C)", help="元件允許最高運作溫度", format="%.2f"),
+                "X(mm)": st.column_config.NumberColumn("X (mm)", help="[選填] 元件中心在 PCB 上的座標 (沿 L_pcb)，供基板熱擴散分析使用", format="%.1f"),
+                "Y(mm)": st.column_config.NumberColumn("Y (mm)", help="[選填] 元件中心在 PCB 上的座標 (沿 W_pcb)，供基板熱擴散分析使用", format="%.1f")
+            },
+            num_rows="dynamic",
+            use_container_width=True,
+            key=f"editor_{st.session_state['editor_key']}"
+        )
     
-    # [Fix] 實時更新 df_current
+    # [Fix] 實時更新 df_current；[Mem] 沒有任何編輯時沿用 df_initial (data_editor 每次都回傳新的複本)
+    editor_state = st.session_state.get(f"editor_{st.session_state['editor_key']}") or {}
+    if not any(editor_state.get(k) for k in ("edited_rows", "added_rows", "deleted_rows")):
+        edited_df = st.session_state['df_initial']
+    prev_df_current = st.session_state['df_current']
     st.session_state['df_current'] = edited_df
 
+    # [Perf] 與上一次 rerun 的編輯狀態比較，得到變動的列 (只比較 data_editor 的小型狀態 dict，不掃描整張表)
+    prev_editor_snapshot = st.session_state.get('editor_snapshot')
+    editor_snapshot = (st.session_state['editor_key'], copy.deepcopy(editor_state))
+    st.session_state['editor_snapshot'] = editor_snapshot
+
 # ==================================================
-# # 核心計算函數 (Refactored for Maintainability)
+# # 核心計算 (rru_engine.incremental，結果與 evaluate_project 相同)
 # ==================================================
-def calc_h_value(Gap):
-    """計算 h_conv, h_rad, h_value"""
-    h_conv = 6.4 * np.tanh(Gap / 7.0)
-    if Gap >= 10.0:
-        rad_factor = 1.0
-    else:
-        rad_factor = np.sqrt(Gap / 10.0)
-    h_rad = 2.4 * rad_factor
-    h_value = h_conv + h_rad
-    return h_value, h_conv, h_rad
-
-def calc_fin_count(W_hsk, Gap, Fin_t):
-    """植樹原理計算最大鰭片數"""
-    if Gap + Fin_t > 0:
-        num_fins_float = (W_hsk + Gap) / (Gap + Fin_t)
-        num_fins_int = int(num_fins_float)
-        if num_fins_int > 0:
-            total_width = num_fins_int * Fin_t + (num_fins_int - 1) * Gap
-            while total_width > W_hsk and num_fins_int > 0:
-                num_fins_int -= 1
-                total_width = num_fins_int * Fin_t + (num_fins_int - 1) * Gap
+RESULT_CACHE_MB = float(os.environ.get("RRU_RESULT_CACHE_MB", DEFAULT_RESULT_CACHE_MB))
+
+@st.cache_resource
+def get_result_cache():
+    """跨 session 共用的結果快取 (LRU，依結果 + 衍生圖表的估計位元組數淘汰)"""
+    return ResultCache(max_bytes=int(RESULT_CACHE_MB * 2**20))
+
+result_cache = get_result_cache()
+current_params = {k: st.session_state[k] for k in DEFAULT_GLOBALS}
+current_params['fin_eff_mode'] = st.session_state.get('fin_eff_mode', DEFAULT_FIN_EFF_MODE)
+# [Perf] 快取未命中時以本 session 的增量引擎重算 (只重算變動的參數階段與元件列)
+if 'incremental_evaluator' not in st.session_state:
+    st.session_state['incremental_evaluator'] = IncrementalEvaluator()
+incremental_evaluator = st.session_state['incremental_evaluator']
+# [Perf] 增量引擎的上一次輸入就是上一次 rerun 的元件表 (同一個 data_editor) 時，直接交給它依編輯差異重算：
+#        不對整張表做內容雜湊；輸入未變時回傳同一個結果 dict，其上的圖表沿用。
+#        換表 (載入專案、重設、元件庫加入) 或第一次執行時，才以內容雜湊查跨 session 的結果快取。
+with perf.stage("model"):
+    if (prev_editor_snapshot is not None and prev_editor_snapshot[0] == editor_snapshot[0]
+            and incremental_evaluator.source_df is prev_df_current):
+        changed_rows = editor_changed_rows(st.session_state['df_initial'], prev_editor_snapshot[1], editor_state, edited_df)
+        results = incremental_evaluator.evaluate(current_params, edited_df, changed_rows=changed_rows)
     else:
-        num_fins_int = 0
-    return num_fins_int
-
-def calc_thermal_resistance(row, g):
-    """單行元件熱阻計算 (取代原本 apply_excel_formulas)"""
-    # 從 g (globals_dict) 取出需要的全域變數
-    if row['Component'] == "Final PA":
-        base_l, base_w = g['Coin_L_Setting'], g['Coin_W_Setting']
-    elif row['Power(W)'] == 0 or row['Thick(mm)'] == 0:
-        base_l, base_w = 0.0, 0.0
-    else:
-        base_l, base_w = row['Pad_L'] + row['Thick(mm)'], row['Pad_W'] + row['Thick(mm)']
-        
-    loc_amb = g['T_amb'] + (row['Height(mm)'] * g['Slope'])
-    
-    if row['Board_Type'] == "Copper Coin":
-        k_board = 380.0
-    elif row['Board_Type'] == "Thermal Via":
-        k_board = g['K_Via']
-    else:
-        k_board = 0.0
-
-    pad_area = (row['Pad_L'] * row['Pad_W']) / 1e6
-    base_area = (base_l * base_w) / 1e6
-    
-    if k_board > 0 and pad_area > 0:
-        eff_area = np.sqrt(pad_area * base_area) if base_area > 0 else pad_area
-        r_int_val = (row['Thick(mm)']/1000) / (k_board * eff_area)
-        if row['Component'] == "Final PA":
-            r_int = r_int_val + ((g['t_Solder']/1000) / (g['K_Solder'] * pad_area * g['Voiding']))
-        elif row['Board_Type'] == "Thermal Via":
-            r_int = r_int_val / g['Via_Eff']
-        else:
-            r_int = r_int_val
-    else:
-        r_int = 0
-        
-    tim = g['tim_props'].get(row['TIM_Type'], {"k":1, "t":0})
-    target_area = base_area if base_area > 0 else pad_area
-    if target_area > 0 and tim['t'] > 0:
-        r_tim = (tim['t']/1000) / (tim['k'] * target_area)
-    else:
-        r_tim = 0
-        
-    total_w = row['Qty'] * row['Power(W)']
-    drop = row['Power(W)'] * (row['R_jc'] + r_int + r_tim)
-    allowed_dt = row['Limit(C)'] - drop - loc_amb
-    return pd.Series([base_l, base_w, loc_amb, r_int, r_tim, total_w, drop, allowed_dt])
-
-# --- 後台運算 (Refactored) ---
-globals_dict = {
-    'T_amb': T_amb, 'Slope': Slope,
-    'Coin_L_Setting': Coin_L_Setting, 'Coin_W_Setting': Coin_W_Setting,
-    'K_Via': K_Via, 'Via_Eff': Via_Eff,
-    'K_Solder': K_Solder, 't_Solder': t_Solder, 'Voiding': Voiding,
-}
-tim_props = {
-    "Solder": {"k": K_Solder, "t": t_Solder},
-    "Grease": {"k": K_Grease, "t": t_Grease},
-    "Pad": {"k": K_Pad, "t": t_Pad},
-    "Putty": {"k": K_Putty, "t": t_Putty},
-    "None": {"k": 1, "t": 0}
-}
-globals_dict['tim_props'] = tim_props
-
-# 元件熱阻計算
-if not edited_df.empty:
-    calc_results = edited_df.apply(lambda row: calc_thermal_resistance(row, globals_dict), axis=1)
-    calc_results.columns = ['Base_L', 'Base_W', 'Loc_Amb', 'R_int', 'R_TIM', 'Total_W', 'Drop', 'Allowed_dT']
-    final_df = pd.concat([edited_df, calc_results], axis=1)
-else:
-    final_df = pd.DataFrame()
-
-# 總功耗與瓶頸
-valid_rows = final_df[final_df['Total_W'] > 0].copy()
-if not valid_rows.empty:
-    Total_Watts_Sum = valid_rows['Total_W'].sum()
-    Min_dT_Allowed = valid_rows['Allowed_dT'].min()
-    Bottleneck_Name = valid_rows.loc[valid_rows['Allowed_dT'].idxmin()]['Component'] if not pd.isna(valid_rows['Allowed_dT'].idxmin()) else "None"
-else:
-    Total_Watts_Sum = 0; Min_dT_Allowed = 50; Bottleneck_Name = "None"
-
-L_hsk, W_hsk = L_pcb + Top + Btm, W_pcb + Left + Right
-
-# 核心計算呼叫
-h_value, h_conv, h_rad = calc_h_value(Gap)
-num_fins_int = calc_fin_count(W_hsk, Gap, Fin_t)
-Fin_Count = num_fins_int
-
-Total_Power = Total_Watts_Sum * Margin
-if Total_Power > 0 and Min_dT_Allowed > 0:
-    R_sa = Min_dT_Allowed / Total_Power
-    Area_req = 1 / (h_value * R_sa * Eff)
-    Base_Area_m2 = (L_hsk * W_hsk) / 1e6
-    try:
-        Fin_Height = ((Area_req - Base_Area_m2) * 1e6) / (2 * Fin_Count * L_hsk)
-    except:
-        Fin_Height = 0
-    RRU_Height = t_base + Fin_Height + H_shield + H_filter
-    Volume_L = (L_hsk * W_hsk * RRU_Height) / 1e6
-    
-    # [v3.84] 重量計算
-    base_vol_cm3 = L_hsk * W_hsk * t_base / 1000
-    fins_vol_cm3 = num_fins_int * Fin_t * Fin_Height * L_hsk / 1000
-    hs_weight_kg = (base_vol_cm3 + fins_vol_cm3) * al_density / 1000
-    
-    shield_outer_vol_cm3 = L_hsk * W_hsk * H_shield / 1000
-    shield_inner_vol_cm3 = L_pcb * W_pcb * H_shield / 1000
-    shield_vol_cm3 = max(shield_outer_vol_cm3 - shield_inner_vol_cm3, 0)
-    shield_weight_kg = shield_vol_cm3 * al_density / 1000
-    
-    filter_vol_cm3 = L_hsk * W_hsk * H_filter / 1000
-    filter_weight_kg = filter_vol_cm3 * filter_density / 1000
-    
-    shielding_height_cm = 1.2
-    shielding_area_cm2 = L_pcb * W_pcb / 100
-    shielding_vol_cm3 = shielding_area_cm2 * shielding_height_cm
-    shielding_weight_kg = shielding_vol_cm3 * shielding_density / 1000
-    
-    pcb_area_cm2 = L_pcb * W_pcb / 100
-    pcb_weight_kg = pcb_area_cm2 * pcb_surface_density / 1000
-    
-    cavity_weight_kg = filter_weight_kg + shield_weight_kg + shielding_weight_kg + pcb_weight_kg
-    total_weight_kg = hs_weight_kg + cavity_weight_kg
+        # 相同輸入 (內容雜湊) 直接取用快取結果與圖表，不重算
+        results = result_cache.get_or_compute(
+            canonical_hash(current_params, edited_df),
+            lambda: incremental_evaluator.evaluate(current_params, edited_df)
+        )
 
-else:
-    R_sa = 0; Area_req = 0; Fin_Height = 0; RRU_Height = 0; Volume_L = 0
-    # [Fix NameError] 必須初始化重量變數
-    total_weight_kg = 0; hs_weight_kg = 0; shield_weight_kg = 0
-    filter_weight_kg = 0; shielding_weight_kg = 0; pcb_weight_kg = 0
+final_df = results['final_df']; valid_rows = results['valid_rows']
+Total_Power = results['Total_Power']; Min_dT_Allowed = results['Min_dT_Allowed']; Bottleneck_Name = results['Bottleneck_Name']
+L_hsk, W_hsk = results['L_hsk'], results['W_hsk']
+num_fins_int = results['Fin_Count']; Fin_Count = num_fins_int
+Area_req = results['Area_req']; Fin_Height = results['Fin_Height']
+RRU_Height = results['RRU_Height']; Volume_L = results['Volume_L']
+total_weight_kg = results['total_weight_kg']; hs_weight_kg = results['hs_weight_kg']; shield_weight_kg = results['shield_weight_kg']
+filter_weight_kg = results['filter_weight_kg']; shielding_weight_kg = results['shielding_weight_kg']; pcb_weight_kg = results['pcb_weight_kg']
 
 # ==================================================
 # [DRC] 設計規則檢查
 # ==================================================
-drc_failed = False
-drc_msg = ""
-
-# 計算流阻比 (Aspect Ratio)
-if Gap > 0 and Fin_Height > 0:
-    aspect_ratio = Fin_Height / Gap
+drc_failed = results['drc_failed']
+drc_msg = results['drc_msg']
+aspect_ratio = results['aspect_ratio']
+
+# 側邊欄 Eff 說明 (耦合模式顯示求解結果)
+fin_eff_status = results['fin_eff_status']
+if fin_eff_status == "fixed":
+    eff_caption.caption(f"目前設定效率 (Eff): **{results['Eff']}**")
+elif fin_eff_status == "solved":
+    eff_caption.caption(f"耦合求解：鰭片效率 η_f **{results['Fin_Eff']:.3f}** · 整體 Eff **{results['Eff']:.3f}** "
+                        f"(熱平衡相對誤差 {results['fin_eff_residual']:.1e})")
+elif fin_eff_status == "base_only":
+    eff_caption.caption("耦合求解：基板面積已足夠，不需鰭片 (Eff = 1)")
+elif fin_eff_status == "infeasible":
+    eff_caption.warning("耦合求解無解：鰭片再高也無法排出所需熱量")
 else:
-    aspect_ratio = 0
+    eff_caption.caption("耦合求解：尚無有效熱負載 (Eff = 1)")
+
+# ==================================================
+# 🎯 鰭片幾何最佳化 (每次 rerun 自動計算，< 1 ms)
+# ==================================================
+def apply_optimized_design(opt):
+    for k in ("Gap", "Fin_t", "t_base", "fin_tech_selector_v2"):
+        st.session_state[k] = opt[k]
+
+with st.sidebar.expander("4. 🎯 鰭片幾何最佳化 (Optimize)", expanded=False):
+    opt_objective = st.radio("最佳化目標", list(OPT_OBJECTIVES), format_func=OPT_OBJECTIVES.get, key="opt_objective", horizontal=True)
+    opt_both_tech = st.checkbox("同時比較兩種鰭片製程", value=False, key="opt_both_tech")
+    o1, o2 = st.columns(2)
+    opt_lock_fin_t = o1.checkbox("鎖定鰭片厚度", value=False, key="opt_lock_fin_t")
+    opt_lock_t_base = o2.checkbox("鎖定基板厚", value=False, key="opt_lock_t_base")
+    with perf.stage("optimizer"):
+        opt = optimize_fin_geometry(
+            current_params, results['Total_Watts_Sum'], Min_dT_Allowed, objective=opt_objective,
+            fin_techs=FIN_TECH_OPTIONS if opt_both_tech else None,
+            lock_fin_t=opt_lock_fin_t, lock_t_base=opt_lock_t_base,
+        )
+    if opt is None:
+        st.warning("⚠️ 在製程限制內找不到通過 DRC 的設計，請放大 PCB / 邊距或降低功耗。")
+    else:
+        cur_txt = "N/A (DRC Failed)" if drc_failed else f"{Volume_L:.2f} L / {total_weight_kg:.1f} kg"
+        st.markdown(f"""
+        **建議設計** ({opt['fin_tech_selector_v2'].split(' (')[0]})  
+        Gap **{opt['Gap']:.1f}** mm | Fin_t **{opt['Fin_t']:.1f}** mm | t_base **{opt['t_base']:.1f}** mm  
+        鰭片 {opt['Fin_Count']} pcs × {opt['Fin_Height']:.1f} mm (AR {opt['aspect_ratio']:.1f})  
+        ➡️ **{opt['Volume_L']:.2f} L / {opt['total_weight_kg']:.1f} kg**  
+        <small style="color: #888;">目前：{cur_txt}｜評估 {opt['n_evaluated']} 點，{opt['elapsed_s'] * 1e3:.1f} ms</small>
+        """, unsafe_allow_html=True)
+        st.button("✅ 套用最佳化結果", on_click=apply_optimized_design, args=(opt,), key="apply_opt")
+
+with st.sidebar.expander("🧰 快取狀態 (Cache)", expanded=False):
+    st.toggle("⚡ 只渲染目前分頁", value=True, key="lazy_tabs", help="開啟時隱藏分頁的表格、圖表與 3D 模型不會在每次互動時重建")
+    cache_stats = result_cache.stats()
+    cs1, cs2, cs3 = st.columns(3)
+    cs1.metric("Hit", cache_stats['hits'])
+    cs2.metric("Miss", cache_stats['misses'])
+    cs3.metric("命中率", f"{cache_stats['hit_rate'] * 100:.0f}%")
+    st.caption(f"項目 {cache_stats['size']}｜{cache_stats['bytes'] / 2**20:.1f} / {RESULT_CACHE_MB:g} MB｜"
+               f"淘汰 {cache_stats['evictions']}｜所有使用者共用")
+    asset_stats = asset_cache_stats()
+    st.caption(f"設定檔/靜態資源：命中 {asset_stats['hits']}｜讀檔 {asset_stats['loads']}")
+    inc_stats = incremental_evaluator.last_stats
+    if inc_stats is not None:
+        inc_scope = "全部重算" if inc_stats['full'] else "、".join(inc_stats['stages']) or "無"
+        st.caption(f"最近一次增量重算：元件列 {inc_stats['rows_recomputed']:,} / {inc_stats['rows_total']:,}｜階段 {inc_scope}｜{inc_stats['elapsed_ms']:.1f} ms")
+    st.button("🗑️ 清除快取", on_click=result_cache.clear, key="clear_result_cache")
 
 # [UI] 更新側邊欄的 Aspect Ratio 資訊 (回填)
 # 修正建議值為 4.5 ~ 6.5
@@ -626,255 +665,428 @@ if Fin_Height > 0:
 else:
     ar_status_box.info("等待計算 Aspect Ratio...")
 
-if aspect_ratio > 12.0:
-    drc_failed = True
-    drc_msg = f"⛔ **設計無效 (Choked Flow)：** 流阻比 (高/寬) 達 {aspect_ratio:.1f} (上限 12)。\n鰭片太深且太密，空氣滯留無法流動，請降低高度或增大間距。"
-elif h_conv < 4.0:
-    drc_failed = True
-    drc_msg = f"⛔ **設計無效 (Step 3 - Poor Convection)：** 有效對流係數 h_conv 僅 {h_conv:.2f} (目標 >= 4.0)。\nGap 過小導致風阻過大，散熱效率極低。請增大 Air Gap。"
-elif Gap < 4.0:
-    drc_failed = True
-    drc_msg = f"⛔ **設計無效 (Gap Too Small)：** 鰭片間距 {Gap}mm 小於物理極限 (4mm)。\n邊界層完全重疊，自然對流失效。"
-elif "Embedded" in fin_tech and Fin_Height > 100.0:
-    drc_failed = True
-    drc_msg = f"⛔ **製程限制 (Process Limit)：** Embedded Fin (埋入式鰭片) 製程高度限制需 < 100mm (目前計算值: {Fin_Height:.1f}mm)。\n此高度已超過製程極限，建議增加設備的X/Y方向面積來讓Z方向面積增加。"
-
-# --- Tab 2: 詳細數據 (表二) ---
+# --- Tab 2: 基板熱擴散 (空間模式) ---
+SPREAD_RES_OPTIONS = [4.0, 2.0, 1.0, 0.5]
+SPREAD_MAX_HEATMAP_CELLS = 400  # 熱圖每軸最多顯示格數 (求解仍用完整格點)
+
+@st.fragment
+def render_spreading(current_params, results):
+    """基板 2D 熱擴散；調整格點 / 熱傳導係數只重跑此區塊"""
+    st.markdown("---")
+    st.subheader("🌡️ 基板熱擴散 (Spatial Mode)")
+    st.caption("集總模型假設整個基板溫度相同；空間模式依元件座標 (元件表的 X / Y 欄位) 求解基板的溫度分佈，"
+               "以鰭片側等效對流 (h × Eff × 鰭片面積) 為邊界條件，得到每個元件位置的局部基板溫升。未設定座標的元件功耗均勻分佈。")
+
+    df = st.session_state['df_current']
+    has_xy = all(c in df.columns for c in PLACEMENT_COLUMNS)
+    n_missing = int(df[PLACEMENT_COLUMNS].isna().any(axis=1).sum()) if has_xy else len(df)
+    if n_missing and st.button(f"📐 自動擺放未設定座標的元件 ({n_missing})", key="spread_auto_layout"):
+        st.session_state['df_initial'] = auto_layout(df, current_params)
+        st.session_state['df_current'] = st.session_state['df_initial']
+        st.session_state['editor_key'] += 1
+        st.rerun()
+    if not has_xy:
+        st.info("ℹ️ 元件表尚無 X(mm) / Y(mm) 欄位：可按上方按鈕自動擺放，再到「元件設定」分頁調整座標。")
+        return
+    if results['Area_req'] <= 0:
+        st.warning("⚠️ 目前沒有可行的散熱器設計 (功耗或溫升裕度 ≤ 0)，無法進行空間分析。")
+        return
+
+    s1, s2 = st.columns(2)
+    res_mm = s1.select_slider("格點大小 (mm)", options=SPREAD_RES_OPTIONS, value=1.0, key="spread_res")
+    k_base = s2.number_input("基板熱傳導係數 k (W/m·K)", min_value=1.0, value=base_conductivity(current_params['fin_tech_selector_v2']),
+                             step=5.0, key=f"spread_k_{current_params['fin_tech_selector_v2']}",
+                             help="預設依鰭片製程：Embedded (AL6063 擠型) 200、Die-casting (ADC12) 96")
+    with perf.stage("spreading"):
+        sp = cached_artifact(results, f"spreading_{res_mm}_{k_base}",
+                             lambda: solve_base_temperature(current_params, results, res_mm, k_base))
+
+    table = sp['table']
+    worst = table.loc[table['Margin_local'].idxmin()] if len(table) else None
+    k1, k2, k3 = st.columns(3)
+    k1.metric("基板最高溫升", f"{sp['theta'].max():.2f} °C", f"集總 {sp['dT_lumped']:.2f} °C", delta_color="off")
+    if worst is not None:
+        k2.metric("局部瓶頸", str(worst['Component']), f"裕度 {worst['Margin_local']:+.2f} °C",
+                  delta_color="normal" if worst['Margin_local'] >= 0 else "inverse")
+    k3.metric("格點 / 求解", f"{sp['shape'][0]} × {sp['shape'][1]}", f"{sp['elapsed_ms']:.1f} ms", delta_color="off")
+
+    step = max(1, int(np.ceil(max(sp['shape']) / SPREAD_MAX_HEATMAP_CELLS)))
+    fig = go.Figure(go.Heatmap(z=sp['theta'][::step, ::step].T, x=sp['x'][::step], y=sp['y'][::step],
+                               colorscale='Inferno', colorbar=dict(title="dT (°C)")))
+    comp_names = results['final_df']['Component'].to_numpy()
+    for (x0, x1, y0, y1), name in zip(sp['rects'][sp['placed']], comp_names[sp['placed']]):
+        fig.add_shape(type="rect", x0=x0, x1=x1, y0=y0, y1=y1, line=dict(color="#00e5ff", width=1))
+        fig.add_annotation(x=(x0 + x1) / 2, y=y1, text=str(name), showarrow=False, yshift=8, font=dict(color="#00e5ff", size=10))
+    fig.update_layout(xaxis_title="L (mm)", yaxis_title="W (mm)", yaxis_scaleanchor="x", height=520, margin=dict(t=30))
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(table.style.background_gradient(subset=['Margin_local'], cmap='RdYlGn')
+                 .format("{:.2f}", subset=["Total_W", "Allowed_dT", "dT_lumped", "dT_base", "dT_base_max", "Margin_local"]),
+                 column_config={
+                     "dT_lumped": st.column_config.NumberColumn("集總溫升 (°C)", help="Total_Power × R_sa，所有元件相同"),
+                     "dT_base": st.column_config.NumberColumn("局部基板溫升 (°C)", help="元件足跡範圍內的平均基板溫升"),
+                     "dT_base_max": st.column_config.NumberColumn("足跡最高溫升 (°C)"),
+                     "Margin_local": st.column_config.NumberColumn("局部裕度 (°C)", help="Allowed_dT - 局部基板溫升；< 0 表示該位置過熱"),
+                 }, use_container_width=True, hide_index=True)
+
+# --- Tab 2: 暫態熱模擬 (話務負載曲線) ---
+TRANSIENT_DT_OPTIONS = [0.5, 1.0, 5.0, 10.0, 60.0]
+
+@st.fragment
+def render_transient(current_params, results):
+    """話務負載曲線下的暫態接面溫度；調整曲線 / 時間常數只重跑此區塊"""
+    st.markdown("---")
+    st.subheader("⏱️ 暫態熱模擬 (Traffic Load Profile)")
+    st.caption("穩態模型以額定功耗設計；實際話務隨時間變化，散熱器熱容會吸收短時間的尖峰。"
+               "每個元件為一個接面節點 (R_jc + R_int + R_TIM)，散熱器熱容 = 散熱器重量 × 鋁材比熱，以後向 Euler 逐步模擬。")
+    if results['R_sa'] <= 0 or results['hs_weight_kg'] <= 0:
+        st.warning("⚠️ 目前沒有可行的散熱器設計 (功耗或溫升裕度 ≤ 0)，無法進行暫態模擬。")
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    low = c1.slider("離峰負載 (%)", 0, 100, 30, 5, key="transient_low") / 100
+    peak_hour = c2.slider("尖峰時刻 (h)", 0.0, 23.5, 20.0, 0.5, key="transient_peak_hour")
+    bursts = c3.number_input("滿載突波 (次/h)", min_value=0.0, max_value=60.0, value=6.0, step=1.0, key="transient_bursts",
+                             help="隨機加入 60 s 的滿載突波")
+    tau_pkg = c4.number_input("封裝時間常數 τ (s)", min_value=0.1, value=DEFAULT_TAU_PKG_S, step=1.0, key="transient_tau",
+                              help="接面到散熱器表面的熱時間常數，用來估計接面熱容 (C = τ / R)")
+    c5, c6 = st.columns(2)
+    dt = c5.select_slider("時間步長 (s)", options=TRANSIENT_DT_OPTIONS, value=1.0, key="transient_dt")
+    initial = c6.radio("初始狀態", list(TRANSIENT_INITIAL_MODES), format_func=TRANSIENT_INITIAL_MODES.get,
+                       horizontal=True, key="transient_initial")
+    profile_file = st.file_uploader("自訂負載曲線 CSV (選填)", type=["csv"], key="load_profile_csv",
+                                    help="每列一個時間步 (間隔 = 時間步長)，數值為額定功耗的比例；"
+                                         "ALL 欄套用全部元件，與元件名稱同名的欄位只套用該元件")
+
+    rows = results['valid_rows']
+    if profile_file is not None:
+        data = profile_file.getvalue()
+        try:
+            frac = profile_from_table(pd.read_csv(io.BytesIO(data)), rows['Component'])
+        except Exception as e:
+            st.error(f"負載曲線讀取失敗: {e}")
+            return
+        source = hashlib.md5(data).hexdigest()
+    else:
+        frac = diurnal_profile(24.0, dt, low, 1.0, peak_hour, bursts)
+        source = f"diurnal_{low}_{peak_hour}_{bursts}"
+
+    with perf.stage("transient"):
+        tr = cached_artifact(results, f"transient_{source}_{dt}_{tau_pkg}_{initial}",
+                             lambda: simulate_transient(results, current_params['fin_tech_selector_v2'], frac, dt, tau_pkg, initial))
+
+    table = tr['table']
+    worst = table.iloc[0]
+    k1, k2, k3 = st.columns(3)
+    k1.metric("峰值瓶頸", str(worst['Component']), f"裕度 {worst['Margin_peak']:+.2f} °C",
+              delta_color="normal" if worst['Margin_peak'] >= 0 else "inverse")
+    k2.metric("散熱器峰值溫升", f"{tr['peak_sink_rise']:.2f} °C", f"τ = {tr['tau_sink_s'] / 60:.1f} min", delta_color="off")
+    k3.metric("時間步 / 求解", f"{tr['n_steps']:,}", f"{tr['elapsed_s'] * 1e3:.0f} ms", delta_color="off")
+
+    trace = tr['trace']
+    fig = go.Figure()
+    for name in trace.columns[1:-1]:
+        fig.add_trace(go.Scatter(x=trace['t_s'] / 3600, y=trace[name], mode="lines", name=name))
+    fig.update_layout(xaxis_title="時間 (h)", yaxis_title="接面溫度 (°C)", height=450, margin=dict(t=30),
+                      legend=dict(orientation='h', y=-0.2))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"曲線為每段最大值 (共 {len(trace):,} 點)；表格的峰值以完整時間步計算。")
+
+    st.dataframe(table.style.background_gradient(subset=['Margin_peak'], cmap='RdYlGn')
+                 .format("{:.2f}", subset=["Power(W)", "Tj_steady", "Tj_peak", "Margin_peak"])
+                 .format("{:,.0f}", subset=["t_peak_s"]),
+                 column_config={
+                     "Tj_steady": st.column_config.NumberColumn("穩態 Tj (°C)", help="額定功耗連續運作的接面溫度 (穩態模型)"),
+                     "Tj_peak": st.column_config.NumberColumn("峰值 Tj (°C)", help="負載曲線期間的最高接面溫度"),
+                     "t_peak_s": st.column_config.NumberColumn("峰值時間 (s)"),
+                     "Margin_peak": st.column_config.NumberColumn("峰值裕度 (°C)", help="Limit - 峰值 Tj；< 0 表示超溫"),
+                 }, use_container_width=True, hide_index=True)
+
+# --- Tab 2: 詳細數據表 ---
+def analysis_column_config():
+    """詳細分析表的欄位名稱與說明 (一般 / 大型表格模式共用)"""
+    # [修正 v3.66] 還原完整的 Help 說明 (包含物理公式)
+    return {
+        "Component": st.column_config.TextColumn("元件名稱", help="元件型號或代號 (如 PA, FPGA)"),
+        "Qty": st.column_config.NumberColumn("數量", help="該元件的使用數量"),
+        "Power(W)": st.column_config.NumberColumn("單顆功耗 (W)", help="單一顆元件的發熱瓦數 (TDP)", format="%.1f"),
+        "Height(mm)": st.column_config.NumberColumn("高度 (mm)", help="元件距離 PCB 底部的垂直高度。高度越高，局部環溫 (Local Amb) 越高。公式：全域環溫 + (元件高度 × 0.03)", format="%.1f"),
+        "Pad_L": st.column_config.NumberColumn("Pad 長 (mm)", help="元件底部散熱焊盤 (E-pad) 的長度", format="%.1f"),
+        "Pad_W": st.column_config.NumberColumn("Pad 寬 (mm)", help="元件底部散熱焊盤 (E-pad) 的寬度", format="%.1f"),
+        "Thick(mm)": st.column_config.NumberColumn("板厚 (mm)", help="熱需傳導穿過的 PCB 或銅塊 (Coin) 厚度", format="%.1f"),
+        "R_jc": st.column_config.NumberColumn("Rjc", help="結點到殼的內部熱阻", format="%.2f"),
+        "Limit(C)": st.column_config.NumberColumn("限溫 (°C)", help="元件允許最高運作溫度", format="%.1f"),
+
+        # 計算欄位 - 完整公式說明
+        "Base_L": st.column_config.NumberColumn("Base 長 (mm)", help="熱量擴散後的底部有效長度。Final PA 為銅塊設定值；一般元件為 Pad + 板厚。", format="%.1f"),
+        "Base_W": st.column_config.NumberColumn("Base 寬 (mm)", help="熱量擴散後的底部有效寬度。Final PA 為銅塊設定值；一般元件為 Pad + 板厚。", format="%.1f"),
+        "Loc_Amb": st.column_config.NumberColumn("局部環溫 (°C)", help="該元件高度處的環境溫度。公式：全域環溫 + (元件高度 × 0.03)。", format="%.1f"),
+        "Drop": st.column_config.NumberColumn("內部溫降 (°C)", help="熱量從晶片核心傳導到散熱器表面的溫差。公式：Power × (Rjc + Rint + Rtim)。", format="%.1f"),
+        "Total_W": st.column_config.NumberColumn("總功耗 (W)", help="該元件的總發熱量 (單顆功耗 × 數量)。", format="%.1f"),
+        "Allowed_dT": st.column_config.NumberColumn("允許溫升 (°C)", help="散熱器剩餘可用的溫升裕度。數值越小代表該元件越容易過熱 (瓶頸)。公式：Limit - Loc_Amb - Drop。", format="%.2f"),
+        "R_int": st.column_config.NumberColumn("基板熱阻 (°C/W)", help="元件穿過 PCB (Via) 或銅塊 (Coin) 傳導至底部的熱阻值。", format="%.4f"),
+        "R_TIM": st.column_config.NumberColumn("介面熱阻 (°C/W)", help="元件或銅塊底部與散熱器之間的接觸熱阻 (由 TIM 材料與面積決定)。", format="%.4f"),
+
+        # [修正 v3.67] 名詞一致化
+        "Board_Type": st.column_config.Column("元件導熱方式", help="元件導熱到HSK表面的方式(thermal via或銅塊)"),
+        "TIM_Type": st.column_config.Column("介面材料", help="元件或銅塊底部與散熱器之間的TIM")
+    }
+
+@st.fragment
+def render_large_analysis_table(final_df, results):
+    """大型 BOM：伺服器端排序 / 篩選 / 分頁，只把目前這一頁上色並送到瀏覽器；翻頁只重跑此區塊"""
+    allowed = final_df['Allowed_dT'].to_numpy(dtype=float)
+    color_index = cached_artifact(results, "analysis_color_index", lambda: gradient_index(allowed))
+    min_dt = results['Min_dT_Allowed']
+    st.caption(f"📦 元件表共 {len(final_df):,} 列 (> {LARGE_TABLE_ROWS:,})，已切換為大型表格模式：排序 / 篩選在伺服器端完成，只顯示目前頁。")
+
+    c1, c2, c3, c4 = st.columns([2, 1.3, 1.5, 1])
+    sort = c1.selectbox("排序", list(TABLE_SORT_OPTIONS), format_func=TABLE_SORT_OPTIONS.get, key="bom_sort")
+    max_gap = c2.number_input("距瓶頸 ≤ (°C)", min_value=0.0, value=None, step=1.0, key="bom_max_gap",
+                              help="只顯示允許溫升 ≤ 瓶頸允許溫升 + 此值的元件；空白 = 全部")
+    query = c3.text_input("元件名稱包含", key="bom_query")
+    page_size = c4.selectbox("每頁列數", PAGE_SIZE_OPTIONS, index=1, key="bom_page_size")
+
+    rows = select_rows(allowed, min_dt, sort, max_gap, final_df['Component'], query)
+    n_pages = page_count(len(rows), page_size)
+    # 頁次只由 session_state 決定 (不傳 value)，篩選後頁數變少時先夾回最後一頁
+    if 'bom_page' not in st.session_state:
+        st.session_state['bom_page'] = 1
+    elif st.session_state['bom_page'] > n_pages:
+        st.session_state['bom_page'] = n_pages
+    page = st.number_input(f"頁次 (共 {n_pages:,} 頁，符合 {len(rows):,} 列)", min_value=1, max_value=n_pages, step=1, key="bom_page")
+    sel = page_rows(rows, page, page_size)
+
+    page_df = final_df.iloc[sel].copy()
+    page_df.index = sel + 1  # 原始列號
+    page_df.insert(page_df.columns.get_loc('Allowed_dT') + 1, 'dT_to_bottleneck', allowed[sel] - min_dt)
+    css = gradient_css(color_index[sel])
+    styled_page = page_df.style.apply(lambda _: css, subset=['Allowed_dT']).format({
+        "R_int": "{:.4f}", "R_TIM": "{:.4f}", "Allowed_dT": "{:.2f}", "dT_to_bottleneck": "{:.2f}"
+    })
+    column_config = analysis_column_config()
+    column_config["dT_to_bottleneck"] = st.column_config.NumberColumn("距瓶頸 (°C)", help="Allowed_dT - 瓶頸元件的允許溫升；0 為瓶頸本身", format="%.2f")
+    st.dataframe(styled_page, column_config=column_config, use_container_width=True, hide_index=False)
+
 with tab_data:
-    st.subheader("🔢 DETAILED ANALYSIS (詳細分析)")
-    st.caption("💡 **提示：將滑鼠游標停留在表格的「欄位標題」上，即可查看詳細的名詞解釋與定義。**")
+    if tab_is_active(tab_data):
+        st.subheader("🔢 DETAILED ANALYSIS (詳細分析)")
+        st.caption("💡 **提示：將滑鼠游標停留在表格的「欄位標題」上，即可查看詳細的名詞解釋與定義。**")
     
-    if not final_df.empty:
-        min_val = final_df['Allowed_dT'].min()
-        max_val = final_df['Allowed_dT'].max()
-        mid_val = (min_val + max_val) / 2
-        
-        # [修改] 移除原本的左右分欄 (col_table, col_legend)，改為全寬顯示
-        styled_df = final_df.style.background_gradient(
-            subset=['Allowed_dT'], 
-            cmap='RdYlGn'
-        ).format({
-            "R_int": "{:.4f}", "R_TIM": "{:.4f}", "Allowed_dT": "{:.2f}"
-        })
+        if not final_df.empty:
+            min_val = final_df['Allowed_dT'].min()
+            max_val = final_df['Allowed_dT'].max()
+            mid_val = (min_val + max_val) / 2
         
-        # [修正 v3.66] 還原完整的 Help 說明 (包含物理公式)
-        st.dataframe(
-            styled_df, 
-            column_config={
-                "Component": st.column_config.TextColumn("元件名稱", help="元件型號或代號 (如 PA, FPGA)"),
-                "Qty": st.column_config.NumberColumn("數量", help="該元件的使用數量"),
-                "Power(W)": st.column_config.NumberColumn("單顆功耗 (W)", help="單一顆元件的發熱瓦數 (TDP)", format="%.1f"),
-                "Height(mm)": st.column_config.NumberColumn("高度 (mm)", help="元件距離 PCB 底部的垂直高度。高度越高，局部環溫 (Local Amb) 越高。公式：全域環溫 + (元件高度 × 0.03)", format="%.1f"),
-                "Pad_L": st.column_config.NumberColumn("Pad 長 (mm)", help="元件底部散熱焊盤 (E-pad) 的長度", format="%.1f"),
-                "Pad_W": st.column_config.NumberColumn("Pad 寬 (mm)", help="元件底部散熱焊盤 (E-pad) 的寬度", format="%.1f"),
-                "Thick(mm)": st.column_config.NumberColumn("板厚 (mm)", help="熱需傳導穿過的 PCB 或銅塊 (Coin) 厚度", format="%.1f"),
-                "R_jc": st.column_config.NumberColumn("Rjc", help="結點到殼的內部熱阻", format="%.2f"),
-                "Limit(C)": st.column_config.NumberColumn("限溫 (°C)", help="元件允許最高運作溫度", format="%.1f"),
-                
-                # 計算欄位 - 完整公式說明
-                "Base_L": st.column_config.NumberColumn("Base 長 (mm)", help="熱量擴散後的底部有效長度。Final PA 為銅塊設定值；一般元件為 Pad + 板厚。", format="%.1f"),
-                "Base_W": st.column_config.NumberColumn("Base 寬 (mm)", help="熱量擴散後的底部有效寬度。Final PA 為銅塊設定值；一般元件為 Pad + 板厚。", format="%.1f"),
-                "Loc_Amb": st.column_config.NumberColumn("局部環溫 (°C)", help="該元件高度處的環境溫度。公式：全域環溫 + (元件高度 × 0.03)。", format="%.1f"),
-                "Drop": st.column_config.NumberColumn("內部溫降 (°C)", help="熱量從晶片核心傳導到散熱器表面的溫差。公式：Power × (Rjc + Rint + Rtim)。", format="%.1f"),
-                "Total_W": st.column_config.NumberColumn("總功耗 (W)", help="該元件的總發熱量 (單顆功耗 × 數量)。", format="%.1f"),
-                "Allowed_dT": st.column_config.NumberColumn("允許溫升 (°C)", help="散熱器剩餘可用的溫升裕度。數值越小代表該元件越容易過熱 (瓶頸)。公式：Limit - Loc_Amb - Drop。", format="%.2f"),
-                "R_int": st.column_config.NumberColumn("基板熱阻 (°C/W)", help="元件穿過 PCB (Via) 或銅塊 (Coin) 傳導至底部的熱阻值。", format="%.4f"),
-                "R_TIM": st.column_config.NumberColumn("介面熱阻 (°C/W)", help="元件或銅塊底部與散熱器之間的接觸熱阻 (由 TIM 材料與面積決定)。", format="%.4f"),
-                
-                # [修正 v3.67] 名詞一致化
-                "Board_Type": st.column_config.Column("元件導熱方式", help="元件導熱到HSK表面的方式(thermal via或銅塊)"),
-                "TIM_Type": st.column_config.Column("介面材料", help="元件或銅塊底部與散熱器之間的TIM")
-            },
-            use_container_width=True, 
-            hide_index=True
-        )
+            # [修改] 移除原本的左右分欄 (col_table, col_legend)，改為全寬顯示
+            with perf.stage("analysis_table"):
+                if len(final_df) > LARGE_TABLE_ROWS:
+                    # [Perf] 大型 BOM：Styler 會把每一格轉成 HTML，改為伺服器端分頁
+                    render_large_analysis_table(final_df, results)
+                else:
+                    styled_df = final_df.style.background_gradient(
+                        subset=['Allowed_dT'], 
+                        cmap='RdYlGn'
+                    ).format({
+                        "R_int": "{:.4f}", "R_TIM": "{:.4f}", "Allowed_dT": "{:.2f}"
+                    })
+                    st.dataframe(
+                        styled_df, 
+                        column_config=analysis_column_config(),
+                        use_container_width=True, 
+                        hide_index=True
+                    )
         
-        # [UI Update] 將 Scale Bar 移至下方，並改為橫式
-        st.markdown(f"""
-        <div style="display: flex; flex-direction: column; align-items: center; margin: 15px 0;">
-            <div style="font-weight: bold; margin-bottom: 5px; color: #555; font-size: 0.9rem;">允許溫升 (Allowed dT) 色階參考</div>
-            <div style="width: 100%; max-width: 600px; height: 12px; background: linear-gradient(to right, #d73027, #fee08b, #1a9850); border-radius: 6px; border: 1px solid #ddd;"></div>
-            <div style="display: flex; justify-content: space-between; width: 100%; max-width: 600px; color: #555; font-weight: bold; font-size: 0.8rem; margin-top: 4px;">
-                <span>{min_val:.0f}°C (Risk)</span>
-                <span>{mid_val:.0f}°C</span>
-                <span>{max_val:.0f}°C (Safe)</span>
+            # [UI Update] 將 Scale Bar 移至下方，並改為橫式
+            st.markdown(f"""
+            <div style="display: flex; flex-direction: column; align-items: center; margin: 15px 0;">
+                <div style="font-weight: bold; margin-bottom: 5px; color: #555; font-size: 0.9rem;">允許溫升 (Allowed dT) 色階參考</div>
+                <div style="width: 100%; max-width: 600px; height: 12px; background: linear-gradient(to right, #d73027, #fee08b, #1a9850); border-radius: 6px; border: 1px solid #ddd;"></div>
+                <div style="display: flex; justify-content: space-between; width: 100%; max-width: 600px; color: #555; font-weight: bold; font-size: 0.8rem; margin-top: 4px;">
+                    <span>{min_val:.0f}°C (Risk)</span>
+                    <span>{mid_val:.0f}°C</span>
+                    <span>{max_val:.0f}°C (Safe)</span>
+                </div>
             </div>
-        </div>
-        """, unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
         
-        st.info("""
-        ℹ️ **名詞解釋 - 允許溫升 (Allowed dT)** 此數值代表 **「散熱器可用的溫升裕度」** (Limit - Local Ambient - Drop)。
-        * 🟩 **綠色 (數值高)**：代表散熱裕度充足，該元件不易過熱。
-        * 🟥 **紅色 (數值低)**：代表散熱裕度極低，該元件是系統的熱瓶頸。
-        """)
+            st.info("""
+            ℹ️ **名詞解釋 - 允許溫升 (Allowed dT)** 此數值代表 **「散熱器可用的溫升裕度」** (Limit - Local Ambient - Drop)。
+            * 🟩 **綠色 (數值高)**：代表散熱裕度充足，該元件不易過熱。
+            * 🟥 **紅色 (數值低)**：代表散熱裕度極低，該元件是系統的熱瓶頸。
+            """)
+
+        render_spreading(current_params, results)
+        render_transient(current_params, results)
+    else:
+        keep_widget_state("transient_")
+        keep_widget_state("bom_")
 
 # --- Tab 3: 視覺化報告 ---
+@st.fragment
+def render_tornado(current_params, edited_df, results):
+    """敏感度 Tornado 圖；切換指標/步長只重跑此區塊"""
+    st.markdown("---")
+    st.subheader("🌪️ 敏感度分析 (Sensitivity Tornado)")
+    s1, s2, s3 = st.columns(3)
+    sens_metric = s1.selectbox("指標", list(SENSITIVITY_METRICS), format_func=SENSITIVITY_METRICS.get, key="sens_metric")
+    sens_step = s2.select_slider("擾動幅度 (±)", options=[0.01, 0.05, 0.10, 0.20], value=0.10, format_func=lambda v: f"{v:.0%}", key="sens_step")
+    sens_top = s3.number_input("顯示前 N 項", min_value=3, max_value=60, value=12, step=1, key="sens_top")
+
+    with perf.stage("sensitivity"):
+        sens = cached_artifact(results, f'sensitivity_{sens_step}', lambda: run_sensitivity(current_params, edited_df, sens_step))
+    ranked = rank_sensitivity(sens['table'], sens_metric, top=int(sens_top))
+    if ranked.empty:
+        st.info("所有輸入對此指標皆無影響。")
+        return
+    f0 = sens['nominal'][sens_metric]
+    ranked = ranked.iloc[::-1]  # 影響最大的在最上方
+    fig_tornado = go.Figure()
+    fig_tornado.add_trace(go.Bar(y=ranked['input'], x=ranked[f'{sens_metric}_low'] - f0, orientation='h', name=f'輸入 -{sens_step:.0%}', marker_color='#3498db',
+                                 customdata=ranked[f'{sens_metric}_low'], hovertemplate='%{y}<br>%{customdata:.3f}<extra></extra>'))
+    fig_tornado.add_trace(go.Bar(y=ranked['input'], x=ranked[f'{sens_metric}_high'] - f0, orientation='h', name=f'輸入 +{sens_step:.0%}', marker_color='#e67e22',
+                                 customdata=ranked[f'{sens_metric}_high'], hovertemplate='%{y}<br>%{customdata:.3f}<extra></extra>'))
+    fig_tornado.update_layout(barmode='overlay', height=max(300, 28 * len(ranked) + 120),
+                              title=f"<b>{SENSITIVITY_METRICS[sens_metric]} 變化量 (標稱 {f0:.2f})</b>",
+                              xaxis_title=f"Δ {SENSITIVITY_METRICS[sens_metric]}", legend=dict(orientation='h', y=-0.15))
+    st.plotly_chart(fig_tornado, use_container_width=True)
+    st.caption(f"所有輸入一次批次評估 ({sens['n_cases']} 個案例，{sens['elapsed_s'] * 1e3:.0f} ms)。彈性係數 = 指標變化% / 輸入變化%。")
+    with st.expander("📋 敏感度明細"):
+        detail = rank_sensitivity(sens['table'], sens_metric)[['input', 'nominal', f'{sens_metric}_low', f'{sens_metric}_high', f'{sens_metric}_elasticity']]
+        st.dataframe(detail, use_container_width=True, hide_index=True)
+
 with tab_viz:
-    st.subheader("📊 VISUAL REPORT (視覺化報告)")
+    if tab_is_active(tab_viz):
+        st.subheader("📊 VISUAL REPORT (視覺化報告)")
     
-    def card(col, title, value, desc, color="#333"):
-        col.markdown(f"""
-        <div class="kpi-card" style="border-left: 5px solid {color};">
-            <div class="kpi-title">{title}</div>
-            <div class="kpi-value">{value}</div>
-            <div class="kpi-desc">{desc}</div>
-        </div>""", unsafe_allow_html=True)
-
-    k1, k2, k3, k4 = st.columns(4)
-    # Total Power: Red (#e74c3c)
-    card(k1, "整機總熱耗", f"{round(Total_Power, 2)} W", "Total Power", "#e74c3c")
-    # Bottleneck: Orange (#f39c12)
-    card(k2, "系統瓶頸元件", f"{Bottleneck_Name}", f"dT: {round(Min_dT_Allowed, 2)}°C", "#f39c12")
-    # Area: Blue (#3498db)
-    card(k3, "所需散熱面積", f"{round(Area_req, 3)} m²", "Required Area", "#3498db")
-    # Fin Count: Purple (#9b59b6)
-    card(k4, "預估鰭片數量", f"{int(Fin_Count)} Pcs", "Fin Count", "#9b59b6")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    if not valid_rows.empty:
-        c1, c2 = st.columns(2)
-        with c1:
-            # 圓餅圖
-            fig_pie = px.pie(valid_rows, values='Total_W', names='Component', 
-                             title='<b>各元件功耗佔比 (Power Breakdown)</b>', 
-                             hole=0.5,
-                             color_discrete_sequence=px.colors.qualitative.Pastel)
-            
-            fig_pie.update_traces(
-                textposition='outside', 
-                textinfo='label+percent',
-                marker=dict(line=dict(color='#ffffff', width=2))
-            )
+        def card(col, title, value, desc, color="#333"):
+            col.markdown(f"""
+            <div class="kpi-card" style="border-left: 5px solid {color};">
+                <div class="kpi-title">{title}</div>
+                <div class="kpi-value">{value}</div>
+                <div class="kpi-desc">{desc}</div>
+            </div>""", unsafe_allow_html=True)
+
+        k1, k2, k3, k4 = st.columns(4)
+        # Total Power: Red (#e74c3c)
+        card(k1, "整機總熱耗", f"{round(Total_Power, 2)} W", "Total Power", "#e74c3c")
+        # Bottleneck: Orange (#f39c12)
+        card(k2, "系統瓶頸元件", f"{Bottleneck_Name}", f"dT: {round(Min_dT_Allowed, 2)}°C", "#f39c12")
+        # Area: Blue (#3498db)
+        card(k3, "所需散熱面積", f"{round(Area_req, 3)} m²", "Required Area", "#3498db")
+        # Fin Count: Purple (#9b59b6)
+        card(k4, "預估鰭片數量", f"{int(Fin_Count)} Pcs", "Fin Count", "#9b59b6")
+
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        if not valid_rows.empty:
+            c1, c2 = st.columns(2)
+            with c1, perf.stage("figures"):
+                fig_pie = cached_artifact(results, 'fig_pie', lambda: build_power_pie(valid_rows, Total_Power))
+                st.plotly_chart(fig_pie, use_container_width=True)
             
-            fig_pie.update_layout(
-                showlegend=False, 
-                margin=dict(t=90, b=150, l=100, r=100),
-                title=dict(pad=dict(b=20)),
-                annotations=[
-                    dict(
-                        text=f"<b>{round(Total_Power, 2)} W</b><br><span style='font-size:14px; color:#888'>Total</span>", 
-                        x=0.5, y=0.5, 
-                        font_size=24, 
-                        showarrow=False
-                    )
-                ]
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
-            
-        with c2:
-            valid_rows_sorted = valid_rows.sort_values(by="Allowed_dT", ascending=True)
-            fig_bar = px.bar(
-                valid_rows_sorted, x='Component', y='Allowed_dT', 
-                title='<b>各元件剩餘溫升裕度 (Thermal Budget)</b>',
-                color='Allowed_dT', 
-                color_continuous_scale='RdYlGn',
-                labels={'Allowed_dT': '允許溫升 (°C)'}
-            )
-            fig_bar.update_layout(xaxis_title="元件名稱", yaxis_title="散熱器允許溫升 (°C)")
-            st.plotly_chart(fig_bar, use_container_width=True)
+            with c2, perf.stage("figures"):
+                fig_bar = cached_artifact(results, 'fig_bar', lambda: build_budget_bar(valid_rows))
+                st.plotly_chart(fig_bar, use_container_width=True)
 
-    st.markdown("---")
-    st.subheader("📏 尺寸與體積估算")
-    c5, c6 = st.columns(2)
+        st.markdown("---")
+        st.subheader("📏 尺寸與體積估算")
+        c5, c6 = st.columns(2)
     
-    # [修正] 根據 DRC 結果決定顯示內容
-    if drc_failed:
-        st.error(drc_msg)
-        st.markdown(f"""
-        <div style="display:flex; gap:20px;">
-            <div style="flex:1; background:#eee; padding:20px; border-radius:10px; text-align:center; color:#999;">
-                建議鰭片高度<br>N/A
-            </div>
-            <div style="flex:1; background:#eee; padding:20px; border-radius:10px; text-align:center; color:#999;">
-                RRU 整機尺寸<br>Calculation Failed
+        # [修正] 根據 DRC 結果決定顯示內容
+        if drc_failed:
+            st.error(drc_msg)
+            st.markdown(f"""
+            <div style="display:flex; gap:20px;">
+                <div style="flex:1; background:#eee; padding:20px; border-radius:10px; text-align:center; color:#999;">
+                    建議鰭片高度<br>N/A
+                </div>
+                <div style="flex:1; background:#eee; padding:20px; border-radius:10px; text-align:center; color:#999;">
+                    RRU 整機尺寸<br>Calculation Failed
+                </div>
             </div>
-        </div>
-        """, unsafe_allow_html=True)
-        vol_bg = "#ffebee"; vol_border = "#e74c3c"; vol_title = "#c0392b"; vol_text = "N/A"
-    else:
-        card(c5, "建議鰭片高度", f"{round(Fin_Height, 2)} mm", "Suggested Fin Height", "#2ecc71")
-        card(c6, "RRU 整機尺寸 (LxWxH)", f"{L_hsk} x {W_hsk} x {round(RRU_Height, 1)}", "Estimated Dimensions", "#34495e")
-        vol_bg = "#e6fffa"; vol_border = "#00b894"; vol_title = "#006266"; vol_text = f"{round(Volume_L, 2)} L"
-
-    st.markdown(f"""
-    <div style="background-color: {vol_bg}; padding: 30px; margin-top: 20px; border-radius: 15px; border-left: 10px solid {vol_border}; box-shadow: 0 4px 15px rgba(0,0,0,0.1); text-align: center;">
-        <h3 style="color: {vol_title}; margin:0; font-size: 1.4rem; letter-spacing: 1px;">★ RRU 整機估算體積 (Estimated Volume)</h3>
-        <h1 style="color: {vol_border}; margin:15px 0 0 0; font-size: 4.5rem; font-weight: 800;">{vol_text}</h1>
-    </div>
-    """, unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
+            vol_bg = "#ffebee"; vol_border = "#e74c3c"; vol_title = "#c0392b"; vol_text = "N/A"
+        else:
+            card(c5, "建議鰭片高度", f"{round(Fin_Height, 2)} mm", "Suggested Fin Height", "#2ecc71")
+            card(c6, "RRU 整機尺寸 (LxWxH)", f"{L_hsk} x {W_hsk} x {round(RRU_Height, 1)}", "Estimated Dimensions", "#34495e")
+            vol_bg = "#e6fffa"; vol_border = "#00b894"; vol_title = "#006266"; vol_text = f"{round(Volume_L, 2)} L"
 
-    # [v3.84/85 Fix] 重量顯示區塊 (僅在 DRC 通過時顯示，並確保變數安全)
-    if not drc_failed:
         st.markdown(f"""
-        <div style="background-color: #ecf0f1; padding: 30px; margin-top: 20px; border-radius: 15px; border-left: 10px solid #34495e; box-shadow: 0 4px 15px rgba(0,0,0,0.1); text-align: center;">
-            <h3 style="color: #2c3e50; margin:0; font-size: 1.4rem; letter-spacing: 1px;">⚖️ 整機估算重量 (Estimated Weight)</h3>
-            <h1 style="color: #34495e; margin:15px 0 10px 0; font-size: 3.5rem; font-weight: 800;">{round(total_weight_kg, 1)} kg</h1>
-            <small style="color: #7f8c8d; line-height: 1.6;">
-                Heatsink ≈ {round(hs_weight_kg, 1)} kg | Shield ≈ {round(shield_weight_kg, 1)} kg<br>
-                Filter ≈ {round(filter_weight_kg, 1)} kg | Shielding Case ≈ {round(shielding_weight_kg, 1)} kg | PCB ≈ {round(pcb_weight_kg, 2)} kg
-            </small>
+        <div style="background-color: {vol_bg}; padding: 30px; margin-top: 20px; border-radius: 15px; border-left: 10px solid {vol_border}; box-shadow: 0 4px 15px rgba(0,0,0,0.1); text-align: center;">
+            <h3 style="color: {vol_title}; margin:0; font-size: 1.4rem; letter-spacing: 1px;">★ RRU 整機估算體積 (Estimated Volume)</h3>
+            <h1 style="color: {vol_border}; margin:15px 0 0 0; font-size: 4.5rem; font-weight: 800;">{vol_text}</h1>
         </div>
         """, unsafe_allow_html=True)
 
+        # [v3.84/85 Fix] 重量顯示區塊 (僅在 DRC 通過時顯示，並確保變數安全)
+        if not drc_failed:
+            st.markdown(f"""
+            <div style="background-color: #ecf0f1; padding: 30px; margin-top: 20px; border-radius: 15px; border-left: 10px solid #34495e; box-shadow: 0 4px 15px rgba(0,0,0,0.1); text-align: center;">
+                <h3 style="color: #2c3e50; margin:0; font-size: 1.4rem; letter-spacing: 1px;">⚖️ 整機估算重量 (Estimated Weight)</h3>
+                <h1 style="color: #34495e; margin:15px 0 10px 0; font-size: 3.5rem; font-weight: 800;">{round(total_weight_kg, 1)} kg</h1>
+                <small style="color: #7f8c8d; line-height: 1.6;">
+                    Heatsink ≈ {round(hs_weight_kg, 1)} kg | Shield ≈ {round(shield_weight_kg, 1)} kg<br>
+                    Filter ≈ {round(filter_weight_kg, 1)} kg | Shielding Case ≈ {round(shielding_weight_kg, 1)} kg | PCB ≈ {round(pcb_weight_kg, 2)} kg
+                </small>
+            </div>
+            """, unsafe_allow_html=True)
+
+        render_tornado(current_params, edited_df, results)
+    else:
+        keep_widget_state("sens_")
+
 # --- Tab 4: 3D 模擬視圖 ---
-with tab_3d:
-    st.subheader("🧊 3D SIMULATION (3D 模擬視圖)")
-    st.caption("模型展示：底部電子艙 + 頂部散熱鰭片、鰭片數量與間距皆為真實比例。模擬圖右上角有小功能可使用。")
-    
+@st.fragment
+def render_3d_view():
+    """3D 模型 + LOD 選單；切換 LOD 只重跑此區塊"""
     # [修正] 3D 圖也受 DRC 控制
     if not drc_failed and L_hsk > 0 and W_hsk > 0 and RRU_Height > 0 and Fin_Height > 0:
-        fig_3d = go.Figure()
-        COLOR_FINS = '#E5E7E9'; COLOR_BODY = COLOR_FINS
-        LIGHTING_METAL = dict(ambient=0.5, diffuse=0.8, specular=0.5, roughness=0.1)
-        LIGHTING_MATTE = dict(ambient=0.6, diffuse=0.8, specular=0.1, roughness=0.8)
-
-        # 1. Body
-        h_body = H_shield + H_filter
-        fig_3d.add_trace(go.Mesh3d(
-            x=[0, L_hsk, L_hsk, 0, 0, L_hsk, L_hsk, 0], y=[0, 0, W_hsk, W_hsk, 0, 0, W_hsk, W_hsk], z=[0, 0, 0, 0, h_body, h_body, h_body, h_body],
-            i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2], j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3], k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6],
-            color=COLOR_BODY, lighting=LIGHTING_MATTE, flatshading=True, name='Electronics Body'))
-        
-        # 2. Base
-        z_base_start = h_body; z_base_end = h_body + t_base
-        fig_3d.add_trace(go.Mesh3d(
-            x=[0, L_hsk, L_hsk, 0, 0, L_hsk, L_hsk, 0], y=[0, 0, W_hsk, W_hsk, 0, 0, W_hsk, W_hsk], z=[z_base_start, z_base_start, z_base_start, z_base_start, z_base_end, z_base_end, z_base_end, z_base_end],
-            i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2], j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3], k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6],
-            color=COLOR_FINS, lighting=LIGHTING_METAL, flatshading=True, name='Heatsink Base'))
-        
-        # 3. Fins
-        fin_x, fin_y, fin_z, fin_i, fin_j, fin_k = [], [], [], [], [], []
-        z_fin_start, z_fin_end = z_base_end, z_base_end + Fin_Height
-        if num_fins_int > 0:
-            total_fin_array_width = (num_fins_int * Fin_t) + ((num_fins_int - 1) * Gap)
-            y_offset = (W_hsk - total_fin_array_width) / 2
-        else: y_offset = 0
+        lod_labels = {"auto": "自動 (Auto)", "full": "完整 (Full)", "culled": "剔除隱藏面 (Culled)", "lite": "近似顯示：薄板 (Lite)"}
+        lod_choice = st.selectbox("🧩 模型精細度 (LOD)", list(lod_labels), format_func=lod_labels.get, key="mesh_lod",
+                                  help=f"Auto：鰭片數 ≤ {AUTO_LOD_MAX_FULL_FINS} 用完整模型，超過則用薄板近似以維持互動流暢。"
+                                       "Lite 為近似顯示：每片鰭片畫成無厚度的中心面 (不畫頂面與端面)，外形尺寸正確但看不到鰭片厚度")
+        lod = resolve_lod(lod_choice, num_fins_int)
+
+        def build_3d_figure():
+            fig_3d = go.Figure()
+            COLOR_FINS = '#E5E7E9'; COLOR_BODY = COLOR_FINS
+            LIGHTING_METAL = dict(ambient=0.5, diffuse=0.8, specular=0.5, roughness=0.1)
+            LIGHTING_MATTE = dict(ambient=0.6, diffuse=0.8, specular=0.1, roughness=0.8)
+
+            # 1. Body
+            h_body = H_shield + H_filter
+            x, y, z, i, j, k = box_mesh(0, L_hsk, 0, W_hsk, 0, h_body)
+            fig_3d.add_trace(go.Mesh3d(x=x, y=y, z=z, i=i, j=j, k=k, color=COLOR_BODY, lighting=LIGHTING_MATTE, flatshading=True, name='Electronics Body'))
             
-        base_i = [7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2]; base_j = [3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3]; base_k = [0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6]
-        
-        for idx in range(num_fins_int):
-            y_start = y_offset + idx * (Fin_t + Gap); y_end = y_start + Fin_t
-            if y_end > W_hsk: break
-            current_x = [0, L_hsk, L_hsk, 0, 0, L_hsk, L_hsk, 0]; current_y = [y_start, y_start, y_end, y_end, y_start, y_start, y_end, y_end]
-            current_z = [z_fin_start, z_fin_start, z_fin_start, z_fin_start, z_fin_end, z_fin_end, z_fin_end, z_fin_end]
-            offset = len(fin_x)
-            fin_x.extend(current_x); fin_y.extend(current_y); fin_z.extend(current_z)
-            fin_i.extend([x + offset for x in base_i]); fin_j.extend([x + offset for x in base_j]); fin_k.extend([x + offset for x in base_k])
-
-        fig_3d.add_trace(go.Mesh3d(x=fin_x, y=fin_y, z=fin_z, i=fin_i, j=fin_j, k=fin_k, color=COLOR_FINS, lighting=LIGHTING_METAL, flatshading=True, name='Fins'))
-        
-        # 4. Wireframe
-        x_lines = [0, L_hsk, L_hsk, 0, 0, None, 0, L_hsk, L_hsk, 0, 0, None, 0, 0, None, L_hsk, L_hsk, None, L_hsk, L_hsk, None, 0, 0]
-        y_lines = [0, 0, W_hsk, W_hsk, 0, None, 0, 0, W_hsk, W_hsk, 0, None, 0, 0, None, 0, 0, None, W_hsk, W_hsk, None, W_hsk, W_hsk]
-        z_lines = [0, 0, 0, 0, 0, None, RRU_Height, RRU_Height, RRU_Height, RRU_Height, RRU_Height, None, 0, RRU_Height, None, 0, RRU_Height, None, 0, RRU_Height, None, 0, RRU_Height]
-        fig_3d.add_trace(go.Scatter3d(x=x_lines, y=y_lines, z=z_lines, mode='lines', line=dict(color='black', width=2), showlegend=False))
-        
-        max_dim = max(L_hsk, W_hsk, RRU_Height) * 1.1
-        fig_3d.update_layout(
-            scene=dict(xaxis=dict(title='Length', range=[0, max_dim], dtick=50), yaxis=dict(title='Width', range=[0, max_dim], dtick=50), zaxis=dict(title='Height', range=[0, max_dim], dtick=50), aspectmode='manual', aspectratio=dict(x=1, y=1, z=1), camera=dict(projection=dict(type="orthographic"), eye=dict(x=1.2, y=1.2, z=1.2)), bgcolor='white'),
-            margin=dict(l=0, r=0, b=0, t=0), height=600)
-        st.plotly_chart(fig_3d, use_container_width=True)
+            # 2. Base
+            z_base_start = h_body; z_base_end = h_body + t_base
+            x, y, z, i, j, k = box_mesh(0, L_hsk, 0, W_hsk, z_base_start, z_base_end)
+            fig_3d.add_trace(go.Mesh3d(x=x, y=y, z=z, i=i, j=j, k=k, color=COLOR_FINS, lighting=LIGHTING_METAL, flatshading=True, name='Heatsink Base'))
+            
+            # 3. Fins (NumPy broadcasting 一次產生)
+            x, y, z, i, j, k = build_fin_mesh(L_hsk, W_hsk, z_base_end, z_base_end + Fin_Height, num_fins_int, Fin_t, Gap, lod=lod)
+            fig_3d.add_trace(go.Mesh3d(x=x, y=y, z=z, i=i, j=j, k=k, color=COLOR_FINS, lighting=LIGHTING_METAL, flatshading=True, name='Fins'))
+            
+            # 4. Wireframe
+            x_lines = [0, L_hsk, L_hsk, 0, 0, None, 0, L_hsk, L_hsk, 0, 0, None, 0, 0, None, L_hsk, L_hsk, None, L_hsk, L_hsk, None, 0, 0]
+            y_lines = [0, 0, W_hsk, W_hsk, 0, None, 0, 0, W_hsk, W_hsk, 0, None, 0, 0, None, 0, 0, None, W_hsk, W_hsk, None, W_hsk, W_hsk]
+            z_lines = [0, 0, 0, 0, 0, None, RRU_Height, RRU_Height, RRU_Height, RRU_Height, RRU_Height, None, 0, RRU_Height, None, 0, RRU_Height, None, 0, RRU_Height, None, 0, RRU_Height]
+            fig_3d.add_trace(go.Scatter3d(x=x_lines, y=y_lines, z=z_lines, mode='lines', line=dict(color='black', width=2), showlegend=False))
+            
+            max_dim = max(L_hsk, W_hsk, RRU_Height) * 1.1
+            fig_3d.update_layout(
+                scene=dict(xaxis=dict(title='Length', range=[0, max_dim], dtick=50), yaxis=dict(title='Width', range=[0, max_dim], dtick=50), zaxis=dict(title='Height', range=[0, max_dim], dtick=50), aspectmode='manual', aspectratio=dict(x=1, y=1, z=1), camera=dict(projection=dict(type="orthographic"), eye=dict(x=1.2, y=1.2, z=1.2)), bgcolor='white'),
+                margin=dict(l=0, r=0, b=0, t=0), height=600)
+            return fig_3d
+
+        with perf.stage("mesh_3d"):
+            fig_3d = cached_artifact(results, f'fig_3d_{lod}', build_3d_figure)
+            payload_kb = cached_artifact(results, f'fig_3d_{lod}_payload', lambda: len(fig_3d.to_json()) / 1024)
+            n_tri = len(fig_3d.data[2].i)
+            st.caption(f"📦 3D 傳輸量 ≈ **{payload_kb:,.1f} KB**｜鰭片三角形 {n_tri:,}｜LOD: {lod_labels[lod]}"
+                       + ("｜⚠️ 近似顯示，鰭片以無厚度中心面表示" if lod == "lite" else ""))
+            st.plotly_chart(fig_3d, use_container_width=True)
         c1, c2 = st.columns(2)
         c1.info(f"📐 **外觀尺寸：** 長 {L_hsk:.1f} x 寬 {W_hsk:.1f} x 高 {RRU_Height:.1f} mm")
         c2.success(f"⚡ **鰭片規格：** 數量 {num_fins_int} pcs | 高度 {Fin_Height:.1f} mm | 厚度 {Fin_t} mm | 間距 {Gap} mm")
@@ -884,34 +1096,28 @@ with tab_3d:
     else:
         st.warning("⚠️ 無法繪製 3D 圖形，因為計算出的尺寸無效 (為 0)。請檢查元件清單與參數設定。")
 
-    # --- AI Section ---
-    if not drc_failed:
-        st.markdown("---")
-        st.subheader("🎨 RRU寫實渲染生成流程(AI)")
-        st.markdown("""<div style="background-color: #f8f9fa; padding: 20px; border-radius: 10px; border: 1px solid #e9ecef;"><h4 style="margin-top:0;">準備工作</h4></div>""", unsafe_allow_html=True)
-        c1, c2 = st.columns([1, 1])
-        with c1:
-            st.markdown("#### Step 1. 下載 3D 模擬圖")
-            st.info("請將滑鼠移至上方 3D 圖表的右上角，點擊相機圖示 **(Download plot as a png)** 下載目前的模型底圖。")
-        with c2:
-            st.markdown("#### Step 2. 下載I/O寫實參考圖")
-            default_ref_bytes = None; default_ref_name = None; default_ref_type = None
-            default_files = ['reference_style.png', 'reference_style.jpg', 'reference_style.jpeg']
-            for filename in default_files:
-                if os.path.exists(filename):
-                    with open(filename, "rb") as f:
-                        default_ref_bytes = f.read(); default_ref_name = filename; 
-                        ext = filename.split('.')[-1].lower()
-                        default_ref_type = 'image/png' if ext == 'png' else 'image/jpeg'
-                    break
-            if default_ref_bytes:
-                st.image(default_ref_bytes, caption=f"系統預設參考圖: {default_ref_name}", width=200)
-                st.download_button(label="⬇️ 下載原始高解析度圖檔", data=default_ref_bytes, file_name=default_ref_name, mime=default_ref_type, key="download_ref_img")
-            else:
-                st.warning("⚠️ 系統中找不到預設參考圖 (reference_style.png)。請確認檔案已上傳至 GitHub。")
 
-        st.markdown("#### Step 3. 複製提示詞 (Prompt)")
-        prompt_template = f"""
+@st.fragment
+def render_ai_guide(num_fins_int, L_hsk, W_hsk, RRU_Height):
+    """AI 渲染流程 (參考圖下載 / 提示詞編輯)；互動只重跑此區塊，不觸發熱模型重算"""
+    st.markdown("---")
+    st.subheader("🎨 RRU寫實渲染生成流程(AI)")
+    st.markdown("""<div style="background-color: #f8f9fa; padding: 20px; border-radius: 10px; border: 1px solid #e9ecef;"><h4 style="margin-top:0;">準備工作</h4></div>""", unsafe_allow_html=True)
+    c1, c2 = st.columns([1, 1])
+    with c1:
+        st.markdown("#### Step 1. 下載 3D 模擬圖")
+        st.info("請將滑鼠移至上方 3D 圖表的右上角，點擊相機圖示 **(Download plot as a png)** 下載目前的模型底圖。")
+    with c2:
+        st.markdown("#### Step 2. 下載I/O寫實參考圖")
+        ref_image = load_reference_image()
+        if ref_image:
+            st.image(ref_image.data, caption=f"系統預設參考圖: {ref_image.name}", width=200)
+            st.download_button(label="⬇️ 下載原始高解析度圖檔", data=ref_image.data, file_name=ref_image.name, mime=ref_image.mime, key="download_ref_img", on_click="ignore")
+        else:
+            st.warning("⚠️ 系統中找不到預設參考圖 (reference_style.png)。請確認檔案已上傳至 GitHub。")
+
+    st.markdown("#### Step 3. 複製提示詞 (Prompt)")
+    prompt_template = f"""
 5G RRU 無線射頻單元工業設計渲染圖
 
 核心結構（極其嚴格參照圖 1 的幾何形狀）：
@@ -928,54 +1134,463 @@ with tab_3d:
 
 視覺規格：
 一律生成3D等角視圖，且角度要和第一張模擬圖的視角角位相同（Isometric view），純白背景，8k 高解析度，照片級真實影像渲染。
-        """.strip()
-        user_prompt = st.text_area(label="您可以在此直接修改提示詞：", value=prompt_template, height=300)
-        safe_prompt = user_prompt.replace('`', '\`')
-        components.html(f"""<script>function copyToClipboard(){{const text=`{safe_prompt}`;if(navigator.clipboard&&window.isSecureContext){{navigator.clipboard.writeText(text).then(function(){{document.getElementById('status').innerHTML="✅ 已複製！";setTimeout(()=>{{document.getElementById('status').innerHTML="";}},2000)}},function(err){{fallbackCopy(text)}})}}else{{fallbackCopy(text)}}}}function fallbackCopy(text){{const textArea=document.createElement("textarea");textArea.value=text;textArea.style.position="fixed";document.body.appendChild(textArea);textArea.focus();textArea.select();try{{document.execCommand('copy');document.getElementById('status').innerHTML="✅ 已複製！"}}catch(err){{document.getElementById('status').innerHTML="❌ 複製失敗"}}document.body.removeChild(textArea);setTimeout(()=>{{document.getElementById('status').innerHTML="";}},2000)}}</script><div style="display: flex; align-items: center; font-family: 'Microsoft JhengHei', sans-serif;"><button onclick="copyToClipboard()" style="background-color: #ffffff; border: 1px solid #d1d5db; border-radius: 4px; padding: 8px 16px; font-size: 14px; cursor: pointer; color: #31333F; display: flex; align-items: center; gap: 5px; transition: all 0.2s; box-shadow: 0 1px 2px rgba(0,0,0,0.05);" onmouseover="this.style.borderColor='#ff4b4b'; this.style.color='#ff4b4b'" onmouseout="this.style.borderColor='#d1d5db'; this.style.color='#31333F'">📋 複製提示詞 (Copy Prompt)</button><span id="status" style="margin-left: 10px; color: #00b894; font-size: 14px; font-weight: bold;"></span></div>""", height=50)
+    """.strip()
+    user_prompt = st.text_area(label="您可以在此直接修改提示詞：", value=prompt_template, height=300)
+    safe_prompt = user_prompt.replace('`', '\`')
+    components.html(f"""<script>function copyToClipboard(){{const text=`{safe_prompt}`;if(navigator.clipboard&&window.isSecureContext){{navigator.clipboard.writeText(text).then(function(){{document.getElementById('status').innerHTML="✅ 已複製！";setTimeout(()=>{{document.getElementById('status').innerHTML="";}},2000)}},function(err){{fallbackCopy(text)}})}}else{{fallbackCopy(text)}}}}function fallbackCopy(text){{const textArea=document.createElement("textarea");textArea.value=text;textArea.style.position="fixed";document.body.appendChild(textArea);textArea.focus();textArea.select();try{{document.execCommand('copy');document.getElementById('status').innerHTML="✅ 已複製！"}}catch(err){{document.getElementById('status').innerHTML="❌ 複製失敗"}}document.body.removeChild(textArea);setTimeout(()=>{{document.getElementById('status').innerHTML="";}},2000)}}</script><div style="display: flex; align-items: center; font-family: 'Microsoft JhengHei', sans-serif;"><button onclick="copyToClipboard()" style="background-color: #ffffff; border: 1px solid #d1d5db; border-radius: 4px; padding: 8px 16px; font-size: 14px; cursor: pointer; color: #31333F; display: flex; align-items: center; gap: 5px; transition: all 0.2s; box-shadow: 0 1px 2px rgba(0,0,0,0.05);" onmouseover="this.style.borderColor='#ff4b4b'; this.style.color='#ff4b4b'" onmouseout="this.style.borderColor='#d1d5db'; this.style.color='#31333F'">📋 複製提示詞 (Copy Prompt)</button><span id="status" style="margin-left: 10px; color: #00b894; font-size: 14px; font-weight: bold;"></span></div>""", height=50)
+
+    st.markdown("#### Step 4. 執行 AI 生成")
+    st.success("""1. 開啟 **Gemini** 對話視窗。\n2. 確認模型設定為 **思考型 (Thinking) + Nano Banana (Imagen 3)**。\n3. 依序上傳兩張圖片 (3D 模擬圖 + 寫實參考圖)。\n4. 貼上提示詞並送出。""")
+
+
+with tab_3d:
+    if tab_is_active(tab_3d):
+        st.subheader("🧊 3D SIMULATION (3D 模擬視圖)")
+        st.caption("模型展示：底部電子艙 + 頂部散熱鰭片、鰭片數量與間距皆為真實比例。模擬圖右上角有小功能可使用。")
+        render_3d_view()
+        if not drc_failed:
+            render_ai_guide(num_fins_int, L_hsk, W_hsk, RRU_Height)
+    else:
+        keep_widget_state("mesh_lod")
+
+# --- Tab 5: 參數掃描 ---
+MAX_SWEEP_POINTS = 2_000_000
+
+@st.fragment
+def render_sweep_tab(current_params, edited_df):
+    """掃描表單與結果；調整排序/Heatmap 只重跑此區塊"""
+    st.subheader("🧪 DESIGN SWEEP (參數掃描)")
+    st.caption("選擇要掃描的參數與範圍，一次評估所有組合 (笛卡兒積)。未選擇的參數沿用左側目前設定。")
+
+    sweep_numeric_keys = [k for k in DEFAULT_GLOBALS if k != "fin_tech_selector_v2"]
+    sweep_keys = st.multiselect("掃描參數", sweep_numeric_keys + ["fin_tech_selector_v2"], default=["Gap", "Fin_t"], key="sweep_keys")
+
+    with st.form("sweep_form"):
+        sweep_grid = {}
+        for k in sweep_keys:
+            if k == "fin_tech_selector_v2":
+                sweep_grid[k] = st.multiselect("🔨 鰭片製程", FIN_TECH_OPTIONS, default=FIN_TECH_OPTIONS, key="sweep_fin_tech")
+                continue
+            cur = float(st.session_state[k])
+            c1, c2, c3 = st.columns(3)
+            lo = c1.number_input(f"{k} 最小", value=round(cur * 0.5, 3), key=f"sweep_{k}_lo")
+            hi = c2.number_input(f"{k} 最大", value=round(cur * 1.5, 3), key=f"sweep_{k}_hi")
+            n_steps = c3.number_input(f"{k} 點數", min_value=1, max_value=5000, value=20, step=1, key=f"sweep_{k}_n")
+            sweep_grid[k] = np.linspace(lo, hi, int(n_steps))
+        n_points = int(np.prod([len(v) for v in sweep_grid.values()])) if sweep_grid else 0
+        st.caption(f"格點數：**{n_points:,}** (上限 {MAX_SWEEP_POINTS:,})")
+        sweep_submitted = st.form_submit_button("▶️ 執行掃描")
+
+    if sweep_submitted:
+        if n_points == 0:
+            st.warning("⚠️ 請至少選擇一個掃描參數。")
+        elif n_points > MAX_SWEEP_POINTS:
+            st.error(f"❌ 格點數 {n_points:,} 超過上限，請減少點數。")
+        else:
+            t_sweep = time.perf_counter()
+            with perf.stage("sweep"):
+                st.session_state['sweep_result'] = run_sweep(current_params, edited_df, sweep_grid)
+            st.session_state['sweep_elapsed'] = time.perf_counter() - t_sweep
+
+    sweep_df = st.session_state.get('sweep_result')
+    if sweep_df is not None:
+        swept = [c for c in sweep_df.columns if c not in SWEEP_RESULT_COLUMNS]
+        n_pass = int(sweep_df['drc_pass'].sum())
+        k1, k2, k3 = st.columns(3)
+        k1.metric("格點數", f"{len(sweep_df):,}", f"{st.session_state.get('sweep_elapsed', 0):.2f} s", delta_color="off")
+        k2.metric("DRC 通過", f"{n_pass:,}")
+        if n_pass:
+            best = sweep_df.loc[sweep_df['Volume_L'].where(sweep_df['drc_pass']).idxmin()]
+            k3.metric("最小體積 (DRC 通過)", f"{best['Volume_L']:.2f} L")
+
+        st.markdown("#### 📋 結果表")
+        f1, f2, f3 = st.columns(3)
+        only_pass = f1.checkbox("只顯示 DRC 通過", value=True, key="sweep_only_pass")
+        sort_by = f2.selectbox("排序依據", ["Volume_L", "total_weight_kg", "Fin_Height", "RRU_Height"], key="sweep_sort_by")
+        max_rows = f3.number_input("顯示筆數", min_value=10, max_value=10000, value=500, step=100, key="sweep_max_rows")
+        view = sweep_df[sweep_df['drc_pass']] if only_pass else sweep_df
+        st.dataframe(view.nsmallest(int(max_rows), sort_by), use_container_width=True, hide_index=True)
+        st.caption(f"符合條件 {len(view):,} 筆，顯示前 {min(int(max_rows), len(view)):,} 筆。")
+
+        numeric_swept = [c for c in swept if c != "fin_tech_selector_v2"]
+        if len(numeric_swept) >= 2:
+            st.markdown("#### 🗺️ Heatmap")
+            h1, h2, h3 = st.columns(3)
+            hm_x = h1.selectbox("X 軸", numeric_swept, index=0, key="sweep_hm_x")
+            hm_y = h2.selectbox("Y 軸", numeric_swept, index=1, key="sweep_hm_y")
+            hm_metric = h3.selectbox("指標", ["Volume_L", "total_weight_kg", "Fin_Height", "RRU_Height", "h_value"], key="sweep_hm_metric")
+            if hm_x != hm_y:
+                # 其餘參數取 DRC 通過點中的最小值；全部不通過的格子留白
+                hm = sweep_df[sweep_df['drc_pass']].groupby([hm_y, hm_x])[hm_metric].min().unstack()
+                hm = hm.reindex(index=np.unique(sweep_df[hm_y]), columns=np.unique(sweep_df[hm_x]))
+                fig_hm = go.Figure(go.Heatmap(z=hm.to_numpy(), x=hm.columns, y=hm.index, colorscale='Viridis', colorbar=dict(title=hm_metric)))
+                fig_hm.update_layout(xaxis_title=hm_x, yaxis_title=hm_y, height=500, margin=dict(t=30))
+                st.plotly_chart(fig_hm, use_container_width=True)
+                st.caption("空白格表示該組合下所有點皆未通過 DRC。")
+
+
+with tab_sweep:
+    if tab_is_active(tab_sweep):
+        render_sweep_tab(current_params, edited_df)
+    else:
+        keep_widget_state("sweep_")
+
+# --- Tab 6: 公差分析 (Monte Carlo) ---
+TOLERANCE_SAMPLE_OPTIONS = [10_000, 100_000, 300_000, 1_000_000]
 
-        st.markdown("#### Step 4. 執行 AI 生成")
-        st.success("""1. 開啟 **Gemini** 對話視窗。\n2. 確認模型設定為 **思考型 (Thinking) + Nano Banana (Imagen 3)**。\n3. 依序上傳兩張圖片 (3D 模擬圖 + 寫實參考圖)。\n4. 貼上提示詞並送出。""")
+@st.fragment
+def render_tolerance_tab(current_params, edited_df, results):
+    """公差設定表 + Monte Carlo 結果；執行分析只重跑此區塊"""
+    st.subheader("🎲 TOLERANCE (公差分析)")
+    st.caption("為元件欄位或全域參數指定分佈，以 Monte Carlo 評估瓶頸溫升裕度、瓶頸元件與體積的分佈。「元件」留空表示套用到所有元件。")
+
+    if 'tol_table_base' not in st.session_state:
+        st.session_state['tol_table_base'] = pd.DataFrame(DEFAULT_TOLERANCES)
+        st.session_state['tol_editor_ver'] = 0
+    component_names = sorted({str(c) for c in edited_df['Component'].dropna()}) if 'Component' in edited_df else []
+
+    with st.form("tolerance_form"):
+        tol_table = st.data_editor(
+            st.session_state['tol_table_base'],
+            column_config={
+                "column": st.column_config.SelectboxColumn("參數 / 欄位", options=TOLERANCE_COMPONENT_COLUMNS + TOLERANCE_GLOBAL_KEYS, required=True),
+                "dist": st.column_config.SelectboxColumn("分佈", options=TOLERANCE_DISTS, required=True, help="normal：公差 = 1σ；uniform / triangular：公差 = 半寬"),
+                "spread": st.column_config.NumberColumn("公差", min_value=0.0, format="%.3f"),
+                "relative": st.column_config.CheckboxColumn("相對值", help="勾選時公差為標稱值的比例 (0.05 = ±5%)；否則為絕對值 (與參數同單位)"),
+                "target": st.column_config.SelectboxColumn("元件 (空白 = 全部)", options=component_names, help="只對元件欄位有效"),
+            },
+            num_rows="dynamic", use_container_width=True, hide_index=True,
+            key=f"tolerance_editor_{st.session_state['tol_editor_ver']}"
+        )
+        c1, c2 = st.columns(2)
+        n_samples = c1.select_slider("抽樣次數", options=TOLERANCE_SAMPLE_OPTIONS, value=100_000, format_func=lambda n: f"{n:,}", key="tol_n_samples")
+        seed = c2.number_input("亂數種子", min_value=0, value=0, step=1, key="tol_seed")
+        tol_submitted = st.form_submit_button("▶️ 執行公差分析")
+    st.session_state['tol_table_current'] = tol_table
+
+    if tol_submitted:
+        try:
+            tolerances = tolerances_from_table(tol_table)
+            if not tolerances:
+                st.warning("⚠️ 請至少設定一列公差。")
+            else:
+                with st.spinner(f"抽樣 {n_samples:,} 次中..."):
+                    with perf.stage("tolerance"):
+                        st.session_state['tol_result'] = run_tolerance(current_params, edited_df, tolerances, n_samples=n_samples, seed=int(seed))
+        except ValueError as e:
+            st.error(f"❌ {e}")
+
+    res = st.session_state.get('tol_result')
+    if res is None:
+        return
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("樣本數", f"{res['n_samples']:,}", f"{res['elapsed_s']:.2f} s", delta_color="off")
+    k2.metric("過熱機率 (Min dT ≤ 0)", f"{res['p_overheat'] * 100:.2f}%")
+    k3.metric("Min dT P5", f"{res['Min_dT_Allowed']['P5']:.2f} °C", f"{res['Min_dT_Allowed']['P5'] - results['Min_dT_Allowed']:+.2f} vs 標稱", delta_color="off")
+    if res['feasible_rate'] > 0:
+        k4.metric("體積 P95", f"{res['Volume_L']['P95']:.2f} L", f"{res['Volume_L']['P95'] - results['Volume_L']:+.2f} vs 標稱", delta_color="off")
+
+    stats_df = pd.DataFrame({k: res[k] for k in ("Min_dT_Allowed", "Volume_L", "Fin_Height")}).T
+    st.dataframe(stats_df.drop(columns="count").style.format("{:.2f}"), use_container_width=True)
+    st.caption(f"可行樣本 {res['feasible_rate'] * 100:.1f}%｜DRC 通過 {res['drc_pass_rate'] * 100:.1f}%｜體積 / 鰭片高度只統計可行樣本。")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        counts, edges = res['sketches']['Min_dT_Allowed'].histogram(60)
+        fig_hist = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts / max(res['n_samples'], 1) * 100, width=np.diff(edges), marker_color="#3498db"))
+        fig_hist.add_vline(x=results['Min_dT_Allowed'], line_dash="dash", line_color="#34495e", annotation_text="標稱")
+        if edges[0] <= 0:
+            fig_hist.add_vline(x=0, line_color="#e74c3c")
+        fig_hist.update_layout(title="<b>瓶頸允許溫升分佈 (Min dT Allowed)</b>", xaxis_title="°C", yaxis_title="%", bargap=0)
+        st.plotly_chart(fig_hist, use_container_width=True)
+    with c2:
+        freq = res['bottleneck_freq'] * 100
+        fig_bn = px.bar(x=freq.index, y=freq.to_numpy(), labels={'x': '元件名稱', 'y': '成為瓶頸的比例 (%)'}, title="<b>瓶頸元件頻率 (Bottleneck Frequency)</b>")
+        st.plotly_chart(fig_bn, use_container_width=True)
+
+with tab_tol:
+    if tab_is_active(tab_tol):
+        render_tolerance_tab(current_params, edited_df, results)
+    else:
+        # data_editor 隱藏時狀態會被清掉：先把編輯結果存為新的基底表
+        if st.session_state.get('tol_table_current') is not None:
+            st.session_state['tol_table_base'] = st.session_state.pop('tol_table_current')
+            st.session_state['tol_editor_ver'] += 1
+        keep_widget_state("tol_")
+
+# --- Tab 7: 多專案比較 ---
+def read_compare_projects(files):
+    """上傳檔案 -> [(名稱, global_params, components_df), ...]；封存檔內的每個專案各一筆"""
+    projects, errors = [], []
+    for f in files:
+        try:
+            raw = f.getvalue()
+            if is_archive(raw):
+                projects.extend((name, params, df) for name, params, df, _ in ProjectArchive.from_bytes(raw))
+            else:
+                params, df, _ = parse_project(json.loads(raw))
+                projects.append((f.name.rsplit(".", 1)[0], params, df))
+        except Exception as e:
+            errors.append(f"{f.name}: {e}")
+    return projects, errors
+
+@st.fragment
+def render_compare_tab(current_params, edited_df):
+    """多個專案一次批次評估；更換檔案或圖表指標只重跑此區塊"""
+    st.subheader("🆚 COMPARE (多專案比較)")
+    st.caption(f"一次上傳多個專案檔 (.json / {ARCHIVE_EXT})，所有變體以單次批次運算評估，並列出彼此不同的參數。上傳的檔案不會取代目前專案。")
+
+    # 分頁隱藏時上傳元件的狀態會被清掉 (且不能回寫)：檔案清單另存，只在使用者變更時更新
+    def keep_uploads():
+        st.session_state['compare_uploaded'] = st.session_state['cmp_files'] or []
+    st.file_uploader("專案檔", type=["json", ARCHIVE_EXT.lstrip(".")], accept_multiple_files=True,
+                     key="cmp_files", on_change=keep_uploads, label_visibility="collapsed")
+    files = st.session_state.get('compare_uploaded', [])
+    if files and not st.session_state['cmp_files']:
+        st.caption(f"沿用先前上傳的 {len(files)} 個檔案：{', '.join(f.name for f in files)}")
+    include_current = st.checkbox("加入目前專案 (★ 目前設定)", value=True, key="compare_include_current")
+
+    projects, errors = read_compare_projects(files)
+    for msg in errors:
+        st.error(f"❌ {msg}")
+    if include_current:
+        projects.insert(0, ("★ 目前設定", current_params, edited_df))
+    if len(projects) < 2:
+        st.info("ℹ️ 請至少上傳一個專案檔 (含目前設定共兩個以上) 以進行比較。")
+        return
+
+    # 名稱重複時加上序號，避免表格欄位衝突
+    seen = {}
+    for i, (name, params, df) in enumerate(projects):
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            projects[i] = (f"{name} ({seen[name]})", params, df)
+
+    t_cmp = time.perf_counter()
+    with perf.stage("compare"):
+        cmp_df = evaluate_projects(projects, dict(DEFAULT_GLOBALS, fin_eff_mode=current_params['fin_eff_mode']))
+    elapsed_ms = (time.perf_counter() - t_cmp) * 1e3
+    ok_df = cmp_df[cmp_df['status'] == "OK"]
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("專案數", f"{len(cmp_df):,}", f"{elapsed_ms:.1f} ms", delta_color="off")
+    k2.metric("DRC 通過", f"{int((ok_df['drc_status'] == 'PASS').sum()):,}")
+    if len(ok_df):
+        best = ok_df.loc[ok_df['Volume_L'].idxmin()]
+        k3.metric("最小體積", f"{best['Volume_L']:.2f} L", best['name'], delta_color="off")
+
+    st.markdown("#### 📋 結果表")
+    metric_cols = list(COMPARE_METRICS)
+    view = cmp_df.drop(columns="error") if cmp_df['error'].isna().all() else cmp_df
+    styled = (view.style
+              .format("{:.2f}", subset=metric_cols + ["Min_dT_Allowed"], na_rep="-")
+              .highlight_min(subset=["Volume_L", "total_weight_kg", "RRU_Height"], color="#d5f5e3")
+              .map(lambda v: "color: #e74c3c; font-weight: bold" if v == "FAIL" else "", subset=["drc_status"]))
+    st.dataframe(styled, use_container_width=True, hide_index=True)
+
+    if len(ok_df):
+        st.markdown("#### 📊 指標比較")
+        chart_metrics = st.multiselect("指標", metric_cols, default=["Volume_L", "total_weight_kg"],
+                                       format_func=COMPARE_METRICS.get, key="compare_metrics")
+        for m, col in zip(chart_metrics, st.columns(2) * ((len(chart_metrics) + 1) // 2)):
+            fig = px.bar(ok_df, x="name", y=m, color="drc_status", color_discrete_map={"PASS": "#3498db", "FAIL": "#e74c3c"},
+                         labels={"name": "專案", m: COMPARE_METRICS[m], "drc_status": "DRC"},
+                         hover_data=["Bottleneck_Name", "Fin_Count"], title=f"<b>{COMPARE_METRICS[m]}</b>")
+            fig.update_layout(xaxis_title=None, height=360, margin=dict(t=50, b=10))
+            col.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("#### 🔍 參數差異")
+    diff = param_diff(projects, DEFAULT_GLOBALS)
+    if diff.empty:
+        st.caption("所有專案的全域參數與元件表皆相同。")
+    else:
+        st.dataframe(diff.astype(str), use_container_width=True)
+        st.caption(f"只列出專案間不同的參數 ({len(diff)} 項)；「元件表」列為列數與內容雜湊摘要。")
+
+with tab_cmp:
+    if tab_is_active(tab_cmp):
+        render_compare_tab(current_params, edited_df)
+    else:
+        keep_widget_state("compare_")
+
+# --- Tab 8: 多目標設計探索 (Pareto) ---
+PARETO_CANDIDATE_OPTIONS = [10_000, 50_000, 100_000, 200_000]
+
+def load_pareto_design():
+    """點選圖上的設計 -> 寫回側邊欄參數 (on_select callback，於重跑前執行)"""
+    res = st.session_state.get('pareto_result')
+    trace_rows = st.session_state.get('pareto_trace_rows')
+    event = st.session_state.get('select_pareto')
+    points = event["selection"]["points"] if event else []
+    # 只接受候選設計的兩條曲線 (0 = 其他可行設計，1 = 前緣)；目前設計的星號忽略
+    points = [pt for pt in points if pt.get("curve_number") in (0, 1)]
+    if res is None or trace_rows is None or not points:
+        return
+    row = res['candidates'].loc[trace_rows[points[0]["curve_number"]][points[0]["point_index"]]]
+    for k in PARETO_DESIGN_KEYS:
+        st.session_state[k] = str(row[k]) if k == "fin_tech_selector_v2" else float(row[k])
+    st.session_state['pareto_loaded'] = row.name
+    st.session_state['pareto_pending_rerun'] = True  # 側邊欄在 fragment 外：需整頁重跑才會更新
+
+@st.fragment
+def render_pareto_tab(current_params, results):
+    """候選設計抽樣 + 非支配排序；點選前緣上的設計即載入側邊欄"""
+    st.subheader("🏔️ PARETO (多目標設計探索)")
+    st.caption("在製程範圍內抽樣 Gap / Fin_t / 基板厚 / 防水邊距 / 鰭片製程 / 設計安全係數，找出體積、重量與溫升裕度的非支配解。"
+               "溫升裕度 = 瓶頸允許溫升 × (1 - 1/Margin)，即額定功耗下的剩餘 °C。點選圖上的點即可載入該設計。")
+
+    with st.form("pareto_form"):
+        c1, c2, c3 = st.columns([2, 3, 1])
+        n_candidates = c1.select_slider("候選設計數", options=PARETO_CANDIDATE_OPTIONS, value=50_000, format_func=lambda n: f"{n:,}", key="pareto_n")
+        fin_techs = c2.multiselect("鰭片製程", FIN_TECH_OPTIONS, default=FIN_TECH_OPTIONS, key="pareto_techs")
+        seed = c3.number_input("亂數種子", min_value=0, value=0, step=1, key="pareto_seed")
+        c4, c5 = st.columns(2)
+        margin_x = c4.slider("Margin 上限 (目前值的倍數)", 1.0, 2.0, 1.5, 0.05, key="pareto_margin_x",
+                             help="Margin 在 [目前值, 目前值 × 倍數] 之間抽樣；1.0 表示固定，前緣只比較體積與重量")
+        edge_mm = c5.slider("防水邊距可增加 (mm)", 0.0, 50.0, 20.0, 1.0, key="pareto_edge_mm",
+                            help="Top / Btm / Left / Right 各自在 [目前值, 目前值 + 此值] 之間抽樣")
+        pareto_submitted = st.form_submit_button("▶️ 產生 Pareto 前緣")
+
+    if pareto_submitted:
+        ranges = {"Margin": (current_params['Margin'], current_params['Margin'] * margin_x)}
+        ranges.update({k: (current_params[k], current_params[k] + edge_mm) for k in ("Top", "Btm", "Left", "Right")})
+        with st.spinner(f"評估 {n_candidates:,} 個候選設計中..."), perf.stage("pareto"):
+            st.session_state['pareto_result'] = run_pareto(
+                current_params, results['Total_Watts_Sum'], results['Min_dT_Allowed'], n_candidates,
+                ranges=ranges, fin_techs=fin_techs or None, seed=int(seed))
+
+    res = st.session_state.get('pareto_result')
+    if res is None:
+        return
+    front, cand = res['front'], res['candidates']
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("候選設計", f"{res['n_candidates']:,}", f"{res['elapsed_s']:.2f} s", delta_color="off")
+    k2.metric("通過 DRC", f"{res['n_feasible']:,}")
+    k3.metric("非支配解", f"{len(front):,}", f"排序 {res['sort_s'] * 1e3:.1f} ms", delta_color="off")
+    if len(front):
+        k4.metric("溫升裕度範圍", f"{front['headroom_dT'].min():.1f} ~ {front['headroom_dT'].max():.1f} °C")
+    if not len(front):
+        st.warning("⚠️ 沒有通過 DRC 的候選設計，請放寬範圍或降低功耗。")
+        return
+    if st.session_state.pop('pareto_pending_rerun', False):
+        st.rerun()
+    if st.session_state.get('pareto_loaded') is not None:
+        st.caption(f"✅ 已載入設計 #{st.session_state['pareto_loaded']} 至側邊欄參數")
+
+    hover = ("Gap %{customdata[0]:.1f} mm｜Fin_t %{customdata[1]:.1f} mm｜t_base %{customdata[2]:.1f} mm<br>"
+             "%{customdata[3]}｜Margin %{customdata[4]:.2f}<br>體積 %{x:.2f} L｜重量 %{y:.2f} kg｜裕度 %{marker.color:.1f} °C<extra></extra>")
+    others = cand[~cand['front']]
+    if len(others) > 5000:  # 背景只畫抽樣點，避免圖表過大
+        others = others.sample(5000, random_state=0)
+    custom_cols = ['Gap', 'Fin_t', 't_base', 'fin_tech_selector_v2', 'Margin']
+    st.session_state['pareto_trace_rows'] = (others.index.to_numpy(), front.index.to_numpy())
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=others['Volume_L'], y=others['total_weight_kg'], mode="markers", name="其他可行設計",
+        marker=dict(color="#cfd8dc", size=4), customdata=others[custom_cols].to_numpy(dtype=object),
+        hovertemplate=hover.replace("%{marker.color:.1f}", "-"),
+    ))
+    fig.add_trace(go.Scatter(
+        x=front['Volume_L'], y=front['total_weight_kg'], mode="markers", name="Pareto 前緣",
+        marker=dict(color=front['headroom_dT'], colorscale="Viridis", size=9, showscale=True,
+                    colorbar=dict(title="裕度 (°C)"), line=dict(width=1, color="#34495e")),
+        customdata=front[custom_cols].to_numpy(dtype=object), hovertemplate=hover,
+    ))
+    if not results['drc_failed'] and results['Volume_L'] > 0:
+        fig.add_trace(go.Scatter(x=[results['Volume_L']], y=[results['total_weight_kg']], mode="markers", name="目前設計",
+                                 marker=dict(symbol="star", size=16, color="#e74c3c"), hoverinfo="skip"))
+    fig.update_layout(title="<b>體積 vs 重量 (顏色 = 溫升裕度)</b>", xaxis_title="體積 (L)", yaxis_title="重量 (kg)",
+                      legend=dict(orientation="h", y=-0.15), clickmode="event+select")
+    st.plotly_chart(fig, use_container_width=True, on_select=load_pareto_design, selection_mode="points", key="select_pareto")
+
+    st.markdown("#### 📋 非支配解")
+    st.dataframe(front[PARETO_DESIGN_KEYS + PARETO_RESULT_COLUMNS].style.format(precision=2), use_container_width=True, height=300)
+
+with tab_pareto:
+    if tab_is_active(tab_pareto):
+        render_pareto_tab(current_params, results)
+    else:
+        keep_widget_state("pareto_")
 
 # --- [Project I/O - Save Logic] 移到底部執行 ---
 # 確保所有輸入參數與計算結果都已更新後，才執行儲存邏輯
 # [Critical Fix] 確保 placeholder 名稱與頂部定義一致 (project_io_save_placeholder)
-with project_io_save_placeholder.container():
-    def get_current_state_json():
-        params_to_save = list(DEFAULT_GLOBALS.keys())
-        saved_params = {}
-        for k in params_to_save:
-            if k in st.session_state:
-                saved_params[k] = st.session_state[k]
-        
-        components_data = st.session_state['df_current'].to_dict('records')
-        
-        export_data = {
-            "meta": {"version": APP_VERSION, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")},
-            "global_params": saved_params,
-            "components_data": components_data
-        }
-        return json.dumps(export_data, indent=4)
-
-    if st.session_state.get('trigger_generation', False):
-        json_data = get_current_state_json()
-        st.session_state['json_ready_to_download'] = json_data
-        st.session_state['json_file_name'] = f"RRU_Project_{time.strftime('%Y%m%d_%H%M%S')}.json"
-        st.session_state['trigger_generation'] = False 
-        st.rerun() 
-
-    # [UI Fix] 左右並排按鈕 (使用 columns)
-    c_btn1, c_btn2 = st.columns(2)
-    with c_btn1:
-        if st.button("🔄 1. 更新並產生"):
-            st.session_state['trigger_generation'] = True
-            st.rerun()
-    with c_btn2:
-        if st.session_state.get('json_ready_to_download'):
-            st.download_button(
-                label="💾 2. 下載專案",
-                data=st.session_state['json_ready_to_download'],
-                file_name=st.session_state['json_file_name'],
-                mime="application/json"
-            )
-        else:
-            st.caption("ℹ️ 待更新")
+with project_io_save_placeholder.container(), perf.stage("project_io"):
+    # [Perf] 單鍵下載：按下時才在背景執行緒序列化 (data 為 callable)，session_state 不保留檔案內容；
+    # 閉包只持有本次 rerun 的參數快照與元件表參照，背景執行緒不需讀取 session_state
+    saved_params = {k: st.session_state[k] for k in DEFAULT_GLOBALS if k in st.session_state}
+    saved_params['fin_eff_mode'] = current_params['fin_eff_mode']
+    saved_df = st.session_state['df_current']
+    file_stem = f"RRU_Project_{time.strftime('%Y%m%d_%H%M%S')}"
+    save_as_archive = st.session_state.get('project_save_format') == ARCHIVE_EXT
+
+    def build_project_file():
+        if save_as_archive:
+            return dump_project_archive(saved_params, saved_df, APP_VERSION, file_stem)
+        return project_json_bytes(saved_params, saved_df, APP_VERSION)
+
+    c_fmt, c_btn = st.columns(2)
+    c_fmt.radio("存檔格式", [".json", ARCHIVE_EXT], horizontal=True, key="project_save_format", label_visibility="collapsed",
+                help=f"{ARCHIVE_EXT}：欄位式二進位封存檔 (體積小，可與 .json 無損互轉)")
+    c_btn.download_button(
+        label="💾 下載專案",
+        data=build_project_file,
+        file_name=file_stem + (ARCHIVE_EXT if save_as_archive else ".json"),
+        mime="application/octet-stream" if save_as_archive else "application/json",
+        on_click="ignore",
+        key="project_download"
+    )
+
+# --- [Perf] 本次 rerun 結束，最後才顯示效能面板 (面板本身不計入) ---
+perf.end_run()
+with st.sidebar.expander("⏱️ 效能監測 (Perf)", expanded=False):
+    p1, p2 = st.columns(2)
+    p1.toggle("啟用計時", value=False, key="perf_enabled", help="記錄每次 rerun 各階段的耗時 (最近 200 筆)")
+    p2.toggle("記憶體", value=False, key="perf_memory", disabled=not st.session_state.get('perf_enabled'),
+              help="以 tracemalloc 量測各階段配置量；會讓程式明顯變慢，只在排查時開啟")
+    last_run = perf.latest()
+    if last_run is None:
+        st.caption("ℹ️ 尚無紀錄 (啟用後下一次互動開始記錄)")
+    else:
+        st.caption(f"最近一次 rerun #{last_run['run_id']}：總計 **{last_run['total_ms']:.1f} ms**")
+        st.dataframe(pd.DataFrame(last_run['stages']).T.sort_values('wall_ms', ascending=False).style.format("{:.1f}"),
+                     use_container_width=True)
+        pct_df = pd.DataFrame(perf.percentiles()).T
+        st.caption(f"滾動百分位數 (ms)：{' / '.join(f'P{q}' for q in PERF_PERCENTILES)}")
+        st.dataframe(pct_df.style.format("{:.1f}").format("{:.0f}", subset=['n']), use_container_width=True)
+        st.download_button("📥 匯出 JSONL", data=perf.export_jsonl(), file_name=f"rru_perf_{time.strftime('%Y%m%d_%H%M%S')}.jsonl",
+                           mime="application/x-ndjson", on_click="ignore", key="perf_export")
+    st.button("🗑️ 清除紀錄", on_click=perf.clear, key="perf_clear")
+
+# --- [Mem] Session 記憶體：每次 rerun 結束時量測，超過上限時移除可重算的結果 ---
+SESSION_BUDGET_MB = float(os.environ.get("RRU_SESSION_BUDGET_MB", DEFAULT_SESSION_BUDGET_MB))
+SESSION_EVICTABLE_KEYS = {"sweep_result", "tol_result", "pareto_result", "pareto_trace_rows", "compare_uploaded", "uploaded_archive", "incremental_evaluator"}
+
+@st.cache_resource
+def get_session_registry():
+    """跨 session 共用：每個 session 最近一次的記憶體量測"""
+    return SessionRegistry()
+
+session_registry = get_session_registry()
+# 結果快取為所有 session 共用：session 內參照到的快取結果不算進該 session
+session_mem = session_footprint(st.session_state, shared=[default_components_df, *result_cache.entries()])
+evicted_keys = enforce_budget(st.session_state, session_mem, SESSION_BUDGET_MB * 2**20, SESSION_EVICTABLE_KEYS)
+if evicted_keys:
+    st.toast(f"⚠️ Session 記憶體超過 {SESSION_BUDGET_MB:g} MB，已釋放：{', '.join(evicted_keys)}", icon="🧠")
+session_ctx = get_script_run_ctx()
+session_registry.update(session_ctx.session_id if session_ctx else "local", session_mem)
+
+with st.sidebar.expander("🧠 Session 記憶體 (Admin)", expanded=False):
+    m1, m2, m3 = st.columns(3)
+    m1.metric("本 session", f"{session_mem['total'] / 2**20:.2f} MB", f"上限 {SESSION_BUDGET_MB:g} MB", delta_color="off")
+    m2.metric("共用資料", f"{session_mem['shared'] / 2**20:.2f} MB", help="預設元件表 + 結果快取，不計入各 session")
+    m3.metric("結果快取", f"{result_cache.stats()['bytes'] / 2**20:.2f} MB", f"上限 {RESULT_CACHE_MB:g} MB", delta_color="off")
+    st.dataframe(pd.Series(session_mem['keys'], name="KB").div(2**10).head(10).to_frame().style.format("{:.1f}"),
+                 use_container_width=True)
+    sessions = session_registry.snapshot()
+    now = time.time()
+    st.caption(f"所有 session：{len(sessions)} 個，合計 **{session_registry.total_bytes() / 2**20:.2f} MB**")
+    st.dataframe(pd.DataFrame([{
+        "session": sid[:8], "MB": e['total_bytes'] / 2**20, "keys": e['n_keys'],
+        "最大項目": ", ".join(k for k, _ in e['top_keys'][:3]), "閒置 (s)": int(now - e['updated']),
+    } for sid, e in sessions]).style.format("{:.2f}", subset=["MB"]), use_container_width=True, hide_index=True)
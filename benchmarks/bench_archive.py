@@ -0,0 +1,147 @@
+"""專案封存檔 (.rrua) 基準測試：與逐檔 JSON 比較大小與讀寫耗時，並做無損往返檢查
+
+1. 無損：每個專案 JSON -> .rrua -> 專案 dict，與 parse_project 的結果 (參數型別 / 順序、欄位 dtype、meta) 完全相同
+2. 邊界情況：缺欄位、混合型別欄、缺值、額外參數、int / float 參數、非 ASCII 名稱、空元件表
+3. 大小與耗時：N 個專案的 JSON (indent=4) vs 單一 .rrua；全部讀取 vs memmap 只載入一個專案
+
+用法：
+    python benchmarks/bench_archive.py [--projects 2000] [--rows 10 200]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_thermal_kernel import make_bom  # noqa: E402
+from rru_engine.archive import ProjectArchive, dump_archive, save_archive  # noqa: E402
+from rru_engine.project_io import dump_project_json, load_project, parse_project  # noqa: E402
+
+CONFIG = os.path.join(ROOT, "default_config.json")
+
+
+def same_project(a, b):
+    """(params, df, meta) 完全相同：參數值 / 型別 / 順序、元件表欄位 / dtype / 數值 (NaN 視為相同)"""
+    pa, da, ma = a
+    pb, db, mb = b
+    if list(pa.items()) != list(pb.items()) or [type(v) for v in pa.values()] != [type(v) for v in pb.values()]:
+        return False
+    if ma != mb or list(da.columns) != list(db.columns) or not da.dtypes.equals(db.dtypes):
+        return False
+    try:
+        pd.testing.assert_frame_equal(da, db, check_exact=True)
+    except AssertionError:
+        return False
+    return json.dumps(da.to_dict('records')) == json.dumps(db.to_dict('records'))
+
+
+def edge_projects(params, df):
+    """各種邊界情況 (皆以 JSON 文字經 parse_project 產生，與實際上傳的專案檔相同)"""
+    cases = []
+    p_int = dict(params, T_amb=45, Gap=13)
+    cases.append(("int 參數", p_int, df))
+    cases.append(("額外參數 + 順序", {"custom_note": "測試", "Voiding": None, **dict(reversed(list(params.items())))}, df))
+    missing = df.drop(columns=["R_jc", "TIM_Type"])
+    cases.append(("缺欄位 (舊版)", params, missing))
+    mixed = df.copy()
+    mixed["Qty"] = mixed["Qty"].astype(object)
+    mixed.loc[0, "Qty"] = "4"
+    mixed.loc[1, "Power(W)"] = None
+    mixed.loc[2, "Board_Type"] = None
+    mixed.loc[3, "Component"] = "功放 Final PA ✓"
+    cases.append(("混合型別 / 缺值 / 非 ASCII", params, mixed))
+    cases.append(("空元件表", params, df.iloc[0:0]))
+    cases.append(("額外欄位", params, df.assign(Note="x", Flag=True)))
+    out = []
+    for name, p, d in cases:
+        text = dump_project_json(p, d, "v-edge")
+        out.append((name,) + parse_project(json.loads(text)))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--rows", type=int, nargs=2, default=[10, 200], help="每個專案的元件列數範圍")
+    args = parser.parse_args()
+
+    params, df, _ = load_project(CONFIG)
+
+    # --- 邊界情況 ---
+    edges = edge_projects(params, df)
+    archive = ProjectArchive.from_bytes(dump_archive(edges))
+    for name, p, d, m in edges:
+        if not same_project((p, d, m), archive.load(name)):
+            sys.exit(f"❌ 往返不一致：{name}")
+
+    # --- 大量專案 ---
+    rng = np.random.default_rng(0)
+    sources, projects = [], []
+    for i in range(args.projects):
+        p = dict(params, Gap=float(np.round(rng.uniform(5, 20), 1)), L_pcb=float(rng.integers(250, 450)))
+        bom = make_bom(int(rng.integers(*args.rows)), seed=i)
+        sources.append((p, bom))
+        projects.append((f"design_{i:05d}",) + parse_project(json.loads(dump_project_json(p, bom, "v3.98"))))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        json_bytes = 0
+        for i, (p, bom) in enumerate(sources):
+            with open(os.path.join(tmp, f"{i}.json"), "w", encoding="utf-8") as f:
+                json_bytes += f.write(dump_project_json(p, bom, "v3.98"))
+        t_json_write = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for i in range(len(sources)):
+            load_project(os.path.join(tmp, f"{i}.json"))
+        t_json_read = time.perf_counter() - t0
+
+        path = os.path.join(tmp, "library.rrua")
+        t0 = time.perf_counter()
+        size = save_archive(path, projects)
+        t_arch_write = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        archive = ProjectArchive.open(path)
+        t_open = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        loaded = [archive.load(i) for i in range(len(archive))]
+        t_arch_read = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        archive.load(len(archive) // 2)
+        t_one = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        table = archive.params_table()
+        t_params = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        frame = archive.components_frame()
+        t_frame = time.perf_counter() - t0
+        if len(frame) != sum(len(p[2]) for p in projects):
+            sys.exit("❌ components_frame 列數不一致")
+
+        for (name, p, d, m), got in zip(projects, loaded):
+            if not same_project((p, d, m), got):
+                sys.exit(f"❌ 往返不一致：{name}")
+        del archive, loaded, frame
+
+    n_rows = sum(len(p[2]) for p in projects)
+    print(f"{args.projects:,} 個專案，共 {n_rows:,} 列元件")
+    print(f"{'':<26} | {'JSON (逐檔)':>12} | {'.rrua':>12}")
+    print("-" * 58)
+    print(f"{'大小 (MB)':<26} | {json_bytes / 1e6:>12.2f} | {size / 1e6:>12.2f}  ({json_bytes / size:.1f}x)")
+    print(f"{'寫入 (s)':<26} | {t_json_write:>12.2f} | {t_arch_write:>12.2f}")
+    print(f"{'全部讀取 (s)':<26} | {t_json_read:>12.2f} | {t_arch_read:>12.2f}")
+    print(f"開啟封存檔 (解析檔頭)      : {t_open * 1e3:8.2f} ms")
+    print(f"只載入一個專案 (memmap)    : {t_one * 1e3:8.2f} ms")
+    print(f"全部專案的參數表           : {t_params * 1e3:8.2f} ms  ({table.shape[0]:,} × {table.shape[1]})")
+    print(f"全部元件合併為一張表       : {t_frame * 1e3:8.2f} ms")
+    print(f"無損往返檢查 : ✅ ({len(edges)} 個邊界情況 + {args.projects:,} 個專案)")
+
+
+if __name__ == "__main__":
+    main()
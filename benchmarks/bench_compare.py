@@ -0,0 +1,126 @@
+"""多專案比較基準測試 (evaluate_projects vs 逐一 evaluate_project)
+
+以 default_config.json 為基準產生 N 個變體 (改 Gap / Fin_t / T_amb / 熱介面材料 / 鰭片製程 / 元件功耗、增刪元件、
+空元件表、缺欄位與參數型別錯誤)，批次評估的每一列都必須與 evaluate_project 的結果完全相同，並量測耗時。
+「stacked」為對全部變體元件表串接後的大表只呼叫一次 evaluate_project 的耗時：批次評估的成本與總列數成正比，
+應接近這個下限，而不是單一專案 (50 × 1,000 列約為單一專案的 10 倍)。
+
+用法：
+    python benchmarks/bench_compare.py [--variants 5 20 50] [--rows 10 1000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_thermal_kernel import make_bom  # noqa: E402
+from rru_engine import evaluate_project, resolve_params  # noqa: E402
+from rru_engine.compare import evaluate_projects, param_diff  # noqa: E402
+from rru_engine.defaults import FIN_TECH_OPTIONS  # noqa: E402
+from rru_engine.project_io import load_project  # noqa: E402
+
+CONFIG = os.path.join(ROOT, "default_config.json")
+FIELDS = ["Total_Power", "Bottleneck_Name", "Min_dT_Allowed", "Fin_Count", "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg", "drc_rule"]
+
+
+def make_variants(params, df, n, seed=0):
+    rng = np.random.default_rng(seed)
+    variants = []
+    for i in range(n):
+        p, d = dict(params), df.copy()
+        kind = i % 8
+        if kind == 1:
+            p["Gap"] = float(np.round(rng.uniform(3.0, 20.0), 1))
+        elif kind == 2:
+            p["Fin_t"] = float(np.round(rng.uniform(0.8, 3.0), 2)); p["T_amb"] = int(rng.integers(35, 55))
+        elif kind == 3:
+            p["K_Pad"] = float(rng.uniform(3.0, 12.0)); p["fin_tech_selector_v2"] = FIN_TECH_OPTIONS[int(rng.integers(2))]
+        elif kind == 4:
+            d.loc[d.index[int(rng.integers(len(d)))], "Power(W)"] *= rng.uniform(0.5, 1.5)
+        elif kind == 5:
+            d = pd.concat([d, d.iloc[[int(rng.integers(len(d)))]]], ignore_index=True).iloc[1:]
+        elif kind == 6:
+            p["L_pcb"] = float(rng.uniform(250.0, 450.0)); p["Margin"] = 1.1
+        elif kind == 7:
+            d.loc[d.index[0], "Limit(C)"] = np.nan
+        variants.append((f"v{i:02d}", p, d))
+    return variants
+
+
+def check_same(batch, variants):
+    for row, (name, p, d) in zip(batch.itertuples(index=False), variants):
+        try:
+            ref = evaluate_project(resolve_params(p), d)
+        except Exception:
+            if row.status != "ERROR":
+                sys.exit(f"❌ {name}: evaluate_project 失敗但批次結果為 {row.status}")
+            continue
+        if row.status != "OK":
+            sys.exit(f"❌ {name}: 批次結果為 ERROR ({row.error})")
+        for k in FIELDS:
+            got, want = getattr(row, k), ref[k]
+            same = got == want or (isinstance(want, float) and np.isnan(want) and np.isnan(got))
+            if not same:
+                sys.exit(f"❌ {name}: {k} 不一致 ({got!r} vs {want!r})")
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--repeat", type=int, default=5, help="單一 / stacked / batch 取 N 次中的最小值")
+    args = parser.parse_args()
+
+    params, config_df, _ = load_project(CONFIG)
+    params = resolve_params(params)
+
+    # 邊界情況：空元件表、缺欄位、參數型別錯誤
+    edge = make_variants(params, config_df, 3) + [
+        ("empty", params, pd.DataFrame([])),
+        ("no_rjc", params, config_df.drop(columns=["R_jc"])),
+        ("bad_gap", {**params, "Gap": "13.2"}, config_df),
+    ]
+    batch = evaluate_projects(edge)
+    check_same(batch, edge)
+    if list(batch["status"]) != ["OK"] * 4 + ["ERROR"] * 2:
+        sys.exit(f"❌ 邊界情況狀態不符: {list(batch['status'])}")
+
+    print(f"{'rows':>6} | {'variants':>8} | {'1 x evaluate_project':>20} | {'stacked (ms)':>12} | {'loop (ms)':>9} | {'batch (ms)':>10}")
+    print("-" * 83)
+    for n_rows in args.rows:
+        df = config_df if n_rows == len(config_df) or n_rows <= 10 else make_bom(n_rows)
+        t_one = best_of(lambda: evaluate_project(params, df), args.repeat)
+        for n in args.variants:
+            variants = make_variants(params, df, n)
+            stacked = pd.concat([d for _, _, d in variants], ignore_index=True)
+            t_stacked = best_of(lambda: evaluate_project(params, stacked), args.repeat)
+            t0 = time.perf_counter()
+            for _, p, d in variants:
+                evaluate_project(p, d)
+            t_loop = time.perf_counter() - t0
+            t_batch = best_of(lambda: evaluate_projects(variants), args.repeat)
+            check_same(evaluate_projects(variants), variants)
+            print(f"{len(df):>6} | {n:>8} | {t_one * 1e3:>17.2f} ms | {t_stacked * 1e3:>12.2f} | {t_loop * 1e3:>9.2f} | {t_batch * 1e3:>10.2f}")
+
+    diff = param_diff(make_variants(params, config_df, 8))
+    print(f"\n參數差異 (8 個變體): {', '.join(map(str, diff.index))}")
+    print("等價性檢查 : ✅ (每個變體皆與 evaluate_project 完全一致)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""鰭片效率耦合求解 (fin_eff_mode = "coupled") 驗證與基準測試
+
+用法：
+    python benchmarks/bench_fin_eff.py                 # 預設 10^6 格點
+    python benchmarks/bench_fin_eff.py --points 1e5
+
+1. 熱平衡：以二分法逐點求 h·(A_base + η_f·A_fin) = 1/R_sa 的 H，與 solve_fin_coupled 的反解比對
+2. 極限：k -> ∞ 時 η_f -> 1，鰭片高度回到 Eff = 1 的固定公式
+3. 等價性：run_sweep (陣列) 與 evaluate_project / IncrementalEvaluator (單點) 逐點一致
+4. 耗時：同一格點 fixed 與 coupled 模式的掃描時間
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_sweep import make_grid  # noqa: E402
+from rru_engine import DEFAULT_COMPONENT_DATA, DEFAULT_GLOBALS, evaluate_project  # noqa: E402
+from rru_engine.geometry import solve_fin_coupled  # noqa: E402
+from rru_engine.incremental import IncrementalEvaluator  # noqa: E402
+from rru_engine.sweep import run_sweep  # noqa: E402
+
+CHECK_COLUMNS = ["Eff", "Fin_Eff", "Fin_Count", "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg"]
+COUPLED = dict(DEFAULT_GLOBALS, fin_eff_mode="coupled")
+
+
+def bisect_height(Area_conv, A_base, N, L, h, k, t):
+    """逐點二分法求鰭片高度 (m)，作為反解的參考值"""
+    m = np.sqrt(2 * h / (k * t / 1000))
+    per = 2 * N * L / 1000
+    lo, hi = 0.0, 10.0
+    for _ in range(200):
+        mid = (lo + hi) / 2
+        q = A_base + per * np.tanh(m * mid) / m
+        lo, hi = (mid, hi) if q < Area_conv else (lo, mid)
+    return (lo + hi) / 2
+
+
+def check_balance(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    Area_conv = rng.uniform(0.2, 1.5, n)
+    A_base, N, L = 0.12, rng.integers(10, 60, n), 400.0
+    h, k, t = rng.uniform(5.0, 8.8, n), rng.choice([96.0, 200.0], n), rng.uniform(0.8, 3.0, n)
+    sol = solve_fin_coupled(Area_conv, A_base, N, L, h, k, t)
+    solved = sol["status"] == 1
+    worst = 0.0
+    for i in np.flatnonzero(solved):
+        ref = bisect_height(Area_conv[i], A_base, N[i], L, h[i], k[i], t[i]) * 1000
+        worst = max(worst, abs(sol["Fin_Height"][i] - ref) / ref)
+    if worst > 1e-9:
+        sys.exit(f"❌ 反解與二分法不一致：最大相對誤差 {worst:.2e}")
+    if sol["residual"].max() > 1e-9:
+        sys.exit(f"❌ 熱平衡殘差過大：{sol['residual'].max():.2e}")
+    if not np.all(np.isposinf(sol["Fin_Height"][sol["status"] == 3])):
+        sys.exit("❌ 無解的點應回傳 Fin_Height = inf")
+    return int(solved.sum()), int((sol["status"] == 3).sum()), worst
+
+
+def check_limit():
+    sol = solve_fin_coupled(0.8, 0.12, 40, 400.0, 7.0, 1e12, 1.5)
+    ref = (0.8 - 0.12) * 1e6 / (2 * 40 * 400.0)
+    if not np.isclose(sol["Fin_Height"], ref, rtol=1e-6) or not np.isclose(sol["Fin_Eff"], 1.0, rtol=1e-6):
+        sys.exit(f"❌ k -> ∞ 極限不一致: {float(sol['Fin_Height'])} vs {ref}")
+
+
+def check_equivalence(df_sweep, components_df, n_samples=200, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = ["Gap", "Fin_t", "T_amb", "t_base", "fin_tech_selector_v2"]
+    inc = IncrementalEvaluator()
+    for i in rng.choice(len(df_sweep), size=min(n_samples, len(df_sweep)), replace=False):
+        row = df_sweep.iloc[i]
+        params = dict(COUPLED)
+        params.update({k: row[k] for k in keys})
+        ref = evaluate_project(params, components_df)
+        res_inc = inc.evaluate(params, components_df)
+        for c in CHECK_COLUMNS:
+            if not np.isclose(row[c], ref[c], rtol=1e-12, atol=0) and not row[c] == ref[c]:
+                sys.exit(f"❌ 第 {i} 點 {c} 不一致: sweep={row[c]!r} ref={ref[c]!r}")
+            if not res_inc[c] == ref[c]:
+                sys.exit(f"❌ 第 {i} 點 {c} 增量引擎不一致: {res_inc[c]!r} vs {ref[c]!r}")
+        if bool(row["drc_pass"]) == ref["drc_failed"] or (ref["drc_failed"] and row["drc_rule"] != ref["drc_rule"]):
+            sys.exit(f"❌ 第 {i} 點 DRC 不一致: sweep={row['drc_rule']!r} ref={ref['drc_rule']!r}")
+    # 模式切換：增量引擎須重算 heatsink 階段並回到固定效率
+    fixed = dict(params, fin_eff_mode="fixed")
+    if inc.evaluate(fixed, components_df)["Fin_Height"] != evaluate_project(fixed, components_df)["Fin_Height"]:
+        sys.exit("❌ 切回 fixed 模式後增量引擎結果不一致")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=float, default=1e6)
+    args = parser.parse_args()
+
+    n_solved, n_infeasible, worst = check_balance()
+    check_limit()
+    print(f"熱平衡      : ✅ {n_solved} 點與二分法一致 (最大相對誤差 {worst:.1e})，{n_infeasible} 點正確判定無解")
+
+    components_df = pd.DataFrame(DEFAULT_COMPONENT_DATA)
+    grid = make_grid(args.points)
+    n = int(np.prod([len(v) for v in grid.values()]))
+    t0 = time.perf_counter()
+    run_sweep(DEFAULT_GLOBALS, components_df, grid)
+    t_fixed = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    df = run_sweep(COUPLED, components_df, grid)
+    t_coupled = time.perf_counter() - t0
+    check_equivalence(df, components_df)
+
+    print(f"格點數      : {n:,}")
+    print(f"fixed       : {t_fixed:.3f} s")
+    print(f"coupled     : {t_coupled:.3f} s  ({n / t_coupled / 1e6:.2f} M points/s)")
+    print(f"Eff 範圍    : {df['Eff'].min():.3f} ~ {df['Eff'].max():.3f}  (η_f {df['Fin_Eff'].min():.3f} ~ {df['Fin_Eff'].max():.3f})")
+    print(f"無解 (inf)  : {int(np.isposinf(df['Fin_Height']).sum()):,}")
+    print("等價性檢查  : ✅ (200 點與 evaluate_project / IncrementalEvaluator 一致)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""增量重算基準測試 (IncrementalEvaluator vs evaluate_project)
+
+對大型合成 BOM 依序套用一連串編輯 (改一列、新增 / 刪除列、改 Gap、改熱阻參數、改密度…)，
+每一步都與 evaluate_project 的結果逐項比對 (DataFrame 與純量皆須完全相同)，並量測：
+- full  : evaluate_project 整張重算
+- scan  : 沒有差異資訊時的路徑 (內容雜湊查快取 + 引擎逐欄比對整張表)，即換表後的第一次 rerun
+- delta : App 平常的路徑，依 data_editor 編輯狀態的差異 (changed_rows) 只重算變動的列
+
+用法：
+    python benchmarks/bench_incremental.py [--sizes 1000 10000 100000] [--repeat 5]
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_thermal_kernel import make_bom  # noqa: E402
+from rru_engine import DEFAULT_GLOBALS, evaluate_project  # noqa: E402
+from rru_engine.incremental import IncrementalEvaluator  # noqa: E402
+from rru_engine.result_cache import canonical_hash  # noqa: E402
+
+
+def edit_steps(df, params):
+    """(說明, params, df, changed_rows) 的編輯序列，每一步都以上一步為基礎
+
+    changed_rows 為與上一步相比內容改變的列 index 標籤 (與 editor_changed_rows 的結果相同)；None 表示沒有差異資訊。
+    """
+    steps = []
+    p, d = dict(params), df
+
+    def add(label, changed=()):
+        steps.append((label, dict(p), d, None if changed is None else pd.Index(list(changed))))
+
+    add("初次評估", None)
+    row = d.index[len(d) // 2]
+    d = d.copy(); d.loc[row, 'Power(W)'] = 12.34
+    add("修改一列功耗", [row])
+    d = d.copy(); d.loc[d.index[3], 'R_jc'] = 0.77
+    add("修改一列 R_jc", [d.index[3]])
+    d = pd.concat([d, d.iloc[[5]].assign(Component="New Part")], ignore_index=True)
+    add("新增一列", [d.index[-1]])
+    d = d.drop(index=d.index[7])
+    add("刪除一列")
+    p['Gap'] = 9.5
+    add("修改 Gap")
+    p['Fin_t'] = 1.5
+    add("修改 Fin_t")
+    p['al_density'] = 2.8
+    add("修改鋁密度")
+    p['T_amb'] = 50.0
+    add("修改 T_amb (熱阻參數)")
+    p['fin_tech_selector_v2'] = "Die-casting Fin (0.90)"
+    add("修改鰭片製程")
+    add("無變動")
+    return steps
+
+
+def best_of(func, repeat):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def best_of_stateful(ev, func, repeat):
+    """每次都從同一個引擎狀態 (深複製) 出發執行 func(ev)，回傳 (最短耗時, 執行後的引擎)"""
+    best = float('inf')
+    for _ in range(repeat):
+        trial = copy.deepcopy(ev)
+        t0 = time.perf_counter()
+        func(trial)
+        best = min(best, time.perf_counter() - t0)
+    return best, trial
+
+
+def check_same(res, ref, label):
+    for key, value in ref.items():
+        got = res[key]
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(got, value, check_exact=True)
+        elif not (type(got) is type(value) and got == value):
+            sys.exit(f"❌ {label}: {key} 不一致 ({got!r} vs {value!r})")
+    if list(res) != list(ref):
+        sys.exit(f"❌ {label}: 結果欄位順序不一致")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        ev_scan, ev_delta = IncrementalEvaluator(), IncrementalEvaluator()
+        print(f"\nBOM {n:,} 列 (best of {args.repeat})")
+        print(f"{'step':<22} | {'full (ms)':>9} | {'scan (ms)':>9} | {'delta (ms)':>10} | {'rows':>7} | stages")
+        print("-" * 100)
+        for label, params, df, changed in edit_steps(make_bom(n), dict(DEFAULT_GLOBALS)):
+            t_full, ref = best_of(lambda: evaluate_project(params, df), args.repeat)
+
+            def scan(ev):
+                canonical_hash(params, df)
+                return ev.evaluate(params, df)
+            t_scan, ev_scan = best_of_stateful(ev_scan, scan, args.repeat)
+            check_same(ev_scan.evaluate(params, df), ref, label)
+            t_delta, ev_delta = best_of_stateful(ev_delta, lambda ev: ev.evaluate(params, df, changed_rows=changed), args.repeat)
+            s = ev_delta.last_stats
+            check_same(ev_delta.evaluate(params, df, changed_rows=pd.Index([])), ref, label)
+            print(f"{label:<22} | {t_full * 1e3:>9.2f} | {t_scan * 1e3:>9.2f} | {t_delta * 1e3:>10.2f} | "
+                  f"{s['rows_recomputed']:>7,} | {', '.join(s['stages']) or '-'}")
+    print("\n等價性檢查 : ✅ (每一步皆與 evaluate_project 完全一致)")
+
+if __name__ == "__main__":
+    main()
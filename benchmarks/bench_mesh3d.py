@@ -0,0 +1,82 @@
+"""3D 鰭片網格基準測試 (舊版 for 迴圈 vs NumPy broadcasting, 各 LOD 傳輸量)
+
+用法：
+    python benchmarks/bench_mesh3d.py
+    python benchmarks/bench_mesh3d.py --case 900 1200 4.0 0.8 --repeat 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rru_engine.geometry import calc_fin_count  # noqa: E402
+from rru_engine.mesh3d import LOD_LEVELS, build_fin_mesh  # noqa: E402
+
+
+def legacy_fin_mesh(L_hsk, W_hsk, z_fin_start, z_fin_end, num_fins_int, Fin_t, Gap):
+    """v3.98 app.py 的逐片 for 迴圈 (對照組)"""
+    fin_x, fin_y, fin_z, fin_i, fin_j, fin_k = [], [], [], [], [], []
+    if num_fins_int > 0:
+        total_fin_array_width = (num_fins_int * Fin_t) + ((num_fins_int - 1) * Gap)
+        y_offset = (W_hsk - total_fin_array_width) / 2
+    else: y_offset = 0
+    base_i = [7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2]; base_j = [3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3]; base_k = [0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6]
+    for idx in range(num_fins_int):
+        y_start = y_offset + idx * (Fin_t + Gap); y_end = y_start + Fin_t
+        if y_end > W_hsk: break
+        current_x = [0, L_hsk, L_hsk, 0, 0, L_hsk, L_hsk, 0]; current_y = [y_start, y_start, y_end, y_end, y_start, y_start, y_end, y_end]
+        current_z = [z_fin_start, z_fin_start, z_fin_start, z_fin_start, z_fin_end, z_fin_end, z_fin_end, z_fin_end]
+        offset = len(fin_x)
+        fin_x.extend(current_x); fin_y.extend(current_y); fin_z.extend(current_z)
+        fin_i.extend([x + offset for x in base_i]); fin_j.extend([x + offset for x in base_j]); fin_k.extend([x + offset for x in base_k])
+    return fin_x, fin_y, fin_z, fin_i, fin_j, fin_k
+
+
+def payload_kb(mesh):
+    x, y, z, i, j, k = mesh
+    return len(go.Figure(go.Mesh3d(x=x, y=y, z=z, i=i, j=j, k=k)).to_json()) / 1024
+
+
+def timed(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+DEFAULT_CASES = [(376.0, 272.0, 11.6, 1.2), (600.0, 500.0, 4.0, 0.8), (900.0, 1200.0, 4.0, 0.8)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", type=float, nargs=4, action="append", metavar=("L", "W", "GAP", "FIN_T"),
+                        help="散熱器尺寸 L x W (mm)、Gap、Fin_t；可重複指定 (預設三組)")
+    parser.add_argument("--fin-height", type=float, default=60.0, help="鰭片高度 (mm)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    cases = args.case or DEFAULT_CASES
+    print(f"{'L x W (mm)':>12} | {'fins':>5} | {'loop (ms)':>9} | {'numpy (ms)':>10} | " + " | ".join(f"{l + ' KB':>10}" for l in ["legacy"] + LOD_LEVELS))
+    print("-" * 100)
+    for L, W, gap, fin_t in cases:
+        n = calc_fin_count(W, gap, fin_t)
+        mesh_args = (L, W, 69.0, 69.0 + args.fin_height, n, fin_t, gap)
+        t_loop, ref = timed(lambda: legacy_fin_mesh(*mesh_args), args.repeat)
+        t_vec, vec = timed(lambda: build_fin_mesh(*mesh_args, lod="full"), args.repeat)
+        for a, b in zip(ref, vec):
+            # 頂點以 float32 傳送，比對容許 float32 捨入誤差
+            if not np.allclose(np.asarray(a, dtype=float), np.asarray(b, dtype=float), rtol=1e-6, atol=1e-4):
+                sys.exit(f"❌ full LOD 網格與舊版不一致 ({L}x{W})")
+        sizes = [payload_kb(ref)] + [payload_kb(build_fin_mesh(*mesh_args, lod=lod)) for lod in LOD_LEVELS]
+        print(f"{f'{L:.0f}x{W:.0f}':>12} | {n:>5} | {t_loop * 1e3:>9.2f} | {t_vec * 1e3:>10.3f} | " + " | ".join(f"{s:>10.1f}" for s in sizes))
+    print("等價性檢查  : ✅ (full LOD 與舊版逐點相同，容許 float32 捨入)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Pareto 前緣 (多目標設計探索) 驗證與基準測試
+
+用法：
+    python benchmarks/bench_pareto.py                      # 預設 10^5 候選設計、10^6 點排序
+    python benchmarks/bench_pareto.py --candidates 2e4 --sort-points 1e5
+
+1. non_dominated_mask 與兩兩比較 (O(n²)) 的結果完全一致 (含重複點與同值)
+2. 非支配排序耗時 (隨機 3 目標點)
+3. run_pareto 端到端耗時；前緣上的設計以 evaluate_project 單點重算，KPI 一致
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rru_engine import DEFAULT_COMPONENT_DATA, DEFAULT_GLOBALS, evaluate_project  # noqa: E402
+from rru_engine.defaults import FIN_TECH_OPTIONS  # noqa: E402
+from rru_engine.pareto import PARETO_DESIGN_KEYS, non_dominated_mask, run_pareto  # noqa: E402
+
+CHECK_COLUMNS = ["Fin_Count", "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg"]
+
+
+def brute_force_mask(F):
+    le = (F[:, None, :] <= F[None, :, :]).all(axis=2)
+    lt = (F[:, None, :] < F[None, :, :]).any(axis=2)
+    dominated = (le & lt).any(axis=0)  # [j, i]：j 支配 i
+    return ~dominated
+
+
+def check_sort(seed=0):
+    rng = np.random.default_rng(seed)
+    for k in (2, 3):
+        for trial in range(20):
+            n = 3000 if trial < 4 else 400  # 3000 點會啟用 3 目標的樞紐點預篩
+            F = rng.integers(0, 12, size=(n, k)).astype(float)  # 小整數範圍：大量同值 / 重複點
+            if trial % 2:
+                F = rng.normal(size=(n, k))
+            if not np.array_equal(non_dominated_mask(F), brute_force_mask(F)):
+                sys.exit(f"❌ {k} 目標非支配排序與兩兩比較不一致 (trial {trial})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=float, default=1e5)
+    parser.add_argument("--sort-points", type=float, default=1e6)
+    args = parser.parse_args()
+
+    check_sort()
+    print("排序正確性   : ✅ (2 / 3 目標，與兩兩比較一致)")
+
+    F = np.random.default_rng(1).random((int(args.sort_points), 3))
+    t0 = time.perf_counter()
+    mask = non_dominated_mask(F)
+    print(f"排序耗時     : {time.perf_counter() - t0:.3f} s  ({len(F):,} 點 -> 前緣 {int(mask.sum()):,} 點)")
+
+    components_df = pd.DataFrame(DEFAULT_COMPONENT_DATA)
+    ref = evaluate_project(DEFAULT_GLOBALS, components_df)
+    p = DEFAULT_GLOBALS
+    ranges = {"Margin": (p['Margin'], p['Margin'] * 1.5),
+              **{k: (p[k], p[k] + 20.0) for k in ("Top", "Btm", "Left", "Right")}}
+    res = run_pareto(DEFAULT_GLOBALS, ref['Total_Watts_Sum'], ref['Min_dT_Allowed'], int(args.candidates),
+                     ranges=ranges, fin_techs=FIN_TECH_OPTIONS)
+    front = res['front']
+    for i, row in front.head(50).iterrows():
+        params = dict(DEFAULT_GLOBALS)
+        params.update({k: row[k] for k in PARETO_DESIGN_KEYS})
+        r = evaluate_project(params, components_df)
+        for c in CHECK_COLUMNS:
+            if not np.isclose(row[c], r[c], rtol=1e-12, atol=0):
+                sys.exit(f"❌ 前緣第 {i} 點 {c} 不一致: {row[c]!r} vs {r[c]!r}")
+        if r['drc_failed']:
+            sys.exit(f"❌ 前緣第 {i} 點未通過 DRC: {r['drc_rule']}")
+    print(f"候選設計     : {res['n_candidates']:,} (通過 DRC {res['n_feasible']:,})")
+    print(f"端到端耗時   : {res['elapsed_s']:.3f} s  (排序 {res['sort_s'] * 1e3:.1f} ms)")
+    print(f"前緣         : {len(front):,} 點，體積 {front['Volume_L'].min():.2f} ~ {front['Volume_L'].max():.2f} L，"
+          f"重量 {front['total_weight_kg'].min():.2f} ~ {front['total_weight_kg'].max():.2f} kg")
+    print("等價性檢查   : ✅ (前緣設計與 evaluate_project 一致)")
+
+
+if __name__ == "__main__":
+    main()
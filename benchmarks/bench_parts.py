@@ -0,0 +1,125 @@
+"""元件庫索引基準測試 (PartLibrary vs pandas 布林遮罩)
+
+產生 N 筆合成料號，量測建索引耗時與各種查詢 (名稱開頭 / 功耗範圍 / Pad 面積 / 組合條件) 的延遲，
+並逐一與 pandas 全表布林遮罩的結果比對 (列集合與順序皆須相同)。
+
+用法：
+    python benchmarks/bench_parts.py [--parts 50000] [--queries 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rru_engine.parts import PartLibrary  # noqa: E402
+
+FAMILIES = ["Final PA", "Driver PA", "Pre Driver", "Circulator", "Cavity Filter", "CPU FPGA",
+            "Transceiver", "Clock", "DDR4", "DDR5", "Power Mod", "POL Buck", "SFP", "LNA"]
+BOARD_TYPES = ["Copper Coin", "Thermal Via", "None"]
+TIM_TYPES = ["Solder", "Grease", "Pad", "Putty", "None"]
+
+
+def make_library(n, seed=0):
+    rng = np.random.default_rng(seed)
+    family = rng.choice(FAMILIES, n)
+    pad_l = rng.choice([2.0, 3.0, 5.0, 7.5, 8.6, 10.0, 17.0, 20.0, 27.0, 35.0, 45.0, 58.0], n)
+    pad_w = np.round(pad_l * rng.uniform(0.5, 1.5, n), 1)
+    return pd.DataFrame({
+        "Part": [f"{f} {i:05d}-{rng_s}" for i, (f, rng_s) in enumerate(zip(family, rng.integers(0, 999, n)))],
+        "Category": family,
+        "Package": [f"PKG {l:g}x{w:g}" for l, w in zip(pad_l, pad_w)],
+        "Power(W)": np.round(rng.lognormal(1.0, 1.2, n), 2),
+        "Height(mm)": rng.choice([0.0, 30.0, 50.0, 60.0, 180.0, 200.0, 250.0], n),
+        "Pad_L": pad_l,
+        "Pad_W": pad_w,
+        "Thick(mm)": rng.choice([0.0, 2.0, 2.5], n),
+        "Board_Type": rng.choice(BOARD_TYPES, n),
+        "Limit(C)": rng.choice([85.0, 95.0, 100.0, 125.0, 175.0, 200.0, 225.0], n),
+        "R_jc": np.round(rng.uniform(0.0, 5.0, n), 2),
+        "TIM_Type": rng.choice(TIM_TYPES, n),
+    })
+
+
+def make_queries(lib, count, seed=1):
+    rng = np.random.default_rng(seed)
+    names = lib.df["Part"].to_numpy()
+    queries = []
+    for i in range(count):
+        kind = i % 4
+        q = {"prefix": "", "power": None, "area": None, "board_type": None}
+        if kind in (0, 3):
+            name = names[rng.integers(len(names))]
+            q["prefix"] = name[: rng.integers(2, 5 if kind == 3 else len(name))].lower()
+        if kind in (1, 3):
+            lo = float(rng.uniform(0.0, 20.0))
+            q["power"] = (lo, lo + float(rng.uniform(0.5, 10.0)))
+        if kind in (2, 3):
+            lo = float(rng.uniform(0.0, 1000.0))
+            q["area"] = (lo, lo + float(rng.uniform(10.0, 500.0 if kind == 2 else 2000.0)))
+        if kind == 3:
+            q["board_type"] = str(rng.choice(BOARD_TYPES))
+        queries.append(q)
+    return queries
+
+
+def brute_force(df, prefix, power, area, board_type):
+    mask = np.ones(len(df), dtype=bool)
+    if prefix:
+        mask &= df["Part"].str.casefold().str.startswith(prefix.casefold()).to_numpy()
+    if power is not None:
+        mask &= df["Power(W)"].between(*power).to_numpy()
+    if area is not None:
+        mask &= (df["Pad_L"] * df["Pad_W"]).between(*area).to_numpy()
+    if board_type:
+        mask &= (df["Board_Type"] == board_type).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parts", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    raw = make_library(args.parts)
+    t0 = time.perf_counter()
+    lib = PartLibrary(raw)
+    t_build = time.perf_counter() - t0
+    print(f"元件庫 {len(lib):,} 筆，建索引 {t_build * 1e3:.1f} ms")
+
+    labels = ["名稱開頭", "功耗範圍", "Pad 面積", "組合條件"]
+    t_index = {k: [] for k in labels}
+    t_mask = {k: [] for k in labels}
+    hits = {k: [] for k in labels}
+    for i, q in enumerate(make_queries(lib, args.queries)):
+        label = labels[i % 4]
+        t0 = time.perf_counter()
+        ids = lib.search_ids(**q)
+        t_index[label].append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        ref = brute_force(lib.df, **q)
+        t_mask[label].append(time.perf_counter() - t0)
+        if not np.array_equal(ids, ref):
+            sys.exit(f"❌ 查詢結果不一致: {q} ({len(ids)} vs {len(ref)})")
+        hits[label].append(len(ids))
+
+    print(f"\n{'query':<10} | {'index p50 (ms)':>14} | {'index max (ms)':>14} | {'mask p50 (ms)':>13} | {'hits p50':>8}")
+    print("-" * 72)
+    for label in labels:
+        ti, tm = np.array(t_index[label]) * 1e3, np.array(t_mask[label]) * 1e3
+        print(f"{label:<10} | {np.median(ti):>14.4f} | {ti.max():>14.4f} | {np.median(tm):>13.3f} | {int(np.median(hits[label])):>8,}")
+
+    t0 = time.perf_counter()
+    frame, _ = lib.search("final pa 00", limit=200)
+    lib.to_components(frame, qty=4)
+    print(f"\n查詢 + 取前 200 筆 + 轉為元件表格式: {(time.perf_counter() - t0) * 1e3:.3f} ms")
+    print("等價性檢查 : ✅ (所有查詢皆與 pandas 布林遮罩一致)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""敏感度分析基準測試 (批次評估 vs 逐一呼叫 evaluate_project)
+
+每個輸入的 low / high 結果都會與「修改該輸入後呼叫 evaluate_project」逐一比對。
+
+用法：
+    python benchmarks/bench_sensitivity.py [--step 0.1]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rru_engine import evaluate_project  # noqa: E402
+from rru_engine.project_io import load_project  # noqa: E402
+from rru_engine.sensitivity import SENSITIVITY_METRICS, rank_sensitivity, run_sensitivity  # noqa: E402
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "default_config.json")
+
+
+def reference_loop(params, df, table):
+    """舊做法：每個輸入改一次、各跑一次完整評估"""
+    out = []
+    for rec in table.to_dict('records'):
+        row = []
+        for x in (rec['x_low'], rec['x_high']):
+            p2, df2 = dict(params), df
+            if rec['kind'] == "global":
+                p2[rec['input']] = x
+            else:
+                name, col = rec['input'].split(" · ")
+                idx = int(name.split("#")[1]) if "#" in name else df.index[df['Component'] == name][0]
+                df2 = df.copy()
+                df2[col] = df2[col].astype(float)
+                df2.loc[idx, col] = x
+            r = evaluate_project(p2, df2)
+            row.append({m: r[m] for m in SENSITIVITY_METRICS})
+        out.append(row)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--step", type=float, default=0.10)
+    args = parser.parse_args()
+
+    params, df, _ = load_project(CONFIG)
+    run_sensitivity(params, df, args.step)  # warm-up
+    t0 = time.perf_counter()
+    res = run_sensitivity(params, df, args.step)
+    t_batch = time.perf_counter() - t0
+    table = res['table']
+
+    t0 = time.perf_counter()
+    ref = reference_loop(params, df, table)
+    t_loop = time.perf_counter() - t0
+
+    for i, (lo, hi) in enumerate(ref):
+        for m in SENSITIVITY_METRICS:
+            if not np.allclose([table[f"{m}_low"].iat[i], table[f"{m}_high"].iat[i]], [lo[m], hi[m]], rtol=1e-12, atol=1e-12):
+                sys.exit(f"❌ {table['input'].iat[i]} / {m} 與 evaluate_project 不一致")
+
+    print(f"輸入數 {len(table)}｜案例數 {res['n_cases']}")
+    print(f"批次評估   : {t_batch * 1e3:8.2f} ms")
+    print(f"逐一評估   : {t_loop * 1e3:8.2f} ms  ({t_loop / t_batch:.0f}x)")
+    for m, label in SENSITIVITY_METRICS.items():
+        top = rank_sensitivity(table, m, top=3)
+        print(f"{label:<14}: " + "、".join(f"{r['input']} ({r[m + '_elasticity']:+.2f})" for r in top.to_dict('records')))
+    print("等價性檢查 : ✅ (所有擾動案例與 evaluate_project 一致)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""基板 2D 熱擴散基準測試 (rru_engine.spreading)
+
+- 正確性：小格點與直接組出的 5 點差分稀疏矩陣 (dense 求解) 比對；功耗均勻時須等於集總模型；能量守恆
+- 速度：完整機殼 1 mm / 0.5 mm 格點的首次求解 (含分解) 與只改功耗的重解
+
+用法：
+    python benchmarks/bench_spreading.py [--res 1.0 0.5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rru_engine import evaluate_project, resolve_params  # noqa: E402
+from rru_engine.project_io import load_project  # noqa: E402
+from rru_engine.spreading import BasePlateSolver, auto_layout, get_solver, solve_base_temperature  # noqa: E402
+
+CONFIG = os.path.join(ROOT, "default_config.json")
+
+
+def dense_reference(solver, q):
+    """直接組出 -k·t·∇² + G 的 5 點差分矩陣 (絕熱邊界) 並求解"""
+    nx, ny = solver.shape
+    kt = solver.k * solver.t / 1e3
+    ax, ay = kt / (solver.dx / 1e3) ** 2, kt / (solver.dy / 1e3) ** 2
+    n = nx * ny
+    A = np.zeros((n, n))
+    idx = np.arange(n).reshape(nx, ny)
+    for i in range(nx):
+        for j in range(ny):
+            r = idx[i, j]
+            A[r, r] = solver.g_eff
+            for di, dj, a in ((1, 0, ax), (-1, 0, ax), (0, 1, ay), (0, -1, ay)):
+                if 0 <= i + di < nx and 0 <= j + dj < ny:
+                    A[r, r] += a
+                    A[r, idx[i + di, j + dj]] -= a
+    return np.linalg.solve(A, q.ravel()).reshape(nx, ny)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--res", type=float, nargs="+", default=[1.0, 0.5], help="格點大小 (mm)")
+    args = parser.parse_args()
+
+    # --- 正確性：與 dense 5 點差分比對 ---
+    rng = np.random.default_rng(0)
+    small = BasePlateSolver(60.0, 40.0, 7.0, 96.0, 900.0, res_mm=2.0)
+    q = rng.uniform(0, 5e4, small.shape) * (rng.uniform(size=small.shape) > 0.8)
+    err = np.abs(small.solve_flux(q) - dense_reference(small, q)).max()
+    if err > 1e-9:
+        sys.exit(f"❌ 與 dense 求解不一致 (max |Δθ| = {err:.2e})")
+
+    params, df, _ = load_project(CONFIG)
+    p = resolve_params(params)
+    res = evaluate_project(p, df)
+
+    # --- 無座標 (均勻分佈) 時等於集總模型 ---
+    uni = solve_base_temperature(p, res)
+    lumped = res['Min_dT_Allowed']  # Total_Power · R_sa
+    if not np.allclose(uni['theta'], lumped, rtol=1e-9):
+        sys.exit(f"❌ 均勻功耗時溫升 {uni['theta'].mean():.4f} ≠ 集總 {lumped:.4f}")
+
+    # --- 自動擺放後：能量守恆 ---
+    placed_df = auto_layout(df, p)
+    res_placed = evaluate_project(p, placed_df)
+    out = solve_base_temperature(p, res_placed)
+    nx, ny = out['shape']
+    cell_m2 = (res['L_hsk'] / nx) * (res['W_hsk'] / ny) / 1e6
+    q_out = (out['G'] * out['theta'] * cell_m2).sum()
+    if not np.isclose(q_out, res['Total_Power'], rtol=1e-9):
+        sys.exit(f"❌ 能量不守恆：對流 {q_out:.3f} W ≠ 輸入 {res['Total_Power']:.3f} W")
+
+    print(f"基板 {res['L_hsk']:.0f} × {res['W_hsk']:.0f} mm，t = {p['t_base']} mm，k = {out['k']:.0f} W/m·K，G = {out['G']:.1f} W/m²·K")
+    print(f"{'格點 (mm)':>9} | {'格數':>9} | {'首次 (含分解)':>13} | {'只改功耗':>9}")
+    print("-" * 52)
+    for r in args.res:
+        get_solver.cache_clear()
+        t0 = time.perf_counter()
+        solve_base_temperature(p, res_placed, res_mm=r)
+        t_first = time.perf_counter() - t0
+        scaled = dict(res_placed, final_df=res_placed['final_df'].assign(Total_W=res_placed['final_df']['Total_W'] * 1.1))
+        t0 = time.perf_counter()
+        n_rep = 5
+        for _ in range(n_rep):
+            o = solve_base_temperature(p, scaled, res_mm=r)
+        t_again = (time.perf_counter() - t0) / n_rep
+        print(f"{r:>9.2f} | {o['shape'][0] * o['shape'][1]:>9,} | {t_first * 1e3:>10.1f} ms | {t_again * 1e3:>6.1f} ms")
+
+    table = out['table'].sort_values('Margin_local')
+    print("\n局部基板溫升 (1 mm，自動擺放)：")
+    for rec in table.head(5).to_dict('records'):
+        print(f"  {rec['Component']:<14} dT_base {rec['dT_base']:6.2f} (集總 {rec['dT_lumped']:.2f})  局部裕度 {rec['Margin_local']:+6.2f} °C")
+    print("正確性檢查 : ✅ (dense 5 點差分 / 集總模型 / 能量守恆)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""App 冷啟動時間報告 (Cold Start)
+
+每項量測都在全新的 Python 行程中進行 (模組尚未載入、無快取)，取多次中的最小值：
+- import.<模組> : 已 import streamlit 的行程再載入該模組所需時間 (streamlit 本身從空行程量測)
+- login.*       : 以 streamlit.testing 的 AppTest 執行 app.py 直到登入頁畫出 (首次繪製)；
+                  first_paint = import streamlit + 登入頁腳本 (不含 server 啟動與瀏覽器)
+- main.*        : 登入後第一次執行完整主畫面 (預設分頁)
+
+另檢查登入頁沒有載入 HEAVY_MODULES (有則視為退化，結束代碼 1)，並列出登入後主畫面載入了哪些模組。
+輸出格式與 run_benchmarks.py 相同，可用 --baseline 比較不同版本。
+
+用法：
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py -o results/startup_v3.98.json
+    python benchmarks/bench_startup.py --baseline results/startup_v3.97.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from run_benchmarks import compare, git_revision  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+SCHEMA_VERSION = 1
+
+IMPORT_MODULES = ["streamlit", "numpy", "pandas", "plotly.graph_objects", "plotly.express",
+                  "streamlit.components.v1", "matplotlib", "rru_engine"]
+# 登入頁不應載入的模組 (plotly.graph_objects 由 streamlit 自己的 plotly_chart 元件載入，不在此列)
+HEAVY_MODULES = ["numpy", "pandas", "plotly.express", "matplotlib", "rru_engine"]
+MIN_COMPARE_S = 0.005  # 低於此值的階段 (例如已被 streamlit 載入的模組) 只是雜訊，不做比較
+
+_IMPORT_CODE = textwrap.dedent("""
+    import importlib, sys, time
+    name = sys.argv[1]
+    if name != "streamlit":
+        import streamlit
+    t = time.perf_counter()
+    importlib.import_module(name)
+    print(time.perf_counter() - t)
+""")
+
+_APP_CODE = textwrap.dedent("""
+    import json, sys, time
+    app, heavy = sys.argv[1], sys.argv[2].split(",")
+    t0 = time.perf_counter()
+    import streamlit
+    t_import = time.perf_counter() - t0
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(app, default_timeout=300)
+    t = time.perf_counter()
+    at.run()
+    t_login = time.perf_counter() - t
+    login_modules = [m for m in heavy if m in sys.modules]
+    login_ok = len(at.text_input) == 1 and not at.exception
+    at.session_state["password_correct"] = True
+    t = time.perf_counter()
+    at.run()
+    t_main = time.perf_counter() - t
+    print(json.dumps({
+        "import_streamlit_s": t_import, "login_script_s": t_login, "main_first_run_s": t_main,
+        "login_ok": login_ok, "main_ok": not at.exception,
+        "login_modules": login_modules, "main_modules": [m for m in heavy if m in sys.modules],
+    }))
+""")
+
+
+def run_fresh(code, *args):
+    """全新行程執行 code，回傳 stdout 最後一行"""
+    proc = subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT, capture_output=True, text=True, check=False)
+    if proc.returncode != 0:
+        sys.exit(f"❌ 子行程失敗:\n{proc.stderr[-2000:]}")
+    return proc.stdout.strip().splitlines()[-1]
+
+
+def stage(samples):
+    return {"min_s": min(samples), "median_s": sorted(samples)[len(samples) // 2], "repeat": len(samples)}
+
+
+def run_suite(label, repeat=3):
+    stages = {}
+    for name in IMPORT_MODULES:
+        stages[f"import.{name}"] = stage([float(run_fresh(_IMPORT_CODE, name)) for _ in range(repeat)])
+        print(f"  {'import.' + name:<32} {stages[f'import.{name}']['min_s'] * 1e3:>10.1f} ms", file=sys.stderr, flush=True)
+
+    runs = [json.loads(run_fresh(_APP_CODE, APP, ",".join(HEAVY_MODULES))) for _ in range(repeat)]
+    stages["login.script"] = stage([r["login_script_s"] for r in runs])
+    stages["login.first_paint"] = stage([r["import_streamlit_s"] + r["login_script_s"] for r in runs])
+    stages["main.first_run"] = stage([r["main_first_run_s"] for r in runs])
+    for name in ("login.script", "login.first_paint", "main.first_run"):
+        print(f"  {name:<32} {stages[name]['min_s'] * 1e3:>10.1f} ms", file=sys.stderr, flush=True)
+
+    import streamlit
+    return {
+        "schema": SCHEMA_VERSION,
+        "label": label or "dev",
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "git": git_revision(),
+        "env": {"python": platform.python_version(), "streamlit": streamlit.__version__,
+                "platform": platform.platform(), "processor": platform.processor()},
+        "login_ok": all(r["login_ok"] for r in runs), "main_ok": all(r["main_ok"] for r in runs),
+        "login_modules": runs[0]["login_modules"], "main_modules": runs[0]["main_modules"],
+        "stages": stages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="結果 JSON 路徑 (省略則只印出)")
+    parser.add_argument("--label", help="結果標籤 (例如版本號)")
+    parser.add_argument("--baseline", help="要比較的先前結果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="退化門檻 (0.25 = 慢 25%%)")
+    parser.add_argument("--repeat", type=int, default=3, help="每項量測的全新行程數")
+    args = parser.parse_args()
+
+    print(f"Measuring cold start ({APP}) ...", file=sys.stderr)
+    current = run_suite(args.label, args.repeat)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"結果已寫入 {args.output}", file=sys.stderr)
+
+    print(f"\n登入頁載入的重量級模組 : {', '.join(current['login_modules']) or '(無)'}")
+    print(f"主畫面載入的重量級模組 : {', '.join(current['main_modules']) or '(無)'}")
+    failed = False
+    if not current["login_ok"] or not current["main_ok"]:
+        print("❌ App 執行失敗 (登入頁或主畫面有例外)")
+        failed = True
+    if current["login_modules"]:
+        print(f"❌ 登入頁不應載入：{', '.join(current['login_modules'])}")
+        failed = True
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        significant = {k: v for k, v in current["stages"].items()
+                       if max(v["min_s"], baseline["stages"].get(k, v)["min_s"]) >= MIN_COMPARE_S}
+        rows, regressions = compare(dict(current, stages=significant), baseline, args.threshold)
+        print(f"\n{'stage':<32} | {baseline['label'][:10]:>10} | {current['label'][:10]:>10} | {'ratio':>6} | status")
+        print("-" * 80)
+        for name, base_s, cur_s, ratio, status in rows:
+            print(f"{name:<32} | {base_s * 1e3:>8.1f}ms | {cur_s * 1e3:>8.1f}ms | {ratio:>6.2f} | {status}")
+        if regressions:
+            print(f"\n❌ {len(regressions)} 個階段退化超過 {args.threshold:.0%}：{', '.join(regressions)}")
+            failed = True
+    if failed:
+        sys.exit(1)
+    print("\n✅ 冷啟動檢查通過")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""設計空間掃描基準測試
+
+用法：
+    python benchmarks/bench_sweep.py                 # 預設 10^6 格點
+    python benchmarks/bench_sweep.py --points 1e5
+
+先抽樣比對 run_sweep 與 evaluate_project (單點) 的結果，再量測整個格點的耗時。
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rru_engine import DEFAULT_COMPONENT_DATA, DEFAULT_GLOBALS, evaluate_project  # noqa: E402
+from rru_engine.defaults import FIN_TECH_OPTIONS  # noqa: E402
+from rru_engine.sweep import run_sweep  # noqa: E402
+
+CHECK_COLUMNS = ["Fin_Count", "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg"]
+
+
+def make_grid(n_points):
+    """Gap x Fin_t x T_amb x t_base x fin tech，格點數約 n_points"""
+    per_axis = max(2, int(round((n_points / 2) ** 0.25)))
+    return {
+        "Gap": np.linspace(3.0, 20.0, per_axis),
+        "Fin_t": np.linspace(0.8, 3.0, per_axis),
+        "T_amb": np.linspace(25.0, 55.0, per_axis),
+        "t_base": np.linspace(4.0, 12.0, per_axis),
+        "fin_tech_selector_v2": FIN_TECH_OPTIONS,
+    }
+
+
+def check_equivalence(df_sweep, components_df, n_samples=200, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = ["Gap", "Fin_t", "T_amb", "t_base", "fin_tech_selector_v2"]
+    for i in rng.choice(len(df_sweep), size=min(n_samples, len(df_sweep)), replace=False):
+        row = df_sweep.iloc[i]
+        params = dict(DEFAULT_GLOBALS)
+        params.update({k: row[k] for k in keys})
+        ref = evaluate_project(params, components_df)
+        for c in CHECK_COLUMNS:
+            if not np.isclose(row[c], ref[c], rtol=1e-12, atol=0):
+                sys.exit(f"❌ 第 {i} 點 {c} 不一致: sweep={row[c]!r} ref={ref[c]!r}")
+        if bool(row["drc_pass"]) == ref["drc_failed"] or (ref["drc_failed"] and row["drc_rule"] != ref["drc_rule"]):
+            sys.exit(f"❌ 第 {i} 點 DRC 不一致: sweep={row['drc_rule']!r} ref={ref['drc_rule']!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=float, default=1e6)
+    args = parser.parse_args()
+
+    components_df = pd.DataFrame(DEFAULT_COMPONENT_DATA)
+    grid = make_grid(args.points)
+    n = int(np.prod([len(v) for v in grid.values()]))
+
+    t0 = time.perf_counter()
+    df = run_sweep(DEFAULT_GLOBALS, components_df, grid)
+    elapsed = time.perf_counter() - t0
+    check_equivalence(df, components_df)
+
+    print(f"格點數      : {n:,}")
+    print(f"耗時        : {elapsed:.3f} s  ({n / elapsed / 1e6:.2f} M points/s)")
+    print(f"DRC 通過    : {int(df['drc_pass'].sum()):,}")
+    print(f"記憶體      : {df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+    print("等價性檢查  : ✅ (200 點與 evaluate_project 一致)")
+
+
+if __name__ == "__main__":
+    main()
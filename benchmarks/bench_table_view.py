@@ -0,0 +1,99 @@
+"""大型 BOM 表格模式 (rru_engine.table_view) 驗證與基準測試
+
+用法：
+    python benchmarks/bench_table_view.py
+    python benchmarks/bench_table_view.py --rows 1000 10000 50000
+
+1. 色階：向量化查表與 pandas Styler.background_gradient(cmap='RdYlGn') 逐列的 CSS 完全相同
+2. 排序 / 篩選 / 分頁：與 pandas sort_values / 布林篩選的結果一致
+3. 耗時：整張表 Styler 渲染 (to_html) vs 大型模式 (篩選 + 排序 + 單頁 Styler)
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_thermal_kernel import make_bom  # noqa: E402
+from rru_engine import DEFAULT_GLOBALS, evaluate_project  # noqa: E402
+from rru_engine.table_view import gradient_css, gradient_index, page_rows, select_rows  # noqa: E402
+
+FORMAT = {"R_int": "{:.4f}", "R_TIM": "{:.4f}", "Allowed_dT": "{:.2f}"}
+PAGE_SIZE = 100
+
+
+def final_table(n_rows, seed=0):
+    res = evaluate_project(DEFAULT_GLOBALS, make_bom(n_rows, seed))
+    return res["final_df"], res["Min_dT_Allowed"]
+
+
+def check_colors(df):
+    # 以 Styler 內部計算結果 (ctx：{(列, 欄): [(屬性, 值), ...]}) 作為參考
+    styler = df.style.background_gradient(subset=["Allowed_dT"], cmap="RdYlGn")
+    styler._compute()
+    j = df.columns.get_loc("Allowed_dT")
+    ours = gradient_css(gradient_index(df["Allowed_dT"]))
+    for i in range(len(df)):
+        ref = "".join(f"{k}: {v};" for k, v in styler.ctx[(i, j)])
+        if ours[i] != ref:
+            sys.exit(f"❌ 第 {i} 列色階不一致: {ours[i]!r} vs {ref!r}")
+
+
+def check_selection(df, min_dt):
+    allowed = df["Allowed_dT"].to_numpy(dtype=float)
+    rows = select_rows(allowed, min_dt, "worst")
+    if not np.array_equal(rows, df["Allowed_dT"].sort_values(kind="stable").index.to_numpy()):
+        sys.exit("❌ 排序 (worst) 與 pandas sort_values 不一致")
+    rows = select_rows(allowed, min_dt, "best", max_gap=20.0, names=df["Component"], query="pa")
+    keep = (df["Allowed_dT"] - min_dt <= 20.0) & df["Component"].str.lower().str.contains("pa")
+    ref = df.loc[keep, "Allowed_dT"].sort_values(ascending=False, kind="stable").index.to_numpy()
+    if not np.array_equal(np.sort(rows), np.sort(ref)) or not np.array_equal(allowed[rows], allowed[ref]):
+        sys.exit("❌ 篩選 + 排序 (best) 與 pandas 不一致")
+    last = page_rows(rows, 10**9, PAGE_SIZE)
+    if len(rows) and not np.array_equal(last, rows[(len(rows) - 1) // PAGE_SIZE * PAGE_SIZE:]):
+        sys.exit("❌ 超出範圍的頁次應取最後一頁")
+
+
+def time_full(df):
+    t0 = time.perf_counter()
+    df.style.background_gradient(subset=["Allowed_dT"], cmap="RdYlGn").format(FORMAT).to_html()
+    return time.perf_counter() - t0
+
+
+def time_large(df, min_dt):
+    t0 = time.perf_counter()
+    allowed = df["Allowed_dT"].to_numpy(dtype=float)
+    color_index = gradient_index(allowed)
+    t_colors = time.perf_counter() - t0
+    t1 = time.perf_counter()
+    sel = page_rows(select_rows(allowed, min_dt, "worst", 10.0, df["Component"], "a"), 1, PAGE_SIZE)
+    page = df.iloc[sel]
+    css = gradient_css(color_index[sel])
+    page.style.apply(lambda _: css, subset=["Allowed_dT"]).format(FORMAT).to_html()
+    return t_colors, time.perf_counter() - t1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    df, min_dt = final_table(3000)
+    check_colors(df)
+    check_selection(df, min_dt)
+    print("色階 / 篩選 : ✅ 與 Styler.background_gradient / pandas 排序一致 (3,000 列)")
+
+    print(f"\n{'rows':>8} | {'Styler 全表':>12} | {'色階索引':>10} | {'單頁 (篩選+排序+渲染)':>22}")
+    print("-" * 64)
+    for n in args.rows:
+        df, min_dt = final_table(n, seed=1)
+        t_full = time_full(df)
+        t_colors, t_page = min(time_large(df, min_dt) for _ in range(3))
+        print(f"{n:>8,} | {t_full * 1e3:>10.0f}ms | {t_colors * 1e3:>8.2f}ms | {t_page * 1e3:>20.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
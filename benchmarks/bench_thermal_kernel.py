@@ -0,0 +1,101 @@
+"""元件熱阻 Kernel 基準測試 (row-wise apply vs 向量化)
+
+用法：
+    python benchmarks/bench_thermal_kernel.py
+    python benchmarks/bench_thermal_kernel.py --sizes 10 1000 100000 --max-apply-rows 20000
+
+每個尺寸先做等價性檢查 (向量化結果需與 calc_thermal_resistance 逐位元相同)，
+再分別量測兩種路徑的耗時。
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rru_engine import COMPONENT_RESULT_COLUMNS, calc_thermal_resistance, calc_thermal_resistance_vec  # noqa: E402
+
+# 與 app.py 預設值相同的全域參數
+BENCH_GLOBALS = {
+    'T_amb': 45.0, 'Slope': 0.03,
+    'Coin_L_Setting': 55.0, 'Coin_W_Setting': 35.0,
+    'K_Via': 30.0, 'Via_Eff': 0.9,
+    'K_Solder': 58.0, 't_Solder': 0.3, 'Voiding': 0.75,
+    'tim_props': {
+        "Solder": {"k": 58.0, "t": 0.3},
+        "Grease": {"k": 3.0, "t": 0.05},
+        "Pad": {"k": 7.5, "t": 1.7},
+        "Putty": {"k": 9.1, "t": 0.5},
+        "None": {"k": 1, "t": 0},
+    },
+}
+
+COMPONENT_NAMES = ["Final PA", "Driver PA", "Pre Driver", "Circulator", "Cavity Filter", "CPU (FPGA)", "Si5518", "16G DDR", "Power Mod", "SFP"]
+BOARD_TYPES = ["Thermal Via", "Copper Coin", "None"]
+TIM_TYPES = ["Grease", "Pad", "Putty", "Solder", "None"]
+
+
+def make_bom(n_rows, seed=0):
+    """產生 n_rows 列的合成 BOM (含 0 功耗、0 板厚等邊界值)"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Component": rng.choice(COMPONENT_NAMES, n_rows),
+        "Qty": rng.integers(1, 5, n_rows),
+        "Power(W)": np.round(rng.choice([0.0, 0.4, 2.0, 9.5, 35.0, 52.1], n_rows) * rng.uniform(0.5, 1.5, n_rows), 2),
+        "Height(mm)": rng.integers(0, 260, n_rows),
+        "Pad_L": np.round(rng.choice([0.0, 2.0, 5.0, 10.0, 35.0], n_rows), 1),
+        "Pad_W": np.round(rng.choice([0.0, 2.0, 5.0, 11.5, 61.0], n_rows), 1),
+        "Thick(mm)": rng.choice([0.0, 2.0, 2.5], n_rows),
+        "Board_Type": rng.choice(BOARD_TYPES, n_rows),
+        "Limit(C)": rng.choice([95, 100, 125, 175, 200, 225], n_rows),
+        "R_jc": np.round(rng.choice([0.0, 0.16, 1.5, 3.0, 50.0], n_rows), 2),
+        "TIM_Type": rng.choice(TIM_TYPES, n_rows),
+    })
+
+
+def run_apply(df):
+    res = df.apply(lambda row: calc_thermal_resistance(row, BENCH_GLOBALS), axis=1)
+    res.columns = COMPONENT_RESULT_COLUMNS
+    return res
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--max-apply-rows", type=int, default=100000, help="超過此列數不跑 row-wise apply (太慢)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} | {'apply (ms)':>11} | {'vec (ms)':>9} | {'speedup':>8} | equal")
+    print("-" * 56)
+    for n in args.sizes:
+        df = make_bom(n)
+        vec_t = best_of(lambda: calc_thermal_resistance_vec(df, BENCH_GLOBALS), args.repeat)
+        if n <= args.max_apply_rows:
+            ref = run_apply(df)
+            vec = calc_thermal_resistance_vec(df, BENCH_GLOBALS)
+            equal = np.array_equal(ref.to_numpy(dtype=float), vec.to_numpy(dtype=float), equal_nan=True)
+            if not equal:
+                diff = np.nanmax(np.abs(ref.to_numpy(dtype=float) - vec.to_numpy(dtype=float)))
+                sys.exit(f"❌ 向量化結果與 calc_thermal_resistance 不一致 (rows={n}, max |diff|={diff:g})")
+            apply_t = best_of(lambda: run_apply(df), 1 if n >= 10000 else args.repeat)
+            print(f"{n:>8} | {apply_t * 1e3:>11.2f} | {vec_t * 1e3:>9.3f} | {apply_t / vec_t:>7.0f}x | ✅")
+        else:
+            print(f"{n:>8} | {'-':>11} | {vec_t * 1e3:>9.3f} | {'-':>8} | -")
+
+
+if __name__ == "__main__":
+    main()
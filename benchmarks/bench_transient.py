@@ -0,0 +1,97 @@
+"""暫態熱模擬 (rru_engine.transient) 驗證與基準測試
+
+用法：
+    python benchmarks/bench_transient.py                # 24 h @ 1 s
+    python benchmarks/bench_transient.py --hours 168
+
+1. 穩態：固定負載時接面溫度等於穩態模型 (瓶頸 T_j = Limit - Min_dT + Min_dT / Margin)
+2. 積分器：模態前綴掃描與逐步求解 (C/dt + K)·x_k = C/dt·x_{k-1} + u_k 的結果一致 (含週期初始狀態)
+3. 耗時：整天負載曲線 (所有元件) 的模擬時間
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rru_engine import DEFAULT_COMPONENT_DATA, DEFAULT_GLOBALS, evaluate_project  # noqa: E402
+from rru_engine.transient import TransientModel, diurnal_profile, simulate_transient  # noqa: E402
+
+FIN_TECH = DEFAULT_GLOBALS["fin_tech_selector_v2"]
+
+
+def check_steady(res):
+    out = simulate_transient(res, FIN_TECH, np.ones(3600), dt=1.0)
+    table = out["table"]
+    if not np.allclose(table["Tj_peak"], table["Tj_steady"], rtol=0, atol=1e-9):
+        sys.exit(f"❌ 固定負載與穩態不一致：最大誤差 {np.abs(table['Tj_peak'] - table['Tj_steady']).max():.2e}")
+    worst = table.iloc[0]
+    ref = worst["Limit(C)"] - res["Min_dT_Allowed"] + res["Min_dT_Allowed"] / DEFAULT_GLOBALS["Margin"]
+    if worst["Component"] != res["Bottleneck_Name"] or not np.isclose(worst["Tj_peak"], ref, rtol=0, atol=1e-9):
+        sys.exit(f"❌ 瓶頸元件接面溫度不一致：{worst['Tj_peak']} vs {ref}")
+    return worst
+
+
+def stepwise(model, frac, dt, x0):
+    """逐步後向 Euler (參考解)，x0 為第一步之前的狀態"""
+    u = model.heat_input(frac)
+    C = 1 / model.d_inv ** 2
+    A = np.diag(C / dt) + model.K
+    x = x0
+    out = np.empty_like(u)
+    for k in range(len(u)):
+        x = np.linalg.solve(A, C / dt * x + u[k])
+        out[k] = x
+    return out
+
+
+def check_integrator(res, n=600, seed=0):
+    """steady：參考解由 K·x0 = u_0 出發；periodic：由掃描結果的最後狀態出發須重現整個週期"""
+    rng = np.random.default_rng(seed)
+    n_rows = len(res["valid_rows"])
+    model = TransientModel(res, FIN_TECH, tau_pkg_s=rng.uniform(2.0, 30.0, n_rows))
+    worst = 0.0
+    for dt in (0.5, 5.0):
+        frac = rng.uniform(0.2, 1.0, (n, n_rows))
+        fast = model.simulate(frac, dt, "steady")
+        ref = stepwise(model, frac, dt, np.linalg.solve(model.K, model.heat_input(frac[:1])[0]))
+        worst = max(worst, np.abs(fast - ref).max())
+        fast = model.simulate(frac, dt, "periodic")
+        worst = max(worst, np.abs(fast - stepwise(model, frac, dt, fast[-1])).max())
+    if worst > 1e-8:
+        sys.exit(f"❌ 模態掃描與逐步求解不一致：最大誤差 {worst:.2e} °C")
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--dt", type=float, default=1.0)
+    args = parser.parse_args()
+
+    res = evaluate_project(DEFAULT_GLOBALS, pd.DataFrame(DEFAULT_COMPONENT_DATA))
+    worst = check_steady(res)
+    print(f"穩態        : ✅ 固定負載 = 穩態模型 (瓶頸 {worst['Component']} T_j = {worst['Tj_peak']:.2f} °C)")
+    err = check_integrator(res)
+    print(f"積分器      : ✅ 模態掃描與逐步後向 Euler 一致 (最大誤差 {err:.1e} °C，含週期初始狀態)")
+
+    frac = diurnal_profile(args.hours, args.dt, burst_per_hour=6, seed=0)
+    n_rows = len(res["valid_rows"])
+    per_row = np.repeat(frac[:, None], n_rows, axis=1) * np.linspace(0.8, 1.0, n_rows)
+    simulate_transient(res, FIN_TECH, per_row[:10], args.dt)  # 暖機
+    t0 = time.perf_counter()
+    out = simulate_transient(res, FIN_TECH, per_row, args.dt, initial="periodic")
+    elapsed = time.perf_counter() - t0
+    top = out["table"].iloc[0]
+    print(f"時間步      : {out['n_steps']:,} × {n_rows} 元件 (dt = {args.dt:g} s)")
+    print(f"耗時        : {elapsed:.3f} s  ({out['n_steps'] / elapsed / 1e6:.2f} M steps/s)")
+    print(f"散熱器 τ    : {out['tau_sink_s'] / 60:.1f} min，峰值溫升 {out['peak_sink_rise']:.2f} °C")
+    print(f"瓶頸        : {top['Component']} 峰值 {top['Tj_peak']:.2f} °C @ {top['t_peak_s'] / 3600:.2f} h (裕度 {top['Margin_peak']:+.2f} °C)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""評估服務負載測試 (rru_engine.service)
+
+以多條 keep-alive 連線並行送出請求，回報吞吐量與延遲百分位數，並核對每筆回應與 evaluate_project 的數值完全一致
+(缺漏參數以 default_config.json 補齊，與 App 畫面相同)。預設在本行程內以空閒埠啟動服務；--url 可指向已執行中的服務。
+
+用法：
+    python benchmarks/load_test_service.py [--requests 2000] [--concurrency 16] [--workers 4] [--batch 1]
+    python benchmarks/load_test_service.py --url http://127.0.0.1:8765 --batch 20
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_compare import make_variants  # noqa: E402
+from rru_engine import evaluate_project, resolve_params  # noqa: E402
+from rru_engine.project_io import build_project_dict, load_project  # noqa: E402
+from rru_engine.service import RESULT_KEYS, EvaluationService  # noqa: E402
+
+CONFIG = os.path.join(ROOT, "default_config.json")
+PERCENTILES = [50, 90, 99]
+
+
+def start_local_service(workers, defaults):
+    """在背景執行緒的 event loop 中啟動服務 (空閒埠)，回傳 (port, stop 函式)"""
+    loop = asyncio.new_event_loop()
+    service = EvaluationService(workers, defaults)
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service.start("127.0.0.1", 0))
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(service.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+    return service.port, service.workers, stop
+
+
+def expected_result(params, df, defaults):
+    res = evaluate_project(resolve_params(params, defaults), df)
+    return {k: (v.item() if hasattr(v, "item") else v) for k, v in ((k, res[k]) for k in RESULT_KEYS)}
+
+
+def same_value(got, want):
+    if isinstance(want, float) and not np.isfinite(want):
+        return got is None
+    return got == want
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="已執行中的服務 (預設在本行程內啟動)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None, help="本地服務的運算行程數 (預設 = CPU 核心數)")
+    parser.add_argument("--batch", type=int, default=1, help="每個請求的專案數 (>1 時使用 /evaluate/batch)")
+    parser.add_argument("--variants", type=int, default=64, help="輪流送出的專案變體數")
+    args = parser.parse_args()
+
+    params, config_df, _ = load_project(CONFIG)
+    defaults = resolve_params(params)
+    variants = make_variants(defaults, config_df, args.variants)
+    # 只送出部分參數，驗證服務以 default_config.json 補齊缺漏值 (與 App 相同)
+    payloads = [build_project_dict({k: v for k, v in p.items() if v != defaults[k]}, d, "load-test") for _, p, d in variants]
+    bodies = [json.dumps(p).encode("utf-8") for p in payloads]
+    expected = [expected_result(p, d, defaults) for _, p, d in variants]
+
+    stop = None
+    if args.url:
+        url = urlparse(args.url)
+        host, port, workers = url.hostname, url.port, "?"
+    else:
+        host = "127.0.0.1"
+        port, workers, stop = start_local_service(args.workers, defaults)
+
+    n_req = args.requests
+    latencies = np.zeros(n_req)
+    mismatches = []
+    local = threading.local()
+
+    def send(i):
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(host, port, timeout=60)
+        idx = [(i * args.batch + j) % len(bodies) for j in range(args.batch)]
+        if args.batch == 1:
+            path, body = "/evaluate", bodies[idx[0]]
+        else:
+            path, body = "/evaluate/batch", b'{"projects": [' + b", ".join(bodies[j] for j in idx) + b"]}"
+        t0 = time.perf_counter()
+        conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        data = json.loads(resp.read())
+        latencies[i] = time.perf_counter() - t0
+        results = [data] if args.batch == 1 else data["results"]
+        for j, res in zip(idx, results):
+            bad = [k for k in RESULT_KEYS if not same_value(res.get(k), expected[j][k])]
+            if resp.status != 200 or res.get("status") != "OK" or bad:
+                mismatches.append((i, j, resp.status, bad or res.get("error")))
+
+    # 暖機 (建立連線)
+    with ThreadPoolExecutor(args.concurrency) as ex:
+        list(ex.map(send, range(min(n_req, args.concurrency))))
+    mismatches.clear()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as ex:
+        list(ex.map(send, range(n_req)))
+    elapsed = time.perf_counter() - t0
+    if stop is not None:
+        stop()
+
+    pct = np.percentile(latencies * 1e3, PERCENTILES)
+    print(f"服務       : http://{host}:{port}  (workers = {workers})")
+    print(f"請求       : {n_req:,} 次 × {args.batch} 專案，並行 {args.concurrency} 條連線，耗時 {elapsed:.2f} s")
+    print(f"吞吐量     : {n_req / elapsed:,.0f} req/s｜{n_req * args.batch / elapsed:,.0f} 專案/s")
+    print("延遲 (ms)  : " + "  ".join(f"P{q} {v:.2f}" for q, v in zip(PERCENTILES, pct)) + f"  max {latencies.max() * 1e3:.2f}")
+    if mismatches:
+        sys.exit(f"❌ {len(mismatches)} 筆回應與 evaluate_project 不一致，例如：{mismatches[:3]}")
+    print("等價性檢查 : ✅ (所有回應與 evaluate_project 完全一致)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""效能基準測試套件 (Benchmark Suite)
+
+量測各階段耗時並輸出 JSON，可與先前的結果比較 (不同版本的程式或專案設定檔)：
+- thermal   : calc_thermal_resistance (row-wise) / calc_thermal_resistance_vec，合成 BOM 10 ~ 100k 列
+- fin_count : calc_fin_count 逐點 / calc_fin_count_vec，大範圍 W_hsk × Gap
+- pipeline  : evaluate_project (單一專案)、evaluate_design_arrays (10^5 設計點)、多專案比較、Pareto 前緣、暫態模擬 (24 h @ 1 s)
+- mesh      : build_fin_mesh (full / lite) 與 3D Figure 序列化
+- figures   : 功耗圓餅圖 / 溫升長條圖的建立與序列化
+- json_io   : 專案檔存檔 / 讀檔來回
+- perf      : PerfRecorder.stage() 關閉 / 開啟時的額外成本 (空區塊)
+
+用法：
+    python benchmarks/run_benchmarks.py -o results/v3.98.json
+    python benchmarks/run_benchmarks.py --config old_v3.85.json --label v3.85 -o results/v3.85.json
+    python benchmarks/run_benchmarks.py --baseline results/v3.85.json --threshold 0.25
+    python benchmarks/run_benchmarks.py --quick --stages thermal pipeline
+
+比較時以各階段的最佳單次耗時 (min) 為準；超過 baseline × (1 + threshold) 視為退化，結束代碼為 1。
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import plotly.graph_objects as go  # noqa: E402
+
+from bench_compare import make_variants  # noqa: E402
+from bench_thermal_kernel import BENCH_GLOBALS, make_bom, run_apply  # noqa: E402
+from rru_engine import calc_fin_count, calc_thermal_resistance_vec, evaluate_project  # noqa: E402
+from rru_engine.compare import evaluate_projects  # noqa: E402
+from rru_engine.pareto import run_pareto  # noqa: E402
+from rru_engine.figures import build_budget_bar, build_power_pie  # noqa: E402
+from rru_engine.mesh3d import build_fin_mesh  # noqa: E402
+from rru_engine.perf import PerfRecorder  # noqa: E402
+from rru_engine.model import resolve_params  # noqa: E402
+from rru_engine.project_io import dump_project_json, load_project, parse_project  # noqa: E402
+from rru_engine.sweep import calc_fin_count_vec, evaluate_design_arrays  # noqa: E402
+from rru_engine.transient import diurnal_profile, simulate_transient  # noqa: E402
+
+SCHEMA_VERSION = 1
+DEFAULT_CONFIG = os.path.join(ROOT, "default_config.json")
+STAGE_GROUPS = ["thermal", "fin_count", "pipeline", "mesh", "figures", "json_io", "perf"]
+
+
+def measure(func, repeat):
+    """timeit.autorange 決定每輪次數 (>= 0.2 s)，回傳每次呼叫的 min / median 秒數"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = np.array(timer.repeat(repeat=repeat, number=number)) / number
+    return {"min_s": float(runs.min()), "median_s": float(np.median(runs)), "number": number, "repeat": repeat}
+
+
+def build_stages(params, components_df, quick=False):
+    """{stage 名稱: 無參數函式}；輸入資料在此先準備好，不計入量測"""
+    stages = {}
+
+    # --- thermal ---
+    sizes = [10, 100, 1000, 10000] + ([] if quick else [100000])
+    for n in sizes:
+        df = make_bom(n)
+        stages[f"thermal.vec.{n}"] = lambda df=df: calc_thermal_resistance_vec(df, BENCH_GLOBALS)
+        if n <= 1000:
+            stages[f"thermal.apply.{n}"] = lambda df=df: run_apply(df)
+
+    # --- fin_count ---
+    W = np.linspace(150.0, 1500.0, 60 if quick else 200)
+    G = np.linspace(1.0, 30.0, 50 if quick else 100)
+    WW, GG = np.meshgrid(W, G)
+    fin_t = 1.2
+    stages[f"fin_count.scalar.{WW.size}"] = lambda: [calc_fin_count(w, g, fin_t) for w, g in zip(WW.ravel(), GG.ravel())]
+    stages[f"fin_count.vec.{WW.size}"] = lambda: calc_fin_count_vec(WW, GG, fin_t)
+
+    # --- pipeline ---
+    p = resolve_params(params)
+    stages["pipeline.evaluate_project"] = lambda: evaluate_project(params, components_df)
+    n_design = 10_000 if quick else 100_000
+    rng = np.random.default_rng(0)
+    design = dict(p)
+    design.update({"Gap": rng.uniform(3.0, 20.0, n_design), "Fin_t": rng.uniform(0.8, 3.0, n_design)})
+    ref = evaluate_project(params, components_df)
+    stages[f"pipeline.design_arrays.{n_design}"] = lambda: evaluate_design_arrays(design, ref['Total_Watts_Sum'], ref['Min_dT_Allowed'])
+    coupled = dict(design, fin_eff_mode="coupled")
+    stages[f"pipeline.design_arrays_coupled.{n_design}"] = lambda: evaluate_design_arrays(coupled, ref['Total_Watts_Sum'], ref['Min_dT_Allowed'])
+    n_pareto = 10_000 if quick else 50_000
+    stages[f"pipeline.pareto.{n_pareto}"] = lambda: run_pareto(p, ref['Total_Watts_Sum'], ref['Min_dT_Allowed'], n_pareto,
+                                                               ranges={"Margin": (p['Margin'], p['Margin'] * 1.5)})
+    variants = make_variants(p, components_df, 50)
+    stages["pipeline.compare.50"] = lambda: evaluate_projects(variants)
+    load = diurnal_profile(6.0 if quick else 24.0, 1.0, burst_per_hour=6)
+    stages[f"pipeline.transient.{len(load)}"] = lambda: simulate_transient(ref, p['fin_tech_selector_v2'], load, initial="periodic")
+
+    # --- mesh (大型散熱器，數百片鰭片) ---
+    L, W_big, gap, t = 900.0, 1200.0, 4.0, 0.8
+    n_fins = calc_fin_count(W_big, gap, t)
+    for lod in ("full", "lite"):
+        stages[f"mesh.build.{lod}"] = lambda lod=lod: build_fin_mesh(L, W_big, 69.0, 129.0, n_fins, t, gap, lod=lod)
+    x, y, z, i, j, k = build_fin_mesh(L, W_big, 69.0, 129.0, n_fins, t, gap, lod="full")
+    stages["mesh.figure_json.full"] = lambda: go.Figure(go.Mesh3d(x=x, y=y, z=z, i=i, j=j, k=k)).to_json()
+
+    # --- figures ---
+    valid_rows, total_power = ref['valid_rows'], ref['Total_Power']
+    stages["figures.pie"] = lambda: build_power_pie(valid_rows, total_power)
+    stages["figures.bar"] = lambda: build_budget_bar(valid_rows)
+    fig_pie, fig_bar = build_power_pie(valid_rows, total_power), build_budget_bar(valid_rows)
+    stages["figures.pie_json"] = lambda: fig_pie.to_json()
+    stages["figures.bar_json"] = lambda: fig_bar.to_json()
+
+    # --- json_io ---
+    for label, df in (("config", components_df), ("bom1000", make_bom(1000))):
+        text = dump_project_json(params, df, "bench")
+        stages[f"json_io.dump.{label}"] = lambda df=df: dump_project_json(params, df, "bench")
+        stages[f"json_io.load.{label}"] = lambda text=text: parse_project(json.loads(text))
+
+    # --- perf (儀表化本身的成本) ---
+    for label, enabled in (("disabled", False), ("enabled", True)):
+        rec = PerfRecorder(enabled=enabled)
+        rec.begin_run()
+
+        def empty_stage(rec=rec):
+            with rec.stage("bench"):
+                pass
+        stages[f"perf.stage.{label}"] = empty_stage
+    return stages
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "-C", ROOT, "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(config, label, stage_filter=None, repeat=5, quick=False):
+    params, components_df, meta = load_project(config)
+    with open(config, "rb") as f:
+        config_sha = hashlib.sha256(f.read()).hexdigest()[:12]
+    stages = build_stages(params, components_df, quick)
+    if stage_filter:
+        stages = {k: v for k, v in stages.items() if k.split(".")[0] in stage_filter}
+
+    results = {}
+    for name, func in stages.items():
+        results[name] = measure(func, repeat)
+        print(f"  {name:<32} {results[name]['min_s'] * 1e3:>10.3f} ms", file=sys.stderr, flush=True)
+    return {
+        "schema": SCHEMA_VERSION,
+        "label": label or meta.get("version") or "dev",
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "git": git_revision(),
+        "config": {"path": os.path.relpath(config, ROOT), "sha256": config_sha, "version": meta.get("version")},
+        "env": {
+            "python": platform.python_version(), "numpy": np.__version__,
+            "pandas": sys.modules["pandas"].__version__, "plotly": sys.modules["plotly"].__version__,
+            "platform": platform.platform(), "processor": platform.processor(),
+        },
+        "quick": quick,
+        "stages": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """回傳 (rows, regressions)；只比較兩邊都有的階段"""
+    rows, regressions = [], []
+    for name, cur in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            continue
+        ratio = cur["min_s"] / base["min_s"] if base["min_s"] > 0 else float("inf")
+        status = "REGRESSION" if ratio > 1 + threshold else "faster" if ratio < 1 / (1 + threshold) else "ok"
+        rows.append((name, base["min_s"], cur["min_s"], ratio, status))
+        if status == "REGRESSION":
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="結果 JSON 路徑 (省略則只印出)")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="pipeline / figures / json_io 使用的專案檔")
+    parser.add_argument("--label", help="結果標籤 (預設為專案檔 meta.version)")
+    parser.add_argument("--baseline", help="要比較的先前結果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="退化門檻 (0.25 = 慢 25%%)")
+    parser.add_argument("--stages", nargs="+", choices=STAGE_GROUPS, help="只跑指定群組")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="縮小資料量 (CI / 快速檢查)")
+    args = parser.parse_args()
+
+    print(f"Running benchmarks ({args.config}) ...", file=sys.stderr)
+    current = run_suite(args.config, args.label, args.stages, args.repeat, args.quick)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"結果已寫入 {args.output}", file=sys.stderr)
+
+    if not args.baseline:
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows, regressions = compare(current, baseline, args.threshold)
+    print(f"\n{'stage':<32} | {baseline['label'][:10]:>10} | {current['label'][:10]:>10} | {'ratio':>6} | status")
+    print("-" * 80)
+    for name, base_s, cur_s, ratio, status in rows:
+        print(f"{name:<32} | {base_s * 1e3:>8.3f}ms | {cur_s * 1e3:>8.3f}ms | {ratio:>6.2f} | {status}")
+    if regressions:
+        print(f"\n❌ {len(regressions)} 個階段退化超過 {args.threshold:.0%}：{', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\n✅ 沒有階段退化超過 {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
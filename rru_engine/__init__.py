@@ -0,0 +1,14 @@
+"""5G RRU 熱流引擎 (Headless Engine)
+
+不依賴 Streamlit 的運算核心，供 app.py 與批次工具共用。
+"""
+from .defaults import DEFAULT_COMPONENT_DATA, DEFAULT_GLOBALS
+from .drc import check_drc
+from .geometry import calc_fin_count, calc_h_value
+from .model import evaluate_project, resolve_params
+from .project_io import load_project, parse_project
+from .thermal import (
+    COMPONENT_RESULT_COLUMNS,
+    calc_thermal_resistance,
+    calc_thermal_resistance_vec,
+)
@@ -0,0 +1,455 @@
+"""多專案欄位式封存檔 (.rrua, Columnar Project Archive)
+
+大量歷史設計以單一檔案保存，取代上萬個縮排 JSON：
+- 元件表依欄位連續存放 (所有專案串接)，數值欄為固定型別的二進位陣列，
+  文字欄以字典編碼 (類別碼 + 類別表)，例如 Board_Type / TIM_Type 只需 1 byte
+- 全域參數為固定 schema：數值參數一個 float64 矩陣 (專案 × 參數)，文字參數為類別碼
+- 檔頭為 JSON，之後每個陣列對齊 64 bytes；讀檔以 np.memmap 開啟，只有被讀取的專案會載入記憶體
+
+檔案結構：
+    MAGIC (8 bytes) | 檔頭長度 (uint64 LE) | 檔頭 JSON (utf-8) | padding | 陣列資料 ...
+
+與 JSON 專案檔無損互轉：parse_project(JSON) 與 ProjectArchive.load() 得到相同的參數 (含 int / float 型別與順序)、
+元件表 (含欄位順序與 dtype) 與 meta。無法以固定型別表示的欄位 (混合型別的 object 欄) 以逐格 JSON 保存。
+
+用法：
+    python -m rru_engine.archive pack projects/ -o library.rrua --recursive
+    python -m rru_engine.archive ls library.rrua
+    python -m rru_engine.archive unpack library.rrua -o projects_out/
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .defaults import DEFAULT_GLOBALS
+from .project_io import build_meta, load_project
+
+ARCHIVE_EXT = ".rrua"
+ARCHIVE_MAGIC = b"RRUARCH\x01"
+ARCHIVE_VERSION = 1
+ALIGN = 64
+
+# 全域參數固定 schema (檔頭另存一份，讀檔不依賴目前版本的預設值)
+PARAM_NUMERIC_KEYS = [k for k, v in DEFAULT_GLOBALS.items() if not isinstance(v, str)]
+PARAM_TEXT_KEYS = [k for k, v in DEFAULT_GLOBALS.items() if isinstance(v, str)]
+
+_MAX_EXACT_INT = 2 ** 53  # int 欄與 float 欄合併時，超過此值無法以 float64 無損表示
+
+
+def is_archive(data):
+    """bytes / 檔案路徑是否為 .rrua 封存檔 (以 MAGIC 判斷)"""
+    if isinstance(data, (str, os.PathLike)):
+        with open(data, "rb") as f:
+            data = f.read(len(ARCHIVE_MAGIC))
+    return bytes(data[:len(ARCHIVE_MAGIC)]) == ARCHIVE_MAGIC
+
+
+# ==================================================
+# 寫入
+# ==================================================
+def _column_kind(series):
+    """pandas 欄位 -> 封存型別 (bool / int / float / category / json)"""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) and not series.hasnans:
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype) and not series.hasnans:
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if isinstance(dtype, pd.StringDtype):
+        return "category"
+    if dtype == object and all(type(v) is str for v in series.to_numpy()):
+        return "category"  # object 欄但全為字串 (無缺值)
+    return "json"
+
+
+def _merge_kinds(parts):
+    """同名欄位在不同專案的型別不同時，取可無損容納全部的型別"""
+    kinds = {k for _, _, k in parts}
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds == {"int", "float"}:
+        if all(np.abs(s.to_numpy()).max(initial=0) <= _MAX_EXACT_INT for _, s, k in parts if k == "int"):
+            return "float"
+    return "json"
+
+
+def _json_cell(v):
+    if isinstance(v, np.generic):
+        v = v.item()
+    if v is pd.NA:
+        v = None
+    if not isinstance(v, (str, int, float, bool, type(None))):
+        raise ValueError(f"無法封存的元件表數值型別：{type(v).__name__}")
+    return json.dumps(v, ensure_ascii=False)
+
+
+class _Writer:
+    """收集陣列並計算對齊後的位移"""
+
+    def __init__(self):
+        self.blocks = []
+        self.size = 0
+
+    def add(self, array, dtype):
+        array = np.ascontiguousarray(array, dtype=dtype)
+        offset = self.size
+        self.blocks.append((offset, array))
+        self.size = -(-(offset + array.nbytes) // ALIGN) * ALIGN
+        return {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+
+def _int_dtype(values):
+    """整數欄以能容納全部數值的最小寬度儲存 (讀回時還原為原本的 dtype)"""
+    lo, hi = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for dtype in ("<i1", "<i2", "<i4"):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return "<i8"
+
+
+def _code_dtype(n_categories):
+    return "<i1" if n_categories < 2 ** 7 else "<i2" if n_categories < 2 ** 15 else "<i4"
+
+
+def _encode_params(projects, w):
+    """全域參數 -> 數值矩陣 + 類別碼；不符 schema 的參數 (型別不同、額外鍵) 存於 extra_params"""
+    n = len(projects)
+    numeric = np.full((n, len(PARAM_NUMERIC_KEYS)), np.nan)
+    present = np.zeros((n, len(PARAM_NUMERIC_KEYS)), dtype=bool)
+    is_int = np.zeros_like(present)
+    text_values = {k: [None] * n for k in PARAM_TEXT_KEYS}
+    extras, orders = [], []
+    num_index = {k: j for j, k in enumerate(PARAM_NUMERIC_KEYS)}
+    default_order = PARAM_NUMERIC_KEYS + PARAM_TEXT_KEYS
+    for i, (_, params, _, _) in enumerate(projects):
+        extra = {}
+        for k, v in params.items():
+            if k in num_index and isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_)):
+                j = num_index[k]
+                numeric[i, j], present[i, j] = v, True
+                is_int[i, j] = isinstance(v, (int, np.integer))
+            elif k in text_values and isinstance(v, str):
+                text_values[k][i] = v
+            else:
+                extra[k] = v.item() if isinstance(v, np.generic) else v
+        extras.append(extra or None)
+        keys = list(params)
+        orders.append(None if keys == [k for k in default_order if k in params] else keys)
+
+    header = {"numeric_keys": PARAM_NUMERIC_KEYS, "text_keys": PARAM_TEXT_KEYS,
+              "numeric": w.add(numeric, "<f8"), "present": w.add(present, "|b1"), "is_int": w.add(is_int, "|b1"),
+              "text": {}}
+    for k, values in text_values.items():
+        codes, cats = pd.factorize(pd.Series(values, dtype=object))
+        header["text"][k] = {"categories": [str(c) for c in cats], **w.add(codes, _code_dtype(len(cats)))}
+    return header, extras, orders
+
+
+def _encode_components(projects, w):
+    """所有專案的元件表依欄位串接；每個專案記錄自己的欄位順序與 dtype (schema)
+
+    相同 schema 的專案先合併成一張表再逐欄編碼 (避免上萬次逐專案取欄)。
+    """
+    lengths = np.array([len(df) for _, _, df, _ in projects], dtype=np.int64)
+    row_offsets = np.concatenate([[0], np.cumsum(lengths)])
+    schemas, schema_ids, groups = [], [], {}
+    for i, (name, _, df, _) in enumerate(projects):
+        if not df.columns.is_unique:
+            raise ValueError(f"專案 {name} 的元件表欄位名稱重複")
+        schema = (tuple(str(c) for c in df.columns), tuple(str(t) for t in df.dtypes))
+        if schema not in groups:
+            groups[schema] = (len(schemas), [])
+            schemas.append({"columns": list(schema[0]), "dtypes": list(schema[1])})
+        schema_id, members = groups[schema]
+        members.append(i)
+        schema_ids.append(schema_id)
+
+    col_parts = {}  # col -> [(該 schema 的列位置, 合併後的欄位, kind)]
+    for _, members in groups.values():
+        frames = [projects[i][2] for i in members]
+        merged = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        rows = np.concatenate([np.arange(row_offsets[i], row_offsets[i + 1]) for i in members])
+        for col in merged.columns:
+            series = merged[col]
+            col_parts.setdefault(str(col), []).append((rows, series, _column_kind(series)))
+
+    total = int(row_offsets[-1])
+    columns = {}
+    for col, parts in col_parts.items():
+        kind = _merge_kinds(parts)
+        if kind in ("bool", "int", "float"):
+            dtype = {"bool": "|b1", "int": "<i8", "float": "<f8"}[kind]
+            data = np.zeros(total, dtype=dtype) if kind != "float" else np.full(total, np.nan)
+            for rows, series, _ in parts:
+                data[rows] = series.to_numpy(dtype=dtype if kind != "float" else float)
+            if kind == "int":
+                dtype = _int_dtype(data)
+            columns[col] = {"kind": kind, **w.add(data, dtype)}
+        elif kind == "category":
+            data = np.full(total, None, dtype=object)
+            for rows, series, _ in parts:
+                data[rows] = series.to_numpy(dtype=object)
+            codes, cats = pd.factorize(data)  # 缺值 (含未使用的列) -> -1
+            columns[col] = {"kind": kind, "categories": [str(c) for c in cats], **w.add(codes, _code_dtype(len(cats)))}
+        else:
+            cells = [b"null"] * total
+            for rows, series, _ in parts:
+                for r, v in zip(rows, series.to_numpy(dtype=object)):
+                    cells[r] = _json_cell(v).encode("utf-8")
+            offsets = np.concatenate([[0], np.cumsum([len(c) for c in cells], dtype=np.int64)])
+            blob = np.frombuffer(b"".join(cells), dtype=np.uint8)
+            columns[col] = {"kind": kind, "offsets": w.add(offsets, "<i8"), "blob": w.add(blob, "|u1")}
+    return {"row_offsets": w.add(row_offsets, "<i8"), "schema_ids": w.add(np.array(schema_ids, dtype=np.int32), "<i4"),
+            "schemas": schemas, "columns": columns}
+
+
+def dump_archive(projects):
+    """[(name, params, components_df, meta), ...] -> .rrua bytes"""
+    projects = list(projects)
+    names = [str(p[0]) for p in projects]
+    if len(set(names)) != len(names):
+        raise ValueError("封存檔內的專案名稱不可重複")
+    w = _Writer()
+    params_header, extras, orders = _encode_params(projects, w)
+    header = {
+        "format": "rru-archive", "version": ARCHIVE_VERSION, "n_projects": len(projects),
+        "names": names, "meta": [p[3] for p in projects],
+        "extra_params": extras, "param_order": orders,
+        "params": params_header, "components": _encode_components(projects, w),
+    }
+    head = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = -(-(len(ARCHIVE_MAGIC) + 8 + len(head)) // ALIGN) * ALIGN
+    buf = bytearray(data_start + w.size)
+    buf[:len(ARCHIVE_MAGIC)] = ARCHIVE_MAGIC
+    buf[len(ARCHIVE_MAGIC):len(ARCHIVE_MAGIC) + 8] = len(head).to_bytes(8, "little")
+    buf[len(ARCHIVE_MAGIC) + 8:len(ARCHIVE_MAGIC) + 8 + len(head)] = head
+    for offset, array in w.blocks:
+        buf[data_start + offset:data_start + offset + array.nbytes] = array.tobytes()
+    return bytes(buf)
+
+
+def dump_project_archive(params, components_df, version, name="project"):
+    """單一專案 -> .rrua bytes (對應 dump_project_json)"""
+    return dump_archive([(name, params, components_df, build_meta(version))])
+
+
+def save_archive(path, projects):
+    data = dump_archive(projects)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+# ==================================================
+# 讀取
+# ==================================================
+class ProjectArchive:
+    """.rrua 讀取器：檔頭一次解析，各專案的元件表在 load() 時才從 buffer 切片解碼"""
+
+    def __init__(self, buffer):
+        buf = np.frombuffer(buffer, dtype=np.uint8) if not isinstance(buffer, np.ndarray) else buffer
+        if bytes(buf[:len(ARCHIVE_MAGIC)]) != ARCHIVE_MAGIC:
+            raise ValueError("不是有效的 .rrua 封存檔")
+        head_len = int.from_bytes(bytes(buf[len(ARCHIVE_MAGIC):len(ARCHIVE_MAGIC) + 8]), "little")
+        head_end = len(ARCHIVE_MAGIC) + 8 + head_len
+        self.header = json.loads(bytes(buf[len(ARCHIVE_MAGIC) + 8:head_end]).decode("utf-8"))
+        if self.header.get("format") != "rru-archive" or self.header.get("version", 0) > ARCHIVE_VERSION:
+            raise ValueError(f"不支援的封存檔版本：{self.header.get('version')}")
+        self._buf = buf
+        self._data_start = -(-head_end // ALIGN) * ALIGN
+        comp = self.header["components"]
+        self._row_offsets = self._array(comp["row_offsets"])
+        self._schema_ids = self._array(comp["schema_ids"])
+        self.names = self.header["names"]
+        self._name_index = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def open(cls, path):
+        """以 memmap 開啟 (不會一次讀入整個檔案)"""
+        return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(data)
+
+    def __len__(self):
+        return self.header["n_projects"]
+
+    def _array(self, spec, start=0, stop=None):
+        """檔頭中的陣列描述 -> ndarray (第一維可只取 [start:stop]，其餘資料不會被讀取)"""
+        dtype = np.dtype(spec["dtype"])
+        shape = spec["shape"]
+        inner = int(np.prod(shape[1:], dtype=np.int64))
+        stop = shape[0] if stop is None else stop
+        offset = self._data_start + spec["offset"] + start * inner * dtype.itemsize
+        arr = np.frombuffer(self._buf, dtype=dtype, count=(stop - start) * inner, offset=offset)
+        return arr.reshape((stop - start,) + tuple(shape[1:]))
+
+    def index_of(self, key):
+        if isinstance(key, (int, np.integer)):
+            if not -len(self) <= key < len(self):
+                raise IndexError(f"專案索引超出範圍：{key}")
+            return int(key) % len(self)
+        if key not in self._name_index:
+            raise KeyError(f"封存檔中沒有專案：{key}")
+        return self._name_index[key]
+
+    def params_table(self):
+        """所有專案的數值參數 (DataFrame，專案 × 參數；缺漏者為 NaN)，不需解碼元件表"""
+        ph = self.header["params"]
+        values = np.where(self._array(ph["present"]), self._array(ph["numeric"]), np.nan)
+        table = pd.DataFrame(values, columns=ph["numeric_keys"], index=pd.Index(self.names, name="name"))
+        for k, spec in ph["text"].items():
+            cats = np.array(spec["categories"] + [None], dtype=object)
+            table[k] = cats[self._array(spec)]
+        return table
+
+    def load_params(self, i):
+        ph = self.header["params"]
+        values = self._array(ph["numeric"], i, i + 1)[0]
+        present = self._array(ph["present"], i, i + 1)[0]
+        is_int = self._array(ph["is_int"], i, i + 1)[0]
+        params = {}
+        for j, k in enumerate(ph["numeric_keys"]):
+            if present[j]:
+                params[k] = int(values[j]) if is_int[j] else float(values[j])
+        for k, spec in ph["text"].items():
+            code = int(self._array(spec, i, i + 1)[0])
+            if code >= 0:
+                params[k] = spec["categories"][code]
+        params.update(self.header["extra_params"][i] or {})
+        order = self.header["param_order"][i]
+        return {k: params[k] for k in order} if order else params
+
+    def load_components(self, i):
+        comp = self.header["components"]
+        a, b = int(self._row_offsets[i]), int(self._row_offsets[i + 1])
+        schema = comp["schemas"][int(self._schema_ids[i])]
+        if not schema["columns"]:
+            return pd.DataFrame([])  # 與 parse_project 的空元件表相同
+        data = {}
+        for col, dtype in zip(schema["columns"], schema["dtypes"]):
+            spec = comp["columns"][col]
+            data[col] = self._decode_column(spec, a, b, pd.api.types.pandas_dtype(dtype))
+        return pd.DataFrame(data, columns=schema["columns"], index=pd.RangeIndex(b - a))
+
+    def _decode_column(self, spec, a, b, dtype):
+        """第 a:b 列 -> 原始 dtype 的陣列"""
+        kind = spec["kind"]
+        if kind in ("bool", "int", "float"):
+            return self._array(spec, a, b).astype(dtype)  # astype 一律複製 (memmap 為唯讀)
+        if kind == "category":
+            cats = np.array(spec["categories"] + [None], dtype=object)
+            return pd.array(cats[self._array(spec, a, b)], dtype=dtype) if dtype != object else cats[self._array(spec, a, b)]
+        offsets = self._array(spec["offsets"], a, b + 1)
+        raw = bytes(self._array(spec["blob"], int(offsets[0]), int(offsets[-1])))
+        bounds = offsets - offsets[0]
+        cells = [json.loads(raw[s:e]) for s, e in zip(bounds[:-1], bounds[1:])]
+        return pd.array(cells, dtype=dtype) if dtype != object else np.array(cells + [None], dtype=object)[:-1]
+
+    def components_frame(self, columns=None):
+        """所有專案的元件表合併為一張表 (加上 project 欄)，供整個設計庫的查詢 / 統計
+
+        columns 只取指定欄位；各欄以封存型別解碼 (不還原個別專案的 dtype)，專案缺少的欄位為缺值。
+        """
+        comp = self.header["components"]
+        total = int(self._row_offsets[-1])
+        names = pd.Categorical.from_codes(np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self._row_offsets)), self.names)
+        data = {"project": names}
+        for col in columns or comp["columns"]:
+            spec = comp["columns"][col]
+            dtype = {"bool": np.dtype(bool), "int": np.dtype("int64"), "float": np.dtype(float),
+                     "category": pd.CategoricalDtype(spec.get("categories")), "json": np.dtype(object)}[spec["kind"]]
+            if spec["kind"] == "category":
+                data[col] = pd.Categorical.from_codes(self._array(spec).astype(np.int32), dtype=dtype)
+            else:
+                data[col] = self._decode_column(spec, 0, total, dtype)
+        return pd.DataFrame(data)
+
+    def load(self, key):
+        """單一專案 -> (global_params, components_df, meta)，與 parse_project 相同格式"""
+        i = self.index_of(key)
+        return self.load_params(i), self.load_components(i), self.header["meta"][i]
+
+    def project_dict(self, key):
+        """單一專案 -> JSON 專案檔格式的 dict (meta + global_params + components_data)"""
+        params, df, meta = self.load(key)
+        return {"meta": meta, "global_params": params, "components_data": df.to_dict('records')}
+
+    def __iter__(self):
+        for i, name in enumerate(self.names):
+            yield (name,) + self.load(i)
+
+
+# ==================================================
+# CLI
+# ==================================================
+def _pack(args):
+    from .batch import iter_project_files
+    projects = []
+    for path in iter_project_files(args.input, pattern=".json", recursive=args.recursive):
+        params, df, meta = load_project(path)
+        name = os.path.splitext(os.path.relpath(path, args.input if os.path.isdir(args.input) else os.path.dirname(path)))[0]
+        projects.append((name, params, df, meta))
+    size = save_archive(args.output, projects)
+    print(f"✅ {len(projects)} 個專案 -> {args.output} ({size / 1024:,.1f} KB)", file=sys.stderr)
+
+
+def unpack_path(output_dir, name):
+    """專案名稱 -> output_dir 下的 .json 路徑；名稱為絕對路徑或會跑出 output_dir (../) 時丟出 ValueError
+
+    名稱來自封存檔內容，不可信任：以 realpath 解析 (含符號連結) 後確認仍在 output_dir 之內。
+    """
+    root = os.path.realpath(output_dir)
+    path = os.path.realpath(os.path.join(root, name + ".json"))
+    if os.path.isabs(name) or os.path.commonpath([root, path]) != root:
+        raise ValueError(f"封存檔內的專案名稱不安全，拒絕解開：{name!r}")
+    return path
+
+
+def _unpack(args):
+    archive = ProjectArchive.open(args.input)
+    # 先檢查所有名稱，任何一個不安全就不寫入任何檔案
+    paths = [unpack_path(args.output, name) for name in archive.names]
+    for name, path in zip(archive.names, paths):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(archive.project_dict(name), f, indent=4)
+    print(f"✅ {len(archive)} 個專案 -> {args.output}", file=sys.stderr)
+
+
+def _ls(args):
+    archive = ProjectArchive.open(args.input)
+    lengths = np.diff(archive._row_offsets)
+    for name, meta, n_rows in zip(archive.names, archive.header["meta"], lengths):
+        print(f"{name}\t{(meta or {}).get('version', '')}\t{n_rows} rows")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rru_engine.archive", description="RRU 專案封存檔 (.rrua) 工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("pack", help="JSON 專案檔資料夾 -> .rrua")
+    p.add_argument("input")
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--recursive", action="store_true")
+    p.set_defaults(func=_pack)
+    p = sub.add_parser("unpack", help=".rrua -> JSON 專案檔")
+    p.add_argument("input")
+    p.add_argument("-o", "--output", required=True)
+    p.set_defaults(func=_unpack)
+    p = sub.add_parser("ls", help="列出封存檔內的專案")
+    p.add_argument("input")
+    p.set_defaults(func=_ls)
+    args = parser.parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
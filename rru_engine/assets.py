@@ -0,0 +1,144 @@
+"""設定檔與靜態資源快取 (每個 process 只解析一次)
+
+default_config.json 與 reference_style.* 在每次 rerun 都會用到；這裡以
+(路徑, mtime, size) 為簽章快取解析結果，檔案更新時自動重新讀取。
+回傳的是不可變物件 (MappingProxyType / tuple / bytes)，可安全地讓所有 session 共用；
+預設元件表為共用的 DataFrame (copy-on-write，不可就地修改)。
+"""
+import json
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+import pandas as pd
+
+from .defaults import DEFAULT_COMPONENT_DATA
+
+ConfigSnapshot = namedtuple("ConfigSnapshot", "exists error global_params components_data")
+ReferenceImage = namedtuple("ReferenceImage", "data name mime")
+
+REFERENCE_IMAGE_FILES = ['reference_style.png', 'reference_style.jpg', 'reference_style.jpeg']
+
+
+def file_signature(path):
+    """(mtime_ns, size)；檔案不存在時回傳 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def freeze(obj):
+    """遞迴轉為不可變結構 (dict -> MappingProxyType, list -> tuple)"""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def unfreeze(obj):
+    """freeze 的反向轉換 (MappingProxyType -> dict, tuple -> list)，交給 pandas 建表用"""
+    if isinstance(obj, (dict, MappingProxyType)):
+        return {k: unfreeze(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [unfreeze(v) for v in obj]
+    return obj
+
+
+class FileCache:
+    """以檔案簽章失效的 process 層級快取"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, path, loader):
+        sig = file_signature(path)
+        key = (os.path.abspath(path), loader.__name__)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                self.hits += 1
+                return entry[1]
+        value = loader(path, sig)
+        with self._lock:
+            self._entries[key] = (sig, value)
+            self.loads += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "loads": self.loads, "entries": len(self._entries)}
+
+
+_file_cache = FileCache()
+
+
+def _component_records(data):
+    """components_data -> list of records；欄位導向 (dict of lists) 的舊版設定檔與 pd.DataFrame(data) 一樣可讀"""
+    if isinstance(data, dict):
+        return pd.DataFrame(data).to_dict('records')
+    return data
+
+
+def _parse_config(path, sig):
+    if sig is None:
+        return ConfigSnapshot(False, None, None, None)
+    try:
+        with open(path, "r", encoding='utf-8') as f:
+            data = json.load(f)
+        components = _component_records(data.get('components_data'))
+    except Exception as e:
+        return ConfigSnapshot(True, str(e), None, None)
+    return ConfigSnapshot(True, None, freeze(data.get('global_params')), freeze(components))
+
+
+def _read_image(path, sig):
+    if sig is None:
+        return None
+    with open(path, "rb") as f:
+        data = f.read()
+    ext = path.split('.')[-1].lower()
+    return ReferenceImage(data, os.path.basename(path), 'image/png' if ext == 'png' else 'image/jpeg')
+
+
+def load_config(path):
+    """讀取專案格式的設定檔 (global_params / components_data)"""
+    return _file_cache.get(path, _parse_config)
+
+
+def _build_default_components(path, sig):
+    snapshot = load_config(path)
+    data = snapshot.components_data if snapshot.components_data is not None else DEFAULT_COMPONENT_DATA
+    return pd.DataFrame(unfreeze(data))
+
+
+def load_default_components(path):
+    """預設元件表 (設定檔有 components_data 則用之)，所有 session 共用同一個 DataFrame
+
+    pandas 以 copy-on-write 共用資料；呼叫端只能讀取或取得修改後的新表，不可就地修改。
+    """
+    return _file_cache.get(path, _build_default_components)
+
+
+def load_reference_image(candidates=REFERENCE_IMAGE_FILES):
+    """依序尋找 AI 渲染參考圖，回傳第一個存在的 ReferenceImage (或 None)"""
+    for path in candidates:
+        image = _file_cache.get(path, _read_image)
+        if image is not None:
+            return image
+    return None
+
+
+def cached_load(path, loader):
+    """以 (路徑, mtime, size) 快取任意檔案的解析結果；loader(path, sig) 在 sig 為 None 時表示檔案不存在"""
+    return _file_cache.get(path, loader)
+
+
+def asset_cache_stats():
+    return _file_cache.stats()
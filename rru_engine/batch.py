@@ -0,0 +1,168 @@
+"""批次評估 CLI：掃描專案檔資料夾，每個專案輸出一列結果 (CSV / JSONL)
+
+用法：
+    python -m rru_engine.batch projects/ -o results.csv
+    python -m rru_engine.batch projects/ -o results.jsonl --recursive
+    python -m rru_engine.batch projects/ -o - --format jsonl      # 輸出到 stdout
+    python -m rru_engine.batch library.rrua -o results.csv        # 封存檔內的每個專案各一列
+
+結果逐筆寫出 (streaming)，單一檔案錯誤只會記錄在該列，不會中斷整批。
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+
+from .archive import ARCHIVE_EXT, ProjectArchive
+from .model import evaluate_project, resolve_params
+from .project_io import load_project
+
+RESULT_FIELDS = [
+    "file", "version", "status", "Total_Power", "Bottleneck_Name", "Min_dT_Allowed",
+    "Fin_Count", "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg",
+    "drc_status", "drc_rule", "drc_msg", "error",
+]
+
+
+def iter_project_files(root, pattern=(".json", ARCHIVE_EXT), recursive=False):
+    """依檔名排序列出專案檔"""
+    if os.path.isfile(root):
+        yield root
+        return
+    if recursive:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith(pattern):
+                    yield os.path.join(dirpath, name)
+    else:
+        for name in sorted(os.listdir(root)):
+            path = os.path.join(root, name)
+            if name.endswith(pattern) and os.path.isfile(path):
+                yield path
+
+
+def _to_builtin(v):
+    """numpy 純量 -> Python 原生型別 (json 可序列化)"""
+    return v.item() if hasattr(v, "item") else v
+
+
+def json_value(v):
+    """numpy 純量 -> Python 原生型別；NaN / inf -> None (JSON 沒有非有限數值)"""
+    v = _to_builtin(v)
+    if isinstance(v, float) and not math.isfinite(v):
+        return None
+    return v
+
+
+def evaluate_file(path, defaults=None):
+    """評估單一專案檔，回傳一列結果 dict"""
+    return _evaluate_loaded(path, lambda: load_project(path), defaults)
+
+
+def evaluate_archive(path, defaults=None):
+    """評估封存檔內的每個專案 (逐一從 memmap 載入)，依序產生結果 dict；file 欄為「檔名#專案名稱」"""
+    try:
+        archive = ProjectArchive.open(path)
+    except Exception as e:
+        row = dict.fromkeys(RESULT_FIELDS)
+        row.update(file=path, status="ERROR", error=f"{type(e).__name__}: {e}")
+        yield row
+        return
+    for i, name in enumerate(archive.names):
+        yield _evaluate_loaded(f"{path}#{name}", lambda: archive.load(i), defaults)
+
+
+def _evaluate_loaded(label, loader, defaults):
+    row = dict.fromkeys(RESULT_FIELDS)
+    row["file"] = label
+    try:
+        params, components_df, meta = loader()
+        row["version"] = meta.get("version", "")
+        res = evaluate_project(resolve_params(params, defaults), components_df)
+    except Exception as e:
+        row["status"] = "ERROR"
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+    row["status"] = "OK"
+    for k in ("Total_Power", "Bottleneck_Name", "Min_dT_Allowed", "Fin_Count", "Fin_Height",
+              "RRU_Height", "Volume_L", "total_weight_kg", "drc_rule", "drc_msg"):
+        row[k] = _to_builtin(res[k])
+    row["drc_status"] = "FAIL" if res["drc_failed"] else "PASS"
+    return row
+
+
+def iter_results(root, recursive=False, defaults=None):
+    """資料夾內的 JSON 專案檔與 .rrua 封存檔 -> 逐筆結果 dict"""
+    for path in iter_project_files(root, recursive=recursive):
+        if path.endswith(ARCHIVE_EXT):
+            yield from evaluate_archive(path, defaults)
+        else:
+            yield evaluate_file(path, defaults)
+
+
+class _CsvSink:
+    def __init__(self, fp):
+        self.fp = fp
+        self.writer = csv.DictWriter(fp, fieldnames=RESULT_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+
+class _JsonlSink:
+    def __init__(self, fp):
+        self.fp = fp
+
+    def write(self, row):
+        # 不可行的設計 Fin_Height = inf (耦合模式)、無瓶頸時 Min_dT_Allowed = NaN：寫成 null，每列皆為合法 JSON
+        record = {k: json_value(v) for k, v in row.items()}
+        self.fp.write(json.dumps(record, ensure_ascii=False, allow_nan=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m rru_engine.batch",
+        description="批次評估 RRU 專案檔 (global_params + components_data)",
+    )
+    parser.add_argument("input", help="專案檔資料夾 (或單一 .json / .rrua 檔)")
+    parser.add_argument("-o", "--output", default="-", help="輸出檔 (.csv / .jsonl)；'-' 表示 stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="輸出格式 (預設依副檔名判斷)")
+    parser.add_argument("--recursive", action="store_true", help="遞迴掃描子資料夾")
+    parser.add_argument("--base-config", help="以此專案檔的 global_params 作為缺漏參數的預設值 (例如 default_config.json)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.output.endswith((".jsonl", ".ndjson")) else "csv")
+    defaults = None
+    if args.base_config:
+        defaults = resolve_params(load_project(args.base_config)[0])
+
+    fp = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    sink = _JsonlSink(fp) if fmt == "jsonl" else _CsvSink(fp)
+    n_ok = n_fail = n_err = 0
+    t0 = time.perf_counter()
+    try:
+        for row in iter_results(args.input, args.recursive, defaults):
+            sink.write(row)
+            fp.flush()
+            if row["status"] == "ERROR":
+                n_err += 1
+            elif row["drc_status"] == "FAIL":
+                n_fail += 1
+            else:
+                n_ok += 1
+    finally:
+        if fp is not sys.stdout:
+            fp.close()
+    elapsed = time.perf_counter() - t0
+    total = n_ok + n_fail + n_err
+    print(f"✅ {total} 個專案完成 ({elapsed:.2f} s)：DRC PASS {n_ok} / FAIL {n_fail} / ERROR {n_err}", file=sys.stderr)
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
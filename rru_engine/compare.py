@@ -0,0 +1,133 @@
+"""多專案比較 (Multi-project Comparison)
+
+N 個專案 (變體) 一次批次評估：
+- 所有元件表堆疊後轉成逐欄 numpy 陣列，影響熱阻的全域參數 (COMPONENT_KEYS) 展開為逐列陣列，
+  calc_thermal_resistance_arrays 只呼叫一次；再依各專案的列區段求總功耗 / 瓶頸
+- 幾何 -> 鰭片高度 / 體積 / 重量 / DRC 以 evaluate_design_arrays 一次算完 N 個專案
+結果與逐一呼叫 evaluate_project 相同；參數型別錯誤或缺欄位的專案只會在該列標記 ERROR。
+"""
+import numpy as np
+import pandas as pd
+
+from .defaults import COMPONENT_COLUMNS, DEFAULT_GLOBALS
+from .geometry import DEFAULT_FIN_EFF_MODE
+from .model import build_globals_dict, resolve_params
+from .sweep import COMPONENT_KEYS, DRC_RULES, evaluate_design_arrays
+from .thermal import calc_thermal_resistance_arrays, component_arrays
+
+COMPARE_RESULT_COLUMNS = [
+    "name", "status", "Total_Power", "Bottleneck_Name", "Min_dT_Allowed", "Fin_Count",
+    "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg", "drc_status", "drc_rule", "error",
+]
+COMPARE_METRICS = {
+    "Total_Power": "總功耗 (W)", "Fin_Height": "鰭片高度 (mm)", "RRU_Height": "整機高度 (mm)",
+    "Volume_L": "體積 (L)", "total_weight_kg": "重量 (kg)",
+}
+NUMERIC_KEYS = [k for k in DEFAULT_GLOBALS if k != "fin_tech_selector_v2"]
+_NUMBER_TYPES = (int, float, np.integer, np.floating)
+
+
+def _check_project(params, components_df, defaults):
+    """補齊參數並檢查型別 / 欄位，不合格時丟出 ValueError"""
+    p = resolve_params(params, defaults)
+    bad = [k for k in NUMERIC_KEYS if isinstance(p[k], bool) or not isinstance(p[k], _NUMBER_TYPES)]
+    if not isinstance(p["fin_tech_selector_v2"], str):
+        bad.append("fin_tech_selector_v2")
+    if bad:
+        raise ValueError(f"參數型別錯誤: {', '.join(bad)}")
+    if not components_df.empty:
+        missing = [c for c in COMPONENT_COLUMNS if c not in components_df.columns]
+        if missing:
+            raise ValueError(f"元件表缺少欄位: {', '.join(missing)}")
+    return p
+
+
+def _stack_components(frames):
+    """各專案元件表 -> 堆疊後的 {欄位: ndarray} (component_arrays 的格式)
+
+    先以一次 pd.concat 合併 (逐表逐欄轉換的 pandas 額外成本遠大於計算本身)，再直接轉成 numpy 陣列交給
+    calc_thermal_resistance_arrays，不再重建 DataFrame；dtype 不同的欄位合併後為 object，pd.to_numeric 的結果與逐表轉換相同。
+    """
+    return component_arrays(pd.concat([df for df in frames if len(df)], ignore_index=True))
+
+
+def _summarize_segment(total_w, allowed, comp):
+    """單一專案的列區段 -> (Total_Watts_Sum, Min_dT_Allowed, Bottleneck_Name)，與 summarize_components 一致"""
+    valid = total_w > 0
+    if not valid.any():
+        return 0, 50, "None"
+    dt = allowed[valid]
+    if np.isnan(dt).all():
+        return total_w[valid].sum(), np.nan, "None"
+    return total_w[valid].sum(), np.nanmin(dt), comp[valid][np.nanargmin(dt)]
+
+
+def evaluate_projects(projects, defaults=None):
+    """projects: [(名稱, global_params, components_df), ...] -> 每個專案一列的 DataFrame (COMPARE_RESULT_COLUMNS)"""
+    rows = []
+    ok = []  # (rows 位置, 已補齊的參數, 元件表)
+    for name, params, components_df in projects:
+        row = dict.fromkeys(COMPARE_RESULT_COLUMNS)
+        row["name"] = name
+        try:
+            ok.append((len(rows), _check_project(params, components_df, defaults), components_df))
+        except Exception as e:
+            row["status"] = "ERROR"
+            row["error"] = f"{type(e).__name__}: {e}"
+        rows.append(row)
+
+    if ok:
+        counts = np.array([len(df) for _, _, df in ok])
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        if bounds[-1]:
+            stacked = _stack_components([df for _, _, df in ok])
+            pg = dict(ok[0][1])
+            for k in COMPONENT_KEYS:
+                pg[k] = np.repeat(np.array([p[k] for _, p, _ in ok], dtype=float), counts)
+            res = calc_thermal_resistance_arrays(stacked, build_globals_dict(pg))
+            total_w = res['Total_W']
+            allowed = res['Allowed_dT']
+            comp = stacked['Component']
+        summary = [
+            _summarize_segment(total_w[s:e], allowed[s:e], comp[s:e]) if e > s else (0, 50, "None")
+            for s, e in zip(bounds[:-1], bounds[1:])
+        ]
+
+        pts = {k: np.array([p[k] for _, p, _ in ok], dtype=float) for k in NUMERIC_KEYS}
+        pts["fin_tech_selector_v2"] = np.array([p["fin_tech_selector_v2"] for _, p, _ in ok], dtype=object)
+        pts["fin_eff_mode"] = np.array([p.get("fin_eff_mode", DEFAULT_FIN_EFF_MODE) for _, p, _ in ok], dtype=object)
+        out = evaluate_design_arrays(pts, [s[0] for s in summary], [s[1] for s in summary])
+        for j, (pos, _, _) in enumerate(ok):
+            rule = DRC_RULES[out["drc_rule_code"][j]]
+            rows[pos].update({
+                "status": "OK", "Total_Power": float(out["Total_Power"][j]), "Bottleneck_Name": summary[j][2],
+                "Min_dT_Allowed": float(summary[j][1]), "Fin_Count": int(out["Fin_Count"][j]),
+                "Fin_Height": float(out["Fin_Height"][j]), "RRU_Height": float(out["RRU_Height"][j]),
+                "Volume_L": float(out["Volume_L"][j]), "total_weight_kg": float(out["total_weight_kg"][j]),
+                "drc_status": "FAIL" if rule else "PASS", "drc_rule": rule,
+            })
+    return pd.DataFrame(rows, columns=COMPARE_RESULT_COLUMNS)
+
+
+def component_signature(components_df):
+    """元件表摘要 (列數 + 內容雜湊前 6 碼)，用於比較表中判斷元件表是否相同"""
+    if components_df.empty:
+        return "0 列"
+    digest = pd.util.hash_pandas_object(components_df, index=False).sum()
+    return f"{len(components_df)} 列 · {int(digest) & 0xFFFFFF:06x}"
+
+
+def param_diff(projects, defaults=None):
+    """各專案間有差異的全域參數 -> DataFrame (列 = 參數, 欄 = 專案名稱)；最後一列為元件表摘要"""
+    names = [name for name, _, _ in projects]
+    resolved = [resolve_params(params, defaults) for _, params, _ in projects]
+    keys = list(DEFAULT_GLOBALS) + sorted({k for p in resolved for k in p if k not in DEFAULT_GLOBALS})
+    data = {}
+    for k in keys:
+        values = [p.get(k) for p in resolved]
+        if any(v != values[0] for v in values[1:]):
+            data[k] = values
+    signatures = [component_signature(df) for _, _, df in projects]
+    if len(set(signatures)) > 1:
+        data["元件表"] = signatures
+    return pd.DataFrame.from_dict(data, orient="index", columns=names, dtype=object)
@@ -0,0 +1,40 @@
+"""內建預設值 (Internal Defaults)
+
+app.py 會再以 default_config.json 覆蓋；批次工具與服務直接使用此處數值補齊缺漏參數。
+"""
+
+# 1. 全域參數預設值
+DEFAULT_GLOBALS = {
+    "T_amb": 45.0, "Margin": 1.0, 
+    "L_pcb": 350.0, "W_pcb": 250.0, "t_base": 7.0, "H_shield": 20.0, "H_filter": 42.0,
+    "Top": 11.0, "Btm": 13.0, "Left": 11.0, "Right": 11.0,
+    "Coin_L_Setting": 55.0, "Coin_W_Setting": 35.0,
+    "Gap": 13.2, "Fin_t": 1.2,
+    "K_Via": 30.0, "Via_Eff": 0.9,
+    "K_Putty": 9.1, "t_Putty": 0.5,
+    "K_Pad": 7.5, "t_Pad": 1.7,
+    "K_Grease": 3.0, "t_Grease": 0.05,
+    "K_Solder": 58.0, "t_Solder": 0.3, "Voiding": 0.75,
+    "fin_tech_selector_v2": "Embedded Fin (0.95)",
+    "al_density": 2.70, "filter_density": 1.00, 
+    "shielding_density": 0.76, "pcb_surface_density": 0.95
+}
+
+FIN_TECH_OPTIONS = ["Embedded Fin (0.95)", "Die-casting Fin (0.90)"]
+
+# 2. 預設元件清單
+DEFAULT_COMPONENT_DATA = {
+    "Component": ["Final PA", "Driver PA", "Pre Driver", "Circulator", "Cavity Filter", "CPU (FPGA)", "Si5518", "16G DDR", "Power Mod", "SFP"],
+    "Qty": [4, 4, 4, 4, 1, 1, 1, 2, 1, 1],
+    "Power(W)": [52.13, 9.54, 0.37, 2.76, 31.07, 35.00, 2.00, 0.40, 29.00, 0.50],
+    "Height(mm)": [250, 200, 180, 250, 0, 50, 80, 60, 30, 0], 
+    "Pad_L": [20, 5, 2, 10, 0, 35, 8.6, 7.5, 58, 14], 
+    "Pad_W": [10, 5, 2, 10, 0, 35, 8.6, 11.5, 61, 50],
+    "Thick(mm)": [2.5, 2.0, 2.0, 2.0, 0, 0, 2.0, 0, 0, 0],
+    "Board_Type": ["Copper Coin", "Thermal Via", "Thermal Via", "Thermal Via", "None", "None", "Thermal Via", "None", "None", "None"],
+    "Limit(C)": [225, 200, 175, 125, 200, 100, 125, 95, 95, 200],
+    "R_jc": [1.50, 1.70, 50.0, 0.0, 0.0, 0.16, 0.50, 0.0, 0.0, 0.0],
+    "TIM_Type": ["Solder", "Grease", "Grease", "Grease", "None", "Putty", "Pad", "Grease", "Grease", "Grease"]
+}
+
+COMPONENT_COLUMNS = list(DEFAULT_COMPONENT_DATA.keys())
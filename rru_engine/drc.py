@@ -0,0 +1,32 @@
+"""[DRC] 設計規則檢查"""
+
+AR_LIMIT = 12.0              # 流阻比 (Fin_Height / Gap) 上限
+H_CONV_MIN = 4.0             # 有效對流係數下限
+GAP_MIN = 4.0                # 鰭片間距物理極限 (mm)
+EMBEDDED_FIN_H_MAX = 100.0   # Embedded Fin 製程高度上限 (mm)
+
+
+def calc_aspect_ratio(Fin_Height, Gap):
+    """計算流阻比 (Aspect Ratio)"""
+    if Gap > 0 and Fin_Height > 0:
+        return Fin_Height / Gap
+    return 0
+
+
+def check_drc(Gap, Fin_Height, h_conv, fin_tech, fin_eff_mode="fixed"):
+    """依序檢查 DRC 規則，回傳 (drc_failed, drc_rule, drc_msg)；只回報第一條違規
+
+    fin_eff_limit 只適用於 coupled 模式 (耦合求解無解)；fixed 模式的無限高度 (例如沒有鰭片) 交給後續規則判定。
+    """
+    if fin_eff_mode == "coupled" and Fin_Height == float("inf"):
+        return True, "fin_eff_limit", "⛔ **設計無效 (Fin Efficiency Limit)：** 鰭片效率耦合求解無解：鰭片越高效率越低，再高也無法排出所需熱量。\n請增加鰭片數 (縮小 Gap / Fin_t)、加厚鰭片或增加設備的X/Y方向面積。"
+    aspect_ratio = calc_aspect_ratio(Fin_Height, Gap)
+    if aspect_ratio > AR_LIMIT:
+        return True, "choked_flow", f"⛔ **設計無效 (Choked Flow)：** 流阻比 (高/寬) 達 {aspect_ratio:.1f} (上限 12)。\n鰭片太深且太密，空氣滯留無法流動，請降低高度或增大間距。"
+    if h_conv < H_CONV_MIN:
+        return True, "poor_convection", f"⛔ **設計無效 (Step 3 - Poor Convection)：** 有效對流係數 h_conv 僅 {h_conv:.2f} (目標 >= 4.0)。\nGap 過小導致風阻過大，散熱效率極低。請增大 Air Gap。"
+    if Gap < GAP_MIN:
+        return True, "gap_too_small", f"⛔ **設計無效 (Gap Too Small)：** 鰭片間距 {Gap}mm 小於物理極限 (4mm)。\n邊界層完全重疊，自然對流失效。"
+    if "Embedded" in fin_tech and Fin_Height > EMBEDDED_FIN_H_MAX:
+        return True, "process_limit", f"⛔ **製程限制 (Process Limit)：** Embedded Fin (埋入式鰭片) 製程高度限制需 < 100mm (目前計算值: {Fin_Height:.1f}mm)。\n此高度已超過製程極限，建議增加設備的X/Y方向面積來讓Z方向面積增加。"
+    return False, "", ""
@@ -0,0 +1,48 @@
+"""報告圖表 (Plotly)：VISUAL REPORT 分頁使用，基準測試亦直接呼叫"""
+from .lazy import LazyModule
+
+px = LazyModule("plotly.express")  # 第一次建圖時才載入 (VISUAL REPORT 分頁)
+
+
+def build_power_pie(valid_rows, Total_Power):
+    """各元件功耗佔比 (甜甜圈圖)，中心顯示整機總熱耗"""
+    # 圓餅圖
+    fig_pie = px.pie(valid_rows, values='Total_W', names='Component', 
+                     title='<b>各元件功耗佔比 (Power Breakdown)</b>', 
+                     hole=0.5,
+                     color_discrete_sequence=px.colors.qualitative.Pastel)
+
+    fig_pie.update_traces(
+        textposition='outside', 
+        textinfo='label+percent',
+        marker=dict(line=dict(color='#ffffff', width=2))
+    )
+
+    fig_pie.update_layout(
+        showlegend=False, 
+        margin=dict(t=90, b=150, l=100, r=100),
+        title=dict(pad=dict(b=20)),
+        annotations=[
+            dict(
+                text=f"<b>{round(Total_Power, 2)} W</b><br><span style='font-size:14px; color:#888'>Total</span>", 
+                x=0.5, y=0.5, 
+                font_size=24, 
+                showarrow=False
+            )
+        ]
+    )
+    return fig_pie
+
+
+def build_budget_bar(valid_rows):
+    """各元件剩餘溫升裕度 (由小到大)"""
+    valid_rows_sorted = valid_rows.sort_values(by="Allowed_dT", ascending=True)
+    fig_bar = px.bar(
+        valid_rows_sorted, x='Component', y='Allowed_dT', 
+        title='<b>各元件剩餘溫升裕度 (Thermal Budget)</b>',
+        color='Allowed_dT', 
+        color_continuous_scale='RdYlGn',
+        labels={'Allowed_dT': '允許溫升 (°C)'}
+    )
+    fig_bar.update_layout(xaxis_title="元件名稱", yaxis_title="散熱器允許溫升 (°C)")
+    return fig_bar
@@ -0,0 +1,177 @@
+"""散熱器幾何：h 值、鰭片數、鰭片高度/體積、重量估算"""
+import numpy as np
+
+SHIELDING_HEIGHT_CM = 1.2  # Shielding 固定高度 12 mm
+ALLOY_CONDUCTIVITY = {"Embedded": 200.0, "Die-casting": 96.0}  # W/m·K：AL6063 擠型 / ADC12 壓鑄
+ALLOY_SPECIFIC_HEAT = {"Embedded": 900.0, "Die-casting": 963.0}  # J/kg·K：AL6063 擠型 / ADC12 壓鑄
+
+# 鰭片效率模式 (全域參數 fin_eff_mode；未指定時為 fixed)
+FIN_EFF_MODES = {
+    "fixed": "依製程固定 (0.95 / 0.90)",
+    "coupled": "耦合求解 (tanh(mH)/mH)",
+}
+DEFAULT_FIN_EFF_MODE = "fixed"
+# 耦合求解狀態碼 (陣列版以 int8 回傳，索引對應此表)
+FIN_EFF_STATUS = ["fixed", "solved", "base_only", "infeasible", "no_load"]
+
+
+def calc_h_value(Gap):
+    """計算 h_conv, h_rad, h_value"""
+    h_conv = 6.4 * np.tanh(Gap / 7.0)
+    if Gap >= 10.0:
+        rad_factor = 1.0
+    else:
+        rad_factor = np.sqrt(Gap / 10.0)
+    h_rad = 2.4 * rad_factor
+    h_value = h_conv + h_rad
+    return h_value, h_conv, h_rad
+
+
+def calc_fin_count(W_hsk, Gap, Fin_t):
+    """植樹原理計算最大鰭片數"""
+    if Gap + Fin_t > 0:
+        num_fins_float = (W_hsk + Gap) / (Gap + Fin_t)
+        num_fins_int = int(num_fins_float)
+        if num_fins_int > 0:
+            total_width = num_fins_int * Fin_t + (num_fins_int - 1) * Gap
+            while total_width > W_hsk and num_fins_int > 0:
+                num_fins_int -= 1
+                total_width = num_fins_int * Fin_t + (num_fins_int - 1) * Gap
+    else:
+        num_fins_int = 0
+    return num_fins_int
+
+
+def calc_fin_eff(fin_tech):
+    """鰭片製程 -> 鰭片效率 (Eff)"""
+    if "Embedded" in fin_tech:
+        return 0.95
+    return 0.90
+
+
+def calc_alloy_k(fin_tech):
+    """鰭片製程 -> 鋁材熱傳導係數 (W/m·K)"""
+    if "Embedded" in fin_tech:
+        return ALLOY_CONDUCTIVITY["Embedded"]
+    return ALLOY_CONDUCTIVITY["Die-casting"]
+
+
+def calc_alloy_cp(fin_tech):
+    """鰭片製程 -> 鋁材比熱 (J/kg·K)"""
+    if "Embedded" in fin_tech:
+        return ALLOY_SPECIFIC_HEAT["Embedded"]
+    return ALLOY_SPECIFIC_HEAT["Die-casting"]
+
+
+def solve_fin_coupled(Area_conv, Base_Area_m2, Fin_Count, L_hsk, h_value, k_fin, Fin_t):
+    """鰭片高度與鰭片效率耦合求解 (純量或可 broadcast 的陣列)
+
+    Area_conv : 所需的等效對流面積 1 / (h_value · R_sa) (m²)
+    熱平衡 h·(A_base + η_f·A_fin) = 1/R_sa，A_fin = 2·N·L·H，η_f = tanh(mH)/(mH)，m = √(2h / (k·Fin_t))
+    => tanh(mH) = m·(Area_conv - A_base) / (2·N·L)，右側 x < 1 時有唯一解 H = atanh(x)/m，直接反解不需迭代；
+    x >= 1 表示鰭片再高也排不出所需熱量 (Fin_Height = inf)；Area_conv <= A_base 時基板即足夠 (η_f = 1)。
+    回傳 dict of ndarray：
+        Fin_Height (mm)、Area_req (m², 基板 + 鰭片總面積)、Eff (整體表面效率 = Area_conv / Area_req)、
+        Fin_Eff (單片鰭片效率 η_f)、status (FIN_EFF_STATUS 索引)、residual (熱平衡相對誤差)
+    """
+    Area_conv, Base_Area_m2, Fin_Count, L_hsk, h_value, k_fin, Fin_t = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (Area_conv, Base_Area_m2, Fin_Count, L_hsk, h_value, k_fin, Fin_t)))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        m = np.sqrt(2 * h_value / (k_fin * Fin_t / 1000))  # 1/m
+        perimeter = 2 * Fin_Count * L_hsk / 1000  # 2·N·L (m)
+        need = Area_conv - Base_Area_m2  # 鰭片須提供的等效面積 η_f·A_fin (m²)
+        x = m * need / perimeter
+        base_only = need <= 0
+        solved = ~base_only & (x < 1)
+
+        H_m = np.where(solved, np.arctanh(np.where(solved, x, 0.0)) / m, np.where(base_only, need / perimeter, np.inf))
+        H_m = np.where(base_only & (Fin_Count <= 0), 0.0, H_m)
+        mH = m * H_m
+        Fin_Eff = np.where(solved & (mH > 0), np.tanh(mH) / mH, 1.0)
+        A_fin = perimeter * H_m
+        Area_req = np.where(base_only, Area_conv, Base_Area_m2 + A_fin)
+        Eff = np.where(solved | base_only, Area_conv / Area_req, 0.0)
+        residual = np.where(solved, np.abs((Base_Area_m2 + Fin_Eff * A_fin) / Area_conv - 1), 0.0)
+    status = np.select([base_only, solved], [2, 1], default=3).astype(np.int8)
+    return {"Fin_Height": H_m * 1000, "Area_req": Area_req, "Eff": Eff, "Fin_Eff": Fin_Eff,
+            "status": status, "residual": residual}
+
+
+def calc_hsk_outline(p):
+    """PCB + 防水邊距 -> 散熱器外框 (L_hsk, W_hsk)"""
+    return p['L_pcb'] + p['Top'] + p['Btm'], p['W_pcb'] + p['Left'] + p['Right']
+
+
+def calc_heatsink_size(p, L_hsk, W_hsk, Total_Power, Min_dT_Allowed, h_value, Eff, Fin_Count):
+    """所需散熱面積 -> 鰭片高度、整機高度與體積
+
+    回傳 (R_sa, Area_req, Fin_Height, RRU_Height, Volume_L)；功耗或溫升裕度不足時全為 0。
+    """
+    if Total_Power > 0 and Min_dT_Allowed > 0:
+        R_sa = Min_dT_Allowed / Total_Power
+        Area_req = 1 / (h_value * R_sa * Eff)
+        Base_Area_m2 = (L_hsk * W_hsk) / 1e6
+        try:
+            Fin_Height = ((Area_req - Base_Area_m2) * 1e6) / (2 * Fin_Count * L_hsk)
+        except:
+            Fin_Height = 0
+        RRU_Height = p['t_base'] + Fin_Height + p['H_shield'] + p['H_filter']
+        Volume_L = (L_hsk * W_hsk * RRU_Height) / 1e6
+        return R_sa, Area_req, Fin_Height, RRU_Height, Volume_L
+    return 0, 0, 0, 0, 0
+
+
+def calc_heatsink_size_coupled(p, L_hsk, W_hsk, Total_Power, Min_dT_Allowed, h_value, Fin_Count):
+    """耦合模式的 calc_heatsink_size：鰭片效率隨鰭片高度、Fin_t、h_value 與鋁材 k 一起求解
+
+    回傳 (R_sa, Area_req, Fin_Height, RRU_Height, Volume_L, fin_eff)；
+    fin_eff = {"Eff", "Fin_Eff", "fin_eff_status", "fin_eff_residual"}。功耗或溫升裕度不足時尺寸全為 0。
+    """
+    if not (Total_Power > 0 and Min_dT_Allowed > 0):
+        return 0, 0, 0, 0, 0, {"Eff": 1.0, "Fin_Eff": 1.0, "fin_eff_status": "no_load", "fin_eff_residual": 0.0}
+    R_sa = Min_dT_Allowed / Total_Power
+    sol = solve_fin_coupled(1 / (h_value * R_sa), (L_hsk * W_hsk) / 1e6, Fin_Count, L_hsk, h_value,
+                            calc_alloy_k(p['fin_tech_selector_v2']), p['Fin_t'])
+    Fin_Height = float(sol["Fin_Height"])
+    RRU_Height = p['t_base'] + Fin_Height + p['H_shield'] + p['H_filter']
+    Volume_L = (L_hsk * W_hsk * RRU_Height) / 1e6
+    fin_eff = {"Eff": float(sol["Eff"]), "Fin_Eff": float(sol["Fin_Eff"]),
+               "fin_eff_status": FIN_EFF_STATUS[int(sol["status"])], "fin_eff_residual": float(sol["residual"])}
+    return R_sa, float(sol["Area_req"]), Fin_Height, RRU_Height, Volume_L, fin_eff
+
+
+def calc_weight(p, L_hsk, W_hsk, num_fins_int, Fin_Height):
+    """[v3.84] 重量計算 (kg)"""
+    L_pcb, W_pcb = p['L_pcb'], p['W_pcb']
+
+    base_vol_cm3 = L_hsk * W_hsk * p['t_base'] / 1000
+    fins_vol_cm3 = num_fins_int * p['Fin_t'] * Fin_Height * L_hsk / 1000
+    hs_weight_kg = (base_vol_cm3 + fins_vol_cm3) * p['al_density'] / 1000
+    
+    shield_outer_vol_cm3 = L_hsk * W_hsk * p['H_shield'] / 1000
+    shield_inner_vol_cm3 = L_pcb * W_pcb * p['H_shield'] / 1000
+    shield_vol_cm3 = max(shield_outer_vol_cm3 - shield_inner_vol_cm3, 0)
+    shield_weight_kg = shield_vol_cm3 * p['al_density'] / 1000
+    
+    filter_vol_cm3 = L_hsk * W_hsk * p['H_filter'] / 1000
+    filter_weight_kg = filter_vol_cm3 * p['filter_density'] / 1000
+    
+    shielding_area_cm2 = L_pcb * W_pcb / 100
+    shielding_vol_cm3 = shielding_area_cm2 * SHIELDING_HEIGHT_CM
+    shielding_weight_kg = shielding_vol_cm3 * p['shielding_density'] / 1000
+    
+    pcb_area_cm2 = L_pcb * W_pcb / 100
+    pcb_weight_kg = pcb_area_cm2 * p['pcb_surface_density'] / 1000
+    
+    cavity_weight_kg = filter_weight_kg + shield_weight_kg + shielding_weight_kg + pcb_weight_kg
+    return {
+        "hs_weight_kg": hs_weight_kg, "shield_weight_kg": shield_weight_kg,
+        "filter_weight_kg": filter_weight_kg, "shielding_weight_kg": shielding_weight_kg,
+        "pcb_weight_kg": pcb_weight_kg, "total_weight_kg": hs_weight_kg + cavity_weight_kg,
+    }
+
+
+ZERO_WEIGHT = {
+    "hs_weight_kg": 0, "shield_weight_kg": 0, "filter_weight_kg": 0,
+    "shielding_weight_kg": 0, "pcb_weight_kg": 0, "total_weight_kg": 0,
+}
@@ -0,0 +1,314 @@
+"""增量重算 (Incremental Recomputation)
+
+evaluate_project 拆成數個階段，依「參數 -> 階段」與「階段 -> 上游階段」的相依圖 (STAGE_GRAPH)
+只重算受影響的部分：
+- 全域參數：與上一次比較，只有讀到變動參數的階段 (及其下游) 需要重算
+- 元件表：依 index 對齊上一次的表，只有新增 / 修改的列送進 calc_thermal_resistance_vec，
+  其餘列沿用上一次的計算欄位 (熱阻 kernel 逐列獨立，結果逐位元一致)；
+  data_editor 刪除列時保留其他列的 index，新增列則接在後面，皆可對齊。
+  App 以 data_editor 的編輯狀態 (edited_rows / added_rows / deleted_rows) 與上一次的差異
+  直接得到變動的列 (editor_changed_rows)，不需對整張表做雜湊或逐欄比較；
+  沒有差異資訊時 (批次工具、換表) 才逐欄比較
+- 階段輸出與上一次相同時不再往下游傳遞 (early cutoff)，例如修改非瓶頸元件的 R_jc 不會重算鰭片高度
+
+IncrementalEvaluator 保存上一次的輸入摘要與各階段輸出，應每個 session 一個實例；
+回傳的 dict 與 evaluate_project 完全相同 (共享的 DataFrame 為唯讀)。
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from .drc import calc_aspect_ratio, check_drc
+from .geometry import (DEFAULT_FIN_EFF_MODE, ZERO_WEIGHT, calc_fin_count, calc_fin_eff, calc_h_value,
+                       calc_heatsink_size, calc_heatsink_size_coupled, calc_hsk_outline, calc_weight)
+from .model import build_globals_dict, resolve_params, summarize_components
+from .sweep import COMPONENT_KEYS
+from .thermal import (COMPONENT_RESULT_COLUMNS, calc_thermal_resistance_arrays, calc_thermal_resistance_vec,
+                      component_arrays)
+
+OUTLINE_KEYS = ["L_pcb", "W_pcb", "Top", "Btm", "Left", "Right"]
+WEIGHT_KEYS = ["L_pcb", "W_pcb", "Fin_t", "t_base", "H_shield", "H_filter",
+               "al_density", "filter_density", "shielding_density", "pcb_surface_density"]
+
+
+def _stage_summary(p, v):
+    valid_rows, Total_Watts_Sum, Min_dT_Allowed, Bottleneck_Name = summarize_components(v['final_df'])
+    return {"valid_rows": valid_rows, "Total_Watts_Sum": Total_Watts_Sum,
+            "Min_dT_Allowed": Min_dT_Allowed, "Bottleneck_Name": Bottleneck_Name}
+
+
+def _stage_outline(p, v):
+    L_hsk, W_hsk = calc_hsk_outline(p)
+    return {"L_hsk": L_hsk, "W_hsk": W_hsk}
+
+
+def _stage_convection(p, v):
+    h_value, h_conv, h_rad = calc_h_value(p['Gap'])
+    return {"h_value": h_value, "h_conv": h_conv, "h_rad": h_rad}
+
+
+def _stage_fin_eff(p, v):
+    # 依製程的固定效率；實際採用的 Eff 由 heatsink 階段決定 (coupled 模式會重新求解)
+    return {"Eff_fixed": calc_fin_eff(p['fin_tech_selector_v2'])}
+
+
+def _stage_fin_count(p, v):
+    return {"Fin_Count": calc_fin_count(v['W_hsk'], p['Gap'], p['Fin_t'])}
+
+
+def _stage_heatsink(p, v):
+    Total_Power = v['Total_Watts_Sum'] * p['Margin']
+    if p.get('fin_eff_mode', DEFAULT_FIN_EFF_MODE) == "coupled":
+        R_sa, Area_req, Fin_Height, RRU_Height, Volume_L, fin_eff = calc_heatsink_size_coupled(
+            p, v['L_hsk'], v['W_hsk'], Total_Power, v['Min_dT_Allowed'], v['h_value'], v['Fin_Count'])
+    else:
+        Eff = v['Eff_fixed']
+        R_sa, Area_req, Fin_Height, RRU_Height, Volume_L = calc_heatsink_size(
+            p, v['L_hsk'], v['W_hsk'], Total_Power, v['Min_dT_Allowed'], v['h_value'], Eff, v['Fin_Count'])
+        fin_eff = {"Eff": Eff, "Fin_Eff": Eff, "fin_eff_status": "fixed", "fin_eff_residual": 0.0}
+    return {"Total_Power": Total_Power, "R_sa": R_sa, "Area_req": Area_req,
+            "Fin_Height": Fin_Height, "RRU_Height": RRU_Height, "Volume_L": Volume_L, **fin_eff}
+
+
+def _stage_weight(p, v):
+    if v['Total_Power'] > 0 and v['Min_dT_Allowed'] > 0:
+        return calc_weight(p, v['L_hsk'], v['W_hsk'], v['Fin_Count'], v['Fin_Height'])
+    return dict(ZERO_WEIGHT)
+
+
+def _stage_drc(p, v):
+    drc_failed, drc_rule, drc_msg = check_drc(p['Gap'], v['Fin_Height'], v['h_conv'], p['fin_tech_selector_v2'],
+                                             p.get('fin_eff_mode', DEFAULT_FIN_EFF_MODE))
+    return {"aspect_ratio": calc_aspect_ratio(v['Fin_Height'], p['Gap']),
+            "drc_failed": drc_failed, "drc_rule": drc_rule, "drc_msg": drc_msg}
+
+
+# 階段名稱 -> (計算函式, 讀取的全域參數, 上游階段)；依拓樸順序排列
+# "components" (元件表 -> final_df) 由 IncrementalEvaluator 逐列處理，不在此表
+STAGE_GRAPH = {
+    "summary": (_stage_summary, [], ["components"]),
+    "outline": (_stage_outline, OUTLINE_KEYS, []),
+    "convection": (_stage_convection, ["Gap"], []),
+    "fin_eff": (_stage_fin_eff, ["fin_tech_selector_v2"], []),
+    "fin_count": (_stage_fin_count, ["Gap", "Fin_t"], ["outline"]),
+    "heatsink": (_stage_heatsink, ["Margin", "t_base", "H_shield", "H_filter", "Fin_t", "fin_tech_selector_v2", "fin_eff_mode"],
+                 ["summary", "outline", "convection", "fin_eff", "fin_count"]),
+    "weight": (_stage_weight, WEIGHT_KEYS, ["summary", "outline", "fin_count", "heatsink"]),
+    "drc": (_stage_drc, ["Gap", "fin_tech_selector_v2", "fin_eff_mode"], ["convection", "heatsink"]),
+}
+ROW_DIFF_MIN_ROWS = 5000  # 小表整張重算比逐欄比對更快
+COMPONENT_KEY_SET = set(COMPONENT_KEYS)
+GRAPH_KEYS = COMPONENT_KEY_SET.union(*(keys for _, keys, _ in STAGE_GRAPH.values()))
+
+
+def _same_value(a, b):
+    """全域參數是否未變 (型別不同、非純量或 NaN 一律視為有變動)"""
+    return type(a) is type(b) and np.ndim(a) == 0 and bool(a == b)
+
+
+def _same_output(a, b):
+    """階段輸出是否相同 (DataFrame 只看其他純量欄位；NaN 視為不同，保守起見往下游重算)"""
+    if a is None or a.keys() != b.keys():
+        return False
+    for k, x in a.items():
+        if isinstance(x, pd.DataFrame):
+            continue
+        y = b[k]
+        if type(x) is not type(y) or x != y:
+            return False
+    return True
+
+
+def _changed_rows(prev_df, components_df):
+    """依 index 對齊上一次的元件表逐欄比較，回傳 (changed mask, 上一次的列位置)；無法對齊時回傳 None
+
+    欄位或 dtype 不同、index 重複時整張重算；新增的列 (index 不存在) 一律視為變動。
+    """
+    if list(prev_df.columns) != list(components_df.columns) or not prev_df.dtypes.equals(components_df.dtypes):
+        return None
+    if prev_df.index.equals(components_df.index):
+        pos = np.arange(len(components_df))
+        changed = np.zeros(len(components_df), dtype=bool)
+        aligned = lambda col: prev_df[col]
+    elif prev_df.index.is_unique and components_df.index.is_unique:
+        pos = prev_df.index.get_indexer(components_df.index)
+        changed = pos < 0
+        take = np.where(changed, 0, pos)
+        aligned = lambda col: prev_df[col].take(take).set_axis(components_df.index)
+    else:
+        return None
+    for col in components_df.columns:
+        new, old = components_df[col], aligned(col)
+        same = new.eq(old) | (new.isna() & old.isna())
+        changed |= ~same.to_numpy(dtype=bool)
+    return changed, pos
+
+
+def _delta_rows(prev_df, components_df, changed_rows):
+    """呼叫端提供的差異 (changed_rows：可能變動的列 index 標籤) -> (changed mask, 上一次的列位置)
+
+    changed_rows 以外、上一次也存在的 index 標籤視為內容相同；欄位不同或 index 重複時回傳 None。
+    """
+    if list(prev_df.columns) != list(components_df.columns):
+        return None
+    if not (prev_df.index.is_unique and components_df.index.is_unique):
+        return None
+    if prev_df.index.equals(components_df.index):
+        pos = np.arange(len(components_df))
+    else:
+        pos = prev_df.index.get_indexer(components_df.index)
+    changed = pos < 0
+    if len(changed_rows):
+        changed |= components_df.index.isin(changed_rows)
+    return changed, pos
+
+
+def editor_changed_rows(base_df, prev_state, state, components_df):
+    """st.data_editor 前後兩次的編輯狀態 -> components_df 中內容可能改變的列 (index 標籤)
+
+    base_df 為 data_editor 的輸入表，components_df 為本次的輸出；兩次狀態須來自同一個 base_df。
+    data_editor 依序套用 edited_rows (base_df 的列位置) -> deleted_rows -> added_rows (接在最後，
+    index 依刪除後的表遞增)，因此：
+    - 編輯內容有變的列、取消刪除而恢復的列為變動
+    - 新增列：刪除狀態有變時其 index 可能重新分配，全部視為變動；否則只有內容不同的新增列
+    其餘列與上一次輸出中同一 index 標籤的列完全相同。
+    """
+    prev_edits = prev_state.get("edited_rows") or {}
+    edits = state.get("edited_rows") or {}
+    pos = {int(r) for r in edits.keys() | prev_edits.keys() if edits.get(r) != prev_edits.get(r)}
+    prev_deleted = list(prev_state.get("deleted_rows") or [])
+    deleted = list(state.get("deleted_rows") or [])
+    pos |= set(prev_deleted) - set(deleted)
+    labels = base_df.index[sorted(pos)]
+
+    added = state.get("added_rows") or []
+    if added:
+        added_labels = components_df.index[len(components_df) - len(added):]
+        prev_added = prev_state.get("added_rows") or []
+        if prev_deleted != deleted:
+            labels = labels.append(added_labels)
+        else:
+            dirty = [k for k, row in enumerate(added) if k >= len(prev_added) or prev_added[k] != row]
+            labels = labels.append(added_labels[dirty])
+    return labels
+
+
+class IncrementalEvaluator:
+    """依相依圖只重算受影響的階段與元件列 (每個 session 一個實例)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._params = None
+        self._source_df = None
+        self._row_results = None
+        self._outputs = {}
+        self._result = None
+        self.last_stats = None
+
+    @property
+    def source_df(self):
+        """上一次 evaluate() 傳入的元件表 (呼叫端以 is 判斷差異資訊是否以它為基準)"""
+        return self._source_df
+
+    def _changed_keys(self, p):
+        """與上一次相比有變動的參數；無前次紀錄或參數集合不同時回傳 None (全部重算)"""
+        if self._params is None or self._params.keys() != p.keys():
+            return None
+        return {k for k, v in p.items() if not _same_value(v, self._params[k])}
+
+    def _evaluate_rows(self, components_df, p, prev, changed_rows=None):
+        """元件表 -> final_df；prev 為上一次的 final_df (None 表示整張重算)，回傳 (final_df, 重算列數)"""
+        diff = None
+        if prev is not None and changed_rows is not None and self._row_results is not None:
+            diff = _delta_rows(self._source_df, components_df, changed_rows)
+            if diff is not None and not diff[0].any() and self._source_df.index.equals(components_df.index):
+                return prev, 0
+        elif prev is not None and self._source_df.equals(components_df):
+            return prev, 0
+        if components_df.empty:
+            self._row_results = None
+            return pd.DataFrame(columns=list(components_df.columns) + COMPONENT_RESULT_COLUMNS), 0
+
+        n = len(components_df)
+        out = np.empty((n, len(COMPONENT_RESULT_COLUMNS)))
+        if diff is None and prev is not None and self._row_results is not None and n >= ROW_DIFF_MIN_ROWS:
+            diff = _changed_rows(self._source_df, components_df)
+        if diff is None:
+            changed = np.ones(n, dtype=bool)
+        else:
+            changed, pos = diff
+            keep = ~changed
+            out[keep] = self._row_results[pos[keep]]
+        miss = np.flatnonzero(changed)
+        if len(miss) == n:
+            out[:] = calc_thermal_resistance_vec(components_df, build_globals_dict(p)).to_numpy()
+        elif len(miss):
+            res = calc_thermal_resistance_arrays(component_arrays(components_df, miss), build_globals_dict(p))
+            out[miss] = np.column_stack([res[c] for c in COMPONENT_RESULT_COLUMNS])
+
+        self._row_results = out
+        calc_results = pd.DataFrame(out, columns=COMPONENT_RESULT_COLUMNS, index=components_df.index)
+        return pd.concat([components_df, calc_results], axis=1), len(miss)
+
+    def evaluate(self, params, components_df, changed_rows=None):
+        """與 evaluate_project(params, components_df) 相同的結果 dict；本次重算的範圍記錄於 last_stats
+
+        changed_rows : 相對於上一次傳入的元件表，可能變動的列 index 標籤 (例如 editor_changed_rows 的結果)；
+                       提供時其餘列直接依 index 對齊沿用，不再比較整張表。None 表示由引擎自行比較。
+        沒有任何階段需要重算時回傳上一次的同一個 dict (其上的衍生物件，例如 cached_artifact 的圖表，可繼續沿用)。
+        """
+        t0 = time.perf_counter()
+        p = resolve_params(params)
+        changed = self._changed_keys(p)
+        full = changed is None or not changed <= GRAPH_KEYS
+        if full:
+            changed = set(p)
+            self._outputs = {}
+
+        # 元件表：熱阻參數有變時整張重算，否則只重算與上一次不同的列
+        prev = None if changed & COMPONENT_KEY_SET else self._outputs.get("components", {}).get("final_df")
+        final_df, rows_recomputed = self._evaluate_rows(components_df, p, prev, changed_rows)
+        self._source_df = components_df
+        updated = set()
+        if final_df is not prev:
+            self._outputs["components"] = {"final_df": final_df}
+            updated.add("components")
+
+        values = {}
+        for out in self._outputs.values():
+            values.update(out)
+        recomputed = sorted(updated)
+        for name, (func, keys, upstream) in STAGE_GRAPH.items():
+            if name in self._outputs and not (changed & set(keys)) and not (updated & set(upstream)):
+                continue
+            out = func(p, values)
+            recomputed.append(name)
+            if not _same_output(self._outputs.get(name), out):
+                updated.add(name)
+            self._outputs[name] = out
+            values.update(out)
+
+        self._params = p
+        self.last_stats = {
+            "full": full, "changed_keys": [] if full else sorted(changed), "stages": recomputed,
+            "rows_total": len(components_df), "rows_recomputed": rows_recomputed,
+            "elapsed_ms": (time.perf_counter() - t0) * 1e3,
+        }
+        if recomputed or self._result is None:
+            self._result = _assemble_result(values)
+        return self._result
+
+
+def _assemble_result(v):
+    """鍵的順序與 evaluate_project 相同"""
+    result = {k: v[k] for k in (
+        "final_df", "valid_rows", "Total_Watts_Sum", "Total_Power", "Min_dT_Allowed", "Bottleneck_Name",
+        "L_hsk", "W_hsk", "h_value", "h_conv", "h_rad", "Eff",
+        "Fin_Eff", "fin_eff_status", "fin_eff_residual", "Fin_Count", "R_sa", "Area_req",
+        "Fin_Height", "RRU_Height", "Volume_L", "aspect_ratio", "drc_failed", "drc_rule", "drc_msg",
+    )}
+    result.update({k: v[k] for k in ZERO_WEIGHT})
+    return result
@@ -0,0 +1,31 @@
+"""延遲載入 (Lazy Import)：繪圖等重量級模組在第一次使用屬性時才 import
+
+    go = LazyModule("plotly.graph_objects")
+    go.Figure()   # 這一刻才真正 import
+
+import 系統本身以模組鎖保護，多個 Streamlit session 同時第一次使用也只會載入一次。
+"""
+import importlib
+import sys
+
+
+class LazyModule:
+    """模組代理；第一次存取屬性時 import 並快取，之後直接轉交"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+    @property
+    def is_loaded(self):
+        """是否已載入 (由任何地方 import 皆算)"""
+        return self._module is not None or self._name in sys.modules
+
+    def __repr__(self):
+        return f"<LazyModule {self._name!r} ({'loaded' if self.is_loaded else 'not loaded'})>"
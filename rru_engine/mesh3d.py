@@ -0,0 +1,87 @@
+"""3D 模型網格 (Mesh3d 用頂點/三角形陣列)
+
+鰭片網格以 NumPy broadcasting 一次產生，並提供 LOD (Level of Detail)：
+- "full"   : 每片鰭片 8 頂點 / 12 三角形 (與舊版 for 迴圈相同的幾何，頂點以 float32 傳送)
+- "culled" : 剔除貼在基板上的底面 (永遠看不到) -> 10 三角形
+- "lite"   : 近似顯示 (非精確幾何)：每片鰭片以無厚度的中心面表示，省略頂面與端面 -> 4 頂點 / 2 三角形；
+             鰭片之間有間隙，側面 / 頂面並不共面相連，無法在不改變外形的前提下合併，因此以近似換取傳輸量
+"""
+import numpy as np
+
+# 長方體 8 頂點 (0-3 底面, 4-7 頂面) 的 12 個三角形
+BOX_I = np.array([7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2])
+BOX_J = np.array([3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3])
+BOX_K = np.array([0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6])
+BOX_BOTTOM_FACES = [2, 3]
+BOX_X = np.array([0, 1, 1, 0, 0, 1, 1, 0])
+BOX_Y = np.array([0, 0, 1, 1, 0, 0, 1, 1])
+BOX_Z = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+
+LOD_LEVELS = ["full", "culled", "lite"]
+AUTO_LOD_MAX_FULL_FINS = 150  # 超過此鰭片數時 auto 模式改用 lite
+
+
+def compact_mesh(x, y, z, i, j, k):
+    """縮小傳輸量：頂點轉 float32、索引轉最小的無號整數型別
+
+    Plotly 會把 NumPy 陣列編碼為 base64 typed array，位元數直接決定 JSON 大小。
+    """
+    n_vert = len(x)
+    idx_dtype = np.uint8 if n_vert <= 0xFF else np.uint16 if n_vert <= 0xFFFF else np.uint32
+    return (np.asarray(x, dtype=np.float32), np.asarray(y, dtype=np.float32), np.asarray(z, dtype=np.float32),
+            np.asarray(i, dtype=idx_dtype), np.asarray(j, dtype=idx_dtype), np.asarray(k, dtype=idx_dtype))
+
+
+def box_mesh(x0, x1, y0, y1, z0, z1):
+    """單一長方體 -> (x, y, z, i, j, k)"""
+    return compact_mesh(np.where(BOX_X, x1, x0), np.where(BOX_Y, y1, y0), np.where(BOX_Z, z1, z0),
+                        BOX_I, BOX_J, BOX_K)
+
+
+def fin_positions(W_hsk, num_fins, Fin_t, Gap):
+    """各鰭片的 y 起點 (置中排列；超出 W_hsk 的鰭片不畫)"""
+    if num_fins <= 0:
+        return np.empty(0)
+    total_fin_array_width = (num_fins * Fin_t) + ((num_fins - 1) * Gap)
+    y_offset = (W_hsk - total_fin_array_width) / 2
+    y_start = y_offset + np.arange(num_fins) * (Fin_t + Gap)
+    fits = y_start + Fin_t <= W_hsk
+    # 與舊版 break 行為一致：第一片超出後全部捨棄
+    n_fit = int(np.argmin(fits)) if not fits.all() else len(fits)
+    return y_start[:n_fit]
+
+
+def resolve_lod(lod, num_fins):
+    if lod == "auto":
+        return "full" if num_fins <= AUTO_LOD_MAX_FULL_FINS else "lite"
+    return lod
+
+
+def build_fin_mesh(L_hsk, W_hsk, z_fin_start, z_fin_end, num_fins, Fin_t, Gap, lod="full"):
+    """鰭片陣列 -> (x, y, z, i, j, k)；輸出經 compact_mesh 壓縮型別"""
+    lod = resolve_lod(lod, num_fins)
+    y_start = fin_positions(W_hsk, num_fins, Fin_t, Gap)
+    n = len(y_start)
+
+    if lod == "lite":
+        # 每片鰭片以中心面 (y = y_start + Fin_t/2) 表示
+        y_mid = np.repeat(y_start + Fin_t / 2, 4)
+        x = np.tile(np.array([0.0, L_hsk, L_hsk, 0.0]), n)
+        z = np.tile(np.array([z_fin_start, z_fin_start, z_fin_end, z_fin_end]), n)
+        offset = (np.arange(n, dtype=np.int32) * 4)[:, None]
+        i = (offset + np.array([0, 0], dtype=np.int32)).ravel()
+        j = (offset + np.array([1, 2], dtype=np.int32)).ravel()
+        k = (offset + np.array([2, 3], dtype=np.int32)).ravel()
+        return compact_mesh(x, y_mid, z, i, j, k)
+
+    faces = np.arange(12)
+    if lod == "culled":
+        faces = np.setdiff1d(faces, BOX_BOTTOM_FACES)
+    x = np.tile(np.where(BOX_X, L_hsk, 0.0), n)
+    y = (y_start[:, None] + BOX_Y * Fin_t).ravel()
+    z = np.tile(np.where(BOX_Z, z_fin_end, z_fin_start), n)
+    offset = (np.arange(n, dtype=np.int32) * 8)[:, None]
+    i = (offset + BOX_I[faces]).ravel()
+    j = (offset + BOX_J[faces]).ravel()
+    k = (offset + BOX_K[faces]).ravel()
+    return compact_mesh(x, y, z, i, j, k)
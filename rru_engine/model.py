@@ -0,0 +1,110 @@
+"""整機評估流程：元件熱阻 -> 瓶頸 -> 鰭片/體積/重量 -> DRC
+
+evaluate_project() 與 app.py 畫面上的數值一致，可在無 UI 的情況下呼叫。
+"""
+import pandas as pd
+
+from .defaults import DEFAULT_GLOBALS
+from .drc import calc_aspect_ratio, check_drc
+from .geometry import (DEFAULT_FIN_EFF_MODE, ZERO_WEIGHT, calc_fin_count, calc_fin_eff, calc_h_value,
+                       calc_heatsink_size, calc_heatsink_size_coupled, calc_hsk_outline, calc_weight)
+from .thermal import COMPONENT_RESULT_COLUMNS, calc_thermal_resistance_vec
+
+SLOPE = 0.03  # 局部環溫斜率 (°C/mm)
+
+
+def resolve_params(params, defaults=None):
+    """以預設值補齊缺漏的全域參數 (舊版專案檔可能少欄位)"""
+    merged = dict(DEFAULT_GLOBALS if defaults is None else defaults)
+    merged.update({k: v for k, v in params.items() if v is not None})
+    return merged
+
+
+def build_globals_dict(p):
+    """全域參數 -> calc_thermal_resistance 所需的 globals_dict"""
+    g = {
+        'T_amb': p['T_amb'], 'Slope': SLOPE,
+        'Coin_L_Setting': p['Coin_L_Setting'], 'Coin_W_Setting': p['Coin_W_Setting'],
+        'K_Via': p['K_Via'], 'Via_Eff': p['Via_Eff'],
+        'K_Solder': p['K_Solder'], 't_Solder': p['t_Solder'], 'Voiding': p['Voiding'],
+    }
+    g['tim_props'] = {
+        "Solder": {"k": p['K_Solder'], "t": p['t_Solder']},
+        "Grease": {"k": p['K_Grease'], "t": p['t_Grease']},
+        "Pad": {"k": p['K_Pad'], "t": p['t_Pad']},
+        "Putty": {"k": p['K_Putty'], "t": p['t_Putty']},
+        "None": {"k": 1, "t": 0}
+    }
+    return g
+
+
+def evaluate_components(components_df, p):
+    """元件表 + 計算欄位 (final_df)"""
+    calc_results = calc_thermal_resistance_vec(components_df, build_globals_dict(p))
+    return pd.concat([components_df, calc_results], axis=1)
+
+
+def summarize_components(final_df):
+    """總功耗與瓶頸，回傳 (valid_rows, Total_Watts_Sum, Min_dT_Allowed, Bottleneck_Name)"""
+    valid_rows = final_df[final_df['Total_W'] > 0].copy()
+    if not valid_rows.empty:
+        Total_Watts_Sum = valid_rows['Total_W'].sum()
+        Min_dT_Allowed = valid_rows['Allowed_dT'].min()
+        dt = valid_rows['Allowed_dT']
+        Bottleneck_Name = valid_rows.loc[dt.idxmin(), 'Component'] if dt.notna().any() else "None"
+    else:
+        Total_Watts_Sum = 0; Min_dT_Allowed = 50; Bottleneck_Name = "None"
+    return valid_rows, Total_Watts_Sum, Min_dT_Allowed, Bottleneck_Name
+
+
+def evaluate_project(params, components_df):
+    """單一專案完整評估
+
+    params        : 全域參數 (DEFAULT_GLOBALS 格式，缺漏者以預設值補齊)
+    components_df : 元件表 (components_data 格式的 DataFrame)
+    回傳 dict，包含 final_df / valid_rows 與所有 KPI 與 DRC 結果。
+    params 可另含 fin_eff_mode ("fixed" | "coupled"，見 FIN_EFF_MODES)：coupled 時 Eff 與鰭片高度一起求解。
+    """
+    p = resolve_params(params)
+    if components_df.empty:
+        final_df = pd.DataFrame(columns=list(components_df.columns) + COMPONENT_RESULT_COLUMNS)
+    else:
+        final_df = evaluate_components(components_df, p)
+    valid_rows, Total_Watts_Sum, Min_dT_Allowed, Bottleneck_Name = summarize_components(final_df)
+
+    L_hsk, W_hsk = calc_hsk_outline(p)
+    h_value, h_conv, h_rad = calc_h_value(p['Gap'])
+    Eff = calc_fin_eff(p['fin_tech_selector_v2'])
+    num_fins_int = calc_fin_count(W_hsk, p['Gap'], p['Fin_t'])
+
+    Total_Power = Total_Watts_Sum * p['Margin']
+    if p.get('fin_eff_mode', DEFAULT_FIN_EFF_MODE) == "coupled":
+        R_sa, Area_req, Fin_Height, RRU_Height, Volume_L, fin_eff = calc_heatsink_size_coupled(
+            p, L_hsk, W_hsk, Total_Power, Min_dT_Allowed, h_value, num_fins_int)
+        Eff = fin_eff["Eff"]
+    else:
+        R_sa, Area_req, Fin_Height, RRU_Height, Volume_L = calc_heatsink_size(
+            p, L_hsk, W_hsk, Total_Power, Min_dT_Allowed, h_value, Eff, num_fins_int)
+        fin_eff = {"Eff": Eff, "Fin_Eff": Eff, "fin_eff_status": "fixed", "fin_eff_residual": 0.0}
+    if Total_Power > 0 and Min_dT_Allowed > 0:
+        weights = calc_weight(p, L_hsk, W_hsk, num_fins_int, Fin_Height)
+    else:
+        weights = dict(ZERO_WEIGHT)
+
+    drc_failed, drc_rule, drc_msg = check_drc(p['Gap'], Fin_Height, h_conv, p['fin_tech_selector_v2'],
+                                             p.get('fin_eff_mode', DEFAULT_FIN_EFF_MODE))
+
+    result = {
+        "final_df": final_df, "valid_rows": valid_rows,
+        "Total_Watts_Sum": Total_Watts_Sum, "Total_Power": Total_Power,
+        "Min_dT_Allowed": Min_dT_Allowed, "Bottleneck_Name": Bottleneck_Name,
+        "L_hsk": L_hsk, "W_hsk": W_hsk,
+        "h_value": h_value, "h_conv": h_conv, "h_rad": h_rad, "Eff": Eff,
+        "Fin_Eff": fin_eff["Fin_Eff"], "fin_eff_status": fin_eff["fin_eff_status"],
+        "fin_eff_residual": fin_eff["fin_eff_residual"], "Fin_Count": num_fins_int, "R_sa": R_sa, "Area_req": Area_req,
+        "Fin_Height": Fin_Height, "RRU_Height": RRU_Height, "Volume_L": Volume_L,
+        "aspect_ratio": calc_aspect_ratio(Fin_Height, p['Gap']),
+        "drc_failed": drc_failed, "drc_rule": drc_rule, "drc_msg": drc_msg,
+    }
+    result.update(weights)
+    return result
@@ -0,0 +1,107 @@
+"""鰭片幾何最佳化：在製程限制內找出通過 DRC 的最小體積 / 最小重量設計
+
+搜尋策略 (利用模型的單調性，而非暴力格點)：
+1. t_base 只增加高度與重量、不影響散熱 -> 取製程下限。
+2. 固定 Gap 時，Fin_t 越薄鰭片數越多 (calc_fin_count 單調)，鰭片高度、流阻比越低；
+   鰭片總體積 = Fin_t × (所需面積 - 基板面積) / 2 也越小 -> Fin_t 取製程下限。
+3. Gap 一維搜尋：鰭片數 n 在 Gap 上是階梯函數。同一階梯內 calc_h_value 隨 Gap 遞增，
+   所需面積遞減，因此最佳點必在每個階梯的右端 Gap_n = (W_hsk - n·Fin_t)/(n - 1)。
+   只需評估各階梯右端 (數十個候選點)，即為精確解。
+4. fin_eff_mode = "coupled" 時鰭片越薄效率越低，第 2 點不再成立：Fin_t 改以 resolution 為步長掃描整個製程範圍，
+   每個 Fin_t 各取其 Gap 階梯右端，全部候選點以 evaluate_design_arrays 一次求解 (第 3 點仍成立：
+   h 越大所需的 tanh(mH) 越小、m 越大，鰭片高度仍遞減)。
+"""
+import time
+
+import numpy as np
+
+from .drc import GAP_MIN, H_CONV_MIN
+from .geometry import DEFAULT_FIN_EFF_MODE, calc_hsk_outline
+from .model import resolve_params
+from .sweep import evaluate_design_arrays
+
+# 製程可行範圍 (mm)；依供應商能力調整
+FIN_TECH_LIMITS = {
+    "Embedded": {"Gap": (4.0, 30.0), "Fin_t": (0.8, 2.0), "t_base": (4.0, 12.0)},
+    "Die-casting": {"Gap": (4.0, 30.0), "Fin_t": (1.5, 4.0), "t_base": (5.0, 15.0)},
+}
+
+OPT_OBJECTIVES = {"Volume_L": "最小體積 (Volume)", "total_weight_kg": "最小重量 (Weight)"}
+
+# h_conv = 6.4·tanh(Gap/7) >= H_CONV_MIN 的最小 Gap
+GAP_MIN_HCONV = 7.0 * np.arctanh(H_CONV_MIN / 6.4)
+
+
+def get_fin_tech_limits(fin_tech):
+    return FIN_TECH_LIMITS["Embedded" if "Embedded" in fin_tech else "Die-casting"]
+
+
+def gap_candidates(W_hsk, Fin_t, gap_lo, gap_hi, resolution=0.1):
+    """各鰭片數階梯的右端 Gap (向下取整到輸入解析度)，加上範圍兩端"""
+    n_max = int((W_hsk + gap_lo) // (gap_lo + Fin_t))
+    n_min = max(int((W_hsk + gap_hi) // (gap_hi + Fin_t)), 2)
+    n = np.arange(n_min, n_max + 1, dtype=float)
+    right_ends = (W_hsk - n * Fin_t) / (n - 1)
+    cands = np.concatenate([right_ends, [gap_lo, gap_hi]])
+    cands = np.floor(np.clip(cands, gap_lo, gap_hi) / resolution + 1e-9) * resolution
+    cands = cands[cands >= gap_lo - 1e-12]
+    lo_snapped = np.ceil(gap_lo / resolution - 1e-9) * resolution
+    return np.unique(np.round(np.concatenate([cands, [lo_snapped]]), 6))
+
+
+def optimize_fin_geometry(params, Total_Watts_Sum, Min_dT_Allowed, objective="Volume_L",
+                          fin_techs=None, lock_fin_t=False, lock_t_base=False, resolution=0.1):
+    """回傳最佳設計 dict (Gap, Fin_t, t_base, fin_tech, 各 KPI)；找不到可行解時回傳 None
+
+    params          : 目前全域參數 (PCB、邊距、密度等沿用)
+    Total_Watts_Sum : 元件總功耗 (未乘 Margin)
+    Min_dT_Allowed  : 瓶頸元件允許溫升
+    fin_techs       : 要搜尋的製程清單，預設為目前製程
+    lock_fin_t / lock_t_base : 鎖定目前值，不參與最佳化
+    """
+    t0 = time.perf_counter()
+    p = resolve_params(params)
+    L_hsk, W_hsk = calc_hsk_outline(p)
+    fin_techs = fin_techs or [p['fin_tech_selector_v2']]
+    coupled = p.get('fin_eff_mode', DEFAULT_FIN_EFF_MODE) == "coupled"
+
+    best = None
+    n_evaluated = 0
+    for tech in fin_techs:
+        lim = get_fin_tech_limits(tech)
+        if lock_fin_t:
+            fin_t_values = np.array([p['Fin_t']], dtype=float)
+        elif coupled:
+            fin_t_values = np.round(np.arange(lim['Fin_t'][0], lim['Fin_t'][1] + resolution / 2, resolution), 6)
+        else:
+            fin_t_values = np.array([lim['Fin_t'][0]])
+        t_base = p['t_base'] if lock_t_base else lim['t_base'][0]
+        gap_lo = max(lim['Gap'][0], GAP_MIN, GAP_MIN_HCONV)
+        gap_hi = lim['Gap'][1]
+        if gap_lo > gap_hi:
+            continue
+
+        gap_sets = [gap_candidates(W_hsk, t, gap_lo, gap_hi, resolution) for t in fin_t_values]
+        gaps = np.concatenate(gap_sets)
+        fin_ts = np.repeat(fin_t_values, [len(g) for g in gap_sets])
+        cand = dict(p)
+        cand.update({'Gap': gaps, 'Fin_t': fin_ts, 't_base': t_base, 'fin_tech_selector_v2': tech})
+        out = evaluate_design_arrays(cand, Total_Watts_Sum, Min_dT_Allowed)
+        n_evaluated += len(gaps)
+
+        score = np.where(out['drc_pass'] & (out['Fin_Height'] > 0), np.broadcast_to(out[objective], gaps.shape), np.inf)
+        i = int(np.argmin(score))
+        if not np.isfinite(score[i]):
+            continue
+        if best is None or score[i] < best[objective]:
+            best = {
+                'Gap': float(gaps[i]), 'Fin_t': float(fin_ts[i]), 't_base': float(t_base), 'fin_tech_selector_v2': tech,
+                'Fin_Count': int(out['Fin_Count'][i]), 'Fin_Height': float(out['Fin_Height'][i]),
+                'RRU_Height': float(out['RRU_Height'][i]), 'Volume_L': float(out['Volume_L'][i]),
+                'total_weight_kg': float(out['total_weight_kg'][i]), 'aspect_ratio': float(out['aspect_ratio'][i]),
+            }
+
+    if best is not None:
+        best['n_evaluated'] = n_evaluated
+        best['elapsed_s'] = time.perf_counter() - t0
+    return best
@@ -0,0 +1,165 @@
+"""多目標設計探索 (Pareto Front)：體積 vs 重量 vs 溫升裕度
+
+在製程範圍內隨機抽樣大量候選設計 (Gap、Fin_t、t_base、防水邊距、鰭片製程、設計安全係數 Margin)，
+以 evaluate_design_arrays 一次評估，再從通過 DRC 的設計中取出非支配解 (non-dominated set)。
+
+- 溫升裕度 headroom_dT：散熱器依 Margin × 功耗設計，額定功耗下瓶頸元件還剩 Min_dT_Allowed × (1 - 1/Margin) °C；
+  幾何參數不影響元件熱阻，因此裕度只能用 Margin 換 (Margin 固定時前緣退化為體積 vs 重量)
+- 非支配排序：依目標字典序排序後掃描 (2 目標為累積最小值；3 目標以 (f2, f3) 階梯 + 二分搜尋)，
+  O(n log n)，不做兩兩比較；3 目標掃描前先以少量樞紐點向量化剔除被支配的點
+"""
+import bisect
+import time
+
+import numpy as np
+import pandas as pd
+
+from .defaults import FIN_TECH_OPTIONS
+from .drc import GAP_MIN
+from .model import resolve_params
+from .optimizer import GAP_MIN_HCONV, get_fin_tech_limits
+from .sweep import evaluate_design_arrays
+
+# 目標：名稱 -> (標籤, 方向)；方向 1 = 越小越好，-1 = 越大越好
+PARETO_OBJECTIVES = {
+    "Volume_L": ("體積 (L)", 1),
+    "total_weight_kg": ("重量 (kg)", 1),
+    "headroom_dT": ("溫升裕度 (°C)", -1),
+}
+# 候選設計的參數；未指定範圍者固定為目前值 (Gap / Fin_t / t_base 預設為製程範圍)
+PARETO_DESIGN_KEYS = ["Gap", "Fin_t", "t_base", "Top", "Btm", "Left", "Right", "Margin", "fin_tech_selector_v2"]
+PARETO_RESULT_COLUMNS = ["Fin_Count", "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg", "headroom_dT", "aspect_ratio"]
+# 抽樣值的小數位數 (套用到側邊欄時為整齊的數字)
+_DECIMALS = {"Margin": 2}
+_DEFAULT_DECIMALS = 1
+
+
+def _dominated_by(S, pivots):
+    """S 中被任一 pivot 支配的列 (向量化；pivots 只需少量)"""
+    dominated = np.zeros(len(S), dtype=bool)
+    for q in pivots:
+        dominated |= (S >= q).all(axis=1) & (S > q).any(axis=1)
+    return dominated
+
+
+def non_dominated_mask(F, n_pivots=8):
+    """(n, k) 目標矩陣 (越小越好，k = 2 或 3) -> 非支配解的 bool mask
+
+    完全相同的目標向量互不支配，會一起標記。
+    3 目標時先以少量「正規化目標和最小」的點向量化剔除明顯被支配的點，剩下的點再做階梯掃描。
+    """
+    F = np.asarray(F, dtype=float)
+    if F.ndim != 2 or F.shape[1] not in (2, 3):
+        raise ValueError("只支援 2 或 3 個目標")
+    mask = np.zeros(len(F), dtype=bool)
+    if len(F) == 0:
+        return mask
+    # 字典序排序：排在前面的點第一個目標不會比較差；相同的點相鄰，只判斷每組的第一點
+    order = np.lexsort(F.T[::-1])
+    S = F[order]
+    first = np.concatenate([[True], (S[1:] != S[:-1]).any(axis=1)])
+    group = np.cumsum(first) - 1
+    U = S[first]
+
+    if F.shape[1] == 2:
+        # 與更前面的點相比，第二個目標嚴格較小才不被支配
+        prev_min = np.minimum.accumulate(np.concatenate([[np.inf], U[:-1, 1]]))
+        mask[order] = (U[:, 1] < prev_min)[group]
+        return mask
+
+    candidates = np.arange(len(U))
+    if len(U) > 64 * n_pivots:
+        span = np.ptp(U, axis=0)
+        score = ((U - U.min(axis=0)) / np.where(span > 0, span, 1)).sum(axis=1)
+        pivots = U[np.argpartition(score, n_pivots)[:n_pivots]]
+        candidates = np.flatnonzero(~_dominated_by(U, pivots))
+
+    front = np.zeros(len(U), dtype=bool)
+    ys, zs = [], []  # 已找到的非支配解在 (f2, f3) 平面的階梯：ys 遞增、zs 遞減
+    for i, (_, y, z) in zip(candidates.tolist(), U[candidates].tolist()):
+        pos = bisect.bisect_right(ys, y)
+        if pos and zs[pos - 1] <= z:
+            continue  # 被 f2 <= y 中 f3 最小的點支配
+        front[i] = True
+        end = pos
+        while end < len(ys) and zs[end] >= z:
+            end += 1
+        ys[pos:end] = [y]
+        zs[pos:end] = [z]
+    mask[order] = front[group]
+    return mask
+
+
+def default_ranges(p, fin_tech):
+    """製程範圍 (Gap 下限再受 DRC 限制) 作為 Gap / Fin_t / t_base 的預設抽樣範圍"""
+    lim = get_fin_tech_limits(fin_tech)
+    return {
+        "Gap": (max(lim['Gap'][0], GAP_MIN, GAP_MIN_HCONV), lim['Gap'][1]),
+        "Fin_t": lim['Fin_t'],
+        "t_base": lim['t_base'],
+    }
+
+
+def sample_designs(p, n, ranges=None, fin_techs=None, seed=0):
+    """各製程平均分配 n 個候選設計，數值參數在範圍內均勻抽樣並取到固定小數位數；回傳 {key: ndarray}"""
+    rng = np.random.default_rng(seed)
+    fin_techs = list(fin_techs or [p['fin_tech_selector_v2']])
+    counts = np.full(len(fin_techs), n // len(fin_techs))
+    counts[: n % len(fin_techs)] += 1
+
+    cols = {k: [] for k in PARETO_DESIGN_KEYS if k != "fin_tech_selector_v2"}
+    for tech, m in zip(fin_techs, counts):
+        r = default_ranges(p, tech)
+        r.update(ranges or {})
+        for k in cols:
+            lo, hi = r.get(k, (p[k], p[k]))
+            values = rng.uniform(lo, hi, m) if hi > lo else np.full(m, float(lo))
+            cols[k].append(np.clip(np.round(values, _DECIMALS.get(k, _DEFAULT_DECIMALS)), min(lo, hi), max(lo, hi)))
+    out = {k: np.concatenate(v) for k, v in cols.items()}
+    out["fin_tech_selector_v2"] = pd.Categorical.from_codes(np.repeat(np.arange(len(fin_techs)), counts), categories=fin_techs)
+    return out
+
+
+def run_pareto(params, Total_Watts_Sum, Min_dT_Allowed, n_candidates=50_000, ranges=None, fin_techs=None,
+               objectives=tuple(PARETO_OBJECTIVES), seed=0):
+    """抽樣 -> 評估 -> 非支配排序
+
+    ranges     : {key: (lo, hi)}，key 為 PARETO_DESIGN_KEYS 的數值參數；Margin 範圍決定溫升裕度的取捨空間
+    fin_techs  : 要納入的鰭片製程 (預設為目前製程)
+    objectives : PARETO_OBJECTIVES 的子集 (2 或 3 個)
+    回傳 dict：
+        candidates : 通過 DRC 的候選設計 DataFrame (設計參數 + PARETO_RESULT_COLUMNS + front 欄位)
+        front      : 非支配解 (依體積排序，index 對應 candidates)
+        n_candidates / n_feasible / elapsed_s / sort_s
+    """
+    t0 = time.perf_counter()
+    p = resolve_params(params)
+    fin_techs = [t for t in (fin_techs or [p['fin_tech_selector_v2']]) if t in FIN_TECH_OPTIONS] or [p['fin_tech_selector_v2']]
+    design = sample_designs(p, n_candidates, ranges, fin_techs, seed)
+    cand = dict(p)
+    cand.update(design)
+    out = evaluate_design_arrays(cand, Total_Watts_Sum, Min_dT_Allowed)
+
+    n = n_candidates
+    headroom = np.asarray(Min_dT_Allowed, dtype=float) * (1 - 1 / design["Margin"])
+    metrics = {k: np.broadcast_to(out[k], (n,)) for k in PARETO_RESULT_COLUMNS if k != "headroom_dT"}
+    metrics["headroom_dT"] = np.broadcast_to(headroom, (n,))
+    feasible = out["drc_pass"] & (metrics["Fin_Height"] > 0) & np.isfinite(metrics["Volume_L"])
+
+    df = pd.DataFrame({k: design[k] for k in PARETO_DESIGN_KEYS})
+    for k in PARETO_RESULT_COLUMNS:
+        df[k] = metrics[k]
+    df = df[feasible].reset_index(drop=True)
+
+    t_sort = time.perf_counter()
+    F = np.column_stack([df[k].to_numpy(dtype=float) * PARETO_OBJECTIVES[k][1] for k in objectives])
+    df["front"] = non_dominated_mask(F)
+    sort_s = time.perf_counter() - t_sort
+
+    return {
+        "candidates": df,
+        "front": df[df["front"]].sort_values("Volume_L"),
+        "objectives": list(objectives),
+        "n_candidates": n, "n_feasible": len(df),
+        "elapsed_s": time.perf_counter() - t0, "sort_s": sort_s,
+    }
@@ -0,0 +1,149 @@
+"""本地元件庫 (Indexed Part Library)
+
+component_library.csv 每列一個料號，欄位與元件表相同 (Component 改為 Part，另有 Category / Package)。
+載入時建立三個排序索引，查詢只需二分搜尋 (np.searchsorted) 再取交集，數萬筆料號仍在 1 ms 內：
+- 名稱開頭 (不分大小寫)：資料表依名稱排序，符合某開頭的料號為連續區間
+- 功耗 Power(W)
+- 封裝大小 (Pad_L × Pad_W 面積)
+多個條件時以命中範圍最小的索引取候選列，其餘條件對候選列做向量化篩選。
+
+元件庫經 assets.cached_load 以檔案簽章快取：只有第一次開啟元件庫時才會讀檔建索引，不影響啟動時間。
+"""
+import numpy as np
+import pandas as pd
+
+from .assets import cached_load
+from .defaults import COMPONENT_COLUMNS
+
+PART_LIBRARY_FILE = "component_library.csv"
+PART_INFO_COLUMNS = ["Part", "Category", "Package"]
+PART_VALUE_COLUMNS = [c for c in COMPONENT_COLUMNS if c not in ("Component", "Qty")]
+PART_TEXT_COLUMNS = ["Board_Type", "TIM_Type"]
+
+_PREFIX_END = "\U0010ffff"
+
+
+class PartLibrary:
+    """以排序陣列建立索引的元件庫 (建立後唯讀，可讓所有 session 共用)"""
+
+    def __init__(self, df):
+        missing = [c for c in ["Part"] + PART_VALUE_COLUMNS if c not in df.columns]
+        if missing:
+            raise ValueError(f"元件庫缺少欄位: {', '.join(missing)}")
+        df = df.copy()
+        for col in ("Category", "Package"):
+            if col not in df.columns:
+                df[col] = ""
+        for col in PART_VALUE_COLUMNS:
+            if col in PART_TEXT_COLUMNS:
+                df[col] = df[col].fillna("None").astype(str)
+            else:
+                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype(float)
+        df["Part"] = df["Part"].astype(str).str.strip()
+        df["Category"] = df["Category"].fillna("").astype(str)
+        df["Package"] = df["Package"].fillna("").astype(str)
+
+        # 依名稱排序後，列號即名稱索引的位置
+        names = df["Part"].str.casefold().to_numpy(dtype=str)
+        order = np.argsort(names, kind="stable")
+        self.df = df.iloc[order].reset_index(drop=True)
+        self._names = names[order]
+
+        self._power = self.df["Power(W)"].to_numpy()
+        self._area = (self.df["Pad_L"] * self.df["Pad_W"]).to_numpy()
+        self._power_order = np.argsort(self._power, kind="stable")
+        self._power_sorted = self._power[self._power_order]
+        self._area_order = np.argsort(self._area, kind="stable")
+        self._area_sorted = self._area[self._area_order]
+        self._board = self.df["Board_Type"].to_numpy(dtype=str)
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def power_max(self):
+        return float(self._power_sorted[-1]) if len(self) else 0.0
+
+    @property
+    def area_max(self):
+        return float(self._area_sorted[-1]) if len(self) else 0.0
+
+    @property
+    def board_types(self):
+        return sorted(set(self._board))
+
+    def _prefix_range(self, prefix):
+        key = prefix.strip().casefold()
+        lo = int(np.searchsorted(self._names, key, side="left"))
+        hi = int(np.searchsorted(self._names, key + _PREFIX_END, side="left"))
+        return lo, hi
+
+    @staticmethod
+    def _value_range(sorted_values, bounds):
+        low, high = bounds
+        lo = 0 if low is None else int(np.searchsorted(sorted_values, low, side="left"))
+        hi = len(sorted_values) if high is None else int(np.searchsorted(sorted_values, high, side="right"))
+        return lo, max(lo, hi)
+
+    def search_ids(self, prefix="", power=None, area=None, board_type=None):
+        """符合條件的列號 (依名稱排序)；power / area 為 (下限, 上限)，任一端可為 None"""
+        ranges = []  # (命中數, 種類, lo, hi)
+        if prefix and prefix.strip():
+            lo, hi = self._prefix_range(prefix)
+            ranges.append((hi - lo, "prefix", lo, hi))
+        if power is not None:
+            lo, hi = self._value_range(self._power_sorted, power)
+            ranges.append((hi - lo, "power", lo, hi))
+        if area is not None:
+            lo, hi = self._value_range(self._area_sorted, area)
+            ranges.append((hi - lo, "area", lo, hi))
+        if not ranges:
+            ids = np.arange(len(self))
+        else:
+            ranges.sort(key=lambda r: r[0])
+            _, kind, lo, hi = ranges[0]
+            if kind == "prefix":
+                ids = np.arange(lo, hi)
+            elif kind == "power":
+                ids = np.sort(self._power_order[lo:hi])
+            else:
+                ids = np.sort(self._area_order[lo:hi])
+            for _, other, lo, hi in ranges[1:]:
+                if not len(ids):
+                    break
+                if other == "prefix":
+                    ids = ids[(ids >= lo) & (ids < hi)]
+                else:
+                    values = (self._power if other == "power" else self._area)[ids]
+                    bounds = power if other == "power" else area
+                    keep = np.ones(len(ids), dtype=bool)
+                    if bounds[0] is not None:
+                        keep &= values >= bounds[0]
+                    if bounds[1] is not None:
+                        keep &= values <= bounds[1]
+                    ids = ids[keep]
+        if board_type:
+            ids = ids[self._board[ids] == board_type]
+        return ids
+
+    def search(self, prefix="", power=None, area=None, board_type=None, limit=200):
+        """回傳 (前 limit 筆的 DataFrame, 總命中數)"""
+        ids = self.search_ids(prefix, power, area, board_type)
+        return self.df.iloc[ids[:limit]], len(ids)
+
+    def to_components(self, parts, qty=1):
+        """元件庫的列 -> 元件表格式 (COMPONENT_COLUMNS 欄位順序)"""
+        rows = parts.rename(columns={"Part": "Component"})
+        rows = rows.assign(Qty=int(qty))
+        return rows[COMPONENT_COLUMNS].reset_index(drop=True)
+
+
+def _read_library(path, sig):
+    if sig is None:
+        return None
+    return PartLibrary(pd.read_csv(path))
+
+
+def load_part_library(path=PART_LIBRARY_FILE):
+    """讀取元件庫 (檔案未變動時回傳快取的同一個實例)；檔案不存在時回傳 None"""
+    return cached_load(path, _read_library)
@@ -0,0 +1,126 @@
+"""Rerun 各階段計時 / 記憶體量測 (Hot-path Instrumentation)
+
+用法：
+    perf = PerfRecorder()
+    perf.begin_run()
+    with perf.stage("model"):
+        ...
+    perf.end_run()
+
+- 關閉時 stage() 只做一次布林判斷並回傳共用的 nullcontext，成本接近 0
+- 開啟記憶體量測時以 tracemalloc 記錄每階段的淨配置量與峰值 (tracemalloc 本身約有 2~4 倍額外成本，只在需要時開啟)
+- 每次 rerun 為一筆紀錄，保存在固定長度的 ring buffer (deque)；可算滾動百分位數並匯出 JSON lines
+"""
+import json
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+PERF_PERCENTILES = [50, 90, 99]
+
+_NULL_STAGE = nullcontext()
+
+
+class PerfRecorder:
+    """每個 session 一個實例 (存放於 st.session_state)"""
+
+    def __init__(self, capacity=200, enabled=False, track_memory=False):
+        self.runs = deque(maxlen=capacity)
+        self.enabled = enabled
+        self.track_memory = track_memory
+        self._current = None
+        self._run_id = 0
+        self._owns_tracemalloc = False
+
+    def configure(self, enabled, track_memory=False):
+        """tracemalloc 為 process 全域：只停止自己啟動的追蹤"""
+        self.enabled = enabled
+        self.track_memory = enabled and track_memory
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        elif not self.track_memory and self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def begin_run(self, kind="rerun"):
+        if not self.enabled:
+            self._current = None
+            return
+        self._run_id += 1
+        self._current = {"run_id": self._run_id, "kind": kind, "ts": time.time(), "t0": time.perf_counter(), "stages": {}}
+
+    def end_run(self):
+        run, self._current = self._current, None
+        if run is None:
+            return None
+        run["total_ms"] = (time.perf_counter() - run.pop("t0")) * 1e3
+        self.runs.append(run)
+        return run
+
+    def stage(self, name):
+        """量測區塊：with perf.stage("figures"): ..."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        track = self.track_memory and tracemalloc.is_tracing()
+        if track:
+            mem0 = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            rec = {"wall_ms": (time.perf_counter() - t0) * 1e3}
+            if track:
+                mem1, peak = tracemalloc.get_traced_memory()
+                rec["alloc_kb"] = (mem1 - mem0) / 1024
+                rec["peak_kb"] = (peak - mem0) / 1024
+            self._record(name, rec)
+
+    def _record(self, name, rec):
+        run = self._current
+        if run is None:
+            # fragment 單獨重跑：自成一筆紀錄
+            self._run_id += 1
+            self.runs.append({"run_id": self._run_id, "kind": "fragment", "ts": time.time(),
+                              "stages": {name: rec}, "total_ms": rec["wall_ms"]})
+            return
+        prev = run["stages"].get(name)
+        if prev is not None:
+            # 同一 rerun 內重複進入同名階段：累加
+            rec = {k: prev.get(k, 0.0) + v for k, v in rec.items()}
+        run["stages"][name] = rec
+
+    def latest(self, kind="rerun"):
+        for run in reversed(self.runs):
+            if run["kind"] == kind:
+                return run
+        return None
+
+    def percentiles(self, metric="wall_ms", q=PERF_PERCENTILES):
+        """各階段 (含 total) 的滾動百分位數 -> {stage: {"n", "p50", ...}}"""
+        samples = {}
+        for run in self.runs:
+            for name, rec in run["stages"].items():
+                if metric in rec:
+                    samples.setdefault(name, []).append(rec[metric])
+            if metric == "wall_ms" and run["kind"] == "rerun":
+                samples.setdefault("total", []).append(run["total_ms"])
+        out = {}
+        for name, values in samples.items():
+            pct = np.percentile(values, q)
+            out[name] = {"n": len(values), **{f"p{p}": float(v) for p, v in zip(q, pct)}}
+        return out
+
+    def export_jsonl(self):
+        return "\n".join(json.dumps(run, ensure_ascii=False) for run in self.runs) + ("\n" if self.runs else "")
+
+    def clear(self):
+        self.runs.clear()
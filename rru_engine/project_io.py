@@ -0,0 +1,60 @@
+"""專案檔 (.json) 讀寫：格式與 app.py 的 get_current_state_json 相同"""
+import io
+import json
+import time
+
+import pandas as pd
+
+
+def build_meta(version):
+    return {"version": version, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def build_project_dict(params, components_df, version):
+    """組成專案 dict (meta + global_params + components_data)"""
+    return {
+        "meta": build_meta(version),
+        "global_params": params,
+        "components_data": components_df.to_dict('records')
+    }
+
+
+def iter_project_json(params, components_df, version, chunk_rows=1000):
+    """逐段產生專案 JSON 文字 (與 dump_project_json 完全相同)；元件表每 chunk_rows 列轉一次，不建完整的 records 清單"""
+    head = json.dumps({"meta": build_meta(version), "global_params": params}, indent=4)
+    if components_df.empty:
+        yield head[:-2] + ',\n    "components_data": []\n}'
+        return
+    yield head[:-2] + ',\n    "components_data": ['
+    sep = "\n"
+    for start in range(0, len(components_df), chunk_rows):
+        records = components_df.iloc[start:start + chunk_rows].to_dict('records')
+        yield sep + ",\n".join("        " + json.dumps(r, indent=4).replace("\n", "\n        ") for r in records)
+        sep = ",\n"
+    yield "\n    ]\n}"
+
+
+def dump_project_json(params, components_df, version):
+    return "".join(iter_project_json(params, components_df, version))
+
+
+def project_json_bytes(params, components_df, version):
+    """UTF-8 編碼的專案 JSON (逐段編碼寫入緩衝區，供下載按鈕使用)"""
+    buf = io.BytesIO()
+    for chunk in iter_project_json(params, components_df, version):
+        buf.write(chunk.encode('utf-8'))
+    return buf.getvalue()
+
+
+def parse_project(data):
+    """專案 dict -> (global_params, components_df, meta)"""
+    if not isinstance(data, dict) or ('global_params' not in data and 'components_data' not in data):
+        raise ValueError("不是有效的專案檔 (缺少 global_params / components_data)")
+    params = data.get('global_params', {})
+    components_df = pd.DataFrame(data.get('components_data', []))
+    return params, components_df, data.get('meta', {})
+
+
+def load_project(path):
+    with open(path, "r", encoding='utf-8') as f:
+        return parse_project(json.load(f))
@@ -0,0 +1,190 @@
+"""運算結果快取 (Content-Hash LRU)
+
+以「全域參數 + 元件表」的內容雜湊 (canonical_hash) 為 key，保存 evaluate_project 的結果
+與衍生的圖表物件。app.py 透過 st.cache_resource 取得同一個實例，所有 session 共用。
+
+- 上限以估計位元組數 (estimate_size) 計，結果與其衍生物件一起計入；超過時依 LRU 淘汰整筆結果
+- 衍生物件 (cached_artifact) 存於每筆結果自己的小型 LRU (ArtifactStore)，依輸入而異的物件
+  (熱擴散格點、暫態曲線…) 不會隨互動次數無限累積；在快取中的結果與快取共用同一把鎖
+
+快取中的物件為共享唯讀資料：呼叫端不可就地修改 (需要修改時請先 .copy())。
+"""
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .session_mem import estimate_size
+
+DEFAULT_MAX_ARTIFACTS = 8  # 每筆結果最多保留的衍生物件數
+DEFAULT_RESULT_CACHE_MB = 256  # app 共用結果快取的預設上限 (可用環境變數 RRU_RESULT_CACHE_MB 覆寫)
+
+
+def _canonical_value(v):
+    """數值統一為 float (45 與 45.0 視為相同)，numpy 純量轉為 Python 原生型別"""
+    if isinstance(v, (bool, np.bool_)):
+        return bool(v)
+    if isinstance(v, (int, float, np.integer, np.floating)):
+        return float(v)
+    return v
+
+
+def canonical_hash(params, components_df):
+    """全域參數 + 元件表 -> sha256 hex digest"""
+    h = hashlib.sha256()
+    canon = {str(k): _canonical_value(v) for k, v in params.items()}
+    h.update(json.dumps(canon, sort_keys=True, default=repr).encode('utf-8'))
+    h.update(json.dumps([str(c) for c in components_df.columns]).encode('utf-8'))
+    h.update(json.dumps([str(t) for t in components_df.dtypes]).encode('utf-8'))
+    if len(components_df):
+        h.update(pd.util.hash_pandas_object(components_df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class ArtifactStore:
+    """單一結果的衍生物件 (LRU，最多 maxsize 個)，記錄各物件的估計位元組數
+
+    放入 ResultCache 後改用快取的鎖，新增物件時由快取重新檢查位元組上限。
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAX_ARTIFACTS):
+        self.maxsize = maxsize
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._cache = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._items
+
+    def get_or_build(self, name, builder):
+        with self._lock:
+            if name in self._items:
+                self._items.move_to_end(name)
+                return self._items[name]
+        # 建構可能很慢 (圖表、求解)，不持有鎖；同時建構時保留先放入的那一個
+        value = builder()
+        size = estimate_size(value)
+        with self._lock:
+            if name in self._items:
+                return self._items[name]
+            self._items[name] = value
+            self._sizes[name] = size
+            self.nbytes += size
+            while len(self._items) > self.maxsize:
+                old, _ = self._items.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+            cache = self._cache() if self._cache is not None else None
+        if cache is not None:
+            cache.enforce_budget()
+        return value
+
+    def _attach(self, cache):
+        """由 ResultCache.put 呼叫 (已持有快取的鎖)；以 weakref 參照快取，量測記憶體時不會從結果走到整個快取"""
+        with self._lock:
+            self._cache = weakref.ref(cache)
+            self._lock = cache._lock
+
+
+class ResultCache:
+    """執行緒安全的 LRU 快取，含命中統計
+
+    max_bytes : 結果 + 衍生物件的估計位元組上限 (None = 不限)
+    maxsize   : 項目數上限 (None = 不限)
+    超過任一上限時由最久未使用的項目開始淘汰，最新的一筆一定保留。
+    """
+
+    def __init__(self, maxsize=None, max_bytes=None, max_artifacts=DEFAULT_MAX_ARTIFACTS):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.max_artifacts = max_artifacts
+        self._data = OrderedDict()
+        self._sizes = {}  # key -> 結果本身 (不含衍生物件) 的估計位元組數
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        store = value.get('artifacts')
+        if store is None:
+            store = value.setdefault('artifacts', ArtifactStore(self.max_artifacts))
+        size = estimate_size({k: v for k, v in value.items() if k != 'artifacts'})
+        with self._lock:
+            store._attach(self)
+            self._data[key] = value
+            self._sizes[key] = size
+            self._data.move_to_end(key)
+        self.enforce_budget()
+
+    def get_or_compute(self, key, func):
+        """命中則回傳快取值，否則呼叫 func() 計算並存入"""
+        value = self.get(key)
+        if value is None:
+            value = func()
+            self.put(key, value)
+        return value
+
+    def _nbytes_locked(self):
+        stores = {id(v['artifacts']): v['artifacts'] for v in self._data.values()}
+        return sum(self._sizes.values()) + sum(st.nbytes for st in stores.values())
+
+    def enforce_budget(self):
+        """超過項目數或位元組上限時淘汰最久未使用的項目 (保留最新一筆)"""
+        with self._lock:
+            while len(self._data) > 1 and (
+                    (self.maxsize is not None and len(self._data) > self.maxsize)
+                    or (self.max_bytes is not None and self._nbytes_locked() > self.max_bytes)):
+                key, _ = self._data.popitem(last=False)
+                del self._sizes[key]
+                self.evictions += 1
+
+    def entries(self):
+        """目前所有結果 (供記憶體量測；不更新 LRU 順序)"""
+        with self._lock:
+            return list(self._data.values())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._data), "maxsize": self.maxsize,
+                "bytes": self._nbytes_locked(), "max_bytes": self.max_bytes,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def cached_artifact(entry, name, builder):
+    """在結果 entry 上保存衍生物件 (例如 Plotly Figure)，同一組輸入只建一次
+
+    衍生物件存於 entry 的 ArtifactStore (LRU)：不在快取中的結果 (例如增量重算的結果) 也只保留最近的幾個。
+    """
+    store = entry.get('artifacts')
+    if store is None:
+        store = entry.setdefault('artifacts', ArtifactStore())
+    return store.get_or_build(name, builder)
@@ -0,0 +1,99 @@
+"""一次性敏感度分析 (Tornado)
+
+所有輸入 (數值型全域參數 + 各元件的 Power(W) / R_jc) 各做 ±step 的中央差分，
+標稱點與 2N 個擾動案例組成一批，以 evaluate_case_batch 一次評估 (元件表堆疊 + 陣列幾何)。
+
+擾動量為有限步長 (預設 ±10%)，鰭片數等階梯效應會如實反映在 low / high 結果中。
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from .model import resolve_params
+from .sweep import evaluate_case_batch
+from .tolerance import DEFAULT_BOUNDS, TOLERANCE_BOUNDS, TOLERANCE_GLOBAL_KEYS
+
+SENSITIVITY_METRICS = {
+    "Volume_L": "整機體積 (L)",
+    "total_weight_kg": "整機重量 (kg)",
+    "Fin_Height": "鰭片高度 (mm)",
+    "Min_dT_Allowed": "瓶頸允許溫升 (°C)",
+}
+SENSITIVITY_COMPONENT_COLUMNS = ["Power(W)", "R_jc"]
+
+
+def _input_cases(p, components_df, component_columns):
+    """列出所有輸入 -> [(label, kind, column, row, nominal)]，略過標稱值為 0 的輸入"""
+    inputs = [(k, "global", k, None, float(p[k])) for k in TOLERANCE_GLOBAL_KEYS if float(p[k]) != 0]
+    if len(components_df) == 0:
+        return inputs
+    names = components_df['Component'].astype(object).to_numpy()
+    qty = pd.to_numeric(components_df['Qty'], errors='coerce').to_numpy(dtype=float)
+    power = pd.to_numeric(components_df['Power(W)'], errors='coerce').to_numpy(dtype=float)
+    dup = pd.Series(names).duplicated(keep=False).to_numpy()
+    for col in component_columns:
+        values = pd.to_numeric(components_df[col], errors='coerce').to_numpy(dtype=float)
+        for row in np.flatnonzero((qty * power > 0) & np.isfinite(values) & (values != 0)):
+            name = f"{names[row]}#{row}" if dup[row] else str(names[row])
+            inputs.append((f"{name} · {col}", "component", col, int(row), float(values[row])))
+    return inputs
+
+
+def run_sensitivity(params, components_df, rel_step=0.10, component_columns=SENSITIVITY_COMPONENT_COLUMNS):
+    """所有輸入 ±rel_step 的敏感度表
+
+    回傳 dict：
+        table   : DataFrame，每個輸入一列 (input, kind, nominal, x_low, x_high，
+                  以及各指標的 {m}_low / {m}_high / {m}_swing / {m}_elasticity)
+        nominal : 各指標的標稱值
+        n_cases / elapsed_s
+    elasticity = (Δf / f) / (Δx / x)，即輸入變動 1% 時指標變動的百分比。
+    """
+    t0 = time.perf_counter()
+    p = resolve_params(params)
+    inputs = _input_cases(p, components_df, component_columns)
+    n_in = len(inputs)
+    n = 1 + 2 * n_in  # 案例 0 為標稱點，案例 1+2i / 2+2i 為第 i 個輸入的 low / high
+
+    pp = dict(p)
+    column_values = {}
+    x_low = np.empty(n_in)
+    x_high = np.empty(n_in)
+    for i, (_, kind, col, row, x0) in enumerate(inputs):
+        lo, hi = TOLERANCE_BOUNDS.get(col, DEFAULT_BOUNDS)
+        x_low[i], x_high[i] = np.clip([x0 * (1 - rel_step), x0 * (1 + rel_step)], lo, hi)
+        if kind == "global":
+            if np.ndim(pp[col]) == 0:
+                pp[col] = np.full(n, x0)
+            pp[col][[1 + 2 * i, 2 + 2 * i]] = x_low[i], x_high[i]
+        else:
+            if col not in column_values:
+                nominal = pd.to_numeric(components_df[col], errors='coerce').to_numpy(dtype=float)
+                column_values[col] = np.tile(nominal, (n, 1))
+            column_values[col][[1 + 2 * i, 2 + 2 * i], row] = x_low[i], x_high[i]
+
+    _, _, out = evaluate_case_batch(components_df, pp, n, column_values)
+
+    table = pd.DataFrame({
+        "input": [c[0] for c in inputs], "kind": [c[1] for c in inputs],
+        "nominal": [c[4] for c in inputs], "x_low": x_low, "x_high": x_high,
+    })
+    nominal = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for m in SENSITIVITY_METRICS:
+            f = np.broadcast_to(np.asarray(out[m], dtype=float), (n,))
+            f0, f_lo, f_hi = f[0], f[1::2], f[2::2]
+            nominal[m] = float(f0)
+            table[f"{m}_low"] = f_lo
+            table[f"{m}_high"] = f_hi
+            table[f"{m}_swing"] = np.abs(f_hi - f_lo)
+            slope = (f_hi - f_lo) / (x_high - x_low)
+            table[f"{m}_elasticity"] = np.where((x_high > x_low) & (f0 != 0), slope * table["nominal"].to_numpy() / f0, 0.0)
+    return {"table": table, "nominal": nominal, "n_cases": n, "elapsed_s": time.perf_counter() - t0}
+
+
+def rank_sensitivity(table, metric, top=None):
+    """依指標擺幅 (|high - low|) 由大到小排序，略過無影響的輸入"""
+    ranked = table[table[f"{metric}_swing"] > 0].sort_values(f"{metric}_swing", ascending=False)
+    return ranked.head(top) if top else ranked
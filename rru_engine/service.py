@@ -0,0 +1,282 @@
+"""本地 HTTP/JSON 評估服務 (asyncio 前端 + process pool)
+
+用法：
+    python -m rru_engine.service --port 8765 --workers 4 --base-config default_config.json
+
+端點：
+    GET  /health           -> {"status": "ok", "workers": N, "version": ...}
+    POST /evaluate         -> 單一專案 (與專案檔相同的 global_params + components_data) -> 結果 dict
+    POST /evaluate/batch   -> {"projects": [專案, ...]} (或直接傳 list) -> {"results": [結果, ...]}
+
+請求體可加上 "include_components": true 取得逐元件的計算欄位。
+結果由 evaluate_project 計算，與 app.py 畫面上的數值相同 (缺漏參數以 --base-config 的 global_params 補齊，
+即 App 啟動時載入的 default_config.json)。批次請求會切成數段平行交給 worker；
+單一專案錯誤只會標記在該筆結果 (status = "ERROR")，不影響其他專案；worker 行程異常終止時
+自動重建 process pool 並重試該段一次，仍失敗才把該段標記為 ERROR。
+NaN / inf 以 null 表示 (標準 JSON 不支援)。
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+from .batch import json_value
+from .model import evaluate_project, resolve_params
+from .project_io import load_project, parse_project
+from .thermal import COMPONENT_RESULT_COLUMNS
+
+SERVICE_VERSION = "1"
+MAX_BODY_BYTES = 64 * 2**20
+MAX_HEADER_BYTES = 64 * 2**10
+RESULT_KEYS = [
+    "Total_Watts_Sum", "Total_Power", "Min_dT_Allowed", "Bottleneck_Name", "L_hsk", "W_hsk",
+    "h_value", "h_conv", "h_rad", "Eff", "Fin_Eff", "fin_eff_status",
+    "Fin_Count", "R_sa", "Area_req", "Fin_Height", "RRU_Height",
+    "Volume_L", "aspect_ratio", "hs_weight_kg", "shield_weight_kg", "filter_weight_kg",
+    "shielding_weight_kg", "pcb_weight_kg", "total_weight_kg", "drc_failed", "drc_rule", "drc_msg",
+]
+
+_worker_defaults = None
+
+
+# ==================================================
+# Worker (在子行程中執行)
+# ==================================================
+def _init_worker(defaults):
+    global _worker_defaults
+    _worker_defaults = defaults
+
+
+def evaluate_payload(payload, defaults=None):
+    """單一專案 payload (dict) -> 結果 dict；錯誤時 status = "ERROR" 並附 error 訊息"""
+    try:
+        params, components_df, _ = parse_project(payload)
+        res = evaluate_project(resolve_params(params, defaults), components_df)
+    except Exception as e:
+        return {"status": "ERROR", "error": f"{type(e).__name__}: {e}"}
+    out = {"status": "OK"}
+    if isinstance(payload, dict) and "name" in payload:
+        out["name"] = payload["name"]
+    out.update({k: json_value(res[k]) for k in RESULT_KEYS})
+    out["drc_status"] = "FAIL" if res["drc_failed"] else "PASS"
+    if isinstance(payload, dict) and payload.get("include_components"):
+        cols = [c for c in ["Component"] + COMPONENT_RESULT_COLUMNS if c in res["final_df"].columns]
+        out["components"] = [{k: json_value(v) for k, v in row.items()}
+                             for row in res["final_df"][cols].to_dict('records')]
+    return out
+
+
+def _evaluate_chunk(payloads):
+    return [evaluate_payload(p, _worker_defaults) for p in payloads]
+
+
+# ==================================================
+# HTTP 前端 (asyncio)
+# ==================================================
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class EvaluationService:
+    """asyncio 前端：解析 HTTP/1.1 (keep-alive)，運算交給 ProcessPoolExecutor"""
+
+    def __init__(self, workers=None, defaults=None, chunk_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.defaults = defaults
+        self.chunk_size = chunk_size
+        self.pool = None
+        self.server = None
+        self.stats = {"requests": 0, "projects": 0, "errors": 0, "pool_restarts": 0, "started": time.time()}
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.defaults,))
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.pool = self._new_pool()
+        # 預先啟動所有 worker (import numpy/pandas)，避免第一批請求承擔啟動時間
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _evaluate_chunk, []) for _ in range(self.workers)))
+        self.server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    # --- 運算 ---
+    async def evaluate_many(self, payloads):
+        """依 worker 數切段平行評估，回傳與輸入同順序的結果"""
+        if not payloads:
+            return []
+        loop = asyncio.get_running_loop()
+        size = self.chunk_size or max(1, math.ceil(len(payloads) / self.workers))
+        chunks = [payloads[i:i + size] for i in range(0, len(payloads), size)]
+        parts = await asyncio.gather(*(self._run_chunk(loop, c) for c in chunks))
+        return [r for part in parts for r in part]
+
+    async def _run_chunk(self, loop, chunk):
+        """交給 worker 評估一段；pool 損壞時重建並重試一次，仍失敗則只有這一段回傳 ERROR"""
+        for _ in range(2):
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(pool, _evaluate_chunk, chunk)
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+        return [{"status": "ERROR", "error": "BrokenProcessPool: worker 行程異常終止"} for _ in chunk]
+
+    def _replace_pool(self, broken):
+        """換掉已損壞的 pool (同時有多段發現損壞時只重建一次)"""
+        if self.pool is not broken:
+            return
+        self.pool = self._new_pool()
+        self.stats["pool_restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    # --- 路由 ---
+    async def route(self, method, path, body):
+        if path == "/health":
+            if method != "GET":
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "只支援 GET")
+            return {"status": "ok", "workers": self.workers, "version": SERVICE_VERSION,
+                    "uptime_s": round(time.time() - self.stats["started"], 1),
+                    "requests": self.stats["requests"], "projects": self.stats["projects"],
+                    "pool_restarts": self.stats["pool_restarts"]}
+        if path not in ("/evaluate", "/evaluate/batch"):
+            raise HttpError(HTTPStatus.NOT_FOUND, f"未知的路徑: {path}")
+        if method != "POST":
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "只支援 POST")
+        try:
+            data = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"JSON 格式錯誤: {e}")
+
+        if path == "/evaluate":
+            if not isinstance(data, dict):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "請求體必須是專案物件")
+            self.stats["projects"] += 1
+            return (await self.evaluate_many([data]))[0]
+
+        projects = data.get("projects") if isinstance(data, dict) else data
+        if not isinstance(projects, list):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "批次請求需為 list 或 {\"projects\": [...]}")
+        if isinstance(data, dict) and data.get("include_components"):
+            projects = [dict(p, include_components=True) if isinstance(p, dict) else p for p in projects]
+        self.stats["projects"] += len(projects)
+        return {"results": await self.evaluate_many(projects)}
+
+    # --- 連線處理 ---
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    keep_alive = await self._handle_request(request_line, reader, writer)
+                except (asyncio.LimitOverrunError, ValueError):  # 標頭過長或格式錯誤
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "無效的 HTTP 請求"}, False)
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_request(self, request_line, reader, writer):
+        """處理一個請求；回傳是否保持連線 (請求行 / 標頭格式錯誤時丟出 ValueError)"""
+        method, target, version = request_line.decode("latin-1").split()  # 格式錯誤時 ValueError
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        length = int(headers.get("content-length") or 0)
+        if length < 0:
+            raise ValueError("Content-Length 不可為負")
+        if length > MAX_BODY_BYTES:
+            await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"請求體超過 {MAX_BODY_BYTES} bytes"}, False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        self.stats["requests"] += 1
+        try:
+            status, payload = HTTPStatus.OK, await self.route(method.upper(), target.split("?", 1)[0], body)
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:  # worker 崩潰等非預期錯誤
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+        if status != HTTPStatus.OK:
+            self.stats["errors"] += 1
+        await self._respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host, port, workers=None, defaults=None):
+    service = EvaluationService(workers, defaults)
+    server = await service.start(host, port)
+    print(f"🚀 RRU 評估服務 http://{host}:{service.port}  (workers = {service.workers})", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m rru_engine.service",
+        description="本地 HTTP/JSON 評估服務 (global_params + components_data -> KPI 與 DRC)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="綁定位址 (預設只接受本機連線)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="運算行程數 (預設 = CPU 核心數)")
+    parser.add_argument("--base-config", help="以此專案檔的 global_params 作為缺漏參數的預設值 (例如 default_config.json)")
+    args = parser.parse_args(argv)
+
+    defaults = None
+    if args.base_config:
+        defaults = resolve_params(load_project(args.base_config)[0])
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, defaults))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
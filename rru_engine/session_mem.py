@@ -0,0 +1,129 @@
+"""Session 記憶體量測與上限 (Per-session Memory Footprint)
+
+多人共用一台伺服器時，每個 session 的 st.session_state 會各自持有元件表、分析結果與上傳檔。
+- estimate_size：遞迴估算物件實際佔用的位元組 (DataFrame / ndarray / bytes / 一般物件)，以 id 去重
+- session_footprint：session_state 每個 key 的大小；process 共用的物件 (shared) 另計，不算進該 session
+- enforce_budget：超過上限時依大小由大到小移除「可重算」的 key
+- SessionRegistry：process 層級的彙總表，供管理面板顯示每個 session 的用量 (逾時未更新的 session 自動移除)
+"""
+import io
+import sys
+import threading
+import time
+import types
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SESSION_BUDGET_MB = 64
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+_MAX_DEPTH = 12
+
+
+def estimate_size(obj, seen=None, depth=0):
+    """物件 (含其參照的內容) 的估計位元組數；seen 為已計算過的 id 集合，跨呼叫共用即可去重"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, _SKIP_TYPES) or depth > _MAX_DEPTH:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, np.ndarray):
+        # view 不擁有資料：只算一次底層 buffer；擁有資料時 sys.getsizeof 已包含資料區
+        if obj.base is not None:
+            return sys.getsizeof(obj) + estimate_size(obj.base, seen, depth + 1)
+        return sys.getsizeof(obj) + (sum(estimate_size(v, seen, depth + 1) for v in obj.ravel()) if obj.dtype == object else 0)
+    if isinstance(obj, memoryview):
+        return sys.getsizeof(obj) + obj.nbytes
+    if isinstance(obj, io.BytesIO):
+        try:
+            return sys.getsizeof(obj) + obj.getbuffer().nbytes
+        except ValueError:  # 已關閉
+            return sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, complex)) or obj is None:
+        return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (dict, types.MappingProxyType)):
+        for k, v in obj.items():
+            size += estimate_size(k, seen, depth + 1) + estimate_size(v, seen, depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for v in obj:
+            size += estimate_size(v, seen, depth + 1)
+    if hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), seen, depth + 1)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += estimate_size(getattr(obj, slot), seen, depth + 1)
+    return size
+
+
+def session_footprint(state, shared=()):
+    """session_state (或任何 mapping) -> {"keys": {key: bytes}, "total": bytes, "shared": bytes}
+
+    shared 為 process 共用的物件 (例如預設元件表)：先計入 shared，session 內再參照到時不重複計算。
+    """
+    seen = set()
+    shared_bytes = sum(estimate_size(obj, seen) for obj in shared)
+    sizes = {}
+    for k in list(state.keys()):
+        try:
+            sizes[str(k)] = estimate_size(state[k], seen)
+        except Exception:  # 估算失敗的物件不影響頁面
+            sizes[str(k)] = 0
+    sizes = dict(sorted(sizes.items(), key=lambda kv: kv[1], reverse=True))
+    return {"keys": sizes, "total": sum(sizes.values()), "shared": shared_bytes}
+
+
+def enforce_budget(state, footprint, budget_bytes, evictable):
+    """總量超過 budget_bytes 時，依大小由大到小移除 evictable 中的 key；回傳被移除的 key 清單 (footprint 同步更新)"""
+    evicted = []
+    if footprint["total"] <= budget_bytes:
+        return evicted
+    for k in [k for k in footprint["keys"] if k in evictable]:
+        if footprint["total"] <= budget_bytes:
+            break
+        state.pop(k, None)
+        footprint["total"] -= footprint["keys"].pop(k)
+        evicted.append(k)
+    return evicted
+
+
+class SessionRegistry:
+    """process 層級：session_id -> 最近一次量測結果 (執行緒安全)"""
+
+    def __init__(self, ttl_s=1800):
+        self.ttl_s = ttl_s
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def update(self, session_id, footprint, top=5):
+        entry = {
+            "total_bytes": footprint["total"],
+            "n_keys": len(footprint["keys"]),
+            "top_keys": list(footprint["keys"].items())[:top],
+            "updated": time.time(),
+        }
+        with self._lock:
+            self._sessions[session_id] = entry
+            self._prune_locked()
+
+    def _prune_locked(self):
+        cutoff = time.time() - self.ttl_s
+        for sid in [sid for sid, e in self._sessions.items() if e["updated"] < cutoff]:
+            del self._sessions[sid]
+
+    def snapshot(self):
+        """[(session_id, entry), ...]，用量由大到小"""
+        with self._lock:
+            self._prune_locked()
+            items = [(sid, dict(e)) for sid, e in self._sessions.items()]
+        return sorted(items, key=lambda item: item[1]["total_bytes"], reverse=True)
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(e["total_bytes"] for e in self._sessions.values())
@@ -0,0 +1,222 @@
+"""散熱器基板 2D 熱擴散 (Spatial Heat Spreading)
+
+集總模型把整個散熱器視為單一 R_sa = Min_dT_Allowed / Total_Power，所有元件看到相同的基板溫度。
+空間模式把基板 (L_hsk × W_hsk，厚 t_base) 離散為格點，解穩態熱傳導：
+
+    -k·t·∇²θ + G·θ = q(x, y)      邊界絕熱 (Neumann)
+
+θ 為基板對環境的溫升，q 為元件熱通量 (W/m²)，G = h_value · Eff · (Area_req / 基板面積) 為鰭片側的等效對流導納
+(鰭片面積攤到基板上；功耗均勻分佈時 θ 處處等於集總模型的 Total_Power · R_sa)。
+
+係數均勻、邊界絕熱時，離散算子可被 DCT-II (餘弦基底) 完全對角化：
+    θ = Cxᵀ [(Cx Q Cyᵀ) / Λ] Cy
+Cx / Cy / Λ 即「分解」：Cx / Cy 只與格數有關，Λ 另與 k、t、G 有關，皆以 LRU 快取；只改功耗時直接重用，
+元件足跡的格點重疊權重也另外快取。完整機殼 1 mm 格點 (約 10 萬格) 一次求解為數十 ms。
+
+元件位置：元件表可選擇加入 X(mm) / Y(mm) 欄位 (元件中心在 PCB 上的座標，原點為 PCB 角落，X 沿 L_pcb、Y 沿 W_pcb)；
+足跡為 Base_L × Base_W (熱擴散後的底部面積，為 0 時用 Pad)，Qty > 1 時邊長乘 √Qty。
+沒有座標或足跡的元件 (例如 Cavity Filter) 功耗均勻分佈在整個基板。
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .geometry import calc_alloy_k, calc_hsk_outline
+
+PLACEMENT_COLUMNS = ["X(mm)", "Y(mm)"]
+SPREAD_RESULT_COLUMNS = ["Component", "Placed", "Total_W", "Allowed_dT", "dT_lumped", "dT_base", "dT_base_max", "Margin_local"]
+_FOOTPRINT_CACHE_SIZE = 16
+
+
+def base_conductivity(fin_tech):
+    """鰭片製程 -> 基板熱傳導係數 (W/m·K)；基板與鰭片同一種鋁材"""
+    return calc_alloy_k(fin_tech)
+
+
+def effective_htc(results):
+    """集總結果 -> 基板等效對流導納 G (W/m²·K)；沒有可行設計時為 0"""
+    base_area_m2 = results['L_hsk'] * results['W_hsk'] / 1e6
+    if not 0 < results['Area_req'] < np.inf or base_area_m2 <= 0:
+        return 0.0
+    return float(results['h_value'] * results['Eff'] * results['Area_req'] / base_area_m2)
+
+
+@lru_cache(maxsize=8)
+def _dct_matrix(n):
+    """正交 DCT-II 矩陣 (列 = 餘弦模態)，C @ C.T = I；只與格數有關，唯讀共用"""
+    i = np.arange(n)
+    c = np.cos(np.pi * np.outer(i, i + 0.5) / n) * np.sqrt(2.0 / n)
+    c[0] /= np.sqrt(2.0)
+    c.setflags(write=False)
+    return c
+
+
+def _cell_overlap(lo, hi, edges):
+    """區間 [lo, hi] 與各格 [edges[i], edges[i+1]] 的重疊長度；lo / hi 為 (n_src,) 陣列"""
+    return np.clip(np.minimum(hi[:, None], edges[None, 1:]) - np.maximum(lo[:, None], edges[None, :-1]), 0.0, None)
+
+
+class BasePlateSolver:
+    """固定幾何 / 材料 / 格點的基板求解器；建構時完成分解，solve() 只做矩陣乘法"""
+
+    def __init__(self, L_mm, W_mm, t_mm, k, g_eff, res_mm=1.0):
+        if g_eff <= 0:
+            raise ValueError("等效對流導納必須 > 0 (沒有可行的散熱器設計)")
+        if min(L_mm, W_mm, t_mm, k, res_mm) <= 0:
+            raise ValueError("基板尺寸、厚度、熱傳導係數與格點大小必須 > 0")
+        self.L, self.W, self.t, self.k, self.g_eff = L_mm, W_mm, t_mm, k, g_eff
+        self.nx = max(2, int(round(L_mm / res_mm)))
+        self.ny = max(2, int(round(W_mm / res_mm)))
+        self.dx, self.dy = L_mm / self.nx, W_mm / self.ny
+        self.x_edges = np.linspace(0.0, L_mm, self.nx + 1)
+        self.y_edges = np.linspace(0.0, W_mm, self.ny + 1)
+        self.cx, self.cy = _dct_matrix(self.nx), _dct_matrix(self.ny)
+        # 離散 Neumann Laplacian 的特徵值 (2 - 2cos(πp/n)) / Δ²，Δ 以公尺計
+        mu_x = (2.0 - 2.0 * np.cos(np.pi * np.arange(self.nx) / self.nx)) / (self.dx / 1e3) ** 2
+        mu_y = (2.0 - 2.0 * np.cos(np.pi * np.arange(self.ny) / self.ny)) / (self.dy / 1e3) ** 2
+        self.denom = k * (t_mm / 1e3) * (mu_x[:, None] + mu_y[None, :]) + g_eff
+        self.cell_area_m2 = self.dx * self.dy / 1e6
+        self._footprints = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self):
+        return self.nx, self.ny
+
+    def solve_flux(self, q):
+        """熱通量格點 q (W/m², shape = (nx, ny)) -> 溫升格點 θ (K)"""
+        return self.cx.T @ ((self.cx @ q @ self.cy.T) / self.denom) @ self.cy
+
+    def footprints(self, rects):
+        """元件矩形 (n, 4) [x0, x1, y0, y1] (mm，基板座標) -> 正規化的 (OX, OY) 重疊權重 (依內容快取)"""
+        rects = np.ascontiguousarray(rects, dtype=float).reshape(-1, 4)
+        key = rects.tobytes()
+        with self._lock:
+            hit = self._footprints.get(key)
+            if hit is not None:
+                self._footprints.move_to_end(key)
+                return hit
+        ox = _cell_overlap(rects[:, 0], rects[:, 1], self.x_edges)
+        oy = _cell_overlap(rects[:, 2], rects[:, 3], self.y_edges)
+        sx, sy = ox.sum(axis=1, keepdims=True), oy.sum(axis=1, keepdims=True)
+        inside = (sx[:, 0] > 0) & (sy[:, 0] > 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ox = np.where(inside[:, None], ox / sx, 0.0)
+            oy = np.where(inside[:, None], oy / sy, 0.0)
+        value = (ox, oy, inside)
+        with self._lock:
+            self._footprints[key] = value
+            if len(self._footprints) > _FOOTPRINT_CACHE_SIZE:
+                self._footprints.popitem(last=False)
+        return value
+
+    def solve(self, rects, powers, uniform_power=0.0):
+        """元件矩形 + 功耗 (W) -> (θ 格點, 足跡平均溫升, 足跡最高溫升)
+
+        足跡完全落在基板外的元件與 uniform_power 一起均勻分佈 (其讀值為基板平均溫升)。
+        """
+        ox, oy, inside = self.footprints(rects)
+        powers = np.asarray(powers, dtype=float)
+        uniform_power = float(uniform_power) + powers[~inside].sum()
+        q = (ox.T * np.where(inside, powers, 0.0)) @ oy / self.cell_area_m2
+        theta = self.solve_flux(q) + uniform_power / (self.g_eff * self.nx * self.ny * self.cell_area_m2)
+        mean = np.einsum('si,ij,sj->s', ox, theta, oy)
+        peak = np.empty(len(powers))
+        for s in range(len(powers)):
+            if not inside[s]:
+                mean[s] = peak[s] = theta.mean()
+                continue
+            ix, iy = np.flatnonzero(ox[s]), np.flatnonzero(oy[s])
+            peak[s] = theta[ix[0]:ix[-1] + 1, iy[0]:iy[-1] + 1].max()
+        return theta, mean, peak
+
+
+@lru_cache(maxsize=8)
+def get_solver(L_mm, W_mm, t_mm, k, g_eff, res_mm=1.0):
+    """依 (幾何, 材料, G, 格點) 快取的求解器；只改功耗或位置時重用同一個分解"""
+    return BasePlateSolver(L_mm, W_mm, t_mm, k, g_eff, res_mm)
+
+
+def component_rects(final_df, p):
+    """元件表 (含計算欄位) -> (rects (n, 4) mm 基板座標, placed 布林陣列)"""
+    n = len(final_df)
+    if not all(c in final_df.columns for c in PLACEMENT_COLUMNS):
+        return np.zeros((n, 4)), np.zeros(n, dtype=bool)
+    x = pd.to_numeric(final_df['X(mm)'], errors='coerce').to_numpy(dtype=float)
+    y = pd.to_numeric(final_df['Y(mm)'], errors='coerce').to_numpy(dtype=float)
+    base_l = final_df['Base_L'].to_numpy(dtype=float)
+    base_w = final_df['Base_W'].to_numpy(dtype=float)
+    pad_l = pd.to_numeric(final_df['Pad_L'], errors='coerce').to_numpy(dtype=float)
+    pad_w = pd.to_numeric(final_df['Pad_W'], errors='coerce').to_numpy(dtype=float)
+    qty = pd.to_numeric(final_df['Qty'], errors='coerce').fillna(1).clip(lower=1).to_numpy(dtype=float)
+    use_base = (base_l > 0) & (base_w > 0)
+    fl = np.where(use_base, base_l, pad_l) * np.sqrt(qty)
+    fw = np.where(use_base, base_w, pad_w) * np.sqrt(qty)
+    placed = np.isfinite(x) & np.isfinite(y) & (fl > 0) & (fw > 0)
+    cx, cy = x + p['Top'], y + p['Left']  # PCB 座標 -> 散熱器座標
+    rects = np.column_stack([cx - fl / 2, cx + fl / 2, cy - fw / 2, cy + fw / 2])
+    return np.where(placed[:, None], rects, 0.0), placed
+
+
+def solve_base_temperature(p, results, res_mm=1.0, k_base=None):
+    """集總評估結果 + 元件座標 -> 基板溫升場與逐元件的局部溫升 / 裕度
+
+    p       : 已補齊的全域參數 (resolve_params)
+    results : evaluate_project 的回傳值 (需要 final_df / L_hsk / W_hsk / h_value / Eff / Area_req)
+    回傳 dict：theta (nx, ny)、x / y 格點中心 (mm)、table (SPREAD_RESULT_COLUMNS)、dT_lumped、k、G、elapsed_ms
+    """
+    t0 = time.perf_counter()
+    L_hsk, W_hsk = calc_hsk_outline(p)
+    g_eff = effective_htc(results)
+    k = float(k_base) if k_base else base_conductivity(p['fin_tech_selector_v2'])
+    solver = get_solver(float(L_hsk), float(W_hsk), float(p['t_base']), k, g_eff, float(res_mm))
+
+    final_df = results['final_df']
+    total_w = final_df['Total_W'].to_numpy(dtype=float) if len(final_df) else np.zeros(0)
+    powers = np.nan_to_num(total_w) * p['Margin']
+    valid = powers > 0
+    rects, placed = component_rects(final_df, p)
+    placed &= valid
+    theta, mean, peak = solver.solve(rects[placed], powers[placed], powers[valid & ~placed].sum())
+
+    dT_lumped = powers.sum() / (g_eff * L_hsk * W_hsk / 1e6)
+    local = np.full(len(final_df), theta.mean())
+    local_max = local.copy()
+    local[placed], local_max[placed] = mean, peak
+    allowed = final_df['Allowed_dT'].to_numpy(dtype=float) if len(final_df) else np.zeros(0)
+    table = pd.DataFrame({
+        "Component": final_df['Component'].to_numpy() if len(final_df) else [],
+        "Placed": placed, "Total_W": total_w, "Allowed_dT": allowed,
+        "dT_lumped": dT_lumped, "dT_base": local, "dT_base_max": local_max,
+        "Margin_local": allowed - local,
+    }, columns=SPREAD_RESULT_COLUMNS)
+    return {
+        "theta": theta,
+        "x": (solver.x_edges[:-1] + solver.x_edges[1:]) / 2, "y": (solver.y_edges[:-1] + solver.y_edges[1:]) / 2,
+        "rects": rects, "placed": placed, "table": table[valid].reset_index(drop=True),
+        "dT_lumped": dT_lumped, "k": k, "G": g_eff, "shape": solver.shape,
+        "elapsed_ms": (time.perf_counter() - t0) * 1e3,
+    }
+
+
+def auto_layout(components_df, p):
+    """沒有座標且有 Pad 的元件平均排在 PCB 的格狀位置上 (依表格順序)，回傳加上 X(mm) / Y(mm) 欄位的新表"""
+    df = components_df.copy()
+    for c in PLACEMENT_COLUMNS:
+        if c not in df.columns:
+            df[c] = np.nan
+    pad_area = (pd.to_numeric(df['Pad_L'], errors='coerce') * pd.to_numeric(df['Pad_W'], errors='coerce')).fillna(0)
+    todo = np.flatnonzero((df['X(mm)'].isna() | df['Y(mm)'].isna()).to_numpy() & (pad_area > 0).to_numpy())
+    if len(todo) == 0:
+        return df
+    L, W = float(p['L_pcb']), float(p['W_pcb'])
+    n_cols = max(1, int(np.ceil(np.sqrt(len(todo) * L / W))))
+    n_rows = int(np.ceil(len(todo) / n_cols))
+    k = np.arange(len(todo))
+    df.iloc[todo, df.columns.get_loc('X(mm)')] = np.round((k % n_cols + 0.5) * L / n_cols, 1)
+    df.iloc[todo, df.columns.get_loc('Y(mm)')] = np.round((k // n_cols + 0.5) * W / n_rows, 1)
+    return df
@@ -0,0 +1,265 @@
+"""設計空間掃描 (Design-Space Sweep)
+
+對任意 DEFAULT_GLOBALS 參數給定範圍/格點，以陣列一次評估整個笛卡兒積：
+h_value、Fin_Count、Fin_Height、RRU_Height、Volume_L、total_weight_kg 與 DRC。
+
+- 幾何/重量/DRC 全部以 NumPy broadcasting 計算 (calc_*_vec，與單點版逐位元一致)
+- 影響元件熱阻的參數 (COMPONENT_KEYS) 只在其子格點上評估元件表，再映射回全格點
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .drc import AR_LIMIT, EMBEDDED_FIN_H_MAX, GAP_MIN, H_CONV_MIN
+from .geometry import ALLOY_CONDUCTIVITY, DEFAULT_FIN_EFF_MODE, SHIELDING_HEIGHT_CM, solve_fin_coupled
+from .model import build_globals_dict, resolve_params
+from .thermal import calc_thermal_resistance_vec
+
+# 會改變元件熱阻 / Allowed_dT 的全域參數
+COMPONENT_KEYS = [
+    "T_amb", "Coin_L_Setting", "Coin_W_Setting", "K_Via", "Via_Eff",
+    "K_Putty", "t_Putty", "K_Pad", "t_Pad", "K_Grease", "t_Grease",
+    "K_Solder", "t_Solder", "Voiding",
+]
+# 元件表的文字欄位 (批次堆疊時以類別碼複製)
+TEXT_COLUMNS = ["Component", "Board_Type", "TIM_Type"]
+MAX_CHUNK_ROWS = 500_000  # 批次評估時每塊堆疊表的最大列數 (案例數 × 元件數)
+
+DRC_RULES = ["", "choked_flow", "poor_convection", "gap_too_small", "process_limit", "fin_eff_limit"]
+
+SWEEP_RESULT_COLUMNS = [
+    "h_value", "h_conv", "Eff", "Fin_Eff", "Fin_Count", "Min_dT_Allowed", "Total_Power", "Fin_Height",
+    "RRU_Height", "Volume_L", "total_weight_kg", "aspect_ratio", "drc_pass", "drc_rule",
+]
+
+
+def calc_h_value_vec(Gap):
+    """calc_h_value 的陣列版"""
+    Gap = np.asarray(Gap, dtype=float)
+    with np.errstate(invalid='ignore'):
+        h_conv = 6.4 * np.tanh(Gap / 7.0)
+        rad_factor = np.where(Gap >= 10.0, 1.0, np.sqrt(Gap / 10.0))
+    h_rad = 2.4 * rad_factor
+    return h_conv + h_rad, h_conv, h_rad
+
+
+def calc_fin_count_vec(W_hsk, Gap, Fin_t):
+    """calc_fin_count 的陣列版 (植樹原理 + 浮點誤差修正)"""
+    W_hsk, Gap, Fin_t = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (W_hsk, Gap, Fin_t)))
+    pitch = Gap + Fin_t
+    ok = pitch > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n = np.trunc(np.where(ok, (W_hsk + Gap) / pitch, 0.0))
+    # 對應單點版的 while 迴圈：總寬超出 W_hsk 時逐片遞減 (通常最多 1 次)
+    over = ok & (n > 0) & (n * Fin_t + (n - 1) * Gap > W_hsk)
+    while over.any():
+        n = np.where(over, n - 1, n)
+        over = over & (n > 0) & (n * Fin_t + (n - 1) * Gap > W_hsk)
+    return n.astype(np.int64)
+
+
+def calc_fin_eff_vec(fin_tech):
+    """calc_fin_eff 的陣列版 (大量格點請傳 pd.Categorical，只需判斷各類別一次)"""
+    if isinstance(fin_tech, pd.Categorical):
+        eff, embedded = calc_fin_eff_vec(np.asarray(fin_tech.categories, dtype=object))
+        return eff[fin_tech.codes], embedded[fin_tech.codes]
+    fin_tech = np.asarray(fin_tech, dtype=object)
+    embedded = np.array(["Embedded" in str(t) for t in fin_tech.ravel()], dtype=bool).reshape(fin_tech.shape)
+    return np.where(embedded, 0.95, 0.90), embedded
+
+
+def evaluate_design_arrays(p, Total_Watts_Sum, Min_dT_Allowed):
+    """幾何 -> 鰭片高度/體積/重量/DRC 的陣列版 (evaluate_project 的後半段)
+
+    p 的每個值可為純量或可 broadcast 的陣列；Total_Watts_Sum、Min_dT_Allowed 亦同。
+    fin_eff_mode 可為純量或逐點的字串陣列；coupled 的點以 solve_fin_coupled 一次求解鰭片高度與效率。
+    回傳 dict of ndarray (欄位見 SWEEP_RESULT_COLUMNS，另含 fin_eff_status_code / fin_eff_residual)。
+    """
+    f = {k: np.asarray(v, dtype=float) for k, v in p.items() if k not in ("fin_tech_selector_v2", "fin_eff_mode")}
+    Eff, embedded = calc_fin_eff_vec(p["fin_tech_selector_v2"])
+    coupled = np.asarray(p.get("fin_eff_mode", DEFAULT_FIN_EFF_MODE), dtype=object) == "coupled"
+
+    L_hsk = f['L_pcb'] + f['Top'] + f['Btm']
+    W_hsk = f['W_pcb'] + f['Left'] + f['Right']
+    Gap, Fin_t = f['Gap'], f['Fin_t']
+    h_value, h_conv, _ = calc_h_value_vec(Gap)
+    Fin_Count = calc_fin_count_vec(W_hsk, Gap, Fin_t)
+
+    Total_Power = np.asarray(Total_Watts_Sum, dtype=float) * f['Margin']
+    Min_dT = np.asarray(Min_dT_Allowed, dtype=float)
+    ok = (Total_Power > 0) & (Min_dT > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R_sa = Min_dT / Total_Power
+        Area_req = 1 / (h_value * R_sa * Eff)
+        Base_Area_m2 = (L_hsk * W_hsk) / 1e6
+        Fin_Height = ((Area_req - Base_Area_m2) * 1e6) / (2 * Fin_Count * L_hsk)
+        Fin_Eff = Eff
+        status = np.zeros(np.shape(coupled), dtype=np.int8)
+        residual = 0.0
+        if coupled.any():
+            k_fin = np.where(embedded, ALLOY_CONDUCTIVITY["Embedded"], ALLOY_CONDUCTIVITY["Die-casting"])
+            sol = solve_fin_coupled(1 / (h_value * R_sa), Base_Area_m2, Fin_Count, L_hsk, h_value, k_fin, Fin_t)
+            Fin_Height = np.where(coupled, sol["Fin_Height"], Fin_Height)
+            Eff = np.where(coupled, np.where(ok, sol["Eff"], 1.0), Eff)
+            Fin_Eff = np.where(coupled, np.where(ok, sol["Fin_Eff"], 1.0), Fin_Eff)
+            status = np.where(coupled, np.where(ok, sol["status"], 4), 0).astype(np.int8)
+            residual = np.where(coupled & ok, sol["residual"], 0.0)
+        RRU_Height = f['t_base'] + Fin_Height + f['H_shield'] + f['H_filter']
+        Volume_L = (L_hsk * W_hsk * RRU_Height) / 1e6
+
+        base_vol_cm3 = L_hsk * W_hsk * f['t_base'] / 1000
+        fins_vol_cm3 = Fin_Count * Fin_t * Fin_Height * L_hsk / 1000
+        hs_weight_kg = (base_vol_cm3 + fins_vol_cm3) * f['al_density'] / 1000
+        shield_vol_cm3 = np.maximum(L_hsk * W_hsk * f['H_shield'] / 1000 - f['L_pcb'] * f['W_pcb'] * f['H_shield'] / 1000, 0)
+        shield_weight_kg = shield_vol_cm3 * f['al_density'] / 1000
+        filter_weight_kg = L_hsk * W_hsk * f['H_filter'] / 1000 * f['filter_density'] / 1000
+        shielding_weight_kg = f['L_pcb'] * f['W_pcb'] / 100 * SHIELDING_HEIGHT_CM * f['shielding_density'] / 1000
+        pcb_weight_kg = f['L_pcb'] * f['W_pcb'] / 100 * f['pcb_surface_density'] / 1000
+        total_weight_kg = hs_weight_kg + (filter_weight_kg + shield_weight_kg + shielding_weight_kg + pcb_weight_kg)
+
+    Fin_Height = np.where(ok, Fin_Height, 0.0)
+    RRU_Height = np.where(ok, RRU_Height, 0.0)
+    Volume_L = np.where(ok, Volume_L, 0.0)
+    total_weight_kg = np.where(ok, total_weight_kg, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aspect_ratio = np.where((Gap > 0) & (Fin_Height > 0), Fin_Height / Gap, 0.0)
+    rule = np.select(
+        [coupled & np.isposinf(Fin_Height), aspect_ratio > AR_LIMIT, h_conv < H_CONV_MIN, Gap < GAP_MIN, embedded & (Fin_Height > EMBEDDED_FIN_H_MAX)],
+        [5, 1, 2, 3, 4], default=0,
+    ).astype(np.int8)
+
+    return {
+        "h_value": h_value, "h_conv": h_conv, "Eff": Eff, "Fin_Eff": Fin_Eff, "Fin_Count": Fin_Count,
+        "Min_dT_Allowed": Min_dT, "Total_Power": Total_Power,
+        "Fin_Height": Fin_Height, "RRU_Height": RRU_Height, "Volume_L": Volume_L,
+        "total_weight_kg": total_weight_kg, "hs_weight_kg": np.where(ok, hs_weight_kg, 0.0),
+        "aspect_ratio": aspect_ratio, "drc_pass": rule == 0, "drc_rule_code": rule,
+        "fin_eff_status_code": status, "fin_eff_residual": residual,
+    }
+
+
+def summarize_component_grid(components_df, p, comp_grid):
+    """在元件參數子格點上評估元件表，回傳 (Total_Watts_Sum, Min_dT_Allowed[combos])
+
+    comp_grid: {key: 1-D values}，僅含 COMPONENT_KEYS；為空時回傳純量。
+    各組合以 evaluate_component_cases 批次評估，每塊不超過 MAX_CHUNK_ROWS 列 (組合數 × 元件數)，
+    峰值記憶體不隨組合總數成長。
+    """
+    keys = list(comp_grid)
+    combos = list(itertools.product(*(comp_grid[k] for k in keys)))
+    n_combo = len(combos)
+    combos = np.array(combos, dtype=float).reshape(n_combo, len(keys))
+    if components_df.empty:
+        return 0.0, np.full(n_combo, 50.0) if keys else np.float64(50.0)
+    n_rows = len(components_df)
+    chunk = max(1, MAX_CHUNK_ROWS // n_rows)
+
+    Min_dT = np.empty(n_combo)
+    for start in range(0, n_combo, chunk):
+        part = combos[start:start + chunk]
+        pc = dict(p)
+        for i, k in enumerate(keys):
+            pc[k] = part[:, i]
+        total_w, allowed = evaluate_component_cases(components_df, pc, len(part))
+        valid = total_w[0] > 0
+        if not valid.any():
+            return 0.0, np.full(n_combo, 50.0) if keys else np.float64(50.0)
+        Min_dT[start:start + len(part)] = np.nanmin(allowed[:, valid], axis=1)
+    Total_Watts_Sum = total_w[0][valid].sum()
+    return Total_Watts_Sum, Min_dT if keys else Min_dT[0]
+
+
+def evaluate_component_cases(components_df, p, n, column_values=None):
+    """元件表複製 n 份堆疊後一次計算熱阻，回傳 (Total_W, Allowed_dT)，皆為 (n, 元件數) 陣列
+
+    p             : 全域參數，COMPONENT_KEYS 的值可為純量或 (n,) 陣列
+    column_values : {元件欄位: (n, 元件數) 陣列}，覆寫各案例的元件數值
+    案例 i 的第 j 列位於 i·元件數 + j；文字欄位每個案例相同，以類別碼複製。
+    """
+    n_rows = len(components_df)
+    cols = {}
+    for c in components_df.columns:
+        if c in (column_values or {}):
+            cols[c] = np.asarray(column_values[c], dtype=float).reshape(n * n_rows)
+        elif c in TEXT_COLUMNS:
+            # 文字欄位每個案例相同：以類別碼複製，避免逐格建立字串
+            cat = pd.Categorical(components_df[c].astype(object))
+            cols[c] = pd.Categorical.from_codes(np.tile(cat.codes, n), categories=cat.categories)
+        else:
+            cols[c] = np.tile(pd.to_numeric(components_df[c], errors='coerce').to_numpy(dtype=float), n)
+
+    # 影響元件熱阻的全域參數展開為逐列陣列
+    pg = dict(p)
+    for k in COMPONENT_KEYS:
+        if np.ndim(p[k]):
+            pg[k] = np.repeat(p[k], n_rows)
+    res = calc_thermal_resistance_vec(pd.DataFrame(cols), build_globals_dict(pg))
+    return res['Total_W'].to_numpy().reshape(n, n_rows), res['Allowed_dT'].to_numpy().reshape(n, n_rows)
+
+
+def evaluate_case_batch(components_df, p, n, column_values=None):
+    """n 組獨立案例一次評估 (Monte Carlo 樣本、敏感度擾動等)
+
+    p             : 全域參數，每個值可為純量或 (n,) 陣列
+    column_values : {元件欄位: (n, 元件數) 陣列}，覆寫各案例的元件數值
+    元件熱阻由 evaluate_component_cases 一次算完；呼叫端負責分塊 (n × 元件數 ≤ MAX_CHUNK_ROWS)。
+    回傳 (Min_dT_Allowed, 瓶頸列索引 (-1 = 無), evaluate_design_arrays 結果)。
+    """
+    if len(components_df) == 0:
+        return np.full(n, 50.0), np.full(n, -1), evaluate_design_arrays(p, 0.0, 50.0)
+
+    total_w, allowed = evaluate_component_cases(components_df, p, n, column_values)
+    valid = total_w > 0
+    masked = np.where(valid & ~np.isnan(allowed), allowed, np.inf)
+    bottleneck = np.argmin(masked, axis=1)
+    Min_dT = masked[np.arange(n), bottleneck]
+    any_valid = valid.any(axis=1)
+    # 與 summarize_components 一致：無有效元件時 Min_dT = 50
+    Min_dT = np.where(any_valid, np.where(np.isinf(Min_dT), np.nan, Min_dT), 50.0)
+    bottleneck = np.where(any_valid & ~np.isnan(Min_dT), bottleneck, -1)
+    Total_Watts_Sum = np.where(valid, total_w, 0.0).sum(axis=1)
+    return Min_dT, bottleneck, evaluate_design_arrays(p, Total_Watts_Sum, Min_dT)
+
+
+def run_sweep(params, components_df, grid):
+    """笛卡兒積掃描
+
+    params : 基準全域參數 (未掃描的參數固定為此值)
+    grid   : {key: 1-D values}，key 為任意 DEFAULT_GLOBALS 參數
+    回傳 DataFrame：每個格點一列，含掃描參數欄位與 SWEEP_RESULT_COLUMNS。
+    """
+    p = resolve_params(params)
+    keys = [k for k in grid if len(grid[k]) > 0]
+    axes = {k: np.asarray(grid[k], dtype=float) for k in keys if k != "fin_tech_selector_v2"}
+    if "fin_tech_selector_v2" in keys:
+        axes["fin_tech_selector_v2"] = pd.unique(pd.Series(list(grid["fin_tech_selector_v2"]), dtype=object)).astype(object)
+    shape = tuple(len(axes[k]) for k in keys)
+    n_points = int(np.prod(shape)) if shape else 1
+    idx = np.unravel_index(np.arange(n_points), shape) if shape else ()
+
+    comp_keys = [k for k in keys if k in COMPONENT_KEYS]
+    Total_Watts_Sum, Min_dT = summarize_component_grid(components_df, p, {k: axes[k] for k in comp_keys})
+    if comp_keys:
+        comp_shape = tuple(len(axes[k]) for k in comp_keys)
+        comp_idx = np.ravel_multi_index(tuple(idx[keys.index(k)] for k in comp_keys), comp_shape)
+        Min_dT = Min_dT[comp_idx]
+
+    pts = dict(p)
+    for i, k in enumerate(keys):
+        if k == "fin_tech_selector_v2":
+            pts[k] = pd.Categorical.from_codes(idx[i], categories=axes[k])
+        else:
+            pts[k] = axes[k][idx[i]]
+    out = evaluate_design_arrays(pts, Total_Watts_Sum, Min_dT)
+
+    df = pd.DataFrame({k: pts[k] for k in keys})
+    for c in SWEEP_RESULT_COLUMNS:
+        if c == "drc_rule":
+            df[c] = pd.Categorical.from_codes(out["drc_rule_code"], categories=DRC_RULES)
+        else:
+            df[c] = np.array(np.broadcast_to(out[c], (n_points,)))
+    return df
+
@@ -0,0 +1,94 @@
+"""大型 BOM 表格檢視 (Large-table Mode)
+
+DETAILED ANALYSIS 的表格以 pandas Styler.background_gradient 上色；Styler 會把每一格轉成 HTML/CSS，
+元件數上千時渲染很慢、記憶體很大。超過 LARGE_TABLE_ROWS 列時 App 改用這裡的伺服器端檢視：
+
+- 色階：允許溫升一次向量化映射到 256 色查表的索引 (int16，每列 2 bytes)，與
+  Styler.background_gradient(cmap='RdYlGn') 的色階、深色底白字規則相同，不需要 matplotlib
+- 排序 / 篩選 (距瓶頸溫升、元件名稱) 以 numpy 在伺服器端完成，只把目前這一頁交給 Styler 並送到瀏覽器
+"""
+from functools import lru_cache
+
+import numpy as np
+
+LARGE_TABLE_ROWS = 500
+PAGE_SIZE_OPTIONS = [50, 100, 200, 500]
+TABLE_SORT_OPTIONS = {
+    "worst": "允許溫升 小 → 大 (瓶頸優先)",
+    "best": "允許溫升 大 → 小",
+    "original": "原始順序",
+}
+# matplotlib RdYlGn 的 11 個控制色；查表 256 色 (與 matplotlib colormap 的 N 相同)
+_RDYLGN = ["#a50026", "#d73027", "#f46d43", "#fdae61", "#fee08b", "#ffffbf",
+           "#d9ef8b", "#a6d96a", "#66bd63", "#1a9850", "#006837"]
+_LUT_SIZE = 256
+_TEXT_COLOR_THRESHOLD = 0.408  # pandas Styler.background_gradient 的預設值：背景亮度低於此值改用淺色字
+
+
+@lru_cache(maxsize=1)
+def gradient_lut():
+    """256 個 CSS 字串 (背景色 + 文字色)，格式與 Styler.background_gradient 相同"""
+    stops = np.array([[int(h[i:i + 2], 16) / 255 for i in (1, 3, 5)] for h in _RDYLGN])
+    x = np.linspace(0.0, 1.0, _LUT_SIZE)
+    pos = np.linspace(0.0, 1.0, len(_RDYLGN))
+    rgb = np.column_stack([np.interp(x, pos, stops[:, c]) for c in range(3)])
+    linear = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    dark = linear @ np.array([0.2126, 0.7152, 0.0722]) < _TEXT_COLOR_THRESHOLD
+    return tuple(
+        f"background-color: #{''.join(format(round(v * 255), '02x') for v in c)};color: {'#f1f1f1' if d else '#000000'};"
+        for c, d in zip(rgb, dark)
+    )
+
+
+def gradient_index(values, vmin=None, vmax=None):
+    """數值 -> 色階查表索引 (int16)；NaN 為 -1 (不上色)。vmin / vmax 預設為整欄 (非 NaN) 的最小 / 最大值"""
+    v = np.asarray(values, dtype=float)
+    out = np.full(v.shape, -1, dtype=np.int16)
+    ok = ~np.isnan(v)
+    if not ok.any():
+        return out
+    lo = np.min(v[ok]) if vmin is None else vmin
+    hi = np.max(v[ok]) if vmax is None else vmax
+    norm = (v[ok] - lo) / (hi - lo) if hi > lo else np.zeros(int(ok.sum()))
+    out[ok] = np.clip(np.floor(norm * _LUT_SIZE), 0, _LUT_SIZE - 1)
+    return out
+
+
+def gradient_css(index):
+    """查表索引 -> CSS 字串 list (只對要顯示的列呼叫)"""
+    lut = gradient_lut()
+    return [lut[i] if i >= 0 else "" for i in np.asarray(index).tolist()]
+
+
+def select_rows(allowed_dt, min_dt, sort="worst", max_gap=None, names=None, query=""):
+    """篩選 + 排序後的列位置 (ndarray)
+
+    max_gap : 只保留 Allowed_dT - min_dt <= max_gap 的列 (距瓶頸的溫升；None = 不篩選)
+    query   : 元件名稱包含此字串 (不分大小寫)；names 為與 allowed_dt 等長的名稱序列 (pandas Series)
+    sort    : TABLE_SORT_OPTIONS；排序皆為穩定排序，NaN 排在最後
+    """
+    allowed_dt = np.asarray(allowed_dt, dtype=float)
+    mask = np.ones(len(allowed_dt), dtype=bool)
+    if max_gap is not None:
+        mask &= allowed_dt - min_dt <= max_gap
+    if query and names is not None:
+        mask &= names.astype(str).str.contains(query, case=False, regex=False).to_numpy()
+    rows = np.flatnonzero(mask)
+    if sort == "worst":
+        rows = rows[np.argsort(allowed_dt[rows], kind="stable")]
+    elif sort == "best":
+        rows = rows[np.argsort(-allowed_dt[rows], kind="stable")]
+    elif sort != "original":
+        raise ValueError(f"未知的排序方式: {sort!r}")
+    return rows
+
+
+def page_count(n_rows, page_size):
+    """總頁數 (至少 1 頁)"""
+    return max(1, -(-n_rows // page_size))
+
+
+def page_rows(rows, page, page_size):
+    """第 page 頁 (從 1 起算) 的列位置；page 超出範圍時取最後一頁"""
+    page = min(max(1, int(page)), page_count(len(rows), page_size))
+    return rows[(page - 1) * page_size: page * page_size]
@@ -0,0 +1,152 @@
+"""元件熱阻計算 (Component Thermal Chain)
+
+calc_thermal_resistance         : 單行 (row-wise) 參考實作，與舊版 app.py 完全一致
+calc_thermal_resistance_vec     : 欄位導向 (column-oriented) NumPy 版本，整張表一次算完
+calc_thermal_resistance_arrays  : 同上，輸入為 component_arrays 取出的逐欄陣列 (可只取部分列、或多張表直接串接)，
+                                  省去建立 DataFrame 的固定成本，供增量重算與多專案批次評估使用
+"""
+import numpy as np
+import pandas as pd
+
+# 計算用的輸入欄位 (文字欄 + 數值欄)
+COMPONENT_TEXT_COLUMNS = ['Component', 'Board_Type', 'TIM_Type']
+COMPONENT_NUMERIC_COLUMNS = ['Qty', 'Power(W)', 'Height(mm)', 'Pad_L', 'Pad_W', 'Thick(mm)', 'Limit(C)', 'R_jc']
+# 計算欄位 (順序與 UI 表格一致)
+COMPONENT_RESULT_COLUMNS = ['Base_L', 'Base_W', 'Loc_Amb', 'R_int', 'R_TIM', 'Total_W', 'Drop', 'Allowed_dT']
+
+K_COPPER_COIN = 380.0
+DEFAULT_TIM = {"k": 1, "t": 0}
+
+
+def calc_thermal_resistance(row, g):
+    """單行元件熱阻計算 (取代原本 apply_excel_formulas)"""
+    # 從 g (globals_dict) 取出需要的全域變數
+    if row['Component'] == "Final PA":
+        base_l, base_w = g['Coin_L_Setting'], g['Coin_W_Setting']
+    elif row['Power(W)'] == 0 or row['Thick(mm)'] == 0:
+        base_l, base_w = 0.0, 0.0
+    else:
+        base_l, base_w = row['Pad_L'] + row['Thick(mm)'], row['Pad_W'] + row['Thick(mm)']
+        
+    loc_amb = g['T_amb'] + (row['Height(mm)'] * g['Slope'])
+    
+    if row['Board_Type'] == "Copper Coin":
+        k_board = K_COPPER_COIN
+    elif row['Board_Type'] == "Thermal Via":
+        k_board = g['K_Via']
+    else:
+        k_board = 0.0
+
+    pad_area = (row['Pad_L'] * row['Pad_W']) / 1e6
+    base_area = (base_l * base_w) / 1e6
+    
+    if k_board > 0 and pad_area > 0:
+        eff_area = np.sqrt(pad_area * base_area) if base_area > 0 else pad_area
+        r_int_val = (row['Thick(mm)']/1000) / (k_board * eff_area)
+        if row['Component'] == "Final PA":
+            r_int = r_int_val + ((g['t_Solder']/1000) / (g['K_Solder'] * pad_area * g['Voiding']))
+        elif row['Board_Type'] == "Thermal Via":
+            r_int = r_int_val / g['Via_Eff']
+        else:
+            r_int = r_int_val
+    else:
+        r_int = 0
+        
+    tim = g['tim_props'].get(row['TIM_Type'], DEFAULT_TIM)
+    target_area = base_area if base_area > 0 else pad_area
+    if target_area > 0 and tim['t'] > 0:
+        r_tim = (tim['t']/1000) / (tim['k'] * target_area)
+    else:
+        r_tim = 0
+        
+    total_w = row['Qty'] * row['Power(W)']
+    drop = row['Power(W)'] * (row['R_jc'] + r_int + r_tim)
+    allowed_dt = row['Limit(C)'] - drop - loc_amb
+    return pd.Series([base_l, base_w, loc_amb, r_int, r_tim, total_w, drop, allowed_dt])
+
+
+def component_arrays(df, rows=None):
+    """元件表 -> {欄位: ndarray}：文字欄為 object，數值欄為 float (空白列 None / 非數字 -> NaN)
+
+    rows 為列位置 (整數陣列) 時只取這些列，先切片再轉型，成本與列數成正比。
+    """
+    cols = {}
+    for col in COMPONENT_TEXT_COLUMNS:
+        values = df[col].array
+        cols[col] = np.asarray(values if rows is None else values[rows], dtype=object)
+    for col in COMPONENT_NUMERIC_COLUMNS:
+        series = df[col]
+        values = series.to_numpy()
+        if rows is not None:
+            values = values[rows]
+        if series.dtype.kind in 'biuf':
+            cols[col] = values.astype(float)
+        else:
+            cols[col] = np.asarray(pd.to_numeric(values, errors='coerce'), dtype=float)
+    return cols
+
+
+def calc_thermal_resistance_vec(df, g):
+    """整張元件表的熱阻計算 (向量化版 calc_thermal_resistance)
+
+    分支邏輯以 np.where / np.select 表示，運算順序與單行版相同，
+    結果逐位元一致。g 內的數值可為純量，或與 df 列數相同的陣列 (批次評估用)。
+    回傳 DataFrame，欄位為 COMPONENT_RESULT_COLUMNS，index 與 df 相同。
+    """
+    out = calc_thermal_resistance_arrays(component_arrays(df), g)
+    return pd.DataFrame(out, index=df.index)
+
+
+def calc_thermal_resistance_arrays(cols, g):
+    """calc_thermal_resistance_vec 的陣列版：cols 為 component_arrays 的結果，回傳 {計算欄位: float ndarray}"""
+    comp = cols['Component']
+    board = cols['Board_Type']
+    tim_type = cols['TIM_Type']
+    qty = cols['Qty']
+    power = cols['Power(W)']
+    height = cols['Height(mm)']
+    pad_l = cols['Pad_L']
+    pad_w = cols['Pad_W']
+    thick = cols['Thick(mm)']
+    limit = cols['Limit(C)']
+    r_jc = cols['R_jc']
+
+    is_pa = comp == "Final PA"
+    is_coin = board == "Copper Coin"
+    is_via = board == "Thermal Via"
+    shape = comp.shape
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        no_spread = (power == 0) | (thick == 0)
+        base_l = np.where(is_pa, g['Coin_L_Setting'], np.where(no_spread, 0.0, pad_l + thick))
+        base_w = np.where(is_pa, g['Coin_W_Setting'], np.where(no_spread, 0.0, pad_w + thick))
+
+        loc_amb = g['T_amb'] + (height * g['Slope'])
+
+        k_board = np.select([is_coin, is_via], [K_COPPER_COIN, g['K_Via']], default=0.0)
+
+        pad_area = (pad_l * pad_w) / 1e6
+        base_area = (base_l * base_w) / 1e6
+
+        eff_area = np.where(base_area > 0, np.sqrt(pad_area * base_area), pad_area)
+        r_int_val = (thick/1000) / (k_board * eff_area)
+        r_int_pa = r_int_val + ((g['t_Solder']/1000) / (g['K_Solder'] * pad_area * g['Voiding']))
+        r_int = np.select([is_pa, is_via], [r_int_pa, r_int_val / g['Via_Eff']], default=r_int_val)
+        r_int = np.where((k_board > 0) & (pad_area > 0), r_int, 0.0)
+
+        tim_props = g['tim_props']
+        tim_masks = [tim_type == name for name in tim_props]
+        tim_k = np.select(tim_masks, [p['k'] for p in tim_props.values()], default=DEFAULT_TIM['k'])
+        tim_t = np.select(tim_masks, [p['t'] for p in tim_props.values()], default=DEFAULT_TIM['t'])
+        target_area = np.where(base_area > 0, base_area, pad_area)
+        r_tim = np.where((target_area > 0) & (tim_t > 0), (tim_t/1000) / (tim_k * target_area), 0.0)
+
+        total_w = qty * power
+        drop = power * (r_jc + r_int + r_tim)
+        allowed_dt = limit - drop - loc_amb
+
+    out = {
+        'Base_L': base_l, 'Base_W': base_w, 'Loc_Amb': loc_amb, 'R_int': r_int,
+        'R_TIM': r_tim, 'Total_W': total_w, 'Drop': drop, 'Allowed_dT': allowed_dt,
+    }
+    return {c: np.broadcast_to(out[c], shape).astype(float) for c in COMPONENT_RESULT_COLUMNS}
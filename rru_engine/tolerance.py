@@ -0,0 +1,263 @@
+"""Monte Carlo 公差分析 (Tolerance Analysis)
+
+對元件欄位 (Power(W)、R_jc…) 或全域參數 (t_Putty、Voiding、Via_Eff…) 指定分佈，
+抽樣 10^5~10^6 次並以陣列一次評估整條熱鏈：
+    元件熱阻 (calc_thermal_resistance_vec, 堆疊表) -> 瓶頸 -> 鰭片高度/體積 (evaluate_design_arrays)
+
+記憶體上限固定：樣本分塊 (chunk) 產生，每塊算完即丟棄，只保留
+- QuantileSketch：串流分位數估計 (壓縮器階層，容量固定)
+- 瓶頸元件次數 (bincount)
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .defaults import DEFAULT_GLOBALS
+from .model import resolve_params
+from .sweep import MAX_CHUNK_ROWS, evaluate_case_batch
+
+# column : 元件欄位或全域參數名稱
+# dist   : "normal" (spread = 1σ) / "uniform" / "triangular" (spread = 半寬)
+# spread : 公差；relative=True 時為標稱值的比例 (0.05 = ±5%)
+# target : 只套用到指定元件名稱 (None = 所有元件；全域參數忽略此欄)
+Tolerance = namedtuple("Tolerance", "column dist spread relative target", defaults=(True, None))
+
+TOLERANCE_DISTS = ["normal", "uniform", "triangular"]
+TOLERANCE_COMPONENT_COLUMNS = ["Power(W)", "Height(mm)", "Pad_L", "Pad_W", "Thick(mm)", "Limit(C)", "R_jc"]
+TOLERANCE_GLOBAL_KEYS = [k for k in DEFAULT_GLOBALS if k != "fin_tech_selector_v2"]
+
+# 抽樣值截斷範圍 (預設 >= 0)；比例類參數不可超過 1
+TOLERANCE_BOUNDS = {"T_amb": (-np.inf, np.inf), "Via_Eff": (0.0, 1.0), "Voiding": (0.0, 1.0)}
+DEFAULT_BOUNDS = (0.0, np.inf)
+
+# 規格書常見的離散範圍 (UI 預設表格)
+DEFAULT_TOLERANCES = [
+    Tolerance("Power(W)", "normal", 0.05),
+    Tolerance("R_jc", "normal", 0.10),
+    Tolerance("t_Putty", "uniform", 0.10),
+    Tolerance("t_Pad", "uniform", 0.10),
+    Tolerance("t_Grease", "uniform", 0.20),
+    Tolerance("Voiding", "normal", 0.05, relative=False),
+    Tolerance("Via_Eff", "normal", 0.05, relative=False),
+]
+
+TOLERANCE_QUANTILES = [0.01, 0.05, 0.50, 0.95, 0.99]
+
+
+class QuantileSketch:
+    """串流分位數估計 (壓縮器階層 / KLL 風格)
+
+    第 i 層的每個值代表 2^i 個樣本。某層超過 capacity 時排序、隨機取奇或偶位置的一半
+    推到上一層。記憶體為 O(capacity · log(n / capacity))，排名誤差約 O(log(n) / capacity)。
+    另以 Chan 合併公式精確累計 count / mean / std / min / max。
+    """
+
+    def __init__(self, capacity=8192, seed=None):
+        self.capacity = capacity
+        self._levels = []
+        self._rng = np.random.default_rng(seed)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, values):
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            return
+        n_a, n_b = self.count, len(v)
+        mean_b = v.mean()
+        m2_b = ((v - mean_b) ** 2).sum()
+        delta = mean_b - self._mean
+        self.count = n_a + n_b
+        self._mean += delta * n_b / self.count
+        self._m2 += m2_b + delta ** 2 * n_a * n_b / self.count
+        self.min = min(self.min, v.min())
+        self.max = max(self.max, v.max())
+        self._push(0, v)
+
+    def _push(self, level, v):
+        while True:
+            if level == len(self._levels):
+                self._levels.append(v)
+            else:
+                self._levels[level] = np.concatenate([self._levels[level], v])
+            if len(self._levels[level]) <= self.capacity:
+                return
+            buf = np.sort(self._levels[level])
+            if len(buf) % 2:
+                self._levels[level], buf = buf[-1:], buf[:-1]
+            else:
+                self._levels[level] = buf[:0]
+            v = buf[self._rng.integers(2)::2]
+            level += 1
+
+    def _weighted(self):
+        values = np.concatenate(self._levels) if self._levels else np.empty(0)
+        weights = np.concatenate([np.full(len(lv), 2.0 ** i) for i, lv in enumerate(self._levels)]) if self._levels else np.empty(0)
+        order = np.argsort(values, kind='stable')
+        return values[order], weights[order]
+
+    @property
+    def mean(self):
+        return self._mean if self.count else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    @property
+    def n_stored(self):
+        return sum(len(lv) for lv in self._levels)
+
+    def quantile(self, q):
+        """q 可為純量或陣列 (0~1)"""
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        values, weights = self._weighted()
+        cw = np.cumsum(weights)
+        idx = np.clip(np.searchsorted(cw, q * cw[-1], side='left'), 0, len(values) - 1)
+        out = values[idx]
+        return np.where(q <= 0, self.min, np.where(q >= 1, self.max, out))
+
+    def histogram(self, bins=50, range=None):
+        """加權直方圖 (counts 以樣本數計)"""
+        values, weights = self._weighted()
+        return np.histogram(values, bins=bins, range=range, weights=weights)
+
+    def summary(self, quantiles=TOLERANCE_QUANTILES):
+        out = {"count": self.count, "mean": self.mean, "std": self.std, "min": self.min, "max": self.max}
+        for q, v in zip(quantiles, self.quantile(quantiles)):
+            out[f"P{q * 100:g}"] = float(v)
+        return out
+
+
+def _draw(rng, tol, nominal, n):
+    """依分佈抽樣；nominal 為 (k,) 陣列 -> 回傳 (n, k)"""
+    nominal = np.asarray(nominal, dtype=float)
+    spread = tol.spread * np.abs(nominal) if tol.relative else np.full(nominal.shape, float(tol.spread))
+    if tol.dist == "normal":
+        z = rng.standard_normal((n,) + nominal.shape)
+    elif tol.dist == "uniform":
+        z = rng.uniform(-1.0, 1.0, (n,) + nominal.shape)
+    else:
+        z = rng.triangular(-1.0, 0.0, 1.0, (n,) + nominal.shape)
+    lo, hi = TOLERANCE_BOUNDS.get(tol.column, DEFAULT_BOUNDS)
+    return np.clip(nominal + spread * z, lo, hi)
+
+
+def validate_tolerances(tolerances, components_df):
+    """檢查欄位 / 分佈 / 元件名稱，錯誤時拋出 ValueError"""
+    names = set(components_df['Component']) if 'Component' in components_df else set()
+    for tol in tolerances:
+        if tol.dist not in TOLERANCE_DISTS:
+            raise ValueError(f"未知的分佈：{tol.dist}")
+        if tol.column in TOLERANCE_GLOBAL_KEYS:
+            continue
+        if tol.column not in TOLERANCE_COMPONENT_COLUMNS:
+            raise ValueError(f"不支援公差的欄位：{tol.column}")
+        if tol.target is not None and tol.target not in names:
+            raise ValueError(f"元件表中找不到：{tol.target}")
+
+
+def _evaluate_chunk(components_df, p, tolerances, rng, n):
+    """抽樣 n 組並評估，回傳 (Min_dT, bottleneck_idx, design dict)"""
+    pp = dict(p)
+    for tol in tolerances:
+        if tol.column in TOLERANCE_GLOBAL_KEYS:
+            pp[tol.column] = _draw(rng, tol, [float(p[tol.column])], n)[:, 0]
+
+    column_values = {}
+    if len(components_df):
+        comp_names = components_df['Component'].to_numpy(dtype=object)
+        for tol in tolerances:
+            if tol.column not in TOLERANCE_COMPONENT_COLUMNS:
+                continue
+            rows = np.flatnonzero(comp_names == tol.target) if tol.target is not None else np.arange(len(comp_names))
+            if len(rows) == 0:
+                continue
+            if tol.column not in column_values:
+                nominal = pd.to_numeric(components_df[tol.column], errors='coerce').to_numpy(dtype=float)
+                column_values[tol.column] = np.tile(nominal, (n, 1))
+            arr = column_values[tol.column]
+            arr[:, rows] = _draw(rng, tol, arr[0, rows], n)
+    return evaluate_case_batch(components_df, pp, n, column_values)
+
+
+def run_tolerance(params, components_df, tolerances, n_samples=100_000, seed=None,
+                  chunk_size=None, quantiles=TOLERANCE_QUANTILES, sketch_capacity=8192):
+    """Monte Carlo 公差分析
+
+    params      : 標稱全域參數
+    tolerances  : Tolerance 清單
+    n_samples   : 抽樣次數
+    chunk_size  : 每塊樣本數 (預設依元件數使堆疊表不超過 MAX_CHUNK_ROWS 列)
+    回傳 dict：
+        Min_dT_Allowed / Volume_L / Fin_Height : summary dict (mean, std, min, max, P1…P99)
+        sketches          : {name: QuantileSketch} (畫直方圖用)
+        bottleneck_freq   : 各元件成為瓶頸的比例 (pd.Series，依比例排序)
+        p_overheat        : Min_dT_Allowed <= 0 的比例 (無可行散熱器)
+        feasible_rate / drc_pass_rate
+    Volume_L / Fin_Height 只統計可行 (Min_dT > 0) 的樣本。
+    """
+    t0 = time.perf_counter()
+    p = resolve_params(params)
+    tolerances = list(tolerances)
+    validate_tolerances(tolerances, components_df)
+    n_rows = len(components_df)
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_ROWS // max(n_rows, 1))
+    rng = np.random.default_rng(seed)
+    sketches = {k: QuantileSketch(sketch_capacity, seed=rng.integers(2**32)) for k in ("Min_dT_Allowed", "Volume_L", "Fin_Height")}
+    bottleneck_counts = np.zeros(n_rows + 1, dtype=np.int64)  # 最後一格 = None
+    n_overheat = n_feasible = n_drc_pass = 0
+
+    done = 0
+    while done < n_samples:
+        n = min(chunk_size, n_samples - done)
+        Min_dT, bottleneck, out = _evaluate_chunk(components_df, p, tolerances, rng, n)
+        feasible = (out['Total_Power'] > 0) & (Min_dT > 0) & (out['Fin_Height'] > 0)
+        sketches["Min_dT_Allowed"].update(Min_dT)
+        sketches["Volume_L"].update(np.broadcast_to(out['Volume_L'], (n,))[feasible])
+        sketches["Fin_Height"].update(np.broadcast_to(out['Fin_Height'], (n,))[feasible])
+        bottleneck_counts += np.bincount(np.where(bottleneck < 0, n_rows, bottleneck), minlength=n_rows + 1)
+        n_overheat += int(np.count_nonzero(~(Min_dT > 0)))
+        n_feasible += int(np.count_nonzero(feasible))
+        n_drc_pass += int(np.count_nonzero(feasible & np.broadcast_to(out['drc_pass'], (n,))))
+        done += n
+
+    names = list(components_df['Component']) if n_rows else []
+    freq = pd.Series(bottleneck_counts, index=names + ["None"], dtype=float)
+    freq = freq.groupby(level=0, sort=False).sum() / max(n_samples, 1)
+    freq = freq[freq > 0].sort_values(ascending=False)
+
+    result = {k: s.summary(quantiles) for k, s in sketches.items()}
+    result.update({
+        "n_samples": n_samples, "chunk_size": chunk_size, "sketches": sketches,
+        "bottleneck_freq": freq,
+        "p_overheat": n_overheat / max(n_samples, 1),
+        "feasible_rate": n_feasible / max(n_samples, 1),
+        "drc_pass_rate": n_drc_pass / max(n_samples, 1),
+        "elapsed_s": time.perf_counter() - t0,
+    })
+    return result
+
+
+def tolerances_from_table(table):
+    """UI 表格 (column / dist / spread / relative / target) -> Tolerance 清單，略過空白列"""
+    out = []
+    for row in table.to_dict('records'):
+        column, spread = row.get('column'), row.get('spread')
+        if not column or spread is None or pd.isna(spread):
+            continue
+        target = row.get('target')
+        target = None if target is None or pd.isna(target) or str(target).strip() in ("", "*") else str(target)
+        relative = row.get('relative')
+        out.append(Tolerance(column, row.get('dist') or "normal", float(spread),
+                             True if relative is None or pd.isna(relative) else bool(relative), target))
+    return out
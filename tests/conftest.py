@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 測試重用 benchmarks/ 的資料產生器 (make_bom、make_variants …)
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks"), os.path.dirname(os.path.abspath(__file__))]
+
+from rru_engine import DEFAULT_COMPONENT_DATA, DEFAULT_GLOBALS  # noqa: E402
+
+
+@pytest.fixture
+def params():
+    return dict(DEFAULT_GLOBALS)
+
+
+@pytest.fixture
+def components_df():
+    return pd.DataFrame(DEFAULT_COMPONENT_DATA)
@@ -0,0 +1,15 @@
+"""測試共用：結果 dict 比較"""
+import numpy as np
+import pandas as pd
+
+
+def assert_same_result(got, want):
+    """evaluate_project 格式的結果 dict 完全相同 (鍵順序、純量值、DataFrame；NaN 視為相同)"""
+    assert list(got) == list(want)
+    for k, v in want.items():
+        if isinstance(v, pd.DataFrame):
+            pd.testing.assert_frame_equal(got[k], v, check_exact=True)
+        elif isinstance(v, float) and np.isnan(v):
+            assert np.isnan(got[k]), k
+        else:
+            assert got[k] == v, k
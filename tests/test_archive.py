@@ -0,0 +1,83 @@
+"""專案封存檔 (.rrua)：與 JSON 專案檔無損往返"""
+import json
+import os
+
+import pytest
+
+from bench_archive import edge_projects, same_project
+from rru_engine.archive import ProjectArchive, dump_archive, dump_project_archive, is_archive, main, save_archive, unpack_path
+from rru_engine.project_io import dump_project_json, parse_project
+
+
+@pytest.fixture
+def edge_cases(params, components_df):
+    return edge_projects(params, components_df)
+
+
+def test_round_trip_edge_cases(edge_cases):
+    archive = ProjectArchive.from_bytes(dump_archive(edge_cases))
+    assert archive.names == [c[0] for c in edge_cases]
+    for name, p, d, m in edge_cases:
+        assert same_project(archive.load(name), (p, d, m)), name
+
+
+def test_project_dict_matches_json(edge_cases):
+    archive = ProjectArchive.from_bytes(dump_archive(edge_cases))
+    for name, p, d, m in edge_cases:
+        text = dump_project_json(p, d, m["version"])
+        ref = json.loads(text)
+        got = archive.project_dict(name)
+        assert got["global_params"] == ref["global_params"]
+        assert json.dumps(got["components_data"]) == json.dumps(ref["components_data"])
+
+
+def test_single_project_and_file(tmp_path, params, components_df):
+    data = dump_project_archive(params, components_df, "v-test", name="單一")
+    assert is_archive(data) and not is_archive(b'{"global_params": {}}')
+    p, d, _ = ProjectArchive.from_bytes(data).load(0)
+    ref = parse_project(json.loads(dump_project_json(params, components_df, "v-test")))
+    assert same_project((p, d, {}), (ref[0], ref[1], {}))
+
+    path = os.path.join(tmp_path, "lib.rrua")
+    save_archive(path, [("a", params, components_df, {}), ("b", params, components_df.iloc[:3], {})])
+    archive = ProjectArchive.open(path)
+    assert len(archive) == 2 and len(archive.load("b")[1]) == 3
+
+
+def test_duplicate_names_rejected(params, components_df):
+    with pytest.raises(ValueError):
+        dump_archive([("a", params, components_df, {}), ("a", params, components_df, {})])
+
+
+def test_invalid_archive():
+    with pytest.raises(ValueError):
+        ProjectArchive.from_bytes(b"not an archive" * 8)
+
+
+
+def test_unpack_writes_json(tmp_path, params, components_df):
+    src = tmp_path / "lib.rrua"
+    save_archive(str(src), [("a", params, components_df, {}), ("sub/b", params, components_df, {})])
+    out = tmp_path / "out"
+    assert main(["unpack", str(src), "-o", str(out)]) == 0
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*.json")) == ["a.json", "sub/b.json"]
+
+
+@pytest.mark.parametrize("name", ["../../x", "/etc/x", "sub/../../x", "a/../../../x"])
+def test_unpack_rejects_unsafe_names(tmp_path, params, components_df, name):
+    src = tmp_path / "evil.rrua"
+    save_archive(str(src), [("ok", params, components_df, {}), (name, params, components_df, {})])
+    out = tmp_path / "out"
+    with pytest.raises(ValueError, match="不安全"):
+        main(["unpack", str(src), "-o", str(out)])
+    assert not out.exists() or not any(out.rglob("*.json"))
+    assert not any(tmp_path.parent.glob("x.json"))
+
+
+def test_unpack_path_rejects_symlink_escape(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "link").symlink_to(tmp_path)
+    with pytest.raises(ValueError):
+        unpack_path(str(out), "link/x")
+    assert unpack_path(str(out), "sub/x") == os.path.join(os.path.realpath(out), "sub", "x.json")
@@ -0,0 +1,42 @@
+"""設定檔快取 (rru_engine.assets)"""
+import json
+import os
+
+import pandas as pd
+
+from rru_engine.assets import load_config, load_default_components
+
+
+def write_config(folder, components_data, params):
+    path = os.path.join(folder, "default_config.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"global_params": params, "components_data": components_data}, f)
+    return path
+
+
+def test_records_config(tmp_path, params, components_df):
+    path = write_config(tmp_path, components_df.to_dict("records"), params)
+    pd.testing.assert_frame_equal(load_default_components(path), components_df)
+
+
+def test_columnar_config(tmp_path, params, components_df):
+    """欄位導向的 components_data (dict of lists) 與舊版 pd.DataFrame(components_data) 結果相同"""
+    columnar = components_df.to_dict("list")
+    path = write_config(tmp_path, columnar, params)
+    snapshot = load_config(path)
+    assert snapshot.error is None
+    assert [dict(r) for r in snapshot.components_data] == components_df.to_dict("records")
+    pd.testing.assert_frame_equal(load_default_components(path), pd.DataFrame(columnar))
+
+
+def test_invalid_components_data(tmp_path, params):
+    path = write_config(tmp_path, {"Component": ["a", "b"], "Qty": [1]}, params)
+    snapshot = load_config(path)
+    assert snapshot.exists and snapshot.error
+
+
+def test_missing_config_uses_builtin_defaults(tmp_path, components_df):
+    """沒有設定檔時回到內建的 DEFAULT_COMPONENT_DATA (欄位導向)"""
+    path = os.path.join(tmp_path, "default_config.json")
+    assert not load_config(path).exists
+    pd.testing.assert_frame_equal(load_default_components(path), components_df)
@@ -0,0 +1,33 @@
+"""批次評估 CLI 的輸出格式"""
+import json
+import math
+import os
+
+from rru_engine.batch import RESULT_FIELDS, json_value, main
+from rru_engine.project_io import dump_project_json
+
+
+def write_project(folder, name, params, components_df):
+    with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+        f.write(dump_project_json(params, components_df, "v-test"))
+
+
+def test_json_value():
+    assert json_value(float("inf")) is None and json_value(float("nan")) is None
+    assert json_value(math.pi) == math.pi and json_value("x") == "x"
+
+
+def test_jsonl_non_finite_is_null(tmp_path, params, components_df):
+    # 耦合模式下不可行的設計 Fin_Height = inf
+    write_project(tmp_path, "a_ok.json", params, components_df)
+    write_project(tmp_path, "b_infeasible.json", dict(params, fin_eff_mode="coupled", T_amb=70.0), components_df)
+    out = os.path.join(tmp_path, "out.jsonl")
+    assert main([str(tmp_path), "-o", out]) == 0
+
+    with open(out, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    rows = [json.loads(line, parse_constant=lambda c: (_ for _ in ()).throw(ValueError(c))) for line in lines]
+    assert [list(r) for r in rows] == [RESULT_FIELDS] * 2
+    assert rows[0]["status"] == "OK" and rows[0]["Fin_Height"] > 0
+    assert rows[1]["Fin_Height"] is None and rows[1]["RRU_Height"] is None
+    assert rows[1]["drc_rule"] == "fin_eff_limit"
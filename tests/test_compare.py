@@ -0,0 +1,54 @@
+"""evaluate_projects：批次結果與逐一 evaluate_project 相同，錯誤只影響該專案"""
+import numpy as np
+import pytest
+
+from bench_compare import FIELDS, make_variants
+from bench_thermal_kernel import make_bom
+from rru_engine import evaluate_project, resolve_params
+from rru_engine.compare import COMPARE_RESULT_COLUMNS, evaluate_projects, param_diff
+
+
+def assert_matches_single(batch, variants):
+    for row, (name, p, d) in zip(batch.itertuples(index=False), variants):
+        assert row.name == name
+        assert row.status == "OK", row.error
+        ref = evaluate_project(resolve_params(p), d)
+        for k in FIELDS:
+            got, want = getattr(row, k), ref[k]
+            assert got == want or (np.isnan(want) and np.isnan(got)), (name, k)
+
+
+@pytest.mark.parametrize("n_rows", [None, 300])
+def test_batch_matches_single(params, components_df, n_rows):
+    df = components_df if n_rows is None else make_bom(n_rows)
+    variants = make_variants(params, df, 16)
+    batch = evaluate_projects(variants)
+    assert list(batch.columns) == COMPARE_RESULT_COLUMNS
+    assert_matches_single(batch, variants)
+
+
+def test_coupled_mode(params, components_df):
+    variants = [("fixed", params, components_df), ("coupled", dict(params, fin_eff_mode="coupled"), components_df)]
+    batch = evaluate_projects(variants)
+    assert_matches_single(batch, variants)
+    assert batch["Fin_Height"].iloc[0] != batch["Fin_Height"].iloc[1]
+
+
+def test_errors_are_isolated(params, components_df):
+    variants = [
+        ("ok", params, components_df),
+        ("bad_type", dict(params, Gap="13"), components_df),
+        ("missing_col", params, components_df.drop(columns=["R_jc"])),
+        ("empty", params, components_df.iloc[0:0]),
+    ]
+    batch = evaluate_projects(variants).set_index("name")
+    assert batch.loc["bad_type", "status"] == "ERROR" and "Gap" in batch.loc["bad_type", "error"]
+    assert batch.loc["missing_col", "status"] == "ERROR" and "R_jc" in batch.loc["missing_col", "error"]
+    assert_matches_single(batch.loc[["ok", "empty"]].reset_index(), [variants[0], variants[3]])
+
+
+def test_param_diff(params, components_df):
+    variants = [("a", params, components_df), ("b", dict(params, Gap=9.0), components_df.iloc[1:])]
+    diff = param_diff(variants)
+    assert list(diff.index) == ["Gap", "元件表"]
+    assert diff.loc["Gap"].tolist() == [params["Gap"], 9.0]
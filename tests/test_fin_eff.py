@@ -0,0 +1,80 @@
+"""鰭片效率耦合求解 (fin_eff_mode = "coupled")"""
+import json
+
+import numpy as np
+
+from bench_fin_eff import bisect_height
+from rru_engine import evaluate_project
+from rru_engine.archive import ProjectArchive, dump_project_archive
+from rru_engine.geometry import FIN_EFF_STATUS, calc_fin_eff, solve_fin_coupled
+from rru_engine.project_io import parse_project, project_json_bytes
+from rru_engine.sweep import run_sweep
+
+
+def test_solution_matches_bisection():
+    rng = np.random.default_rng(0)
+    n = 100
+    Area_conv = rng.uniform(0.2, 1.5, n)
+    N, h, k, t = rng.integers(10, 60, n), rng.uniform(5.0, 8.8, n), rng.choice([96.0, 200.0], n), rng.uniform(0.8, 3.0, n)
+    sol = solve_fin_coupled(Area_conv, 0.12, N, 400.0, h, k, t)
+    solved = np.flatnonzero(sol["status"] == FIN_EFF_STATUS.index("solved"))
+    assert len(solved)
+    for i in solved:
+        ref = bisect_height(Area_conv[i], 0.12, N[i], 400.0, h[i], k[i], t[i]) * 1000
+        assert abs(sol["Fin_Height"][i] - ref) <= 1e-9 * ref
+    assert sol["residual"].max() < 1e-9
+
+
+def test_status_cases():
+    sol = solve_fin_coupled([0.05, 0.8, 50.0], 0.12, 40, 400.0, 7.0, 200.0, 1.5)
+    assert [FIN_EFF_STATUS[s] for s in sol["status"]] == ["base_only", "solved", "infeasible"]
+    assert sol["Fin_Height"][0] < 0 and np.isposinf(sol["Fin_Height"][2])
+    assert sol["Fin_Eff"][0] == 1.0 and 0 < sol["Fin_Eff"][1] < 1
+
+
+def test_infinite_conductivity_limit():
+    sol = solve_fin_coupled(0.8, 0.12, 40, 400.0, 7.0, 1e12, 1.5)
+    np.testing.assert_allclose(sol["Fin_Height"], (0.8 - 0.12) * 1e6 / (2 * 40 * 400.0), rtol=1e-6)
+
+
+def test_project_coupled(params, components_df):
+    fixed = evaluate_project(params, components_df)
+    coupled = evaluate_project(dict(params, fin_eff_mode="coupled"), components_df)
+    assert fixed["fin_eff_status"] == "fixed" and fixed["Eff"] == calc_fin_eff(params["fin_tech_selector_v2"])
+    assert coupled["fin_eff_status"] == "solved" and coupled["fin_eff_residual"] < 1e-9
+    assert 0 < coupled["Fin_Eff"] < 1 and coupled["Fin_Height"] > 0
+    assert coupled["R_sa"] == fixed["R_sa"]
+
+
+def test_infeasible_project(params, components_df):
+    res = evaluate_project(dict(params, fin_eff_mode="coupled", T_amb=70.0), components_df)
+    assert res["fin_eff_status"] == "infeasible" and np.isposinf(res["Fin_Height"])
+    assert res["drc_failed"] and res["drc_rule"] == "fin_eff_limit"
+
+
+def test_sweep_matches_single_point(params, components_df):
+    grid = {"Gap": [6.0, 9.0, 13.2], "Fin_t": [0.8, 1.2, 2.0]}
+    coupled = dict(params, fin_eff_mode="coupled")
+    df = run_sweep(coupled, components_df, grid)
+    for row in df.itertuples(index=False):
+        ref = evaluate_project(dict(coupled, Gap=row.Gap, Fin_t=row.Fin_t), components_df)
+        for k in ("Fin_Count", "Fin_Height", "Volume_L", "Fin_Eff"):
+            assert np.isclose(getattr(row, k), ref[k], rtol=1e-12, atol=0), k
+
+
+def test_fixed_mode_infinite_height_not_fin_eff_limit(params, components_df):
+    # 沒有鰭片 (W_pcb 極小) 時高度為無限大：fixed 模式沿用原本的 choked flow，不是耦合求解的 fin_eff_limit
+    tiny = dict(params, W_pcb=1, Left=0, Right=0)
+    res = evaluate_project(tiny, components_df)
+    assert res["fin_eff_status"] == "fixed" and np.isposinf(res["Fin_Height"])
+    assert res["drc_failed"] and res["drc_rule"] == "choked_flow"
+    row = run_sweep(tiny, components_df, {"Gap": [tiny["Gap"]]}).iloc[0]
+    assert row["drc_rule"] == "choked_flow"
+
+
+def test_fin_eff_mode_round_trip(params, components_df):
+    saved = dict(params, fin_eff_mode="coupled")
+    p, _, _ = parse_project(json.loads(project_json_bytes(saved, components_df, "v-test")))
+    assert p["fin_eff_mode"] == "coupled"
+    p, _, _ = ProjectArchive.from_bytes(dump_project_archive(saved, components_df, "v-test")).load(0)
+    assert p["fin_eff_mode"] == "coupled"
@@ -0,0 +1,153 @@
+"""IncrementalEvaluator：每一步都與 evaluate_project 完全一致，且只重算受影響的階段 / 列"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_thermal_kernel import make_bom
+from helpers import assert_same_result
+from rru_engine import evaluate_project
+from rru_engine.incremental import ROW_DIFF_MIN_ROWS, IncrementalEvaluator, editor_changed_rows
+
+
+@pytest.fixture
+def large_df():
+    return make_bom(ROW_DIFF_MIN_ROWS + 100, seed=3)
+
+
+def step(ev, params, df):
+    res = ev.evaluate(params, df)
+    assert_same_result(res, evaluate_project(params, df))
+    return ev.last_stats
+
+
+def test_first_run_is_full(params, components_df):
+    stats = step(IncrementalEvaluator(), params, components_df)
+    assert stats["full"] and stats["rows_recomputed"] == len(components_df)
+
+
+def test_unchanged_rerun_recomputes_nothing(params, components_df):
+    ev = IncrementalEvaluator()
+    step(ev, params, components_df)
+    stats = step(ev, dict(params), components_df.copy())
+    assert stats["stages"] == [] and stats["rows_recomputed"] == 0
+
+
+def test_geometry_param_skips_components(params, components_df):
+    ev = IncrementalEvaluator()
+    step(ev, params, components_df)
+    stats = step(ev, dict(params, Gap=9.0), components_df)
+    assert "components" not in stats["stages"] and stats["rows_recomputed"] == 0
+    assert {"convection", "fin_count", "heatsink", "drc"} <= set(stats["stages"])
+    assert "outline" not in stats["stages"]
+
+
+def test_thermal_param_recomputes_all_rows(params, components_df):
+    ev = IncrementalEvaluator()
+    step(ev, params, components_df)
+    stats = step(ev, dict(params, K_Pad=5.0), components_df)
+    assert stats["rows_recomputed"] == len(components_df)
+
+
+def test_fin_eff_mode_switch(params, components_df):
+    ev = IncrementalEvaluator()
+    step(ev, params, components_df)
+    step(ev, dict(params, fin_eff_mode="coupled"), components_df)
+    step(ev, params, components_df)
+
+
+def test_row_edits_on_large_table(params, large_df):
+    ev = IncrementalEvaluator()
+    step(ev, params, large_df)
+
+    edited = large_df.copy()
+    edited.loc[7, "Power(W)"] = 99.0
+    stats = step(ev, params, edited)
+    assert stats["rows_recomputed"] == 1
+
+    added = pd.concat([edited, edited.iloc[[0]].set_axis([len(edited)])])
+    stats = step(ev, params, added)
+    assert stats["rows_recomputed"] == 1
+
+    deleted = added.drop(index=[3, 11])
+    stats = step(ev, params, deleted)
+    assert stats["rows_recomputed"] == 0
+
+
+def test_nan_cells_are_unchanged(params, large_df):
+    df = large_df.copy()
+    df.loc[::50, "Thick(mm)"] = np.nan
+    ev = IncrementalEvaluator()
+    step(ev, params, df)
+    stats = step(ev, params, df.copy())
+    assert stats["rows_recomputed"] == 0
+
+
+def test_dtype_change_falls_back_to_full(params, large_df):
+    ev = IncrementalEvaluator()
+    step(ev, params, large_df)
+    stats = step(ev, params, large_df.astype({"Qty": float}))
+    assert stats["rows_recomputed"] == len(large_df)
+
+
+def test_empty_table(params, components_df):
+    ev = IncrementalEvaluator()
+    step(ev, params, components_df)
+    step(ev, params, components_df.iloc[0:0])
+    step(ev, params, components_df)
+
+
+def apply_editor_state(base, state):
+    """與 st.data_editor 相同的套用順序：edited_rows (列位置) -> deleted_rows -> added_rows (index 接在最後)"""
+    df = base.copy()
+    for r, changes in (state.get("edited_rows") or {}).items():
+        for col, value in changes.items():
+            df.iloc[int(r), df.columns.get_loc(col)] = value
+    df = df.drop(df.index[state.get("deleted_rows") or []])
+    for row in state.get("added_rows") or []:
+        if isinstance(df.index, pd.RangeIndex):
+            label = df.index.stop
+        else:
+            label = df.index.max() + 1 if len(df) else 0
+        df.loc[label] = [row.get(c) for c in df.columns]
+    return df
+
+
+EDITOR_STATES = [
+    ("edit one cell", {"edited_rows": {7: {"Power(W)": 12.5}}}, 1),
+    ("edit same cell again", {"edited_rows": {7: {"Power(W)": 3.0}}}, 1),
+    ("edit another row", {"edited_rows": {7: {"Power(W)": 3.0}, 2: {"TIM_Type": "Pad"}}}, 1),
+    ("no change", {"edited_rows": {7: {"Power(W)": 3.0}, 2: {"TIM_Type": "Pad"}}}, 0),
+    ("add blank row", {"edited_rows": {7: {"Power(W)": 3.0}, 2: {"TIM_Type": "Pad"}}, "added_rows": [{}]}, 1),
+    ("fill added row", {"edited_rows": {7: {"Power(W)": 3.0}, 2: {"TIM_Type": "Pad"}},
+                        "added_rows": [{"Component": "X", "Qty": 1, "Power(W)": 5.0}]}, 1),
+    ("delete last base row", {"edited_rows": {7: {"Power(W)": 3.0}, 2: {"TIM_Type": "Pad"}},
+                              "added_rows": [{"Component": "X", "Qty": 1, "Power(W)": 5.0}], "deleted_rows": [39]}, 1),
+    ("undo delete", {"edited_rows": {7: {"Power(W)": 3.0}, 2: {"TIM_Type": "Pad"}},
+                     "added_rows": [{"Component": "X", "Qty": 1, "Power(W)": 5.0}]}, 2),
+    ("delete middle row", {"edited_rows": {7: {"Power(W)": 3.0}, 2: {"TIM_Type": "Pad"}},
+                           "added_rows": [{"Component": "X", "Qty": 1, "Power(W)": 5.0}], "deleted_rows": [3]}, 1),
+    ("revert edit", {"edited_rows": {2: {"TIM_Type": "Pad"}},
+                     "added_rows": [{"Component": "X", "Qty": 1, "Power(W)": 5.0}], "deleted_rows": [3]}, 1),
+]
+
+
+def test_editor_delta_sequence(params):
+    """依 data_editor 編輯狀態的差異重算：每一步與 evaluate_project 相同，且只重算變動的列"""
+    base = make_bom(40, seed=5)
+    ev = IncrementalEvaluator()
+    prev_state = {}
+    step(ev, params, base)
+    for label, state, expected_rows in EDITOR_STATES:
+        df = apply_editor_state(base, state)
+        changed = editor_changed_rows(base, prev_state, state, df)
+        res = ev.evaluate(params, df, changed_rows=changed)
+        assert_same_result(res, evaluate_project(params, df))
+        assert ev.last_stats["rows_recomputed"] == expected_rows, label
+        prev_state = state
+
+
+def test_unchanged_returns_same_result(params, components_df):
+    ev = IncrementalEvaluator()
+    first = ev.evaluate(params, components_df)
+    assert ev.evaluate(params, components_df.copy(), changed_rows=pd.Index([])) is first
+    assert ev.evaluate(dict(params, Gap=9.0), components_df, changed_rows=pd.Index([])) is not first
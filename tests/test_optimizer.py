@@ -0,0 +1,39 @@
+"""鰭片幾何最佳化 (rru_engine.optimizer)：結果通過 DRC，且不劣於製程範圍內的暴力格點"""
+import numpy as np
+import pytest
+
+from rru_engine import evaluate_project
+from rru_engine.optimizer import get_fin_tech_limits, optimize_fin_geometry
+from rru_engine.sweep import run_sweep
+
+OPT_KEYS = ["Gap", "Fin_t", "t_base", "fin_tech_selector_v2"]
+
+
+@pytest.fixture
+def base(params, components_df):
+    return evaluate_project(params, components_df)
+
+
+@pytest.mark.parametrize("objective", ["Volume_L", "total_weight_kg"])
+def test_feasible_and_optimal(params, components_df, base, objective):
+    best = optimize_fin_geometry(params, base["Total_Watts_Sum"], base["Min_dT_Allowed"], objective)
+    assert best is not None
+
+    ref = evaluate_project(dict(params, **{k: best[k] for k in OPT_KEYS}), components_df)
+    assert not ref["drc_failed"]
+    assert ref[objective] == pytest.approx(best[objective], rel=1e-12)
+
+    # 暴力格點 (Gap 與 Fin_t 皆為 0.1 mm 步長) 中的最佳可行解不可優於最佳化結果
+    lim = get_fin_tech_limits(params["fin_tech_selector_v2"])
+    grid = {
+        "Gap": np.round(np.arange(lim["Gap"][0], lim["Gap"][1] + 0.05, 0.1), 6),
+        "Fin_t": np.round(np.arange(lim["Fin_t"][0], lim["Fin_t"][1] + 0.05, 0.1), 6),
+        "t_base": np.array([lim["t_base"][0], lim["t_base"][1]]),
+    }
+    df = run_sweep(params, components_df, grid)
+    feasible = df[df["drc_pass"] & (df["Fin_Height"] > 0)]
+    assert best[objective] <= feasible[objective].min() * (1 + 1e-12)
+
+
+def test_infeasible_returns_none(params, base):
+    assert optimize_fin_geometry(params, base["Total_Watts_Sum"], -1.0) is None
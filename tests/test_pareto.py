@@ -0,0 +1,34 @@
+"""多目標設計探索 (rru_engine.pareto)：非支配排序與兩兩比較一致，前緣設計與 evaluate_project 一致"""
+import numpy as np
+import pytest
+
+from bench_pareto import CHECK_COLUMNS, brute_force_mask
+from rru_engine import evaluate_project
+from rru_engine.pareto import PARETO_DESIGN_KEYS, non_dominated_mask, run_pareto
+
+
+@pytest.mark.parametrize("k", [2, 3])
+@pytest.mark.parametrize("n", [400, 3000])  # 3000 點會啟用 3 目標的樞紐點預篩
+def test_mask_matches_pairwise(k, n):
+    rng = np.random.default_rng(k * n)
+    ties = rng.integers(0, 12, size=(n, k)).astype(float)  # 大量同值 / 重複點
+    for F in (ties, rng.normal(size=(n, k))):
+        np.testing.assert_array_equal(non_dominated_mask(F), brute_force_mask(F))
+
+
+def test_mask_edge_cases():
+    assert non_dominated_mask(np.zeros((0, 2))).shape == (0,)
+    assert non_dominated_mask(np.ones((5, 3))).all()  # 完全相同的點互不支配
+
+
+def test_front_matches_evaluate_project(params, components_df):
+    ref = evaluate_project(params, components_df)
+    ranges = {"Margin": (params["Margin"], params["Margin"] * 1.5)}
+    res = run_pareto(params, ref["Total_Watts_Sum"], ref["Min_dT_Allowed"], 5000, ranges=ranges)
+    front = res["front"]
+    assert len(front) and res["n_feasible"] <= res["n_candidates"]
+    for _, row in front.head(10).iterrows():
+        r = evaluate_project(dict(params, **{k: row[k] for k in PARETO_DESIGN_KEYS}), components_df)
+        assert not r["drc_failed"]
+        for c in CHECK_COLUMNS:
+            assert np.isclose(row[c], r[c], rtol=1e-12, atol=0), c
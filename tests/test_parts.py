@@ -0,0 +1,45 @@
+"""元件庫索引 (rru_engine.parts)：search_ids 與 pandas 全表布林遮罩的列集合、順序一致"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_parts import brute_force, make_library, make_queries
+from rru_engine.defaults import COMPONENT_COLUMNS
+from rru_engine.parts import PartLibrary
+
+
+@pytest.fixture(scope="module")
+def lib():
+    return PartLibrary(make_library(5000))
+
+
+def test_queries_match_brute_force(lib):
+    for q in make_queries(lib, 200):
+        np.testing.assert_array_equal(lib.search_ids(**q), brute_force(lib.df, **q), err_msg=str(q))
+
+
+def test_open_bounds_and_edges(lib):
+    power = lib.df["Power(W)"].to_numpy()
+    assert np.array_equal(lib.search_ids(), np.arange(len(lib)))
+    assert np.array_equal(lib.search_ids(power=(None, 2.0)), np.flatnonzero(power <= 2.0))
+    assert np.array_equal(lib.search_ids(power=(5.0, None)), np.flatnonzero(power >= 5.0))
+    # 上下限皆含端點
+    v = float(power[0])
+    assert 0 in lib.search_ids(power=(v, v))
+    assert len(lib.search_ids(prefix="zzz no such part")) == 0
+    assert len(lib.search_ids(power=(5.0, 1.0))) == 0
+
+
+def test_sorted_by_name_and_to_components(lib):
+    names = lib.df["Part"].str.casefold().to_numpy()
+    assert (names[:-1] <= names[1:]).all()
+    frame, total = lib.search("FINAL PA", limit=10)
+    assert total == len(lib.search_ids(prefix="final pa")) and len(frame) == min(10, total)
+    rows = lib.to_components(frame, qty=3)
+    assert list(rows.columns) == COMPONENT_COLUMNS
+    assert (rows["Qty"] == 3).all()
+
+
+def test_missing_columns():
+    with pytest.raises(ValueError):
+        PartLibrary(pd.DataFrame({"Part": ["x"]}))
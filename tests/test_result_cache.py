@@ -0,0 +1,56 @@
+"""結果快取 (rru_engine.result_cache)：位元組上限與衍生物件 LRU"""
+import numpy as np
+
+from rru_engine.result_cache import ResultCache, cached_artifact, canonical_hash
+from rru_engine.session_mem import estimate_size
+
+MB = 2**20
+
+
+def entry(n_bytes=0):
+    return {"data": np.zeros(n_bytes // 8)}
+
+
+def test_canonical_hash_numeric(params, components_df):
+    assert canonical_hash(dict(params, T_amb=45), components_df) == canonical_hash(dict(params, T_amb=45.0), components_df)
+    assert canonical_hash(dict(params, T_amb=46), components_df) != canonical_hash(params, components_df)
+
+
+def test_evicts_by_bytes():
+    cache = ResultCache(max_bytes=3 * MB)
+    for i in range(5):
+        cache.put(i, entry(MB))
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 3 and stats["bytes"] <= 3 * MB
+    assert cache.get(0) is None and cache.get(4) is not None
+
+
+def test_artifacts_count_and_lru():
+    cache = ResultCache(max_bytes=4 * MB, max_artifacts=2)
+    old, new = entry(), entry()
+    cache.put("old", old)
+    cache.put("new", new)
+    for i in range(5):
+        cached_artifact(new, f"a{i}", lambda: np.zeros(MB // 8))
+    assert len(new["artifacts"]) == 2 and "a4" in new["artifacts"] and "a0" not in new["artifacts"]
+    assert cache.stats()["bytes"] <= 4 * MB
+    # 衍生物件計入位元組上限：超過時淘汰最久未使用的結果
+    cached_artifact(old, "big", lambda: np.zeros(2 * MB // 8))
+    assert cache.get("new") is None or cache.get("old") is None
+
+
+def test_artifact_built_once():
+    calls = []
+    e = entry()
+    for _ in range(3):
+        cached_artifact(e, "fig", lambda: calls.append(1) or "figure")
+    assert calls == [1]
+
+
+def test_entry_size_excludes_cache():
+    """量測單筆結果時不會經由衍生物件走到整個快取"""
+    cache = ResultCache()
+    for i in range(4):
+        cache.put(i, entry(MB))
+    cached_artifact(cache.get(3), "x", lambda: 1)
+    assert estimate_size(cache.get(3)) < 2 * MB
@@ -0,0 +1,38 @@
+"""一次性敏感度分析 (rru_engine.sensitivity)：每個擾動案例與 evaluate_project 一致"""
+import numpy as np
+import pytest
+
+from bench_sensitivity import reference_loop
+from rru_engine import evaluate_project
+from rru_engine.sensitivity import SENSITIVITY_METRICS, rank_sensitivity, run_sensitivity
+
+
+@pytest.fixture
+def sens(params, components_df):
+    return run_sensitivity(params, components_df, 0.10)
+
+
+def test_nominal(sens, params, components_df):
+    ref = evaluate_project(params, components_df)
+    assert sens["n_cases"] == 1 + 2 * len(sens["table"])
+    for m in SENSITIVITY_METRICS:
+        assert sens["nominal"][m] == ref[m], m
+
+
+def test_cases_match_evaluate_project(sens, params, components_df):
+    table = sens["table"]
+    for i, (lo, hi) in enumerate(reference_loop(params, components_df, table)):
+        for m in SENSITIVITY_METRICS:
+            got = [table[f"{m}_low"].iat[i], table[f"{m}_high"].iat[i]]
+            np.testing.assert_allclose(got, [lo[m], hi[m]], rtol=1e-12, atol=1e-12, err_msg=f"{table['input'].iat[i]} / {m}")
+
+
+def test_rank_and_elasticity(sens):
+    table = sens["table"]
+    ranked = rank_sensitivity(table, "Min_dT_Allowed")
+    assert (ranked["Min_dT_Allowed_swing"].diff().dropna() <= 0).all()
+    assert (ranked["Min_dT_Allowed_swing"] > 0).all()
+    # 環境溫度升高 -> 允許溫升下降
+    t_amb = table.set_index("input").loc["T_amb"]
+    assert t_amb["Min_dT_Allowed_elasticity"] < 0
+    assert len(rank_sensitivity(table, "Volume_L", top=3)) == 3
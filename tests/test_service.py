@@ -0,0 +1,68 @@
+"""評估服務 (rru_engine.service)：結果與 evaluate_project 一致、錯誤請求、worker 異常終止後自動恢復"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from rru_engine import evaluate_project, resolve_params
+from rru_engine.batch import json_value
+from rru_engine.project_io import project_json_bytes
+from rru_engine.service import RESULT_KEYS, EvaluationService, HttpError, evaluate_payload
+
+
+def project_payload(params, components_df):
+    return json.loads(project_json_bytes(params, components_df, "v-test"))
+
+
+def test_payload_matches_evaluate_project(params, components_df):
+    out = evaluate_payload(dict(project_payload(params, components_df), name="p1", include_components=True))
+    ref = evaluate_project(resolve_params(params), components_df)
+    assert out["status"] == "OK" and out["name"] == "p1"
+    assert {k: out[k] for k in RESULT_KEYS} == {k: json_value(ref[k]) for k in RESULT_KEYS}
+    assert out["drc_status"] == ("FAIL" if ref["drc_failed"] else "PASS")
+    assert len(out["components"]) == len(ref["final_df"])
+
+
+def test_bad_payload_is_error_result(params, components_df):
+    payload = project_payload(params, components_df)
+    payload["global_params"]["Gap"] = "13"
+    out = evaluate_payload(payload)
+    assert out["status"] == "ERROR" and out["error"].startswith("TypeError")
+    assert evaluate_payload([1, 2])["status"] == "ERROR"
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("GET", "/nope", b"", 404),
+    ("GET", "/evaluate", b"", 405),
+    ("POST", "/health", b"", 405),
+    ("POST", "/evaluate", b"{not json", 400),
+    ("POST", "/evaluate", b"[1, 2]", 400),
+    ("POST", "/evaluate/batch", b'{"projects": 3}', 400),
+])
+def test_bad_requests(method, path, body, status):
+    service = EvaluationService(workers=1)
+    with pytest.raises(HttpError) as exc:
+        asyncio.run(service.route(method, path, body))
+    assert exc.value.status == status
+
+
+def test_recovers_from_broken_pool(params, components_df):
+    payload = project_payload(params, components_df)
+
+    async def run():
+        service = EvaluationService(workers=1)
+        service.pool = service._new_pool()
+        try:
+            # worker 行程直接結束 -> pool 損壞
+            with pytest.raises(Exception):
+                await asyncio.get_running_loop().run_in_executor(service.pool, os._exit, 1)
+            results = await service.evaluate_many([payload, payload])
+            return results, service.stats["pool_restarts"]
+        finally:
+            service.pool.shutdown()
+
+    results, restarts = asyncio.run(run())
+    assert restarts == 1
+    assert [r["status"] for r in results] == ["OK", "OK"]
+    assert results[0]["Fin_Height"] == evaluate_payload(payload)["Fin_Height"]
@@ -0,0 +1,33 @@
+"""Session 記憶體量測 (rru_engine.session_mem)"""
+import numpy as np
+
+from rru_engine.result_cache import ResultCache
+from rru_engine.session_mem import enforce_budget, estimate_size, session_footprint
+
+
+def test_array_counted_once():
+    a = np.zeros(1000)
+    assert a.nbytes <= estimate_size(a) < a.nbytes + 200
+    assert estimate_size({"a": a, "view": a[:10]}) < a.nbytes + 1000
+
+
+def test_shared_not_counted_in_session():
+    shared = np.zeros(10_000)
+    fp = session_footprint({"ref": {"x": shared}, "own": np.zeros(100)}, shared=[shared])
+    assert fp["shared"] >= shared.nbytes
+    assert fp["keys"]["ref"] < 1000
+
+
+def test_result_cache_entries_shared():
+    cache = ResultCache()
+    result = cache.get_or_compute("k", lambda: {"arr": np.zeros(10_000)})
+    fp = session_footprint({"last_result": result}, shared=cache.entries())
+    assert fp["shared"] >= 80_000
+    assert fp["keys"]["last_result"] < 1000
+
+
+def test_enforce_budget_evicts_largest_evictable():
+    state = {"big": np.zeros(10_000), "mid": np.zeros(5_000), "keep": np.zeros(20_000)}
+    fp = session_footprint(state)
+    evicted = enforce_budget(state, fp, 250_000, {"big", "mid"})
+    assert evicted == ["big"] and "keep" in state and fp["total"] <= 250_000
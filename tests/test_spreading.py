@@ -0,0 +1,34 @@
+"""基板 2D 熱擴散 (rru_engine.spreading)：功耗均勻時等於集總模型、與 dense 差分一致、能量守恆"""
+import numpy as np
+
+from bench_spreading import dense_reference
+from rru_engine import evaluate_project, resolve_params
+from rru_engine.spreading import BasePlateSolver, auto_layout, solve_base_temperature
+
+
+def test_solver_matches_dense():
+    rng = np.random.default_rng(0)
+    solver = BasePlateSolver(60.0, 40.0, 7.0, 96.0, 900.0, res_mm=4.0)
+    q = rng.uniform(0, 5e4, solver.shape) * (rng.uniform(size=solver.shape) > 0.8)
+    np.testing.assert_allclose(solver.solve_flux(q), dense_reference(solver, q), rtol=0, atol=1e-9)
+
+
+def test_uniform_power_equals_lumped(params, components_df):
+    p = resolve_params(params)
+    res = evaluate_project(p, components_df)
+    out = solve_base_temperature(p, res, res_mm=4.0)
+    np.testing.assert_allclose(out["theta"], out["dT_lumped"], rtol=1e-9)
+    np.testing.assert_allclose(out["dT_lumped"], res["Min_dT_Allowed"], rtol=1e-9)
+    np.testing.assert_allclose(out["table"]["dT_base"], out["dT_lumped"], rtol=1e-9)
+    assert not out["table"]["Placed"].any()
+
+
+def test_placed_conserves_energy(params, components_df):
+    p = resolve_params(params)
+    res = evaluate_project(p, auto_layout(components_df, p))
+    out = solve_base_temperature(p, res, res_mm=4.0)
+    nx, ny = out["shape"]
+    cell_m2 = (res["L_hsk"] / nx) * (res["W_hsk"] / ny) / 1e6
+    assert np.isclose((out["G"] * out["theta"] * cell_m2).sum(), res["Total_Power"], rtol=1e-9)
+    assert out["table"]["Placed"].any()
+    assert (out["table"]["dT_base_max"] >= out["table"]["dT_base"] - 1e-12).all()
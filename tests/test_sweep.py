@@ -0,0 +1,54 @@
+"""設計空間掃描 (rru_engine.sweep)：與 evaluate_project 逐點一致，元件參數子格點分塊評估"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from rru_engine import evaluate_project
+from rru_engine import sweep
+from rru_engine.defaults import FIN_TECH_OPTIONS
+from rru_engine.sweep import run_sweep
+
+CHECK_COLUMNS = ["Fin_Count", "Min_dT_Allowed", "Total_Power", "Fin_Height", "RRU_Height", "Volume_L", "total_weight_kg"]
+GRID = {
+    "Gap": np.array([3.0, 8.0, 15.0]),
+    "T_amb": np.array([30.0, 50.0]),
+    "t_Putty": np.array([0.5, 2.0]),
+    "Voiding": np.array([0.6, 0.9]),
+    "fin_tech_selector_v2": FIN_TECH_OPTIONS,
+}
+
+
+@pytest.fixture
+def swept(params, components_df):
+    return run_sweep(params, components_df, GRID)
+
+
+def test_matches_evaluate_project(swept, params, components_df):
+    assert len(swept) == np.prod([len(v) for v in GRID.values()])
+    for row in swept.itertuples(index=False):
+        p = dict(params, **{k: getattr(row, k) for k in GRID})
+        ref = evaluate_project(p, components_df)
+        for c in CHECK_COLUMNS:
+            assert getattr(row, c) == pytest.approx(ref[c], rel=1e-12), (p, c)
+        assert bool(row.drc_pass) != ref["drc_failed"]
+        if ref["drc_failed"]:
+            assert row.drc_rule == ref["drc_rule"]
+
+
+def test_component_grid_chunks(swept, params, components_df, monkeypatch):
+    """每塊只放 2 個組合時結果與一次算完相同"""
+    monkeypatch.setattr(sweep, "MAX_CHUNK_ROWS", 2 * len(components_df))
+    pd.testing.assert_frame_equal(run_sweep(params, components_df, GRID), swept)
+
+
+def test_empty_components(params):
+    df = run_sweep(params, pd.DataFrame([]), {"Gap": [5.0, 10.0], "T_amb": [30.0, 40.0]})
+    assert (df["Min_dT_Allowed"] == 50.0).all() and (df["Fin_Height"] == 0.0).all()
+
+
+def test_geometry_only_grid(params, components_df):
+    """未掃描元件參數時元件表只評估一次"""
+    df = run_sweep(params, components_df, {"Gap": [5.0, 10.0], "Fin_t": [1.0, 2.0]})
+    ref = evaluate_project(dict(params, Gap=10.0, Fin_t=2.0), components_df)
+    assert (df["Min_dT_Allowed"] == ref["Min_dT_Allowed"]).all()
+    assert df["Volume_L"].iloc[-1] == pytest.approx(ref["Volume_L"], rel=1e-12)
@@ -0,0 +1,53 @@
+"""大型 BOM 表格檢視 (rru_engine.table_view)：色階與 Styler 相同，排序 / 篩選 / 分頁與 pandas 一致"""
+import numpy as np
+import pytest
+
+from bench_table_view import final_table
+from rru_engine.table_view import gradient_css, gradient_index, page_count, page_rows, select_rows
+
+
+@pytest.fixture(scope="module")
+def table():
+    return final_table(600)
+
+
+def test_colors_match_styler(table):
+    pytest.importorskip("matplotlib")  # 參考值來自 Styler.background_gradient (需要 matplotlib)
+    df, _ = table
+    styler = df.style.background_gradient(subset=["Allowed_dT"], cmap="RdYlGn")
+    styler._compute()
+    j = df.columns.get_loc("Allowed_dT")
+    ours = gradient_css(gradient_index(df["Allowed_dT"]))
+    assert ours == ["".join(f"{k}: {v};" for k, v in styler.ctx[(i, j)]) for i in range(len(df))]
+
+
+def test_gradient_index_edges():
+    idx = gradient_index([np.nan, 1.0, 2.0, 3.0])
+    assert idx.dtype == np.int16 and idx.tolist() == [-1, 0, 128, 255]
+    assert gradient_index([5.0, 5.0]).tolist() == [0, 0]
+    assert gradient_index([np.nan]).tolist() == [-1]
+    assert gradient_css([-1]) == [""]
+
+
+def test_selection_matches_pandas(table):
+    df, min_dt = table
+    allowed = df["Allowed_dT"].to_numpy(dtype=float)
+    worst = select_rows(allowed, min_dt, "worst")
+    np.testing.assert_array_equal(worst, df["Allowed_dT"].sort_values(kind="stable").index.to_numpy())
+    np.testing.assert_array_equal(select_rows(allowed, min_dt, "original"), np.arange(len(df)))
+
+    rows = select_rows(allowed, min_dt, "best", max_gap=20.0, names=df["Component"], query="PA")
+    keep = (df["Allowed_dT"] - min_dt <= 20.0) & df["Component"].str.lower().str.contains("pa")
+    ref = df.loc[keep, "Allowed_dT"].sort_values(ascending=False, kind="stable").index.to_numpy()
+    np.testing.assert_array_equal(rows, ref)
+    with pytest.raises(ValueError):
+        select_rows(allowed, min_dt, "random")
+
+
+def test_paging():
+    rows = np.arange(250)
+    assert page_count(250, 100) == 3 and page_count(0, 100) == 1
+    np.testing.assert_array_equal(page_rows(rows, 2, 100), np.arange(100, 200))
+    np.testing.assert_array_equal(page_rows(rows, 10**9, 100), np.arange(200, 250))  # 超出範圍取最後一頁
+    np.testing.assert_array_equal(page_rows(rows, 0, 100), np.arange(100))
+    assert len(page_rows(rows[:0], 1, 100)) == 0
@@ -0,0 +1,93 @@
+"""calc_thermal_resistance_vec 與單行參考實作 calc_thermal_resistance 的等價性 (含邊界列)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from rru_engine import COMPONENT_RESULT_COLUMNS, DEFAULT_GLOBALS, calc_thermal_resistance, calc_thermal_resistance_vec
+from rru_engine.model import build_globals_dict, resolve_params
+
+G = build_globals_dict(resolve_params(DEFAULT_GLOBALS))
+
+BASE_ROW = {
+    "Component": "Driver PA", "Qty": 4, "Power(W)": 9.54, "Height(mm)": 200, "Pad_L": 5.0, "Pad_W": 5.0,
+    "Thick(mm)": 2.0, "Board_Type": "Thermal Via", "Limit(C)": 200, "R_jc": 1.7, "TIM_Type": "Grease",
+}
+EDGE_CASES = {
+    "base": {},
+    "final_pa": {"Component": "Final PA", "Board_Type": "Copper Coin", "TIM_Type": "Solder", "Thick(mm)": 2.5},
+    "final_pa_no_board": {"Component": "Final PA", "Board_Type": "None"},
+    "power_zero": {"Power(W)": 0.0},
+    "thick_zero": {"Thick(mm)": 0.0},
+    "pad_zero": {"Pad_L": 0.0, "Pad_W": 0.0},
+    "copper_coin": {"Board_Type": "Copper Coin"},
+    "unknown_tim": {"TIM_Type": "Graphite"},
+    "unknown_board": {"Board_Type": "Vapor Chamber"},
+    "tim_none": {"TIM_Type": "None"},
+    "power_nan": {"Power(W)": np.nan},
+    "thick_nan": {"Thick(mm)": np.nan},
+    "pad_nan": {"Pad_L": np.nan},
+    "qty_nan": {"Qty": np.nan},
+}
+
+
+def row_wise(df, g=G):
+    res = df.apply(lambda row: calc_thermal_resistance(row, g), axis=1)
+    res.columns = COMPONENT_RESULT_COLUMNS
+    return res
+
+
+def make_df(cases):
+    return pd.DataFrame([dict(BASE_ROW, **EDGE_CASES[c]) for c in cases], index=list(cases))
+
+
+@pytest.mark.parametrize("case", list(EDGE_CASES))
+def test_edge_row_matches_row_wise(case):
+    df = make_df([case])
+    vec = calc_thermal_resistance_vec(df, G)
+    ref = row_wise(df)
+    assert list(vec.columns) == COMPONENT_RESULT_COLUMNS
+    np.testing.assert_array_equal(vec.to_numpy(dtype=float), ref.to_numpy(dtype=float))
+
+
+def test_mixed_table_matches_row_wise():
+    cases = list(EDGE_CASES) * 3
+    df = make_df(cases).reset_index(drop=True)
+    vec = calc_thermal_resistance_vec(df, G)
+    ref = row_wise(df)
+    np.testing.assert_array_equal(vec.to_numpy(dtype=float), ref.to_numpy(dtype=float))
+    assert vec.index.equals(df.index)
+
+
+def test_default_bom_matches_row_wise(components_df):
+    np.testing.assert_array_equal(calc_thermal_resistance_vec(components_df, G).to_numpy(dtype=float),
+                                  row_wise(components_df).to_numpy(dtype=float))
+
+
+def test_blank_row_is_nan():
+    """data_editor 新增的空白列 (數值欄為 None)：單行版無法計算，向量化版回傳 NaN 而不丟例外"""
+    df = pd.DataFrame([dict.fromkeys(BASE_ROW), BASE_ROW])
+    out = calc_thermal_resistance_vec(df, G)
+    assert out.iloc[0][["Loc_Amb", "Total_W", "Drop", "Allowed_dT"]].isna().all()
+    np.testing.assert_array_equal(out.iloc[[1]].to_numpy(), row_wise(df.iloc[[1]].infer_objects()).to_numpy(dtype=float))
+
+
+def test_final_pa_uses_coin_setting():
+    out = calc_thermal_resistance_vec(make_df(["final_pa", "power_zero", "thick_zero"]), G)
+    assert out.loc["final_pa", ["Base_L", "Base_W"]].tolist() == [DEFAULT_GLOBALS["Coin_L_Setting"], DEFAULT_GLOBALS["Coin_W_Setting"]]
+    assert out.loc["power_zero", ["Base_L", "Base_W"]].tolist() == [0.0, 0.0]
+    assert out.loc["thick_zero", ["Base_L", "Base_W", "R_int"]].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_unknown_tim_uses_default():
+    out = calc_thermal_resistance_vec(make_df(["unknown_tim", "tim_none"]), G)
+    assert out["R_TIM"].tolist() == [0.0, 0.0]
+
+
+def test_per_row_globals():
+    """批次評估時 g 的數值可為逐列陣列，結果等於各列分別以純量參數計算"""
+    df = make_df(["base", "final_pa", "copper_coin"]).reset_index(drop=True)
+    t_amb = np.array([25.0, 45.0, 55.0])
+    out = calc_thermal_resistance_vec(df, dict(G, T_amb=t_amb))
+    for i, t in enumerate(t_amb):
+        ref = calc_thermal_resistance_vec(df.iloc[[i]], dict(G, T_amb=t))
+        np.testing.assert_array_equal(out.iloc[[i]].to_numpy(), ref.to_numpy())
@@ -0,0 +1,50 @@
+"""Monte Carlo 公差分析 (rru_engine.tolerance)"""
+import numpy as np
+import pytest
+
+from rru_engine import evaluate_project
+from rru_engine.tolerance import DEFAULT_TOLERANCES, QuantileSketch, Tolerance, run_tolerance
+
+
+def test_zero_spread_matches_evaluate_project(params, components_df):
+    ref = evaluate_project(params, components_df)
+    zero = [t._replace(spread=0.0) for t in DEFAULT_TOLERANCES]
+    r = run_tolerance(params, components_df, zero, n_samples=500, seed=0, chunk_size=128)
+    for key in ("Min_dT_Allowed", "Volume_L", "Fin_Height"):
+        assert r[key]["min"] == r[key]["max"] == ref[key], key
+    assert r["bottleneck_freq"].index[0] == ref["Bottleneck_Name"]
+    assert r["bottleneck_freq"].iloc[0] == 1.0
+
+
+def test_seeded_and_bounded(params, components_df):
+    tols = [Tolerance("T_amb", "uniform", 10.0, relative=False)]
+    a = run_tolerance(params, components_df, tols, n_samples=2000, seed=3)
+    b = run_tolerance(params, components_df, tols, n_samples=2000, seed=3)
+    assert a["Min_dT_Allowed"] == b["Min_dT_Allowed"]
+    # T_amb ±10 均勻分佈：Min_dT 的範圍即為標稱值 ±10
+    nominal = evaluate_project(params, components_df)["Min_dT_Allowed"]
+    assert a["Min_dT_Allowed"]["min"] >= nominal - 10 - 1e-9
+    assert a["Min_dT_Allowed"]["max"] <= nominal + 10 + 1e-9
+
+
+def test_sketch_rank_error_and_exact_moments():
+    rng = np.random.default_rng(1)
+    data = np.concatenate([rng.normal(40, 2, 100_000), rng.gamma(2.0, 3.0, 100_000)])
+    rng.shuffle(data)
+    sk = QuantileSketch(1024, seed=2)
+    for chunk in np.array_split(data, 20):
+        sk.update(chunk)
+    qs = np.array([0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99])
+    ranks = np.searchsorted(np.sort(data), sk.quantile(qs)) / len(data)
+    assert np.abs(ranks - qs).max() < 0.01
+    assert sk.n_stored < len(data) / 20
+    assert sk.mean == pytest.approx(data.mean(), abs=1e-9)
+    assert sk.std == pytest.approx(data.std(ddof=1), abs=1e-9)
+    assert (sk.min, sk.max) == (data.min(), data.max())
+
+
+def test_sketch_ignores_nan_and_empty():
+    sk = QuantileSketch(16)
+    assert np.isnan(sk.quantile(0.5))
+    sk.update([np.nan, 1.0, 2.0, 3.0])
+    assert sk.count == 3 and sk.quantile(0.5) == 2.0
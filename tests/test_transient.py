@@ -0,0 +1,50 @@
+"""暫態熱模擬 (rru_engine.transient)：固定負載回到穩態模型、模態掃描與逐步後向 Euler 一致"""
+import numpy as np
+import pytest
+
+from bench_transient import stepwise
+from rru_engine import evaluate_project
+from rru_engine.transient import TransientModel, diurnal_profile, simulate_transient
+
+
+@pytest.fixture
+def res(params, components_df):
+    return evaluate_project(params, components_df)
+
+
+def test_constant_load_equals_steady(res, params):
+    out = simulate_transient(res, params["fin_tech_selector_v2"], np.ones(3600), dt=1.0)
+    table = out["table"]
+    np.testing.assert_allclose(table["Tj_peak"], table["Tj_steady"], rtol=0, atol=1e-9)
+    worst = table.iloc[0]
+    assert worst["Component"] == res["Bottleneck_Name"]
+    ref = worst["Limit(C)"] - res["Min_dT_Allowed"] + res["Min_dT_Allowed"] / params["Margin"]
+    assert np.isclose(worst["Tj_peak"], ref, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("dt", [0.5, 5.0])
+def test_scan_matches_stepwise(res, params, dt):
+    rng = np.random.default_rng(0)
+    n_rows = len(res["valid_rows"])
+    model = TransientModel(res, params["fin_tech_selector_v2"], tau_pkg_s=rng.uniform(2.0, 30.0, n_rows))
+    frac = rng.uniform(0.2, 1.0, (200, n_rows))
+    fast = model.simulate(frac, dt, "steady")
+    x0 = np.linalg.solve(model.K, model.heat_input(frac[:1])[0])
+    np.testing.assert_allclose(fast, stepwise(model, frac, dt, x0), rtol=0, atol=1e-8)
+    fast = model.simulate(frac, dt, "periodic")
+    np.testing.assert_allclose(fast, stepwise(model, frac, dt, fast[-1]), rtol=0, atol=1e-8)
+
+
+def test_trace_is_bounded(res, params):
+    frac = diurnal_profile(6.0, 1.0, burst_per_hour=6)
+    out = simulate_transient(res, params["fin_tech_selector_v2"], frac, trace_points=500)
+    assert out["n_steps"] == len(frac) and len(out["trace"]) <= 500
+    assert (out["table"]["Tj_peak"] <= out["table"]["Tj_steady"] + 1e-9).all()  # 負載比例 <= 1
+
+
+def test_invalid_inputs(res, params):
+    model = TransientModel(res, params["fin_tech_selector_v2"])
+    with pytest.raises(ValueError):
+        model.simulate(np.ones(10), dt=0)
+    with pytest.raises(ValueError):
+        model.simulate(np.ones(10), initial="cold")